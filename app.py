@@ -5,33 +5,36 @@ import os
 import sys
 from pathlib import Path
 
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QTabWidget, QLabel, QStatusBar, QMenuBar, QMenu, QMessageBox
+# Startup profiling (--profile-startup) must be enabled before the heavy imports
+from utils.startup_profiler import (
+    consume_profile_flag, finish_after_first_frame, get_startup_profiler
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QAction
 
-# Import existing PySide6 panels
-from panels.pantry_panel import PantryPanel
-from panels.health_log_panel import HealthLogPanel
-from panels.cookbook_panel import CookbookPanel
-from panels.shopping_list_panel import ShoppingListPanel
-from panels.menu_panel import MenuPanel
-from panels.calendar_panel import CalendarPanel
-from panels.guide_panel import GuidePanel
-from panels.settings_panel import SettingsPanel
+_profiler = get_startup_profiler()
+if __name__ == "__main__" and consume_profile_flag(sys.argv):
+    _profiler.enable()
 
-# Import sync manager
-from core.sync_manager import SyncManager
+with _profiler.span("imports"):
+    from PySide6.QtWidgets import (
+        QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+        QTabWidget, QLabel, QStatusBar, QMenuBar, QMenu, QMessageBox
+    )
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QFont, QAction
 
-# Import theme engine
-try:
-    from services.theme_engine_pyside6 import apply_modern_theme
-except ImportError:
-    def apply_modern_theme(app):
-        """Fallback theme if theme engine is not available"""
-        app.setStyle('Fusion')
+    # Panels are imported and constructed on first activation
+    from core.panel_registry import PanelRegistry
+
+    # Import sync manager
+    from core.sync_manager import SyncManager
+
+    # Import theme engine
+    try:
+        from services.theme_engine_pyside6 import apply_modern_theme
+    except ImportError:
+        def apply_modern_theme(app):
+            """Fallback theme if theme engine is not available"""
+            app.setStyle('Fusion')
 
 
 class MainWindow(QMainWindow):
@@ -49,20 +52,25 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(800, 600)
         
         # Initialize database
-        self.init_database()
+        with _profiler.span("init_database"):
+            self.init_database()
         
         # Initialize Bluetooth sync
-        self.sync_manager = SyncManager()
-        self.sync_manager.sync_status_changed.connect(self._handle_sync_update)
-        self.sync_manager.start_bluetooth_sync()
+        with _profiler.span("start_bluetooth_sync"):
+            self.sync_manager = SyncManager()
+            self.sync_manager.sync_status_changed.connect(self._handle_sync_update)
+            self.sync_manager.start_bluetooth_sync()
         
         # Set up UI with centered title and navigation menu
-        self.setup_ui()
-        self.setup_status_bar()
-        self.setup_panels()
+        with _profiler.span("setup_ui"):
+            self.setup_ui()
+            self.setup_status_bar()
+        with _profiler.span("setup_panels"):
+            self.setup_panels()
         
         # Apply saved theme or default theme
-        self.apply_saved_theme()
+        with _profiler.span("apply_saved_theme"):
+            self.apply_saved_theme()
 
     def apply_saved_theme(self):
         """Apply the saved theme or default theme"""
@@ -77,15 +85,12 @@ class MainWindow(QMainWindow):
                     self.status_var = f"Applied theme: {saved_theme}"
                     # Apply menu bar styling at application level to override theme
                     self.apply_application_level_menu_styling()
-                    # Update navigation widget to match theme
-                    self.update_navigation_theme()
                 else:
                     # Fallback to celiac safe theme if saved theme fails
                     result = theme_creator.apply_theme("celiac_safe", app)
                     if result:
                         self.status_var = "Applied fallback Celiac Safe theme"
                         self.apply_application_level_menu_styling()
-                        self.update_navigation_theme()
         except Exception as e:
             print(f"Error applying saved theme: {e}")
             # Fallback to celiac safe theme
@@ -97,7 +102,6 @@ class MainWindow(QMainWindow):
                     if result:
                         self.status_var = "Applied fallback Celiac Safe theme"
                         self.apply_application_level_menu_styling()
-                        self.update_navigation_theme()
             except Exception as e2:
                 print(f"Error applying fallback theme: {e2}")
     
@@ -113,8 +117,6 @@ class MainWindow(QMainWindow):
                     self.status_var = "Celiac Safe theme applied"
                     # Apply menu bar styling at application level to override theme
                     self.apply_application_level_menu_styling()
-                    # Update navigation widget to match theme
-                    self.update_navigation_theme()
                 else:
                     # Fallback to modern theme if celiac safe fails
                     apply_modern_theme(app)
@@ -283,7 +285,8 @@ class MainWindow(QMainWindow):
             from utils.settings import ensure_settings_table
             
             self.db = get_connection()
-            ensure_schema(self.db)
+            with _profiler.span("ensure_schema"):
+                ensure_schema(self.db)
             ensure_settings_table(self.db)
             if self.status_var == "Database initialized":
                 self.status_var = "Database initialized"
@@ -312,49 +315,18 @@ class MainWindow(QMainWindow):
         from core.ui_polish import UIPolish
         title_label.setFont(UIPolish.get_title_font())
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            QLabel {
-                color: #1b5e20;
-                margin: 20px;
-                padding: 16px;
-                background-color: rgba(241, 248, 233, 0.8);
-                border-radius: 8px;
-            }
-        """)
+        # Styled by the application stylesheet of the active theme
+        title_label.setProperty("role", "app-title")
         self.title_label = title_label
         main_layout.addWidget(title_label)
         
         # Create centered navigation menu below title
         self.create_centered_navigation_menu(main_layout)
         
-        # Tab widget with improved styling
+        # Tab widget (styled by the active theme)
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabPosition(QTabWidget.North)
         self.tab_widget.setMovable(True)
-        self.tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #c8e6c9;
-                border-radius: 8px;
-                background-color: #fafafa;
-                margin-top: 4px;
-            }
-            QTabBar::tab {
-                background-color: #e8f5e8;
-                color: #2e7d32;
-                padding: 12px 20px;
-                margin-right: 2px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-                font-weight: 500;
-            }
-            QTabBar::tab:selected {
-                background-color: #ffffff;
-                border-bottom: 2px solid #4caf50;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: #f1f8e9;
-            }
-        """)
         main_layout.addWidget(self.tab_widget)
 
     def create_centered_navigation_menu(self, main_layout):
@@ -364,6 +336,8 @@ class MainWindow(QMainWindow):
             
             # Create navigation widget
             nav_widget = QWidget()
+            nav_widget.setProperty("role", "nav-bar")
+            nav_widget.setAttribute(Qt.WA_StyledBackground, True)
             nav_layout = QHBoxLayout(nav_widget)
             nav_layout.setContentsMargins(20, 10, 20, 10)
             nav_layout.setSpacing(10)
@@ -385,57 +359,13 @@ class MainWindow(QMainWindow):
             
             for text, callback in nav_buttons:
                 btn = QPushButton(text)
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ffffff;
-                        color: #2e7d32;
-                        border: 2px solid #c8e6c9;
-                        padding: 10px 18px;
-                        font-family: 'Segoe UI', sans-serif;
-                        font-size: 11px;
-                        font-weight: 500;
-                        border-radius: 6px;
-                        min-width: 90px;
-                        min-height: 36px;
-                    }
-                    QPushButton:hover {
-                        background-color: #e8f5e8;
-                        border-color: #4caf50;
-                        transform: translateY(-1px);
-                    }
-                    QPushButton:pressed {
-                        background-color: #2e7d32;
-                        color: #ffffff;
-                        border-color: #1b5e20;
-                    }
-                """)
+                btn.setProperty("role", "nav-button")
                 btn.clicked.connect(callback)
                 nav_layout.addWidget(btn)
             
-            # Add Options button with distinct styling
+            # Add Options button
             options_btn = QPushButton("⚙ Options")
-            options_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #f5f5f5;
-                    color: #424242;
-                    border: 2px solid #bdbdbd;
-                    padding: 10px 18px;
-                    font-family: 'Segoe UI', sans-serif;
-                    font-size: 11px;
-                    font-weight: 500;
-                    border-radius: 6px;
-                    min-width: 90px;
-                    min-height: 36px;
-                }
-                QPushButton:hover {
-                    background-color: #eeeeee;
-                    border-color: #757575;
-                }
-                QPushButton:pressed {
-                    background-color: #e0e0e0;
-                    border-color: #424242;
-                }
-            """)
+            options_btn.setProperty("role", "nav-button")
             options_btn.clicked.connect(self.show_settings)
             nav_layout.addWidget(options_btn)
             
@@ -443,90 +373,15 @@ class MainWindow(QMainWindow):
             right_spacer = QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum)
             nav_layout.addItem(right_spacer)
             
-            # Don't apply hardcoded styling - let theme handle it
-            # nav_widget.setStyleSheet("""
-            #     QWidget {
-            #         background-color: #f1f8e9;
-            #         border-bottom: 1px solid #c8e6c9;
-            #     }
-            # """)
-            
-            # Apply polished navigation styling
-            nav_widget.setStyleSheet("""
-                QWidget {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                        stop:0 #f8fdf8, stop:1 #f1f8e9);
-                    border-bottom: 2px solid #c8e6c9;
-                    border-top: 1px solid #e8f5e8;
-                }
-            """)
-            
+            # Navigation bar and buttons are styled by the application
+            # stylesheet of the active theme through their "role" property
+
             self.nav_widget = nav_widget
             main_layout.addWidget(nav_widget)
             
         except Exception as e:
             print(f"Error creating centered navigation menu: {e}")
 
-    def update_navigation_theme(self):
-        """Update navigation widget to match current theme"""
-        try:
-            if hasattr(self, 'nav_widget') and self.nav_widget:
-                # Get the current theme colors
-                from services.theme_creator import theme_creator
-                
-                # Get current theme ID and load theme data
-                current_theme_id = theme_creator.current_theme
-                if current_theme_id:
-                    theme_data = theme_creator.load_theme(current_theme_id)
-                    if theme_data:
-                        # Extract colors from theme
-                        colors = theme_data.get('colors', {})
-                        
-                        # Use the main theme background color for title
-                        header_bg = colors.get('background', '#fafafa')
-                        print(f"DEBUG: Theme {current_theme_id} - background: {header_bg}, primary: {colors.get('primary', 'N/A')}")
-                        
-                        # Try different possible color keys for border
-                        border_color = (colors.get('border_color') or 
-                                      colors.get('border') or 
-                                      colors.get('surface_variant') or 
-                                      '#c8e6c9')
-                        
-                        # Get additional theme colors
-                        background_color = colors.get('background', '#fafafa')
-                        text_color = colors.get('text_primary', '#212121')
-                        
-                        # Update title label styling
-                        if hasattr(self, 'title_label') and self.title_label:
-                            title_style = f"""
-                                QLabel {{
-                                    color: {text_color} !important; 
-                                    margin: 15px; 
-                                    padding: 15px; 
-                                    background-color: {header_bg} !important;
-                                    border-bottom: 2px solid {border_color};
-                                    border: none;
-                                }}
-                            """
-                            self.title_label.setStyleSheet(title_style)
-                            print(f"Updated title background to: {header_bg}")
-                        
-                        # Apply theme colors to navigation widget
-                        self.nav_widget.setStyleSheet(f"""
-                            QWidget {{
-                                background-color: {header_bg};
-                                border-bottom: 1px solid {border_color};
-                            }}
-                        """)
-                        
-                        print(f"Updated navigation theme with background: {header_bg}")
-                    else:
-                        print("Failed to load theme data for navigation update")
-                else:
-                    print("No current theme ID found for navigation update")
-        except Exception as e:
-            print(f"Error updating navigation theme: {e}")
-
     def style_menu_bar(self, menubar):
         """Apply Celiac Safe theme styling to menu bar"""
         try:
@@ -905,33 +760,10 @@ class MainWindow(QMainWindow):
     def setup_panels(self):
         """Set up all panels"""
         try:
-            # Cookbook Panel (index 0)
-            self.cookbook_panel = CookbookPanel(self, self)
-            self.tab_widget.addTab(self.cookbook_panel, "Cookbook")
-            
-            # Pantry Panel (index 1)
-            self.pantry_panel = PantryPanel(self, self)
-            self.tab_widget.addTab(self.pantry_panel, "Pantry")
-            
-            # Shopping List Panel (index 2)
-            self.shopping_list_panel = ShoppingListPanel(self, self)
-            self.tab_widget.addTab(self.shopping_list_panel, "Shopping List")
-            
-            # Menu Panel (index 3)
-            self.menu_panel = MenuPanel(self, self)
-            self.tab_widget.addTab(self.menu_panel, "Menu Planner")
-            
-            # Health Log Panel (index 4)
-            self.health_log_panel = HealthLogPanel(self, self)
-            self.tab_widget.addTab(self.health_log_panel, "Health Log")
-            
-            # Calendar Panel (index 5)
-            self.calendar_panel = CalendarPanel(self, self)
-            self.tab_widget.addTab(self.calendar_panel, "Calendar")
-            
-            # Guide Panel (index 6)
-            self.guide_panel = GuidePanel(self, self)
-            self.tab_widget.addTab(self.guide_panel, "Guide")
+            # Tabs hold placeholders; only the default tab (Cookbook) is
+            # constructed now, the rest on first activation
+            self.panel_registry = PanelRegistry(self.tab_widget, self, self)
+            self.panel_registry.register_all()
             
             # Settings Panel will be created fresh each time it's opened
             
@@ -949,6 +781,52 @@ class MainWindow(QMainWindow):
             error_layout.addWidget(error_label)
             self.tab_widget.addTab(error_widget, "Error")
 
+    def prebuild_panels(self, interval_ms: int = 50):
+        """Construct the remaining panels in idle time after the window is shown"""
+        if hasattr(self, 'panel_registry'):
+            self.panel_registry.prebuild_remaining(interval_ms)
+
+    def start_risk_sweep(self, delay_ms: int = 2000):
+        """Score new or edited pantry items and recipes in the background"""
+        from PySide6.QtCore import QTimer
+        from services.risk_sweep import get_risk_sweep_service
+        QTimer.singleShot(delay_ms, get_risk_sweep_service().start)
+
+    def start_snapshot_schedule(self, delay_ms: int = 10000):
+        """Take scheduled database snapshots in the background"""
+        from PySide6.QtCore import QTimer
+        from services.snapshot_service import get_snapshot_service
+        QTimer.singleShot(delay_ms, get_snapshot_service().start_schedule)
+
+    # Panel accessors kept for code that reaches panels through the main window
+    @property
+    def cookbook_panel(self):
+        return self.panel_registry.get_panel('cookbook')
+
+    @property
+    def pantry_panel(self):
+        return self.panel_registry.get_panel('pantry')
+
+    @property
+    def shopping_list_panel(self):
+        return self.panel_registry.get_panel('shopping_list')
+
+    @property
+    def menu_panel(self):
+        return self.panel_registry.get_panel('menu')
+
+    @property
+    def health_log_panel(self):
+        return self.panel_registry.get_panel('health_log')
+
+    @property
+    def calendar_panel(self):
+        return self.panel_registry.get_panel('calendar')
+
+    @property
+    def guide_panel(self):
+        return self.panel_registry.get_panel('guide')
+
     def switch_to_panel(self, index):
         """Switch to a specific panel by index"""
         try:
@@ -996,13 +874,8 @@ class MainWindow(QMainWindow):
             if app and theme_creator.apply_theme(theme_id, app):
                 print(f"DEBUG: Theme {theme_id} applied successfully in main app")
                 
-                # Force a complete refresh of the main window
-                self.refresh_main_window_styling()
-                
                 # Apply menu styling at application level after theme change
                 self.apply_application_level_menu_styling()
-                # Update navigation theme to match new theme
-                self.update_navigation_theme()
                 self.status_bar.showMessage(f"Theme changed to: {theme_id}")
                 print(f"DEBUG: Theme change complete for {theme_id}")
             else:
@@ -1012,39 +885,6 @@ class MainWindow(QMainWindow):
             print(f"DEBUG: Error in on_theme_changed: {e}")
             QMessageBox.critical(self, "Theme Error", f"Failed to change theme: {str(e)}")
     
-    def refresh_main_window_styling(self):
-        """Force refresh of main window styling"""
-        try:
-            # Force repaint of main window
-            self.update()
-            self.repaint()
-            
-            # Force repaint of central widget
-            central_widget = self.centralWidget()
-            if central_widget:
-                central_widget.update()
-                central_widget.repaint()
-            
-            # Force repaint of tab widget
-            if hasattr(self, 'tab_widget') and self.tab_widget:
-                self.tab_widget.update()
-                self.tab_widget.repaint()
-            
-            # Force repaint of navigation widget
-            if hasattr(self, 'nav_widget') and self.nav_widget:
-                self.nav_widget.update()
-                self.nav_widget.repaint()
-            
-            # Force repaint of title label
-            if hasattr(self, 'title_label') and self.title_label:
-                self.title_label.update()
-                self.title_label.repaint()
-            
-            print("DEBUG: Main window styling refreshed")
-            
-        except Exception as e:
-            print(f"DEBUG: Error refreshing main window styling: {e}")
-
     def show_settings(self):
         """Show settings dialog"""
         try:
@@ -1107,6 +947,9 @@ class MainWindow(QMainWindow):
             # Clean up Bluetooth connection
             if hasattr(self, 'sync_manager'):
                 self.sync_manager.bluetooth_service.server_socket = None
+            # Cancel background jobs and let running ones stop between steps
+            from services.background_jobs import get_job_manager
+            get_job_manager().shutdown()
             event.accept()
         else:
             event.ignore()
@@ -1114,13 +957,22 @@ class MainWindow(QMainWindow):
 
 def main():
     """Main entry point"""
-    app = QApplication(sys.argv)
-    app.setApplicationName("CeliacShield")
-    app.setApplicationVersion("1.0")
-    app.setOrganizationName("CeliacShield")
+    with _profiler.span("qapplication"):
+        app = QApplication(sys.argv)
+        app.setApplicationName("CeliacShield")
+        app.setApplicationVersion("1.0")
+        app.setOrganizationName("CeliacShield")
+    
+    with _profiler.span("window"):
+        window = MainWindow()
+    with _profiler.span("show"):
+        window.show()
     
-    window = MainWindow()
-    window.show()
+    # Construct the remaining panels once the event loop is idle
+    window.prebuild_panels()
+    window.start_risk_sweep()
+    window.start_snapshot_schedule()
+    finish_after_first_frame(_profiler)
     
     sys.exit(app.exec())
 
@@ -33,12 +33,14 @@ class DatabaseManager:
             from utils.db import get_connection
             from utils.migrations import ensure_schema
             from utils.settings import ensure_settings_table
+            from utils.startup_profiler import get_startup_profiler
             
             # Get database connection
             self._connection = get_connection()
             
             # Ensure schema is up to date
-            ensure_schema(self._connection)
+            with get_startup_profiler().span("ensure_schema"):
+                ensure_schema(self._connection)
             
             # Ensure settings table exists
             ensure_settings_table(self._connection)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Panel Registry for CeliacShield Application
+
+Holds lightweight placeholders in the main tab widget and only imports and
+constructs the real panel the first time its tab is activated. Remaining
+panels can be prebuilt one at a time while the event loop is idle.
+"""
+
+import importlib
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QTabWidget
+from PySide6.QtCore import QObject, QTimer, Signal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PanelSpec:
+    """Describes a panel that can be imported and constructed on demand"""
+    key: str
+    title: str
+    module: str
+    class_name: str
+
+
+# Main window tabs in navigation order
+DEFAULT_PANEL_SPECS: List[PanelSpec] = [
+    PanelSpec("cookbook", "Cookbook", "panels.cookbook_panel", "CookbookPanel"),
+    PanelSpec("pantry", "Pantry", "panels.pantry_panel", "PantryPanel"),
+    PanelSpec("shopping_list", "Shopping List", "panels.shopping_list_panel", "ShoppingListPanel"),
+    PanelSpec("menu", "Menu Planner", "panels.menu_panel", "MenuPanel"),
+    PanelSpec("health_log", "Health Log", "panels.health_log_panel", "HealthLogPanel"),
+    PanelSpec("calendar", "Calendar", "panels.calendar_panel", "CalendarPanel"),
+    PanelSpec("guide", "Guide", "panels.guide_panel", "GuidePanel"),
+]
+
+
+class LazyPanelPlaceholder(QWidget):
+    """Tab page that stands in for a panel until it is first activated"""
+
+    def __init__(self, spec: PanelSpec, parent=None):
+        super().__init__(parent)
+        self.spec = spec
+        self.panel: Optional[QWidget] = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+    def set_panel(self, panel: QWidget):
+        """Embed the constructed panel in this tab page"""
+        self.panel = panel
+        self.layout().addWidget(panel)
+
+    def is_built(self) -> bool:
+        """Check whether the real panel has been constructed"""
+        return self.panel is not None
+
+    def refresh(self):
+        """Forward refresh requests to the real panel once it exists"""
+        if self.panel is not None and hasattr(self.panel, 'refresh'):
+            self.panel.refresh()
+
+
+class PanelRegistry(QObject):
+    """Creates main window panels on first activation"""
+
+    # Signals
+    panel_created = Signal(int, str)  # tab index, panel key
+
+    def __init__(self, tab_widget: QTabWidget, master=None, app=None,
+                 factory: Optional[Callable[[PanelSpec], QWidget]] = None):
+        """
+        Args:
+            tab_widget: Tab widget that receives the placeholders
+            master: Parent passed to panel constructors
+            app: Application object passed to panel constructors
+            factory: Optional override used to construct panels
+        """
+        super().__init__(tab_widget)
+        self.tab_widget = tab_widget
+        self.master = master
+        self.app = app
+        self.factory = factory or self._default_factory
+        self._placeholders: List[LazyPanelPlaceholder] = []
+        self._index_by_key: Dict[str, int] = {}
+        self._prebuild_queue: List[int] = []
+
+        self.tab_widget.currentChanged.connect(self._on_current_changed)
+
+    def register(self, spec: PanelSpec) -> int:
+        """
+        Add a placeholder tab for a panel
+
+        Args:
+            spec: Panel description
+
+        Returns:
+            int: Tab index of the placeholder
+        """
+        placeholder = LazyPanelPlaceholder(spec)
+        index = self.tab_widget.addTab(placeholder, spec.title)
+        self._placeholders.append(placeholder)
+        self._index_by_key[spec.key] = index
+        return index
+
+    def register_all(self, specs: Optional[List[PanelSpec]] = None):
+        """Register every panel in order, building the default tab immediately"""
+        for spec in specs or DEFAULT_PANEL_SPECS:
+            self.register(spec)
+        # Adding the first tab normally builds it via currentChanged; this
+        # covers a tab widget whose current index was set beforehand
+        self.ensure_panel(self.tab_widget.currentIndex())
+
+    def index_of(self, key: str) -> int:
+        """Get the tab index for a panel key, or -1 if unknown"""
+        return self._index_by_key.get(key, -1)
+
+    def is_built(self, index_or_key: Union[int, str]) -> bool:
+        """Check whether a panel has been constructed"""
+        placeholder = self._placeholder(index_or_key)
+        return placeholder is not None and placeholder.is_built()
+
+    def get_panel(self, index_or_key: Union[int, str], create: bool = True) -> Optional[QWidget]:
+        """
+        Get the real panel for a tab
+
+        Args:
+            index_or_key: Tab index or panel key
+            create: Construct the panel if it has not been built yet
+
+        Returns:
+            The panel widget, or None if unknown or not built
+        """
+        placeholder = self._placeholder(index_or_key)
+        if placeholder is None:
+            return None
+        if placeholder.panel is None and create:
+            self._build(placeholder)
+        return placeholder.panel
+
+    def ensure_panel(self, index: int) -> Optional[QWidget]:
+        """Construct the panel behind a tab index if needed"""
+        return self.get_panel(index, create=True)
+
+    def built_panels(self) -> List[QWidget]:
+        """Get every panel that has been constructed so far"""
+        return [p.panel for p in self._placeholders if p.panel is not None]
+
+    def prebuild_remaining(self, interval_ms: int = 50):
+        """
+        Build the remaining panels one per idle tick
+
+        Each panel is constructed from its own timer callback so input and
+        paint events are processed between panels.
+
+        Args:
+            interval_ms: Delay between consecutive panel constructions
+        """
+        self._prebuild_queue = [
+            i for i, p in enumerate(self._placeholders) if not p.is_built()
+        ]
+        self._prebuild_interval = interval_ms
+        if self._prebuild_queue:
+            QTimer.singleShot(interval_ms, self._prebuild_next)
+
+    def _prebuild_next(self):
+        """Build the next queued panel and reschedule"""
+        while self._prebuild_queue:
+            index = self._prebuild_queue.pop(0)
+            if not self._placeholders[index].is_built():
+                try:
+                    self._build(self._placeholders[index])
+                except Exception:
+                    # Already logged by _build; the tab retries on activation
+                    pass
+                break
+        if self._prebuild_queue:
+            QTimer.singleShot(self._prebuild_interval, self._prebuild_next)
+
+    def _placeholder(self, index_or_key: Union[int, str]) -> Optional[LazyPanelPlaceholder]:
+        """Resolve a tab index or panel key to its placeholder"""
+        index = self.index_of(index_or_key) if isinstance(index_or_key, str) else index_or_key
+        if 0 <= index < len(self._placeholders):
+            return self._placeholders[index]
+        return None
+
+    def _on_current_changed(self, index: int):
+        """Build a panel when its tab becomes current"""
+        try:
+            self.ensure_panel(index)
+        except Exception:
+            # Already logged by _build; leave the placeholder empty
+            pass
+
+    def _build(self, placeholder: LazyPanelPlaceholder):
+        """Import and construct the panel for a placeholder"""
+        spec = placeholder.spec
+        try:
+            panel = self.factory(spec)
+        except Exception as e:
+            logger.error(f"Error creating panel {spec.key}: {e}")
+            raise
+        placeholder.set_panel(panel)
+        index = self._placeholders.index(placeholder)
+        logger.info(f"Created panel {spec.key} on demand")
+        self.panel_created.emit(index, spec.key)
+
+    def _default_factory(self, spec: PanelSpec) -> QWidget:
+        """Import the panel module and construct the panel class"""
+        module = importlib.import_module(spec.module)
+        panel_class = getattr(module, spec.class_name)
+        return panel_class(self.master, self.app)
@@ -17,19 +17,13 @@ from .ui_manager import UIManager
 from .menu_manager import MenuManager
 from .database_manager import get_database_manager
 from .status_manager import get_status_manager
+from .panel_registry import PanelRegistry
 
 # Import error handling
 from utils.error_handler import get_error_handler, ErrorCategory, ErrorSeverity
+from utils.startup_profiler import get_startup_profiler
 
-# Import panels
-from panels.pantry_panel import PantryPanel
-from panels.health_log_panel import HealthLogPanel
-from panels.cookbook_panel import CookbookPanel
-from panels.shopping_list_panel import ShoppingListPanel
-from panels.menu_panel import MenuPanel
-from panels.calendar_panel import CalendarPanel
-from panels.guide_panel import GuidePanel
-from panels.settings_panel import SettingsPanel
+# Panel modules are imported on first activation by the panel registry
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +60,8 @@ class RefactoredMainWindow(QMainWindow):
     def _initialize_application(self):
         """Initialize application components"""
         # Initialize database
-        db_success = self.database_manager.initialize()
+        with get_startup_profiler().span("init_database"):
+            db_success = self.database_manager.initialize()
         if db_success:
             self.status_manager.update_status_with_database(True)
         else:
@@ -91,33 +86,11 @@ class RefactoredMainWindow(QMainWindow):
     def _setup_panels(self):
         """Set up all application panels"""
         try:
-            # Cookbook Panel (index 0)
-            cookbook_panel = CookbookPanel(self, self)
-            self.ui_manager.add_panel_to_tabs(cookbook_panel, "Cookbook")
-            
-            # Pantry Panel (index 1)
-            pantry_panel = PantryPanel(self, self)
-            self.ui_manager.add_panel_to_tabs(pantry_panel, "Pantry")
-            
-            # Shopping List Panel (index 2)
-            shopping_panel = ShoppingListPanel(self, self)
-            self.ui_manager.add_panel_to_tabs(shopping_panel, "Shopping List")
-            
-            # Menu Panel (index 3)
-            menu_panel = MenuPanel(self, self)
-            self.ui_manager.add_panel_to_tabs(menu_panel, "Menu Planner")
-            
-            # Health Log Panel (index 4)
-            health_panel = HealthLogPanel(self, self)
-            self.ui_manager.add_panel_to_tabs(health_panel, "Health Log")
-            
-            # Calendar Panel (index 5)
-            calendar_panel = CalendarPanel(self, self)
-            self.ui_manager.add_panel_to_tabs(calendar_panel, "Calendar")
-            
-            # Guide Panel (index 6)
-            guide_panel = GuidePanel(self, self)
-            self.ui_manager.add_panel_to_tabs(guide_panel, "Guide")
+            # Tabs hold placeholders; only the default tab (Cookbook) is
+            # constructed now, the rest on first activation
+            with get_startup_profiler().span("setup_panels"):
+                self.panel_registry = PanelRegistry(self.ui_manager.get_tab_widget(), self, self)
+                self.panel_registry.register_all()
             
             # Set initial active navigation button (Cookbook - index 0)
             self.ui_manager.set_active_nav_button(0)
@@ -134,6 +107,29 @@ class RefactoredMainWindow(QMainWindow):
                 self
             )
     
+    def prebuild_panels(self, interval_ms: int = 50):
+        """Construct the remaining panels in idle time after the window is shown"""
+        if hasattr(self, 'panel_registry'):
+            self.panel_registry.prebuild_remaining(interval_ms)
+
+    def start_risk_sweep(self, delay_ms: int = 2000):
+        """Score new or edited pantry items and recipes in the background"""
+        from PySide6.QtCore import QTimer
+        from services.risk_sweep import get_risk_sweep_service
+        QTimer.singleShot(delay_ms, get_risk_sweep_service().start)
+    
+    def start_snapshot_schedule(self, delay_ms: int = 10000):
+        """Take scheduled database snapshots in the background"""
+        from PySide6.QtCore import QTimer
+        from services.snapshot_service import get_snapshot_service
+        QTimer.singleShot(delay_ms, get_snapshot_service().start_schedule)
+    
+    def get_panel(self, key: str):
+        """Get a panel by key, constructing it if needed"""
+        if not hasattr(self, 'panel_registry'):
+            return None
+        return self.panel_registry.get_panel(key)
+    
     def _setup_theme_connections(self):
         """Set up theme manager signal connections"""
         self.theme_manager.theme_applied.connect(self._on_theme_applied)
@@ -142,14 +138,14 @@ class RefactoredMainWindow(QMainWindow):
     
     def _apply_initial_theme(self):
         """Apply the initial theme"""
-        success = self.theme_manager.apply_saved_theme()
+        with get_startup_profiler().span("apply_saved_theme"):
+            success = self.theme_manager.apply_saved_theme()
         if not success:
             logger.warning("Failed to apply initial theme")
     
     def _on_theme_applied(self, theme_id: str):
         """Handle theme application success"""
         self.status_manager.update_status_with_theme(theme_id, True)
-        self._update_ui_theme()
     
     def _on_theme_error(self, error_message: str):
         """Handle theme application error"""
@@ -158,31 +154,6 @@ class RefactoredMainWindow(QMainWindow):
     def _on_fallback_applied(self, fallback_theme_id: str):
         """Handle fallback theme application"""
         self.status_manager.update_status(f"Applied fallback theme: {fallback_theme_id}", "warning")
-        self._update_ui_theme()
-    
-    def _update_ui_theme(self):
-        """Update UI components to match current theme"""
-        try:
-            # Get current theme colors
-            theme_colors = self.theme_manager.get_theme_colors()
-            
-            # Update navigation theme
-            nav_widget = self.ui_manager.get_navigation_widget()
-            if nav_widget:
-                self.ui_manager.update_navigation_theme(theme_colors)
-            
-            # Update title theme
-            title_label = self.ui_manager.get_title_label()
-            if title_label:
-                self.ui_manager.update_title_theme(theme_colors)
-            
-            # Update menu bar styling
-            menu_bar = self.menu_manager.get_menu_bar()
-            if menu_bar:
-                self.menu_manager.apply_menu_bar_styling(menu_bar)
-            
-        except Exception as e:
-            logger.error(f"Error updating UI theme: {e}")
     
     def switch_to_panel(self, index: int):
         """Switch to a specific panel by index"""
@@ -224,6 +195,8 @@ class RefactoredMainWindow(QMainWindow):
             # Layout for the dialog
             layout = QVBoxLayout(dialog)
             
+            from panels.settings_panel import SettingsPanel
+            
             # Create a new settings panel for this dialog
             settings_panel = SettingsPanel(self, self)
             
@@ -260,7 +233,6 @@ class RefactoredMainWindow(QMainWindow):
             
             if success:
                 self.status_manager.update_status_with_theme(theme_id, True)
-                self._update_ui_theme()
             else:
                 self.status_manager.update_status_with_theme(theme_id, False)
                 QMessageBox.warning(self, "Theme Error", "Failed to apply theme. Please check theme configuration.")
@@ -298,6 +270,9 @@ class RefactoredMainWindow(QMainWindow):
                                    QMessageBox.No)
         
         if reply == QMessageBox.Yes:
+            # Cancel background jobs and let running ones stop between steps
+            from services.background_jobs import get_job_manager
+            get_job_manager().shutdown()
             # Clean up resources
             self.database_manager.close_connection()
             event.accept()
@@ -135,7 +135,11 @@ class ThemeManager(QObject):
     
     def update_navigation_theme(self, nav_widget: QWidget, title_label: Optional[QWidget] = None) -> bool:
         """
-        Update navigation widget and title label to match current theme
+        Let navigation widget and title label follow the current theme
+        
+        Both are styled by the application stylesheet through their "role"
+        dynamic property, so this only tags them; later theme switches
+        restyle them without any per-widget stylesheet.
         
         Args:
             nav_widget: Navigation widget to update
@@ -144,48 +148,14 @@ class ThemeManager(QObject):
         Returns:
             bool: True if update was successful
         """
-        if not self._theme_creator or not self._current_theme:
-            logger.warning("No theme creator or current theme available")
-            return False
-        
         try:
-            theme_data = self._theme_creator.load_theme(self._current_theme)
-            if not theme_data:
-                logger.warning(f"Could not load theme data for {self._current_theme}")
-                return False
-            
-            colors = theme_data.get('colors', {})
-            header_bg = colors.get('background', '#fafafa')
-            border_color = (colors.get('border_color') or 
-                          colors.get('border') or 
-                          colors.get('surface_variant') or 
-                          '#c8e6c9')
-            text_color = colors.get('text_primary', '#212121')
-            
-            # Update navigation widget
-            nav_style = f"""
-                QWidget {{
-                    background-color: {header_bg};
-                    border-bottom: 1px solid {border_color};
-                }}
-            """
-            nav_widget.setStyleSheet(nav_style)
-            
-            # Update title label if provided
-            if title_label:
-                title_style = f"""
-                    QLabel {{
-                        color: {text_color} !important; 
-                        margin: 15px; 
-                        padding: 15px; 
-                        background-color: {header_bg} !important;
-                        border-bottom: 2px solid {border_color};
-                        border: none;
-                    }}
-                """
-                title_label.setStyleSheet(title_style)
-            
-            logger.debug(f"Updated navigation theme with background: {header_bg}")
+            for widget, role in ((nav_widget, "nav-bar"), (title_label, "app-title")):
+                if widget is None or widget.property("role") == role:
+                    continue
+                widget.setProperty("role", role)
+                widget.setStyleSheet("")
+                widget.style().unpolish(widget)
+                widget.style().polish(widget)
             return True
             
         except Exception as e:
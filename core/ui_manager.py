@@ -86,11 +86,17 @@ class UIManager:
         title_label.setFont(title_font)
         title_label.setAlignment(Qt.AlignCenter)
         
+        # Styled by the application stylesheet
+        title_label.setProperty("role", "app-title")
+        
         return title_label
     
     def _create_navigation_widget(self) -> QWidget:
         """Create the navigation widget with buttons"""
         nav_widget = QWidget()
+        nav_widget.setProperty("role", "nav-bar")
+        # Plain QWidgets only paint stylesheet backgrounds with this attribute
+        nav_widget.setAttribute(Qt.WA_StyledBackground, True)
         nav_layout = QHBoxLayout(nav_widget)
         nav_layout.setContentsMargins(20, 10, 20, 10)
         nav_layout.setSpacing(10)
@@ -118,66 +124,17 @@ class UIManager:
     def _create_nav_button(self, text: str, panel_index: int) -> QPushButton:
         """Create a navigation button"""
         btn = QPushButton(text)
-        btn.setStyleSheet(self._get_nav_button_style())
+        btn.setProperty("role", "nav-button")
         btn.clicked.connect(lambda: self.main_window.switch_to_panel(panel_index))
         return btn
     
     def _create_options_button(self) -> QPushButton:
         """Create the Options button"""
         options_btn = QPushButton("Options")
-        options_btn.setStyleSheet(self._get_nav_button_style())
+        options_btn.setProperty("role", "nav-button")
         options_btn.clicked.connect(self.main_window.show_settings)
         return options_btn
     
-    def _get_nav_button_style(self, theme_colors: Optional[Dict[str, str]] = None) -> str:
-        """Get the CSS style for navigation buttons with theme support"""
-        if theme_colors:
-            # Use theme colors
-            primary = theme_colors.get('primary', '#1b5e20')
-            primary_light = theme_colors.get('primary_light', '#e8f5e8')
-            primary_dark = theme_colors.get('primary_dark', '#2e7d32')
-            border_color = theme_colors.get('border_color', theme_colors.get('border', '#c8e6c9'))
-            text_primary = theme_colors.get('text_primary', '#212121')
-            text_on_primary = theme_colors.get('text_on_primary', '#ffffff')
-        else:
-            # Fallback to default green theme
-            primary = '#1b5e20'
-            primary_light = '#e8f5e8'
-            primary_dark = '#2e7d32'
-            border_color = '#c8e6c9'
-            text_primary = '#1b5e20'
-            text_on_primary = '#ffffff'
-        
-        return f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {text_primary};
-                border: 1px solid {border_color};
-                padding: 8px 15px;
-                font-family: 'Segoe UI', sans-serif;
-                font-size: 11px;
-                border-radius: 4px;
-                min-width: 80px;
-                font-weight: normal;
-            }}
-            QPushButton:hover {{
-                background-color: {primary_light};
-                color: {text_primary};
-                border-color: {primary};
-            }}
-            QPushButton:pressed {{
-                background-color: {primary};
-                color: {text_on_primary};
-                border-color: {primary_dark};
-            }}
-            QPushButton[active="true"] {{
-                background-color: {primary};
-                color: {text_on_primary};
-                border-color: {primary_dark};
-                font-weight: bold;
-            }}
-        """
-    
     def _create_tab_widget(self) -> QTabWidget:
         """Create and configure the tab widget"""
         tab_widget = QTabWidget()
@@ -230,89 +187,6 @@ class UIManager:
         if self.status_bar:
             self.status_bar.showMessage(message)
     
-    def update_navigation_theme(self, theme_colors: Dict[str, str]):
-        """
-        Update navigation widget styling based on theme colors
-        
-        Args:
-            theme_colors: Dictionary of theme color values
-        """
-        if not self.nav_widget:
-            return
-        
-        try:
-            header_bg = theme_colors.get('background', '#fafafa')
-            border_color = (theme_colors.get('border_color') or 
-                           theme_colors.get('border') or 
-                           theme_colors.get('surface_variant') or 
-                           '#c8e6c9')
-            
-            nav_style = f"""
-                QWidget {{
-                    background-color: {header_bg};
-                    border-bottom: 1px solid {border_color};
-                }}
-            """
-            self.nav_widget.setStyleSheet(nav_style)
-            
-            # Update all navigation button styles with theme colors
-            button_style = self._get_nav_button_style(theme_colors)
-            for btn in self.nav_button_widgets.values():
-                btn.setStyleSheet(button_style)
-                # Re-apply active state if needed
-                if btn.property("active"):
-                    btn.style().unpolish(btn)
-                    btn.style().polish(btn)
-                    
-        except Exception as e:
-            handle_error(
-                e,
-                ErrorCategory.UI,
-                ErrorSeverity.MEDIUM,
-                "Navigation Theme Update",
-                False,
-                self.main_window
-            )
-    
-    def update_title_theme(self, theme_colors: Dict[str, str]):
-        """
-        Update title label styling based on theme colors
-        
-        Args:
-            theme_colors: Dictionary of theme color values
-        """
-        if not self.title_label:
-            return
-        
-        try:
-            header_bg = theme_colors.get('background', '#fafafa')
-            border_color = (theme_colors.get('border_color') or 
-                           theme_colors.get('border') or 
-                           theme_colors.get('surface_variant') or 
-                           '#c8e6c9')
-            text_color = theme_colors.get('text_primary', '#212121')
-            
-            title_style = f"""
-                QLabel {{
-                    color: {text_color} !important; 
-                    margin: 15px; 
-                    padding: 15px; 
-                    background-color: {header_bg} !important;
-                    border-bottom: 2px solid {border_color};
-                    border: none;
-                }}
-            """
-            self.title_label.setStyleSheet(title_style)
-        except Exception as e:
-            handle_error(
-                e,
-                ErrorCategory.UI,
-                ErrorSeverity.MEDIUM,
-                "Title Theme Update",
-                False,
-                self.main_window
-            )
-    
     def get_navigation_widget(self) -> Optional[QWidget]:
         """Get the navigation widget"""
         return self.nav_widget
@@ -4,19 +4,31 @@ Launcher script for the CeliacShield PySide6 application.
 
 This entry point wires up the refactored main window that delegates
 responsibilities to the specialized manager classes.
+
+Run with ``--profile-startup`` to write per-phase and import timings to
+logs/startup_profile.json and a Chrome trace to logs/startup_trace.json.
 """
 
 import sys
 import logging
 from pathlib import Path
 
-from PySide6.QtWidgets import QApplication
-
 # Ensure the project root is on sys.path so package imports work reliably
 PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from core.refactored_main_window import RefactoredMainWindow  # noqa: E402
+from utils.startup_profiler import (  # noqa: E402
+    consume_profile_flag, finish_after_first_frame, get_startup_profiler
+)
+
+_profiler = get_startup_profiler()
+if __name__ == "__main__" and consume_profile_flag(sys.argv):
+    _profiler.enable()
+
+with _profiler.span("imports"):
+    from PySide6.QtWidgets import QApplication  # noqa: E402
+
+    from core.refactored_main_window import RefactoredMainWindow  # noqa: E402
 
 
 def _setup_logging() -> None:
@@ -37,15 +49,24 @@ def main() -> int:
     logger = logging.getLogger(__name__)
 
     try:
-        app = QApplication(sys.argv)
-        app.setApplicationName("CeliacShield")
-        app.setApplicationVersion("1.0")
-        app.setOrganizationName("CeliacShield")
+        with _profiler.span("qapplication"):
+            app = QApplication(sys.argv)
+            app.setApplicationName("CeliacShield")
+            app.setApplicationVersion("1.0")
+            app.setOrganizationName("CeliacShield")
 
         logger.info("Launching CeliacShield PySide6 Application (refactored window)...")
 
-        window = RefactoredMainWindow()
-        window.show()
+        with _profiler.span("window"):
+            window = RefactoredMainWindow()
+        with _profiler.span("show"):
+            window.show()
+
+        # Construct the remaining panels once the event loop is idle
+        window.prebuild_panels()
+        window.start_risk_sweep()
+        window.start_snapshot_schedule()
+        finish_after_first_frame(_profiler)
 
         return app.exec()
 
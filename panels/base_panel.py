@@ -5,7 +5,7 @@ Base Panel for PySide6 Application
 Provides common functionality for all panels in the PySide6 application.
 """
 
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Tuple
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
 from PySide6.QtCore import Qt
 
@@ -13,10 +13,18 @@ from PySide6.QtCore import Qt
 class BasePanel(QWidget):
     """Base class for all PySide6 panels"""
     
+    # Database tables rendered by the panel; refresh() is skipped while
+    # none of them has changed since the last load
+    tracked_tables: Tuple[str, ...] = ()
+    
     def __init__(self, master=None, app=None):
         super().__init__(master)
         self.app = app
+        # Read versions before the initial load so writes that race with
+        # it are picked up by the next refresh
+        versions = self._read_data_versions()
         self.setup_ui()
+        self._rendered_versions: Dict[str, int] = versions
     
     def setup_ui(self):
         """Set up the user interface - to be overridden by subclasses"""
@@ -33,6 +41,49 @@ class BasePanel(QWidget):
         """Refresh the panel data - to be overridden by subclasses"""
         pass
     
+    def data_changed(self) -> bool:
+        """
+        Check whether tracked tables changed since the panel last loaded
+        
+        Records the current versions as rendered, so a True result should
+        be followed by a reload.
+        
+        Returns:
+            bool: True if the panel needs to reload its data
+        """
+        if not self.tracked_tables:
+            return True
+        versions = self._read_data_versions()
+        if versions and versions == getattr(self, '_rendered_versions', None):
+            return False
+        self._rendered_versions = versions
+        return True
+    
+    def invalidate_data(self):
+        """Force the next refresh to reload regardless of data versions"""
+        self._rendered_versions = {}
+    
+    def _read_data_versions(self) -> Dict[str, int]:
+        """Read the versions of the tracked tables"""
+        if not self.tracked_tables:
+            return {}
+        try:
+            from utils.data_versions import get_versions
+            
+            db = getattr(self.app, 'db', None)
+            if db is not None:
+                return get_versions(db, self.tracked_tables)
+            
+            from utils.db import get_connection
+            
+            conn = get_connection()
+            try:
+                return get_versions(conn, self.tracked_tables)
+            finally:
+                conn.close()
+        except Exception:
+            return {}
+    
     def save_data(self):
         """Save panel data - to be overridden by subclasses"""
         pass
@@ -11,17 +11,21 @@ from PySide6.QtWidgets import (
     QDialog, QDialogButtonBox, QFormLayout
 )
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QColor
 
 from panels.base_panel import BasePanel
 from panels.context_menu_mixin import CalendarContextMenuMixin
 from services.care_provider_service import get_care_provider_service
+from services.calendar_event_index import get_calendar_event_index
 
 
 class CalendarPanel(CalendarContextMenuMixin, BasePanel):
     """Calendar panel for PySide6 with Care Provider integration"""
     
+    tracked_tables = ('calendar_events',)
+    
     def __init__(self, master=None, app=None):
+        self.event_index = get_calendar_event_index()
         super().__init__(master, app)
         self.care_provider_service = get_care_provider_service()
         self.care_provider_service.appointment_created.connect(self.on_appointment_created)
@@ -172,6 +176,7 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
         self.month_combo.addItems(["January", "February", "March", "April", "May", "June", 
                                  "July", "August", "September", "October", "November", "December"])
         self.month_combo.currentTextChanged.connect(self.load_calendar)
+        self.month_combo.currentTextChanged.connect(self.load_events)
         nav_layout.addWidget(self.month_combo)
         
         nav_layout.addWidget(QLabel("Year:"))
@@ -186,6 +191,7 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
         self.month_combo.setCurrentIndex(current_month - 1)
         
         self.year_combo.currentTextChanged.connect(self.load_calendar)
+        self.year_combo.currentTextChanged.connect(self.load_events)
         nav_layout.addWidget(self.year_combo)
         
         calendar_group_layout.addLayout(nav_layout)
@@ -317,39 +323,41 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
         self.calendar_table.setColumnCount(7)
         self.calendar_table.setHorizontalHeaderLabels(["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"])
         
+        # Event markers for the month come from the cached index
+        day_summaries = self.event_index.month(year, month_num)
+        today = datetime.now()
+        is_current_month = year == today.year and month_num == today.month
+        
         # Clear the table
         self.calendar_table.setRowCount(6)
-        for row in range(6):
-            for col in range(7):
-                self.calendar_table.setItem(row, col, QTableWidgetItem(""))
+        self.calendar_table.clearContents()
         
         # Fill in the calendar
-        current_day = 1
-        for row in range(6):
-            for col in range(7):
-                if row == 0 and col < first_weekday:
-                    # Empty cells before first day of month
-                    continue
-                elif current_day <= days_in_month:
-                    day_item = QTableWidgetItem(str(current_day))
-                    
-                    # Highlight weekends
-                    if col == 0 or col == 6:  # Sunday or Saturday
-                        day_item.setBackground(Qt.lightGray)
-                    
-                    # Mark today if it's the current date
-                    today = datetime.now()
-                    if (year == today.year and month_num == today.month and 
-                        current_day == today.day):
-                        day_item.setBackground(Qt.yellow)
-                    
-                    # Mark some days with events (sample data)
-                    if current_day in [5, 12, 15, 22, 28]:
-                        day_item.setText(f"{current_day} 📅")
-                        day_item.setToolTip("Has events scheduled")
-                    
-                    self.calendar_table.setItem(row, col, day_item)
-                    current_day += 1
+        for day in range(1, days_in_month + 1):
+            row, col = divmod(first_weekday + day - 1, 7)
+            day_item = QTableWidgetItem(str(day))
+            
+            # Highlight weekends
+            if col == 0 or col == 6:  # Sunday or Saturday
+                day_item.setBackground(Qt.lightGray)
+            
+            # Mark today if it's the current date
+            if is_current_month and day == today.day:
+                day_item.setBackground(Qt.yellow)
+            
+            summary = day_summaries.get(day)
+            if summary:
+                self._mark_day_events(day_item, str(day), summary)
+            
+            self.calendar_table.setItem(row, col, day_item)
+    
+    def _mark_day_events(self, item, label, summary):
+        """Mark a calendar cell as having events"""
+        item.setText(f"{label} 📅" if summary.count == 1 else f"{label} 📅{summary.count}")
+        tooltip = "\n".join(summary.titles)
+        if summary.count > len(summary.titles):
+            tooltip += f"\n+{summary.count - len(summary.titles)} more"
+        item.setToolTip(tooltip)
     
     def load_week_view(self):
         """Load week view calendar"""
@@ -367,7 +375,7 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
             current_date = datetime(year, month_num, 1)
         
         # Find the start of the week (Sunday)
-        days_since_sunday = current_date.weekday() + 1  # +1 because weekday() returns 0=Monday
+        days_since_sunday = (current_date.weekday() + 1) % 7  # weekday() returns 0=Monday
         week_start = current_date - timedelta(days=days_since_sunday)
         
         # Reset table to week view (7 columns, proper headers)
@@ -376,12 +384,16 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
         
         # Clear the table and set to single row
         self.calendar_table.setRowCount(1)
-        for col in range(7):
-            self.calendar_table.setItem(0, col, QTableWidgetItem(""))
+        self.calendar_table.clearContents()
+        
+        week_summaries = self.event_index.day_summaries(
+            week_start.date(), (week_start + timedelta(days=6)).date()
+        )
+        today = datetime.now().date()
         
         # Fill in the week
         for col in range(7):
-            day_date = week_start + timedelta(days=col)
+            day_date = (week_start + timedelta(days=col)).date()
             day_item = QTableWidgetItem(f"{day_date.day}")
             
             # Highlight weekends
@@ -389,15 +401,12 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
                 day_item.setBackground(Qt.lightGray)
             
             # Highlight today
-            today = datetime.now()
-            if (day_date.year == today.year and day_date.month == today.month and 
-                day_date.day == today.day):
+            if day_date == today:
                 day_item.setBackground(Qt.yellow)
             
-            # Mark some days with events (sample data)
-            if day_date.day in [5, 12, 15, 22, 28]:
-                day_item.setText(f"{day_date.day} 📅")
-                day_item.setToolTip("Has events scheduled")
+            summary = week_summaries.get(day_date.isoformat())
+            if summary:
+                self._mark_day_events(day_item, str(day_date.day), summary)
             
             self.calendar_table.setItem(0, col, day_item)
     
@@ -482,9 +491,10 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
                       "July", "August", "September", "October", "November", "December"]
         
         # Clear all cells first
-        for row in range(4):
-            for col in range(3):
-                self.calendar_table.setItem(row, col, QTableWidgetItem(""))
+        self.calendar_table.clearContents()
+        
+        month_counts = self.event_index.year_counts(year)
+        today = datetime.now()
         
         # Fill in the year view
         for month_idx in range(12):
@@ -493,46 +503,61 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
             
             month_name = month_names[month_idx]
             month_num = month_idx + 1
+            is_current = year == today.year and month_num == today.month
             
             # Get number of days in this month
             days_in_month = calendar.monthrange(year, month_num)[1]
             
             # Create month cell content
             month_text = f"{month_name}\n{days_in_month} days"
+            event_count = month_counts.get(month_num, 0)
+            if event_count:
+                month_text += f"\n{event_count} event{'s' if event_count != 1 else ''}"
             
             # Highlight current month if it's the current year
-            today = datetime.now()
-            if year == today.year and month_num == today.month:
+            if is_current:
                 month_text += "\n📅 Current"
             
             month_item = QTableWidgetItem(month_text)
             month_item.setTextAlignment(Qt.AlignCenter)
             
-            # Highlight current month
-            if year == today.year and month_num == today.month:
+            # Highlight months with events, current month last so it wins
+            if event_count:
+                month_item.setBackground(QColor("#e3f2fd"))
+            if is_current:
                 month_item.setBackground(Qt.yellow)
             
-            # Highlight months with events (sample data)
-            if month_num in [1, 3, 6, 9, 12]:  # Sample months with events
-                month_item.setBackground(Qt.lightBlue)
-            
             self.calendar_table.setItem(row, col, month_item)
     
     def load_events(self):
         """Load events for the selected month"""
-        sample_events = [
-            ("2024-01-05", "Doctor Appointment", "Health"),
-            ("2024-01-12", "Gluten-Free Cooking Class", "Education"),
-            ("2024-01-15", "Blood Test", "Health"),
-            ("2024-01-22", "Nutritionist Visit", "Health"),
-            ("2024-01-28", "Family Dinner", "Social")
-        ]
-        
-        self.events_list.setRowCount(len(sample_events))
-        for row, (date, event, event_type) in enumerate(sample_events):
-            self.events_list.setItem(row, 0, QTableWidgetItem(date))
-            self.events_list.setItem(row, 1, QTableWidgetItem(event))
-            self.events_list.setItem(row, 2, QTableWidgetItem(event_type))
+        if not hasattr(self, 'events_list'):
+            return
+        from datetime import datetime
+        import calendar
+        
+        try:
+            year = int(self.year_combo.currentText())
+            month_num = datetime.strptime(self.month_combo.currentText(), "%B").month
+            last_day = calendar.monthrange(year, month_num)[1]
+            events = self.event_index.events_between(
+                f"{year:04d}-{month_num:02d}-01", f"{year:04d}-{month_num:02d}-{last_day:02d}"
+            )
+        except Exception as e:
+            print(f"Error loading calendar events: {e}")
+            events = []
+        
+        self.events_list.setRowCount(len(events))
+        for row, event in enumerate(events):
+            date_item = QTableWidgetItem(event['date'] or "")
+            date_item.setData(Qt.UserRole, event['id'])
+            self.events_list.setItem(row, 0, date_item)
+            self.events_list.setItem(row, 1, QTableWidgetItem(event['time'] or ""))
+            self.events_list.setItem(row, 2, QTableWidgetItem(event['name'] or ""))
+            self.events_list.setItem(row, 3, QTableWidgetItem(event['event_type'] or ""))
+        
+        self.filter_events()
+        self.update_events_stats()
     
     def update_event(self):
         """Update selected event"""
@@ -774,13 +799,6 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
                 QMessageBox.warning(self, "Validation Error", "Event name is required.")
                 return
             
-            # Add to events list
-            row_position = self.events_list.rowCount()
-            self.events_list.insertRow(row_position)
-            self.events_list.setItem(row_position, 0, QTableWidgetItem(date))
-            self.events_list.setItem(row_position, 1, QTableWidgetItem(name))
-            self.events_list.setItem(row_position, 2, QTableWidgetItem(event_type))
-            
             # Save to database
             self._save_event_to_database(0, name, date, time, event_type, priority, description, reminder)
             
@@ -794,9 +812,10 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
         """Edit selected event"""
         current_row = self.events_list.currentRow()
         if current_row >= 0:
-            event_name = self.events_list.item(current_row, 1).text()
+            event_name = self.events_list.item(current_row, 2).text()
             event_date = self.events_list.item(current_row, 0).text()
-            event_type = self.events_list.item(current_row, 2).text()
+            event_type = self.events_list.item(current_row, 3).text()
+            event_id = self.events_list.item(current_row, 0).data(Qt.UserRole) or 0
             
             # Create edit dialog (similar to add dialog but pre-filled)
             dialog = QDialog(self)
@@ -906,13 +925,8 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
                     QMessageBox.warning(self, "Validation Error", "Event date is required.")
                     return
                 
-                # Update the event
-                self.events_list.setItem(current_row, 0, QTableWidgetItem(new_date))
-                self.events_list.setItem(current_row, 1, QTableWidgetItem(new_name))
-                self.events_list.setItem(current_row, 2, QTableWidgetItem(event_type))
-                
                 # Save to database
-                self._save_event_to_database(current_row, new_name, new_date, new_time, event_type, priority, description, reminder)
+                self._save_event_to_database(event_id, new_name, new_date, new_time, event_type, priority, description, reminder)
                 
                 # Refresh events list and calendar
                 self.load_events()
@@ -920,41 +934,30 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
                 
                 QMessageBox.information(self, "Success", "Event updated successfully!")
     
-    def _save_event_to_database(self, row_id: int, name: str, date: str, time: str, event_type: str, priority: str, description: str, reminder: str):
-        """Save event to database"""
+    def _save_event_to_database(self, event_id: int, name: str, date: str, time: str, event_type: str, priority: str, description: str, reminder: str):
+        """Save event to database; event_id 0 inserts a new event"""
         try:
             from utils.db import get_connection
             
             db = get_connection()
             cursor = db.cursor()
             
-            # Create calendar_events table if it doesn't exist
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS calendar_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    date TEXT NOT NULL,
-                    time TEXT,
-                    category TEXT,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
             # Update event in database
-            if row_id > 0:
+            if event_id > 0:
                 cursor.execute("""
                     UPDATE calendar_events 
-                    SET title = ?, date = ?, time = ?, category = ?, description = ?
+                    SET name = ?, date = ?, time = ?, event_type = ?, priority = ?,
+                        description = ?, reminder = ?
                     WHERE id = ?
-                """, (name, date, time, event_type, description, row_id + 1))
+                """, (name, date, time, event_type, priority, description, reminder, event_id))
             else:
                 cursor.execute("""
-                    INSERT INTO calendar_events (title, date, time, category, description)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (name, date, time, event_type, description))
+                    INSERT INTO calendar_events (name, date, time, event_type, priority, description, reminder)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (name, date, time, event_type, priority, description, reminder))
             
             db.commit()
+            db.close()
             
         except Exception as e:
             print(f"Error saving event to database: {str(e)}")
@@ -963,18 +966,30 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
         """Delete selected event"""
         current_row = self.events_list.currentRow()
         if current_row >= 0:
-            event_name = self.events_list.item(current_row, 1).text()
+            event_name = self.events_list.item(current_row, 2).text()
+            event_id = self.events_list.item(current_row, 0).data(Qt.UserRole)
             reply = QMessageBox.question(self, "Delete Event", 
                                        f"Are you sure you want to delete '{event_name}'?",
                                        QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
-                self.events_list.removeRow(current_row)
+                if event_id:
+                    try:
+                        from utils.db import get_connection
+                        
+                        db = get_connection()
+                        db.execute("DELETE FROM calendar_events WHERE id = ?", (event_id,))
+                        db.commit()
+                        db.close()
+                    except Exception as e:
+                        print(f"Error deleting event from database: {str(e)}")
+                self.load_events()
+                self.load_calendar()
     
     def view_day_events(self):
         """View events for selected day"""
         current_item = self.calendar_table.currentItem()
         if current_item:
-            day = current_item.text().replace("📅", "").strip()
+            day = current_item.text().split("📅")[0].strip()
             if day.isdigit():
                 # Get the current month and year
                 month = self.month_combo.currentText()
@@ -987,14 +1002,10 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
                     date_str = f"{year}-{month_num:02d}-{int(day):02d}"
                     
                     # Get events for this specific date
-                    events_for_day = []
-                    for row in range(self.events_list.rowCount()):
-                        event_date_item = self.events_list.item(row, 0)
-                        if event_date_item and event_date_item.text() == date_str:
-                            event_name_item = self.events_list.item(row, 1)
-                            event_type_item = self.events_list.item(row, 2)
-                            if event_name_item and event_type_item:
-                                events_for_day.append(f"• {event_name_item.text()} ({event_type_item.text()})")
+                    events_for_day = [
+                        f"• {event['name']} ({event['event_type'] or 'Other'})"
+                        for event in self.event_index.events_between(date_str, date_str)
+                    ]
                     
                     # Display events or show message if none
                     if events_for_day:
@@ -1116,13 +1127,6 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
                     QMessageBox.warning(self, "Validation Error", "Event name is required.")
                     return
                 
-                # Add to events list
-                row_position = self.events_list.rowCount()
-                self.events_list.insertRow(row_position)
-                self.events_list.setItem(row_position, 0, QTableWidgetItem(date_str))
-                self.events_list.setItem(row_position, 1, QTableWidgetItem(name))
-                self.events_list.setItem(row_position, 2, QTableWidgetItem(event_type))
-                
                 # Save to database
                 self._save_event_to_database(0, name, date_str, time, event_type, "Medium", description, "")
                 
@@ -1152,14 +1156,15 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
                 for row in range(self.events_list.rowCount()):
                     if self.events_list.item(row, 0):  # Check if row has data
                         date = self.events_list.item(row, 0).text()
-                        event = self.events_list.item(row, 1).text()
-                        event_type = self.events_list.item(row, 2).text()
+                        time = self.events_list.item(row, 1).text()
+                        event = self.events_list.item(row, 2).text()
+                        event_type = self.events_list.item(row, 3).text()
                         
                         calendar_data.append({
                             'date': date,
                             'event': event,
                             'type': event_type,
-                            'time': '09:00',  # Default time
+                            'time': time or '09:00',  # Default time
                             'description': event,
                             'priority': 'Medium'  # Default priority
                         })
@@ -1466,5 +1471,7 @@ class CalendarPanel(CalendarContextMenuMixin, BasePanel):
     
     def refresh(self):
         """Refresh panel data"""
+        if not self.data_changed():
+            return
         self.load_calendar()
         self.load_events()
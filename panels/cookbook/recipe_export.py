@@ -230,78 +230,11 @@ class RecipeExport:
             f.write(html_content)
     
     def export_to_pdf(self, recipes: List[Dict[str, Any]], file_path: str):
-        """Export recipes to PDF file"""
-        try:
-            from reportlab.lib.pagesizes import letter
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=1  # Center alignment
-            )
-            
-            story.append(Paragraph("🍳 Cookbook Recipes", title_style))
-            story.append(Spacer(1, 12))
-            
-            # Export info
-            info_style = ParagraphStyle(
-                'Info',
-                parent=styles['Normal'],
-                fontSize=10,
-                textColor='gray'
-            )
-            
-            story.append(Paragraph(f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", info_style))
-            story.append(Paragraph(f"Total recipes: {len(recipes)}", info_style))
-            story.append(Spacer(1, 20))
-            
-            # Recipes
-            for i, recipe in enumerate(recipes):
-                if i > 0:
-                    story.append(PageBreak())
-                
-                # Recipe title
-                story.append(Paragraph(recipe.get('name', 'Untitled Recipe'), styles['Heading2']))
-                story.append(Spacer(1, 12))
-                
-                # Recipe meta
-                meta_text = f"⏱️ Prep: {recipe.get('prep_time', 0)} min | 🍳 Cook: {recipe.get('cook_time', 0)} min | 👥 Serves: {recipe.get('servings', 1)} | 📊 Difficulty: {recipe.get('difficulty', 'Easy')}"
-                story.append(Paragraph(meta_text, styles['Normal']))
-                story.append(Spacer(1, 12))
-                
-                # Description
-                if recipe.get('description'):
-                    story.append(Paragraph("<b>Description:</b>", styles['Heading3']))
-                    story.append(Paragraph(recipe.get('description', ''), styles['Normal']))
-                    story.append(Spacer(1, 12))
-                
-                # Ingredients
-                if recipe.get('ingredients'):
-                    story.append(Paragraph("<b>🥘 Ingredients:</b>", styles['Heading3']))
-                    ingredients_text = recipe.get('ingredients', '').replace('\n', '<br/>')
-                    story.append(Paragraph(ingredients_text, styles['Normal']))
-                    story.append(Spacer(1, 12))
-                
-                # Instructions
-                if recipe.get('instructions'):
-                    story.append(Paragraph("<b>📝 Instructions:</b>", styles['Heading3']))
-                    instructions_text = recipe.get('instructions', '').replace('\n', '<br/>')
-                    story.append(Paragraph(instructions_text, styles['Normal']))
-            
-            doc.build(story)
-            
-        except ImportError:
-            raise Exception("ReportLab library is required for PDF export. Please install it with: pip install reportlab")
+        """Export recipes to PDF file, one recipe at a time"""
+        from services.recipe_pdf import RecipePdfWriter
+        
+        with RecipePdfWriter(file_path, title="Cookbook Recipes") as writer:
+            writer.write(recipes, len(recipes))
     
     def export_to_csv(self, recipes: List[Dict[str, Any]], file_path: str):
         """Export recipes to CSV file"""
@@ -29,6 +29,8 @@ from panels.cookbook.recipe_export import RecipeExport
 class CookbookPanel(CookbookContextMenuMixin, BasePanel):
     """Cookbook panel for PySide6"""
     
+    tracked_tables = ('recipes', 'recipe_ingredients', 'categories', 'recipe_categories')
+    
     def __init__(self, master=None, app=None):
         super().__init__(master, app)
         self.recipe_dialogs = RecipeDialogs(self)
@@ -80,6 +82,10 @@ class CookbookPanel(CookbookContextMenuMixin, BasePanel):
         self.import_file_btn.clicked.connect(self.import_from_file)
         action_layout.addWidget(self.import_file_btn)
         
+        self.import_folder_btn = QPushButton("Import Folder")
+        self.import_folder_btn.clicked.connect(self.import_from_folder)
+        action_layout.addWidget(self.import_folder_btn)
+        
         self.export_btn = QPushButton("Export")
         self.export_btn.clicked.connect(self.export_recipes)
         action_layout.addWidget(self.export_btn)
@@ -133,7 +139,12 @@ class CookbookPanel(CookbookContextMenuMixin, BasePanel):
 
     def refresh(self):
         """Refresh panel data"""
+        if not self.data_changed():
+            return
         self.load_recipes()
+        # Score new or edited recipes; the sweep's writes trigger one more refresh
+        from services.risk_sweep import get_risk_sweep_service
+        get_risk_sweep_service().start()
     
     def load_recipes(self):
         """Load recipes from database"""
@@ -411,7 +422,8 @@ class CookbookPanel(CookbookContextMenuMixin, BasePanel):
         
         self.sort_combo = QComboBox()
         self.sort_combo.addItems([
-            "Name (A-Z)", "Name (Z-A)", "Prep Time", "Difficulty", "Recently Added", "Favorites First"
+            "Name (A-Z)", "Name (Z-A)", "Prep Time", "Difficulty", "Recently Added", "Favorites First",
+            "Gluten Risk"
         ])
         self.sort_combo.setStyleSheet("""
             QComboBox {
@@ -1094,6 +1106,9 @@ class CookbookPanel(CookbookContextMenuMixin, BasePanel):
                 order_clause = "ORDER BY r.id DESC"
             elif sort_option == "Favorites First":
                 order_clause = "ORDER BY r.is_favorite DESC, r.title"
+            elif sort_option == "Gluten Risk":
+                # Safest first; recipes not yet scored by the risk sweep go last
+                order_clause = "ORDER BY r.gluten_risk_score IS NULL, r.gluten_risk_score, r.title"
             
             cursor.execute(f"""
                 SELECT r.id, r.title, r.instructions, r.prep_time, r.cook_time, r.servings, 
@@ -3932,13 +3947,25 @@ Estimated Cost Change: {analysis['estimated_cost_change']}
         pass
     
     def _convert_to_gf_recipe(self, analysis_dialog, recipe_data):
-        """Convert recipe to gluten-free and save as new recipe"""
+        """Convert recipe to gluten-free as a background job, then save it as new recipe"""
         try:
+            from services.background_jobs import CONVERSION, get_job_manager
             from services.gluten_free_converter import gluten_free_converter
             
-            # Convert the recipe
-            converted_recipe = gluten_free_converter.convert_recipe(recipe_data)
+            job = get_job_manager().submit(
+                CONVERSION, lambda context: gluten_free_converter.convert_recipe(recipe_data),
+                title="Gluten-free conversion")
+            job.finished.connect(
+                lambda converted_recipe: self._save_converted_recipe(analysis_dialog, converted_recipe))
+            job.failed.connect(
+                lambda error: QMessageBox.critical(self, "Error", f"Failed to convert recipe: {error}"))
             
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to convert recipe: {str(e)}")
+    
+    def _save_converted_recipe(self, analysis_dialog, converted_recipe):
+        """Show edit dialog for a converted recipe and save it as new recipe"""
+        try:
             # Show edit dialog for the converted recipe
             from utils.edit_dialogs import RecipeEditDialog
             
@@ -3962,7 +3989,7 @@ Estimated Cost Change: {analysis['estimated_cost_change']}
                     QMessageBox.warning(self, "Error", "Failed to save gluten-free recipe.")
             
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to convert recipe: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to save gluten-free recipe: {str(e)}")
     
     def _show_view_recipe_context_menu(self, dialog, recipe_data, position):
         """Show right-click context menu for view recipe dialog"""
@@ -5231,7 +5258,7 @@ Difficulty: {recipe_data.get('difficulty', 'N/A')}
                 elif selected_format == 1:
                     export_service.export_data(self, recipe_data, 'csv', "Recipe Collection")
                 elif selected_format == 2:
-                    export_service.export_data(self, recipe_data, 'pdf', "Gluten-Free Cookbook")
+                    self.export_recipes_to_pdf()
                     
         except ImportError:
             QMessageBox.information(self, "Export Recipes", 
@@ -5737,7 +5764,12 @@ Top Ingredients:
     
     def refresh(self):
         """Refresh panel data"""
+        if not self.data_changed():
+            return
         self.load_recipes()
+        # Score new or edited recipes; the sweep's writes trigger one more refresh
+        from services.risk_sweep import get_risk_sweep_service
+        get_risk_sweep_service().start()
     def import_from_file(self):
 
         """Import recipes from file"""
@@ -6101,1944 +6133,230 @@ Top Ingredients:
 
     
 
-    def import_from_csv(self, file_path, duplicate_handling, default_category):
-
-        """Import recipes from CSV file"""
-
-        import csv
-
-        from utils.db import get_connection
-
+    def export_recipes_to_pdf(self):
+        """Write the whole cookbook to a PDF, page by page, as a background job"""
+        from PySide6.QtWidgets import QFileDialog, QProgressDialog
+        from services.background_jobs import EXPORT, get_job_manager
+        from services.recipe_pdf import export_cookbook_job
         
-
-        conn = get_connection()
-
+        if getattr(self, '_pdf_export_job', None) is not None:
+            QMessageBox.information(self, "Export Running", "A PDF export is already in progress.")
+            return
         
-
-        try:
-
-            with open(file_path, 'r', encoding='utf-8') as file:
-
-                reader = csv.DictReader(file)
-
-                imported_count = 0
-                last_recipe_id = None
-
-                for row in reader:
-
-                    title = row.get('title', '').strip()
-
-                    category = row.get('category', default_category).strip()
-
-                    servings = row.get('servings', '4').strip()
-
-                    cook_time = row.get('cook_time', '').strip()
-
-                    ingredients = row.get('ingredients', '').strip()
-
-                    instructions = row.get('instructions', '').strip()
-
-                    notes = row.get('notes', '').strip()
-
-                    
-
-                    if not title:
-
-                        continue
-
-                    
-
-                    # Handle duplicates
-
-                    if duplicate_handling == "Skip duplicates":
-
-                        existing = conn.execute(
-
-                            "SELECT id FROM recipes WHERE title = ?",
-
-                            (title,)
-
-                        ).fetchone()
-
-                        if existing:
-
-                            continue
-
-                    
-
-                    # Insert recipe
-                    cursor = conn.cursor()
-                    cursor.execute("""
-
-                        INSERT OR REPLACE INTO recipes 
-
-                        (title, category, servings, cook_time, ingredients, instructions, notes)
-
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-
-                    """, (title, category, servings, cook_time, ingredients, instructions, notes))
-
-                    last_recipe_id = cursor.lastrowid
-                    imported_count += 1
-
-                
-
-                conn.commit()
-
-                QMessageBox.information(self, "Import Complete", 
-
-                                      f"Successfully imported {imported_count} recipes from CSV file.")
-                
-                # Return the last imported recipe ID for auto-viewing
-                return last_recipe_id
-                            
-        except Exception as e:
-            conn.rollback()
-            raise e
-
-        finally:
-
-            conn.close()
-
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Cookbook to PDF", "gluten_free_cookbook.pdf", "PDF Files (*.pdf)")
+        if not file_path:
+            return
+        if not file_path.lower().endswith('.pdf'):
+            file_path += '.pdf'
+        
+        self._pdf_export_progress = QProgressDialog("Exporting recipes...", "Cancel", 0, 0, self)
+        self._pdf_export_progress.setWindowTitle("Export Cookbook")
+        self._pdf_export_progress.setMinimumDuration(0)
+        
+        self._pdf_export_job = get_job_manager().submit(
+            EXPORT, export_cookbook_job, file_path, title="Cookbook PDF export")
+        self._pdf_export_job.progress.connect(self._on_pdf_export_progress)
+        self._pdf_export_job.finished.connect(
+            lambda count: self._on_pdf_export_done(True, f"Exported {count} recipes to:\n{file_path}"))
+        self._pdf_export_job.cancelled.connect(
+            lambda count: self._on_pdf_export_done(False, f"Export cancelled after {count or 0} recipes"))
+        self._pdf_export_job.failed.connect(
+            lambda error: self._on_pdf_export_done(False, f"PDF export failed: {error}"))
+        self._pdf_export_progress.canceled.connect(self._pdf_export_job.cancel)
+    
+    def _on_pdf_export_progress(self, done, total, message):
+        """Show how many recipes have been written"""
+        if self._pdf_export_progress is not None:
+            self._pdf_export_progress.setMaximum(total)
+            self._pdf_export_progress.setValue(done)
+            self._pdf_export_progress.setLabelText(f"Exporting recipes... {done} of {total}")
+    
+    def _on_pdf_export_done(self, success, message):
+        """Close the progress dialog and report the result"""
+        self._pdf_export_job = None
+        progress, self._pdf_export_progress = self._pdf_export_progress, None
+        progress.close()
+        
+        if success:
+            QMessageBox.information(self, "Export Cookbook", message)
+        else:
+            QMessageBox.warning(self, "Export Cookbook", message)
+    
+    def import_from_folder(self):
+        """Import every recipe file in a folder, parsed in parallel, as a background job"""
+        from PySide6.QtWidgets import QFileDialog, QInputDialog, QProgressDialog
+        from services.background_jobs import IMPORT, get_job_manager
+        from services.recipe_import import (
+            CREATE_NEW, SKIP_DUPLICATES, UPDATE_EXISTING, ImportSummary, find_recipe_files, import_recipes_job
+        )
+        
+        if getattr(self, '_folder_import_job', None) is not None:
+            QMessageBox.information(self, "Import Running", "A folder import is already in progress.")
+            return
+        
+        directory = QFileDialog.getExistingDirectory(self, "Select Recipe Folder")
+        if not directory:
+            return
+        paths = find_recipe_files(directory)
+        if not paths:
+            QMessageBox.information(self, "Import Folder", "No supported recipe files found in this folder.")
+            return
+        
+        duplicate_handling, ok = QInputDialog.getItem(
+            self, "Import Folder", f"{len(paths)} recipe files found.\nDuplicate handling:",
+            [SKIP_DUPLICATES, UPDATE_EXISTING, CREATE_NEW], 0, False)
+        if not ok:
+            return
+        
+        self._folder_import_progress = QProgressDialog("Importing recipes...", "Cancel", 0, len(paths), self)
+        self._folder_import_progress.setWindowTitle("Import Folder")
+        self._folder_import_progress.setMinimumDuration(0)
+        
+        self._folder_import_job = get_job_manager().submit(
+            IMPORT, import_recipes_job, paths, duplicate_handling, title="Recipe folder import")
+        self._folder_import_job.progress.connect(self._on_folder_import_progress)
+        self._folder_import_job.finished.connect(self._on_folder_import_finished)
+        # A job cancelled while still queued has no summary
+        self._folder_import_job.cancelled.connect(
+            lambda summary: self._on_folder_import_finished(
+                summary or ImportSummary(files=len(paths), cancelled=True)))
+        self._folder_import_progress.canceled.connect(self._folder_import_job.cancel)
+    
+    def _on_folder_import_progress(self, done, total, message):
+        """Show how many files have been imported"""
+        if self._folder_import_progress is not None:
+            self._folder_import_progress.setMaximum(total)
+            self._folder_import_progress.setValue(done)
+            self._folder_import_progress.setLabelText(f"Importing recipes... {done} of {total} files")
+    
+    def _on_folder_import_finished(self, summary):
+        """Close the progress dialog and report the results"""
+        self._folder_import_job = None
+        progress, self._folder_import_progress = self._folder_import_progress, None
+        progress.close()
+        
+        # Reloads the list and starts the risk sweep for the new recipes
+        self.refresh()
+        
+        message = (f"Imported {summary.imported}, updated {summary.updated} and skipped "
+                   f"{summary.skipped} recipes from {summary.files_done} of {summary.files} files.")
+        if summary.cancelled:
+            message += "\nThe import was cancelled."
+        message += self._import_details(summary)
+        QMessageBox.information(self, "Import Folder", message)
+    
+    def import_from_csv(self, file_path, duplicate_handling, default_category):
+        """Import recipes from CSV file"""
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
+    
     def import_from_excel(self, file_path, duplicate_handling, default_category):
         """Import recipes from Excel file"""
-        try:
-            import pandas as pd
-            from utils.db import get_connection
-            
-            # Read Excel file
-            df = pd.read_excel(file_path)
-            
-            if df.empty:
-                QMessageBox.warning(self, "Empty File", "Excel file is empty or contains no data.")
-                return None
-            
-            conn = get_connection()
-            cursor = conn.cursor()
-            imported_count = 0
-            last_recipe_id = None
-            
-            for index, row in df.iterrows():
-                # Convert row to dictionary
-                recipe_data = row.to_dict()
-                
-                # Normalize recipe data
-                normalized_recipe = self._normalize_excel_recipe(recipe_data, default_category)
-                
-                if not normalized_recipe:
-                    continue
-                
-                # Handle duplicates
-                if duplicate_handling == "Skip duplicates":
-                    cursor.execute("SELECT id FROM recipes WHERE title = ?", (normalized_recipe['title'],))
-                    if cursor.fetchone():
-                        continue
-                elif duplicate_handling == "Update existing":
-                    cursor.execute("SELECT id FROM recipes WHERE title = ?", (normalized_recipe['title'],))
-                    existing = cursor.fetchone()
-                    if existing:
-                        recipe_id = existing[0]
-                        # Update existing recipe
-                        cursor.execute("""
-                            UPDATE recipes 
-                            SET category = ?, servings = ?, cook_time = ?, prep_time = ?,
-                                ingredients = ?, instructions = ?, notes = ?, difficulty = ?, description = ?
-                            WHERE id = ?
-                        """, (
-                            normalized_recipe['category'], normalized_recipe['servings'], 
-                            normalized_recipe['cook_time'], normalized_recipe['prep_time'], 
-                            normalized_recipe['ingredients'], normalized_recipe['instructions'],
-                            normalized_recipe['notes'], normalized_recipe['difficulty'], 
-                            normalized_recipe['description'], recipe_id
-                        ))
-                        last_recipe_id = recipe_id
-                        imported_count += 1
-                        continue
-                
-                # Insert new recipe
-                cursor.execute("""
-                    INSERT INTO recipes (title, category, servings, cook_time, prep_time,
-                                       ingredients, instructions, notes, difficulty, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    normalized_recipe['title'], normalized_recipe['category'], 
-                    normalized_recipe['servings'], normalized_recipe['cook_time'],
-                    normalized_recipe['prep_time'], normalized_recipe['ingredients'],
-                    normalized_recipe['instructions'], normalized_recipe['notes'],
-                    normalized_recipe['difficulty'], normalized_recipe['description']
-                ))
-                
-                last_recipe_id = cursor.lastrowid
-                imported_count += 1
-            
-            conn.commit()
-            conn.close()
-            
-            if imported_count > 0:
-                QMessageBox.information(self, "Import Complete", 
-                                      f"Successfully imported {imported_count} recipes from Excel file.")
-                return last_recipe_id
-            else:
-                QMessageBox.information(self, "Import Complete", "No new recipes imported.")
-                return None
-                
-        except ImportError:
-            QMessageBox.critical(self, "Missing Dependency", 
-                               "pandas library is required for Excel import.\n"
-                               "Please install it with: pip install pandas openpyxl")
-            return None
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import from Excel file: {str(e)}")
-            return None
-
-    
-    def _normalize_excel_recipe(self, recipe_data, default_category):
-        """Normalize Excel recipe data to standard format"""
-        try:
-            # Handle different column names (case-insensitive)
-            title = None
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['title', 'name', 'recipe_name', 'recipe']:
-                    title = str(recipe_data[key]).strip()
-                    break
-            
-            if not title or title.lower() in ['nan', 'none', '']:
-                return None
-            
-            # Extract other fields with flexible column names
-            category = default_category
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['category', 'type', 'cuisine', 'kind']:
-                    cat_val = str(recipe_data[key]).strip()
-                    if cat_val.lower() not in ['nan', 'none', '']:
-                        category = cat_val
-                    break
-            
-            servings = 4
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['servings', 'serving_size', 'serves', 'yield']:
-                    try:
-                        servings = int(float(str(recipe_data[key])))
-                        break
-                    except (ValueError, TypeError):
-                        pass
-            
-            cook_time = ''
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['cook_time', 'cooking_time', 'total_time', 'time']:
-                    time_val = str(recipe_data[key]).strip()
-                    if time_val.lower() not in ['nan', 'none', '']:
-                        cook_time = time_val
-                    break
-            
-            prep_time = ''
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['prep_time', 'preparation_time', 'prep']:
-                    time_val = str(recipe_data[key]).strip()
-                    if time_val.lower() not in ['nan', 'none', '']:
-                        prep_time = time_val
-                    break
-            
-            difficulty = 'Medium'
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['difficulty', 'level', 'skill_level', 'hardness']:
-                    diff_val = str(recipe_data[key]).strip()
-                    if diff_val.lower() not in ['nan', 'none', '']:
-                        difficulty = diff_val
-                    break
-            
-            description = ''
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['description', 'summary', 'intro', 'about']:
-                    desc_val = str(recipe_data[key]).strip()
-                    if desc_val.lower() not in ['nan', 'none', '']:
-                        description = desc_val
-                    break
-            
-            notes = ''
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['notes', 'tips', 'comments', 'remarks']:
-                    notes_val = str(recipe_data[key]).strip()
-                    if notes_val.lower() not in ['nan', 'none', '']:
-                        notes = notes_val
-                    break
-            
-            ingredients = ''
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['ingredients', 'ingredient_list', 'ingredient']:
-                    ing_val = str(recipe_data[key]).strip()
-                    if ing_val.lower() not in ['nan', 'none', '']:
-                        ingredients = ing_val
-                    break
-            
-            instructions = ''
-            for key in recipe_data.keys():
-                if key and str(key).lower() in ['instructions', 'directions', 'steps', 'method']:
-                    inst_val = str(recipe_data[key]).strip()
-                    if inst_val.lower() not in ['nan', 'none', '']:
-                        instructions = inst_val
-                    break
-            
-            return {
-                'title': title,
-                'category': category,
-                'servings': servings,
-                'cook_time': cook_time,
-                'prep_time': prep_time,
-                'difficulty': difficulty,
-                'description': description,
-                'notes': notes,
-                'ingredients': ingredients,
-                'instructions': instructions
-            }
-            
-        except Exception as e:
-            print(f"Error normalizing Excel recipe: {e}")
-            return None
-
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
     
-
     def import_from_json(self, file_path, duplicate_handling, default_category):
         """Import recipes from JSON file"""
-        import json
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
+    
+    def import_from_xml(self, file_path, duplicate_handling, default_category):
+        """Import recipes from XML file"""
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
+    
+    def import_from_yaml(self, file_path, duplicate_handling, default_category):
+        """Import recipes from YAML file"""
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
+    
+    def import_from_markdown(self, file_path, duplicate_handling, default_category):
+        """Import recipes from Markdown file"""
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
+    
+    def import_from_pdf(self, file_path, duplicate_handling, default_category):
+        """Import recipes from PDF file"""
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
+    
+    def import_from_word(self, file_path, duplicate_handling, default_category):
+        """Import recipes from Word document (.docx, .doc)"""
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
+    
+    def _toggle_txt_input_mode(self, checked):
+        """Toggle between file selection and text input for TXT import"""
+        if checked:
+            self.text_input_label.setVisible(True)
+            self.recipe_text_input.setVisible(True)
+        else:
+            self.text_input_label.setVisible(False)
+            self.recipe_text_input.setVisible(False)
+    
+    def import_from_txt(self, file_path, duplicate_handling, default_category):
+        """Import recipe from text file"""
+        return self._import_recipe_files([file_path], duplicate_handling, default_category)
+    
+    def import_from_txt_content(self, recipe_text, duplicate_handling, default_category):
+        """Parse and import recipe from text content"""
+        from contextlib import closing
+        from services.recipe_import import RecipeImportPipeline, parse_recipe_text
         from utils.db import get_connection
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-            
-            # Handle different JSON structures
-            if isinstance(data, list):
-                recipes = data
-            elif isinstance(data, dict):
-                if 'recipes' in data:
-                    recipes = data['recipes']
-                else:
-                    recipes = [data]  # Single recipe
-            else:
-                QMessageBox.warning(self, "Invalid JSON", "JSON file must contain a recipe or list of recipes.")
+            recipe_data = parse_recipe_text(recipe_text, default_category)
+            if not recipe_data:
+                QMessageBox.warning(self, "Parse Error", "Could not parse recipe from text. Please check the format.")
                 return None
             
-            conn = get_connection()
-            cursor = conn.cursor()
-            imported_count = 0
-            last_recipe_id = None
-            
-            for recipe_data in recipes:
-                # Normalize recipe data
-                normalized_recipe = self._normalize_json_recipe(recipe_data, default_category)
-                
-                if not normalized_recipe:
-                    continue
-                
-                # Handle duplicates
-                if duplicate_handling == "Skip duplicates":
-                    cursor.execute("SELECT id FROM recipes WHERE title = ?", (normalized_recipe['title'],))
-                    if cursor.fetchone():
-                        continue
-                elif duplicate_handling == "Update existing":
-                    cursor.execute("SELECT id FROM recipes WHERE title = ?", (normalized_recipe['title'],))
-                    existing = cursor.fetchone()
-                    if existing:
-                        recipe_id = existing[0]
-                        # Update existing recipe
-                        cursor.execute("""
-                            UPDATE recipes 
-                            SET category = ?, servings = ?, cook_time = ?, prep_time = ?,
-                                ingredients = ?, instructions = ?, notes = ?, difficulty = ?, description = ?
-                            WHERE id = ?
-                        """, (
-                            normalized_recipe['category'], normalized_recipe['servings'], 
-                            normalized_recipe['cook_time'], normalized_recipe['prep_time'], 
-                            normalized_recipe['ingredients'], normalized_recipe['instructions'],
-                            normalized_recipe['notes'], normalized_recipe['difficulty'], 
-                            normalized_recipe['description'], recipe_id
-                        ))
-                        last_recipe_id = recipe_id
-                        imported_count += 1
-                        continue
-                
-                # Insert new recipe
-                cursor.execute("""
-                    INSERT INTO recipes (title, category, servings, cook_time, prep_time,
-                                       ingredients, instructions, notes, difficulty, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    normalized_recipe['title'], normalized_recipe['category'], 
-                    normalized_recipe['servings'], normalized_recipe['cook_time'],
-                    normalized_recipe['prep_time'], normalized_recipe['ingredients'],
-                    normalized_recipe['instructions'], normalized_recipe['notes'],
-                    normalized_recipe['difficulty'], normalized_recipe['description']
-                ))
-                
-                last_recipe_id = cursor.lastrowid
-                imported_count += 1
+            with closing(get_connection()) as conn:
+                summary = RecipeImportPipeline(conn).import_recipes([recipe_data], duplicate_handling)
+            return self._report_recipe_import(summary)
             
-            conn.commit()
-            conn.close()
-            
-            if imported_count > 0:
-                QMessageBox.information(self, "Import Complete", 
-                                      f"Successfully imported {imported_count} recipes from JSON file.")
-                return last_recipe_id
-            else:
-                QMessageBox.information(self, "Import Complete", "No new recipes imported.")
-                return None
-                
-        except json.JSONDecodeError as e:
-            QMessageBox.critical(self, "JSON Error", f"Invalid JSON format: {str(e)}")
-            return None
         except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import from JSON file: {str(e)}")
+            QMessageBox.critical(self, "Import Error", f"Failed to import recipe: {str(e)}")
             return None
-
     
-    def _normalize_json_recipe(self, recipe_data, default_category):
-        """Normalize JSON recipe data to standard format"""
+    def _import_recipe_files(self, paths, duplicate_handling, default_category):
+        """
+        Import recipe files through the batched, duplicate-aware import pipeline
+        
+        Returns:
+            The id of the last recipe imported or updated, for auto-viewing
+        """
+        from contextlib import closing
+        from services.recipe_import import RecipeImportPipeline
+        from utils.db import get_connection
+        
         try:
-            # Handle different field names
-            title = (recipe_data.get('title') or recipe_data.get('name') or 
-                    recipe_data.get('recipe_name') or '').strip()
-            
-            if not title:
-                return None
-            
-            # Extract other fields with fallbacks
-            category = (recipe_data.get('category') or recipe_data.get('type') or 
-                      recipe_data.get('cuisine') or default_category).strip()
-            
-            servings = recipe_data.get('servings') or recipe_data.get('serving_size') or 4
-            try:
-                servings = int(servings)
-            except (ValueError, TypeError):
-                servings = 4
-            
-            cook_time = (recipe_data.get('cook_time') or recipe_data.get('cooking_time') or 
-                        recipe_data.get('total_time') or '').strip()
-            
-            prep_time = (recipe_data.get('prep_time') or recipe_data.get('preparation_time') or 
-                        recipe_data.get('prep') or '').strip()
-            
-            difficulty = (recipe_data.get('difficulty') or recipe_data.get('level') or 
-                         recipe_data.get('skill_level') or 'Medium').strip()
-            
-            description = (recipe_data.get('description') or recipe_data.get('summary') or 
-                          recipe_data.get('intro') or '').strip()
-            
-            notes = (recipe_data.get('notes') or recipe_data.get('tips') or 
-                    recipe_data.get('comments') or '').strip()
-            
-            # Handle ingredients - can be list or string
-            ingredients = recipe_data.get('ingredients') or recipe_data.get('ingredient_list') or []
-            if isinstance(ingredients, str):
-                ingredients = ingredients.strip()
-            elif isinstance(ingredients, list):
-                # Convert list to string
-                ingredients = '\n'.join(str(ing) for ing in ingredients)
-            else:
-                ingredients = ''
-            
-            # Handle instructions - can be list or string
-            instructions = recipe_data.get('instructions') or recipe_data.get('directions') or recipe_data.get('steps') or []
-            if isinstance(instructions, str):
-                instructions = instructions.strip()
-            elif isinstance(instructions, list):
-                # Convert list to string
-                instructions = '\n'.join(str(step) for step in instructions)
-            else:
-                instructions = ''
-            
-            return {
-                'title': title,
-                'category': category,
-                'servings': servings,
-                'cook_time': cook_time,
-                'prep_time': prep_time,
-                'difficulty': difficulty,
-                'description': description,
-                'notes': notes,
-                'ingredients': ingredients,
-                'instructions': instructions
-            }
-            
+            with closing(get_connection()) as conn:
+                summary = RecipeImportPipeline(conn).run(paths, duplicate_handling, default_category)
+            return self._report_recipe_import(summary)
         except Exception as e:
-            print(f"Error normalizing JSON recipe: {e}")
+            QMessageBox.critical(self, "Import Error", f"Failed to import recipes: {str(e)}")
             return None
-
     
-    def import_from_xml(self, file_path, duplicate_handling, default_category):
-        """Import recipes from XML file"""
-        try:
-            import xml.etree.ElementTree as ET
-            from utils.db import get_connection
-            
-            # Parse XML file
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            conn = get_connection()
-            cursor = conn.cursor()
-            imported_count = 0
-            last_recipe_id = None
-            
-            # Handle different XML structures
-            recipes = []
-            if root.tag.lower() in ['recipes', 'recipebook', 'cookbook']:
-                recipes = root.findall('.//recipe')
-            elif root.tag.lower() == 'recipe':
-                recipes = [root]
-            else:
-                # Try to find recipe elements anywhere in the tree
-                recipes = root.findall('.//recipe')
-            
-            if not recipes:
-                QMessageBox.warning(self, "No Recipes Found", "No recipe elements found in XML file.")
-                return None
-            
-            for recipe_elem in recipes:
-                # Parse recipe from XML element
-                recipe_data = self._parse_xml_recipe(recipe_elem, default_category)
-                
-                if not recipe_data:
-                    continue
-                
-                # Handle duplicates
-                if duplicate_handling == "Skip duplicates":
-                    cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                    if cursor.fetchone():
-                        continue
-                elif duplicate_handling == "Update existing":
-                    cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                    existing = cursor.fetchone()
-                    if existing:
-                        recipe_id = existing[0]
-                        # Update existing recipe
-                        cursor.execute("""
-                            UPDATE recipes 
-                            SET category = ?, servings = ?, cook_time = ?, prep_time = ?,
-                                ingredients = ?, instructions = ?, notes = ?, difficulty = ?, description = ?
-                            WHERE id = ?
-                        """, (
-                            recipe_data['category'], recipe_data['servings'], 
-                            recipe_data['cook_time'], recipe_data['prep_time'], 
-                            recipe_data['ingredients'], recipe_data['instructions'],
-                            recipe_data['notes'], recipe_data['difficulty'], 
-                            recipe_data['description'], recipe_id
-                        ))
-                        last_recipe_id = recipe_id
-                        imported_count += 1
-                        continue
-                
-                # Insert new recipe
-                cursor.execute("""
-                    INSERT INTO recipes (title, category, servings, cook_time, prep_time,
-                                       ingredients, instructions, notes, difficulty, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    recipe_data['title'], recipe_data['category'], 
-                    recipe_data['servings'], recipe_data['cook_time'],
-                    recipe_data['prep_time'], recipe_data['ingredients'],
-                    recipe_data['instructions'], recipe_data['notes'],
-                    recipe_data['difficulty'], recipe_data['description']
-                ))
-                
-                last_recipe_id = cursor.lastrowid
-                imported_count += 1
-            
-            conn.commit()
-            conn.close()
-            
-            if imported_count > 0:
-                QMessageBox.information(self, "Import Complete", 
-                                      f"Successfully imported {imported_count} recipes from XML file.")
-                return last_recipe_id
-            else:
-                QMessageBox.information(self, "Import Complete", "No new recipes imported.")
-                return None
-                
-        except ET.ParseError as e:
-            QMessageBox.critical(self, "XML Error", f"Invalid XML format: {str(e)}")
-            return None
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import from XML file: {str(e)}")
-            return None
-
-    
-    def _parse_xml_recipe(self, recipe_elem, default_category):
-        """Parse recipe from XML element"""
-        try:
-            # Extract title
-            title = recipe_elem.find('title')
-            if title is None:
-                title = recipe_elem.find('name')
-            if title is None:
-                title = recipe_elem.get('name', '')
-            else:
-                title = title.text or ''
-            
-            if not title.strip():
-                return None
-            
-            # Extract other fields
-            category = default_category
-            cat_elem = recipe_elem.find('category')
-            if cat_elem is not None:
-                category = cat_elem.text or default_category
-            
-            servings = 4
-            servings_elem = recipe_elem.find('servings')
-            if servings_elem is not None:
-                try:
-                    servings = int(servings_elem.text or 4)
-                except (ValueError, TypeError):
-                    servings = 4
-            
-            cook_time = ''
-            cook_elem = recipe_elem.find('cook_time')
-            if cook_elem is not None:
-                cook_time = cook_elem.text or ''
-            
-            prep_time = ''
-            prep_elem = recipe_elem.find('prep_time')
-            if prep_elem is not None:
-                prep_time = prep_elem.text or ''
-            
-            difficulty = 'Medium'
-            diff_elem = recipe_elem.find('difficulty')
-            if diff_elem is not None:
-                difficulty = diff_elem.text or 'Medium'
-            
-            description = ''
-            desc_elem = recipe_elem.find('description')
-            if desc_elem is not None:
-                description = desc_elem.text or ''
-            
-            notes = ''
-            notes_elem = recipe_elem.find('notes')
-            if notes_elem is not None:
-                notes = notes_elem.text or ''
-            
-            # Extract ingredients
-            ingredients = ''
-            ing_elem = recipe_elem.find('ingredients')
-            if ing_elem is not None:
-                # Try to get text content or join child elements
-                if ing_elem.text:
-                    ingredients = ing_elem.text.strip()
-                else:
-                    # Join all text from child elements
-                    ingredient_items = []
-                    for item in ing_elem.findall('ingredient'):
-                        if item.text:
-                            ingredient_items.append(item.text.strip())
-                    ingredients = '\n'.join(ingredient_items)
-            
-            # Extract instructions
-            instructions = ''
-            inst_elem = recipe_elem.find('instructions')
-            if inst_elem is None:
-                inst_elem = recipe_elem.find('directions')
-            if inst_elem is None:
-                inst_elem = recipe_elem.find('steps')
-            
-            if inst_elem is not None:
-                # Try to get text content or join child elements
-                if inst_elem.text:
-                    instructions = inst_elem.text.strip()
-                else:
-                    # Join all text from child elements
-                    step_items = []
-                    for step in inst_elem.findall('step'):
-                        if step.text:
-                            step_items.append(step.text.strip())
-                    instructions = '\n'.join(step_items)
-            
-            return {
-                'title': title.strip(),
-                'category': category.strip(),
-                'servings': servings,
-                'cook_time': cook_time.strip(),
-                'prep_time': prep_time.strip(),
-                'difficulty': difficulty.strip(),
-                'description': description.strip(),
-                'notes': notes.strip(),
-                'ingredients': ingredients.strip(),
-                'instructions': instructions.strip()
-            }
-            
-        except Exception as e:
-            print(f"Error parsing XML recipe: {e}")
-            return None
-
-    
-    def import_from_yaml(self, file_path, duplicate_handling, default_category):
-        """Import recipes from YAML file"""
-        try:
-            import yaml
-            from utils.db import get_connection
-            
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = yaml.safe_load(file)
-            
-            # Handle different YAML structures
-            if isinstance(data, list):
-                recipes = data
-            elif isinstance(data, dict):
-                if 'recipes' in data:
-                    recipes = data['recipes']
-                else:
-                    recipes = [data]  # Single recipe
-            else:
-                QMessageBox.warning(self, "Invalid YAML", "YAML file must contain a recipe or list of recipes.")
-                return None
-            
-            conn = get_connection()
-            cursor = conn.cursor()
-            imported_count = 0
-            last_recipe_id = None
-            
-            for recipe_data in recipes:
-                # Normalize recipe data (reuse JSON normalization)
-                normalized_recipe = self._normalize_json_recipe(recipe_data, default_category)
-                
-                if not normalized_recipe:
-                    continue
-                
-                # Handle duplicates
-                if duplicate_handling == "Skip duplicates":
-                    cursor.execute("SELECT id FROM recipes WHERE title = ?", (normalized_recipe['title'],))
-                    if cursor.fetchone():
-                        continue
-                elif duplicate_handling == "Update existing":
-                    cursor.execute("SELECT id FROM recipes WHERE title = ?", (normalized_recipe['title'],))
-                    existing = cursor.fetchone()
-                    if existing:
-                        recipe_id = existing[0]
-                        # Update existing recipe
-                        cursor.execute("""
-                            UPDATE recipes 
-                            SET category = ?, servings = ?, cook_time = ?, prep_time = ?,
-                                ingredients = ?, instructions = ?, notes = ?, difficulty = ?, description = ?
-                            WHERE id = ?
-                        """, (
-                            normalized_recipe['category'], normalized_recipe['servings'], 
-                            normalized_recipe['cook_time'], normalized_recipe['prep_time'], 
-                            normalized_recipe['ingredients'], normalized_recipe['instructions'],
-                            normalized_recipe['notes'], normalized_recipe['difficulty'], 
-                            normalized_recipe['description'], recipe_id
-                        ))
-                        last_recipe_id = recipe_id
-                        imported_count += 1
-                        continue
-                
-                # Insert new recipe
-                cursor.execute("""
-                    INSERT INTO recipes (title, category, servings, cook_time, prep_time,
-                                       ingredients, instructions, notes, difficulty, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    normalized_recipe['title'], normalized_recipe['category'], 
-                    normalized_recipe['servings'], normalized_recipe['cook_time'],
-                    normalized_recipe['prep_time'], normalized_recipe['ingredients'],
-                    normalized_recipe['instructions'], normalized_recipe['notes'],
-                    normalized_recipe['difficulty'], normalized_recipe['description']
-                ))
-                
-                last_recipe_id = cursor.lastrowid
-                imported_count += 1
-            
-            conn.commit()
-            conn.close()
-            
-            if imported_count > 0:
-                QMessageBox.information(self, "Import Complete", 
-                                      f"Successfully imported {imported_count} recipes from YAML file.")
-                return last_recipe_id
-            else:
-                QMessageBox.information(self, "Import Complete", "No new recipes imported.")
-                return None
-                
-        except ImportError:
-            QMessageBox.critical(self, "Missing Dependency", 
-                               "PyYAML library is required for YAML import.\n"
-                               "Please install it with: pip install pyyaml")
-            return None
-        except yaml.YAMLError as e:
-            QMessageBox.critical(self, "YAML Error", f"Invalid YAML format: {str(e)}")
-            return None
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import from YAML file: {str(e)}")
-            return None
-
-    
-    def import_from_markdown(self, file_path, duplicate_handling, default_category):
-        """Import recipes from Markdown file"""
-        try:
-            from utils.db import get_connection
-            
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            
-            # Parse markdown content
-            recipe_data = self._parse_markdown_recipe(content, default_category)
-            
-            if not recipe_data:
-                QMessageBox.warning(self, "Parse Error", "Could not parse recipe from Markdown file.")
-                return None
-            
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Handle duplicates
-            if duplicate_handling == "Skip duplicates":
-                cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                if cursor.fetchone():
-                    QMessageBox.information(self, "Duplicate", f"Recipe '{recipe_data['title']}' already exists. Skipping.")
-                    conn.close()
-                    return None
-            elif duplicate_handling == "Update existing":
-                cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                existing = cursor.fetchone()
-                if existing:
-                    recipe_id = existing[0]
-                    # Update existing recipe
-                    cursor.execute("""
-                        UPDATE recipes 
-                        SET category = ?, servings = ?, cook_time = ?, prep_time = ?,
-                            ingredients = ?, instructions = ?, notes = ?, difficulty = ?, description = ?
-                        WHERE id = ?
-                    """, (
-                        recipe_data['category'], recipe_data['servings'], 
-                        recipe_data['cook_time'], recipe_data['prep_time'], 
-                        recipe_data['ingredients'], recipe_data['instructions'],
-                        recipe_data['notes'], recipe_data['difficulty'], 
-                        recipe_data['description'], recipe_id
-                    ))
-                    conn.commit()
-                    conn.close()
-                    QMessageBox.information(self, "Success", f"Updated recipe '{recipe_data['title']}'")
-                    return recipe_id
-            
-            # Insert new recipe
-            cursor.execute("""
-                INSERT INTO recipes (title, category, servings, cook_time, prep_time,
-                                   ingredients, instructions, notes, difficulty, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                recipe_data['title'], recipe_data['category'], 
-                recipe_data['servings'], recipe_data['cook_time'],
-                recipe_data['prep_time'], recipe_data['ingredients'],
-                recipe_data['instructions'], recipe_data['notes'],
-                recipe_data['difficulty'], recipe_data['description']
-            ))
-            
-            recipe_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
-            QMessageBox.information(self, "Success", f"Imported recipe '{recipe_data['title']}'")
-            return recipe_id
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import from Markdown file: {str(e)}")
-            return None
-
-    
-    def _parse_markdown_recipe(self, content, default_category):
-        """Parse recipe from Markdown content"""
-        import re
-        
-        try:
-            lines = content.split('\n')
-            
-            # Extract title (first # heading)
-            title = ''
-            for line in lines:
-                if line.strip().startswith('# '):
-                    title = line.strip()[2:].strip()
-                    break
-            
-            if not title:
-                return None
-            
-            # Extract metadata from frontmatter or headers
-            category = default_category
-            servings = 4
-            cook_time = ''
-            prep_time = ''
-            difficulty = 'Medium'
-            description = ''
-            notes = ''
-            
-            # Look for metadata in various formats
-            for line in lines:
-                line = line.strip()
-                if line.startswith('**') and line.endswith('**'):
-                    # Bold metadata
-                    if 'Category:' in line or 'Type:' in line:
-                        category = line.split(':', 1)[1].replace('**', '').strip()
-                    elif 'Servings:' in line:
-                        try:
-                            servings = int(line.split(':', 1)[1].replace('**', '').strip())
-                        except (ValueError, TypeError):
-                            pass
-                    elif 'Cook Time:' in line:
-                        cook_time = line.split(':', 1)[1].replace('**', '').strip()
-                    elif 'Prep Time:' in line:
-                        prep_time = line.split(':', 1)[1].replace('**', '').strip()
-                    elif 'Difficulty:' in line:
-                        difficulty = line.split(':', 1)[1].replace('**', '').strip()
-                elif ':' in line and not line.startswith('#'):
-                    # Regular metadata
-                    if 'Category:' in line or 'Type:' in line:
-                        category = line.split(':', 1)[1].strip()
-                    elif 'Servings:' in line:
-                        try:
-                            servings = int(line.split(':', 1)[1].strip())
-                        except (ValueError, TypeError):
-                            pass
-                    elif 'Cook Time:' in line:
-                        cook_time = line.split(':', 1)[1].strip()
-                    elif 'Prep Time:' in line:
-                        prep_time = line.split(':', 1)[1].strip()
-                    elif 'Difficulty:' in line:
-                        difficulty = line.split(':', 1)[1].strip()
-            
-            # Extract ingredients (look for ## Ingredients or similar)
-            ingredients = ''
-            in_ingredients = False
-            for line in lines:
-                line_stripped = line.strip()
-                if line_stripped.lower().startswith('## ingredients') or line_stripped.lower().startswith('### ingredients'):
-                    in_ingredients = True
-                    continue
-                elif in_ingredients:
-                    if line_stripped.startswith('##') or line_stripped.startswith('###'):
-                        break
-                    if line_stripped.startswith('- ') or line_stripped.startswith('* '):
-                        ingredients += line_stripped[2:] + '\n'
-                    elif line_stripped and not line_stripped.startswith('#'):
-                        ingredients += line_stripped + '\n'
-            
-            # Extract instructions (look for ## Instructions or similar)
-            instructions = ''
-            in_instructions = False
-            for line in lines:
-                line_stripped = line.strip()
-                if line_stripped.lower().startswith('## instructions') or line_stripped.lower().startswith('## directions') or line_stripped.lower().startswith('## steps'):
-                    in_instructions = True
-                    continue
-                elif in_instructions:
-                    if line_stripped.startswith('##') or line_stripped.startswith('###'):
-                        break
-                    if line_stripped and not line_stripped.startswith('#'):
-                        instructions += line_stripped + '\n'
-            
-            # Extract description (text before ingredients)
-            description_lines = []
-            in_description = False
-            for line in lines:
-                line_stripped = line.strip()
-                if line_stripped.startswith('# '):
-                    in_description = True
-                    continue
-                elif line_stripped.lower().startswith('## ingredients') or line_stripped.lower().startswith('## instructions'):
-                    break
-                elif in_description and line_stripped and not line_stripped.startswith('#'):
-                    description_lines.append(line_stripped)
-            
-            description = ' '.join(description_lines)
-            
-            return {
-                'title': title,
-                'category': category,
-                'servings': servings,
-                'cook_time': cook_time,
-                'prep_time': prep_time,
-                'difficulty': difficulty,
-                'description': description,
-                'notes': notes,
-                'ingredients': ingredients.strip(),
-                'instructions': instructions.strip()
-            }
-            
-        except Exception as e:
-            print(f"Error parsing Markdown recipe: {e}")
-            return None
-
-    
-    def import_from_pdf(self, file_path, duplicate_handling, default_category):
-        """Import recipes from PDF file"""
-        try:
-            import os
-            from utils.db import get_connection
-            
-            # Extract text from PDF
-            pdf_text = self._extract_pdf_text(file_path)
-            
-            if not pdf_text:
-                QMessageBox.warning(self, "PDF Error", "Could not extract text from PDF file.")
-                return None
-            
-            # Parse the extracted text as a recipe
-            recipe_data = self._parse_pdf_recipe(pdf_text, default_category)
-            
-            if not recipe_data:
-                QMessageBox.warning(self, "Parse Error", "Could not parse recipe from PDF file.")
-                return None
-            
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Handle duplicates
-            if duplicate_handling == "Skip duplicates":
-                cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                if cursor.fetchone():
-                    QMessageBox.information(self, "Duplicate", f"Recipe '{recipe_data['title']}' already exists. Skipping.")
-                    conn.close()
-                    return None
-            elif duplicate_handling == "Update existing":
-                cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                existing = cursor.fetchone()
-                if existing:
-                    recipe_id = existing[0]
-                    # Update existing recipe
-                    cursor.execute("""
-                        UPDATE recipes 
-                        SET category = ?, servings = ?, cook_time = ?, prep_time = ?,
-                            ingredients = ?, instructions = ?, notes = ?, difficulty = ?, description = ?
-                        WHERE id = ?
-                    """, (
-                        recipe_data['category'], recipe_data['servings'], 
-                        recipe_data['cook_time'], recipe_data['prep_time'], 
-                        recipe_data['ingredients'], recipe_data['instructions'],
-                        recipe_data['notes'], recipe_data['difficulty'], 
-                        recipe_data['description'], recipe_id
-                    ))
-                    conn.commit()
-                    conn.close()
-                    QMessageBox.information(self, "Success", f"Updated recipe '{recipe_data['title']}'")
-                    return recipe_id
-            
-            # Insert new recipe
-            cursor.execute("""
-                INSERT INTO recipes (title, category, servings, cook_time, prep_time,
-                                   ingredients, instructions, notes, difficulty, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                recipe_data['title'], recipe_data['category'], 
-                recipe_data['servings'], recipe_data['cook_time'],
-                recipe_data['prep_time'], recipe_data['ingredients'],
-                recipe_data['instructions'], recipe_data['notes'],
-                recipe_data['difficulty'], recipe_data['description']
-            ))
-            
-            recipe_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
-            QMessageBox.information(self, "Success", f"Imported recipe '{recipe_data['title']}' from PDF")
-            return recipe_id
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import from PDF file: {str(e)}")
-            return None
-
-    
-    def _extract_pdf_text(self, file_path):
-        """Extract text from PDF file using multiple methods"""
-        try:
-            # Try PyPDF2 first (more common)
-            try:
-                import PyPDF2
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in pdf_reader.pages:
-                        text += page.extract_text() + "\n"
-                    return text.strip()
-            except ImportError:
-                pass
-            
-            # Try pdfplumber (better text extraction)
-            try:
-                import pdfplumber
-                text = ""
-                with pdfplumber.open(file_path) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                return text.strip()
-            except ImportError:
-                pass
-            
-            # Try pdfminer (fallback)
-            try:
-                from pdfminer.high_level import extract_text
-                text = extract_text(file_path)
-                return text.strip()
-            except ImportError:
-                pass
-            
-            # If no PDF libraries are available
-            QMessageBox.critical(self, "Missing Dependency", 
-                               "No PDF processing library found.\n"
-                               "Please install one of the following:\n"
-                               "• pip install PyPDF2\n"
-                               "• pip install pdfplumber\n"
-                               "• pip install pdfminer.six")
-            return None
-            
-        except Exception as e:
-            print(f"Error extracting PDF text: {e}")
-            return None
-
-    
-    def _parse_pdf_recipe(self, pdf_text, default_category):
-        """Parse recipe from extracted PDF text"""
-        import re
-        
-        try:
-            lines = pdf_text.split('\n')
-            
-            # Clean up the text - remove extra whitespace and normalize
-            cleaned_lines = []
-            for line in lines:
-                line = line.strip()
-                if line:
-                    cleaned_lines.append(line)
-            
-            if not cleaned_lines:
-                return None
-            
-            # Extract title - look for the first substantial line or common patterns
-            title = ''
-            for i, line in enumerate(cleaned_lines[:10]):  # Check first 10 lines
-                # Skip common PDF artifacts
-                if any(skip in line.lower() for skip in ['page', 'copyright', 'www.', 'http', 'recipe']):
-                    continue
-                # Look for title patterns
-                if len(line) > 3 and len(line) < 100 and not line.isdigit():
-                    title = line
-                    break
-            
-            if not title:
-                # Fallback: use first non-empty line
-                title = cleaned_lines[0] if cleaned_lines else "Imported Recipe"
-            
-            # Extract metadata using various patterns
-            category = default_category
-            servings = 4
-            cook_time = ''
-            prep_time = ''
-            difficulty = 'Medium'
-            description = ''
-            notes = ''
-            
-            # Look for metadata patterns
-            for line in cleaned_lines:
-                line_lower = line.lower()
-                
-                # Category detection
-                if any(cat in line_lower for cat in ['appetizer', 'main course', 'dessert', 'side dish', 'beverage']):
-                    for cat in ['appetizer', 'main course', 'dessert', 'side dish', 'beverage']:
-                        if cat in line_lower:
-                            category = cat.title()
-                            break
-                
-                # Servings detection
-                servings_match = re.search(r'(\d+)\s*(servings?|serves?|people)', line_lower)
-                if servings_match:
-                    try:
-                        servings = int(servings_match.group(1))
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Time detection
-                time_patterns = [
-                    r'cook(?:ing)?\s*time[:\s]*(\d+(?:\s*\d+)?\s*(?:min|minutes?|hr|hour|hours?))',
-                    r'total\s*time[:\s]*(\d+(?:\s*\d+)?\s*(?:min|minutes?|hr|hour|hours?))',
-                    r'prep(?:aration)?\s*time[:\s]*(\d+(?:\s*\d+)?\s*(?:min|minutes?|hr|hour|hours?))'
-                ]
-                
-                for pattern in time_patterns:
-                    match = re.search(pattern, line_lower)
-                    if match:
-                        time_value = match.group(1)
-                        if 'cook' in pattern or 'total' in pattern:
-                            cook_time = time_value
-                        elif 'prep' in pattern:
-                            prep_time = time_value
-                        break
-                
-                # Difficulty detection
-                if any(diff in line_lower for diff in ['easy', 'medium', 'hard', 'difficult', 'beginner', 'intermediate', 'advanced']):
-                    for diff in ['easy', 'medium', 'hard', 'difficult', 'beginner', 'intermediate', 'advanced']:
-                        if diff in line_lower:
-                            if diff in ['beginner']:
-                                difficulty = 'Easy'
-                            elif diff in ['intermediate']:
-                                difficulty = 'Medium'
-                            elif diff in ['advanced', 'difficult']:
-                                difficulty = 'Hard'
-                            else:
-                                difficulty = diff.title()
-                            break
-            
-            # Extract ingredients - look for common patterns
-            ingredients = []
-            in_ingredients = False
-            
-            ingredient_keywords = ['ingredients', 'ingredient list', 'you will need']
-            instruction_keywords = ['instructions', 'directions', 'steps', 'method', 'how to']
-            
-            for i, line in enumerate(cleaned_lines):
-                line_lower = line.lower()
-                
-                # Check if we're entering ingredients section
-                if any(keyword in line_lower for keyword in ingredient_keywords):
-                    in_ingredients = True
-                    continue
-                
-                # Check if we're entering instructions section
-                if any(keyword in line_lower for keyword in instruction_keywords):
-                    break
-                
-                # If we're in ingredients section, collect ingredient lines
-                if in_ingredients:
-                    # Skip empty lines and section headers
-                    if not line or line.startswith('#') or len(line) < 3:
-                        continue
-                    
-                    # Look for bullet points or numbered lists
-                    if re.match(r'^[\d\-\*\•]\s+', line):
-                        ingredient = re.sub(r'^[\d\-\*\•]\s+', '', line).strip()
-                        if ingredient:
-                            ingredients.append(ingredient)
-                    # Look for lines that seem like ingredients (contain measurements)
-                    elif re.search(r'\d+\s*(cup|cups|tbsp|tsp|oz|lb|pound|gram|g|ml|l|liter)', line_lower):
-                        ingredients.append(line)
-            
-            # If no ingredients found with section detection, try pattern matching
-            if not ingredients:
-                for line in cleaned_lines:
-                    # Look for lines with measurements
-                    if re.search(r'\d+\s*(cup|cups|tbsp|tsp|oz|lb|pound|gram|g|ml|l|liter)', line.lower()):
-                        ingredients.append(line)
-            
-            # Extract instructions - look for common patterns
-            instructions = []
-            in_instructions = False
-            
-            for i, line in enumerate(cleaned_lines):
-                line_lower = line.lower()
-                
-                # Check if we're entering instructions section
-                if any(keyword in line_lower for keyword in instruction_keywords):
-                    in_instructions = True
-                    continue
-                
-                # If we're in instructions section, collect instruction lines
-                if in_instructions:
-                    # Skip empty lines and section headers
-                    if not line or line.startswith('#') or len(line) < 3:
-                        continue
-                    
-                    # Look for numbered steps
-                    if re.match(r'^\d+[\.\)]\s+', line):
-                        instruction = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
-                        if instruction:
-                            instructions.append(instruction)
-                    # Look for any substantial text
-                    elif len(line) > 10:
-                        instructions.append(line)
-            
-            # If no instructions found with section detection, try pattern matching
-            if not instructions:
-                # Look for numbered steps anywhere in the text
-                for line in cleaned_lines:
-                    if re.match(r'^\d+[\.\)]\s+', line) and len(line) > 10:
-                        instruction = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
-                        if instruction:
-                            instructions.append(instruction)
-            
-            # Extract description from text before ingredients
-            description_lines = []
-            found_ingredients = False
-            
-            for line in cleaned_lines:
-                line_lower = line.lower()
-                if any(keyword in line_lower for keyword in ingredient_keywords):
-                    found_ingredients = True
-                    break
-                if line and len(line) > 10 and not line.isdigit():
-                    description_lines.append(line)
-            
-            if description_lines:
-                description = ' '.join(description_lines[:3])  # Take first 3 lines
-            
-            return {
-                'title': title,
-                'category': category,
-                'servings': servings,
-                'cook_time': cook_time,
-                'prep_time': prep_time,
-                'difficulty': difficulty,
-                'description': description,
-                'notes': notes,
-                'ingredients': '\n'.join(ingredients),
-                'instructions': '\n'.join(instructions)
-            }
-            
-        except Exception as e:
-            print(f"Error parsing PDF recipe: {e}")
-            return None
-
-    
-    def import_from_word(self, file_path, duplicate_handling, default_category):
-        """Import recipes from Word document (.docx, .doc)"""
-        try:
-            from utils.db import get_connection
-            
-            # Extract text from Word document
-            word_text = self._extract_word_text(file_path)
-            
-            if not word_text:
-                QMessageBox.warning(self, "Word Error", "Could not extract text from Word document.")
-                return None
-            
-            # Parse the extracted text as a recipe
-            recipe_data = self._parse_word_recipe(word_text, default_category)
-            
-            if not recipe_data:
-                QMessageBox.warning(self, "Parse Error", "Could not parse recipe from Word document.")
-                return None
-            
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Handle duplicates
-            if duplicate_handling == "Skip duplicates":
-                cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                if cursor.fetchone():
-                    QMessageBox.information(self, "Duplicate", f"Recipe '{recipe_data['title']}' already exists. Skipping.")
-                    conn.close()
-                    return None
-            elif duplicate_handling == "Update existing":
-                cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                existing = cursor.fetchone()
-                if existing:
-                    recipe_id = existing[0]
-                    # Update existing recipe
-                    cursor.execute("""
-                        UPDATE recipes 
-                        SET category = ?, servings = ?, cook_time = ?, prep_time = ?,
-                            ingredients = ?, instructions = ?, notes = ?, difficulty = ?, description = ?
-                        WHERE id = ?
-                    """, (
-                        recipe_data['category'], recipe_data['servings'], 
-                        recipe_data['cook_time'], recipe_data['prep_time'], 
-                        recipe_data['ingredients'], recipe_data['instructions'],
-                        recipe_data['notes'], recipe_data['difficulty'], 
-                        recipe_data['description'], recipe_id
-                    ))
-                    conn.commit()
-                    conn.close()
-                    QMessageBox.information(self, "Success", f"Updated recipe '{recipe_data['title']}'")
-                    return recipe_id
-            
-            # Insert new recipe
-            cursor.execute("""
-                INSERT INTO recipes (title, category, servings, cook_time, prep_time,
-                                   ingredients, instructions, notes, difficulty, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                recipe_data['title'], recipe_data['category'], 
-                recipe_data['servings'], recipe_data['cook_time'],
-                recipe_data['prep_time'], recipe_data['ingredients'],
-                recipe_data['instructions'], recipe_data['notes'],
-                recipe_data['difficulty'], recipe_data['description']
-            ))
-            
-            recipe_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
-            QMessageBox.information(self, "Success", f"Imported recipe '{recipe_data['title']}' from Word document")
-            return recipe_id
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import from Word document: {str(e)}")
-            return None
-
-    
-    def _extract_word_text(self, file_path):
-        """Extract text from Word document using multiple methods"""
-        import os
-        
-        try:
-            file_ext = os.path.splitext(file_path)[1].lower()
-            
-            # Try python-docx for .docx files (modern format)
-            if file_ext == '.docx':
-                try:
-                    from docx import Document
-                    doc = Document(file_path)
-                    
-                    # Extract text from paragraphs
-                    text_parts = []
-                    for paragraph in doc.paragraphs:
-                        if paragraph.text.strip():
-                            text_parts.append(paragraph.text)
-                    
-                    # Extract text from tables (ingredients often in tables)
-                    for table in doc.tables:
-                        for row in table.rows:
-                            row_text = []
-                            for cell in row.cells:
-                                if cell.text.strip():
-                                    row_text.append(cell.text.strip())
-                            if row_text:
-                                text_parts.append(' | '.join(row_text))
-                    
-                    return '\n'.join(text_parts)
-                    
-                except ImportError:
-                    QMessageBox.critical(self, "Missing Dependency", 
-                                       "python-docx library is required for .docx import.\n"
-                                       "Please install it with: pip install python-docx")
-                    return None
-            
-            # Try textract for .doc files (older format) or as fallback
-            elif file_ext == '.doc':
-                try:
-                    import textract
-                    text = textract.process(file_path).decode('utf-8')
-                    return text
-                except ImportError:
-                    QMessageBox.critical(self, "Missing Dependency", 
-                                       "textract library is required for .doc import.\n"
-                                       "Please install it with: pip install textract\n"
-                                       "Note: .doc format support may require additional dependencies.")
-                    return None
-                except Exception as e:
-                    # Fallback: Try to open as .docx anyway (sometimes works)
-                    try:
-                        from docx import Document
-                        doc = Document(file_path)
-                        text_parts = []
-                        for paragraph in doc.paragraphs:
-                            if paragraph.text.strip():
-                                text_parts.append(paragraph.text)
-                        return '\n'.join(text_parts)
-                    except:
-                        QMessageBox.critical(self, "Format Error", 
-                                           f"Could not process .doc file: {str(e)}\n"
-                                           "Please convert to .docx format or install textract.")
-                        return None
-            else:
-                QMessageBox.warning(self, "Unsupported Format", 
-                                  f"File format {file_ext} is not supported.\n"
-                                  "Please use .docx or .doc format.")
-                return None
-                
-        except Exception as e:
-            print(f"Error extracting Word text: {e}")
-            return None
-
-    
-    def _parse_word_recipe(self, word_text, default_category):
-        """Parse recipe from extracted Word document text"""
-        import re
-        
-        try:
-            lines = word_text.split('\n')
-            
-            # Clean up the text - remove extra whitespace and normalize
-            cleaned_lines = []
-            for line in lines:
-                line = line.strip()
-                if line and line not in ['|', '||', '|||']:  # Remove table separators
-                    cleaned_lines.append(line)
-            
-            if not cleaned_lines:
-                return None
-            
-            # Extract title - look for the first substantial line
-            title = ''
-            for i, line in enumerate(cleaned_lines[:10]):  # Check first 10 lines
-                # Skip common document artifacts
-                if any(skip in line.lower() for skip in ['recipe', 'document', 'page', 'copyright']):
-                    if len(cleaned_lines) > i + 1:
-                        continue
-                # Look for title patterns - substantial text, not too long
-                if len(line) > 3 and len(line) < 100 and not line.isdigit():
-                    # Check if it's styled like a title (all caps, title case, etc.)
-                    title = line
-                    break
-            
-            if not title:
-                # Fallback: use first non-empty line
-                title = cleaned_lines[0] if cleaned_lines else "Imported Recipe"
-            
-            # Extract metadata using various patterns
-            category = default_category
-            servings = 4
-            cook_time = ''
-            prep_time = ''
-            difficulty = 'Medium'
-            description = ''
-            notes = ''
-            
-            # Look for metadata patterns (often in Word docs as "Label: Value")
-            for line in cleaned_lines:
-                line_lower = line.lower()
-                
-                # Category detection
-                if 'category:' in line_lower or 'type:' in line_lower or 'cuisine:' in line_lower:
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        category = parts[1].strip()
-                elif any(cat in line_lower for cat in ['appetizer', 'main course', 'dessert', 'side dish', 'beverage', 'breakfast', 'lunch', 'dinner']):
-                    for cat in ['appetizer', 'main course', 'dessert', 'side dish', 'beverage', 'breakfast', 'lunch', 'dinner']:
-                        if cat in line_lower:
-                            category = cat.title()
-                            break
-                
-                # Servings detection
-                if 'servings:' in line_lower or 'serves:' in line_lower or 'yield:' in line_lower:
-                    servings_match = re.search(r'(\d+)', line)
-                    if servings_match:
-                        try:
-                            servings = int(servings_match.group(1))
-                        except (ValueError, TypeError):
-                            pass
-                else:
-                    servings_match = re.search(r'(\d+)\s*(servings?|serves?|people)', line_lower)
-                    if servings_match:
-                        try:
-                            servings = int(servings_match.group(1))
-                        except (ValueError, TypeError):
-                            pass
-                
-                # Time detection
-                if 'cook time:' in line_lower or 'cooking time:' in line_lower:
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        cook_time = parts[1].strip()
-                elif 'prep time:' in line_lower or 'preparation time:' in line_lower:
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        prep_time = parts[1].strip()
-                elif 'total time:' in line_lower:
-                    parts = line.split(':', 1)
-                    if len(parts) > 1 and not cook_time:
-                        cook_time = parts[1].strip()
-                
-                # Difficulty detection
-                if 'difficulty:' in line_lower or 'level:' in line_lower:
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        difficulty = parts[1].strip().title()
-                elif any(diff in line_lower for diff in ['easy', 'medium', 'hard', 'beginner', 'intermediate', 'advanced']):
-                    for diff in ['easy', 'medium', 'hard', 'beginner', 'intermediate', 'advanced']:
-                        if diff in line_lower:
-                            if diff == 'beginner':
-                                difficulty = 'Easy'
-                            elif diff == 'intermediate':
-                                difficulty = 'Medium'
-                            elif diff in ['advanced', 'difficult']:
-                                difficulty = 'Hard'
-                            else:
-                                difficulty = diff.title()
-                            break
-            
-            # Extract ingredients - look for common patterns
-            ingredients = []
-            in_ingredients = False
-            
-            ingredient_keywords = ['ingredients', 'ingredient list', 'you will need', 'what you need']
-            instruction_keywords = ['instructions', 'directions', 'steps', 'method', 'how to make', 'preparation']
-            
-            for i, line in enumerate(cleaned_lines):
-                line_lower = line.lower()
-                
-                # Check if we're entering ingredients section
-                if any(keyword in line_lower for keyword in ingredient_keywords):
-                    in_ingredients = True
-                    continue
-                
-                # Check if we're entering instructions section
-                if any(keyword in line_lower for keyword in instruction_keywords):
-                    in_ingredients = False
-                    break
-                
-                # If we're in ingredients section, collect ingredient lines
-                if in_ingredients:
-                    # Skip empty lines and section headers
-                    if not line or len(line) < 2:
-                        continue
-                    
-                    # Handle table format (with | separator)
-                    if '|' in line:
-                        parts = line.split('|')
-                        # Combine amount and ingredient if in separate columns
-                        combined = ' '.join(p.strip() for p in parts if p.strip())
-                        if combined:
-                            ingredients.append(combined)
-                    # Look for bullet points or numbered lists
-                    elif re.match(r'^[\d\-\*\•·]\s+', line):
-                        ingredient = re.sub(r'^[\d\-\*\•·]\s+', '', line).strip()
-                        if ingredient:
-                            ingredients.append(ingredient)
-                    # Look for lines that seem like ingredients
-                    elif re.search(r'\d+\s*(cup|cups|tbsp|tsp|oz|lb|pound|gram|g|ml|l|liter|tablespoon|teaspoon)', line_lower) or len(line) < 60:
-                        ingredients.append(line)
-            
-            # If no ingredients found with section detection, try pattern matching
-            if not ingredients:
-                for line in cleaned_lines:
-                    # Look for lines with measurements
-                    if re.search(r'\d+\s*(cup|cups|tbsp|tsp|oz|lb|pound|gram|g|ml|l|liter|tablespoon|teaspoon)', line.lower()):
-                        ingredients.append(line)
-            
-            # Extract instructions - look for common patterns
-            instructions = []
-            in_instructions = False
-            
-            for i, line in enumerate(cleaned_lines):
-                line_lower = line.lower()
-                
-                # Check if we're entering instructions section
-                if any(keyword in line_lower for keyword in instruction_keywords):
-                    in_instructions = True
-                    continue
-                
-                # If we're in instructions section, collect instruction lines
-                if in_instructions:
-                    # Skip empty lines and very short lines
-                    if not line or len(line) < 5:
-                        continue
-                    
-                    # Skip lines that look like section headers
-                    if line.lower() in ['notes', 'tips', 'nutrition']:
-                        break
-                    
-                    # Look for numbered steps
-                    if re.match(r'^\d+[\.\)]\s+', line):
-                        instruction = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
-                        if instruction:
-                            instructions.append(instruction)
-                    # Look for any substantial text
-                    elif len(line) > 15:
-                        instructions.append(line)
-            
-            # If no instructions found with section detection, try pattern matching
-            if not instructions:
-                # Look for numbered steps anywhere in the text
-                for line in cleaned_lines:
-                    if re.match(r'^\d+[\.\)]\s+', line) and len(line) > 15:
-                        instruction = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
-                        if instruction:
-                            instructions.append(instruction)
-            
-            # Extract description from text before ingredients
-            description_lines = []
-            found_ingredients = False
-            
-            for line in cleaned_lines:
-                line_lower = line.lower()
-                if any(keyword in line_lower for keyword in ingredient_keywords):
-                    found_ingredients = True
-                    break
-                if line and line != title and len(line) > 15 and not line.isdigit():
-                    # Skip metadata lines
-                    if ':' not in line or len(line) > 50:
-                        description_lines.append(line)
-            
-            if description_lines:
-                description = ' '.join(description_lines[:3])  # Take first 3 lines
-            
-            return {
-                'title': title,
-                'category': category,
-                'servings': servings,
-                'cook_time': cook_time,
-                'prep_time': prep_time,
-                'difficulty': difficulty,
-                'description': description,
-                'notes': notes,
-                'ingredients': '\n'.join(ingredients),
-                'instructions': '\n'.join(instructions)
-            }
-            
-        except Exception as e:
-            print(f"Error parsing Word recipe: {e}")
-            return None
-
-    
-    def _toggle_txt_input_mode(self, checked):
-        """Toggle between file selection and text input for TXT import"""
-        if checked:
-            self.text_input_label.setVisible(True)
-            self.recipe_text_input.setVisible(True)
-        else:
-            self.text_input_label.setVisible(False)
-            self.recipe_text_input.setVisible(False)
-    
-    def import_from_txt(self, file_path, duplicate_handling, default_category):
-        """Import recipe from text file"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                recipe_text = file.read()
-            
-            self.import_from_txt_content(recipe_text, duplicate_handling, default_category)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import from text file: {str(e)}")
-    
-    def import_from_txt_content(self, recipe_text, duplicate_handling, default_category):
-        """Parse and import recipe from text content"""
-        from utils.db import get_connection
-        
-        try:
-            # Parse the recipe text
-            recipe_data = self._parse_recipe_text(recipe_text, default_category)
-            
-            if not recipe_data:
-                QMessageBox.warning(self, "Parse Error", "Could not parse recipe from text. Please check the format.")
-                return
-            
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Handle duplicates
-            if duplicate_handling == "Skip duplicates":
-                cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                if cursor.fetchone():
-                    QMessageBox.information(self, "Duplicate", f"Recipe '{recipe_data['title']}' already exists. Skipping.")
-                    conn.close()
-                    return
-            elif duplicate_handling == "Update existing":
-                cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe_data['title'],))
-                existing = cursor.fetchone()
-                if existing:
-                    recipe_id = existing[0]
-                    # Update existing recipe
-                    cursor.execute("""
-                        UPDATE recipes 
-                        SET category = ?, servings = ?, cook_time = ?, prep_time = ?,
-                            ingredients = ?, instructions = ?, notes = ?, difficulty = ?, description = ?
-                        WHERE id = ?
-                    """, (
-                        recipe_data['category'], recipe_data['servings'], recipe_data['cook_time'],
-                        recipe_data['prep_time'], recipe_data['ingredients'], recipe_data['instructions'],
-                        recipe_data['notes'], recipe_data['difficulty'], recipe_data['description'], recipe_id
-                    ))
-                    conn.commit()
-                    conn.close()
-                    QMessageBox.information(self, "Success", f"Updated recipe '{recipe_data['title']}'")
-                    return recipe_id
-            
-            # Insert new recipe
-            cursor.execute("""
-                INSERT INTO recipes (title, category, servings, cook_time, prep_time,
-                                   ingredients, instructions, notes, difficulty, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                recipe_data['title'], recipe_data['category'], recipe_data['servings'],
-                recipe_data['cook_time'], recipe_data['prep_time'], recipe_data['ingredients'],
-                recipe_data['instructions'], recipe_data['notes'], recipe_data['difficulty'],
-                recipe_data['description']
-            ))
-            
-            recipe_id = cursor.lastrowid
-            
-            # Insert ingredients into recipe_ingredients table if we have structured data
-            if recipe_data.get('parsed_ingredients'):
-                for ingredient in recipe_data['parsed_ingredients']:
-                    cursor.execute("""
-                        INSERT INTO recipe_ingredients (recipe_id, ingredient_name, quantity, unit, notes)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (
-                        recipe_id,
-                        ingredient.get('name', ''),
-                        ingredient.get('quantity', ''),
-                        ingredient.get('unit', ''),
-                        ingredient.get('notes', '')
-                    ))
-            
-            conn.commit()
-            conn.close()
-            
-            QMessageBox.information(self, "Success", f"Imported recipe '{recipe_data['title']}'")
-            
-            # Return the recipe ID for auto-viewing
-            return recipe_id
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import recipe: {str(e)}")
+    def _report_recipe_import(self, summary):
+        """Tell the user what an import did, including near-duplicates it found"""
+        if summary.errors and not (summary.imported or summary.updated or summary.skipped):
+            path, error = next(iter(summary.errors.items()))
+            QMessageBox.warning(self, "Import Failed", f"Could not import {os.path.basename(path) or path}:\n{error}")
             return None
-    
-    def _parse_recipe_text(self, text, default_category):
-        """Parse recipe from text content
-        
-        Supports formats like:
-        - Recipe Name: ...
-        - Category: ...
-        - Ingredients: (or Ingredients list)
-        - Instructions: (or Directions:, Steps:, Method:)
-        """
-        import re
         
-        recipe_data = {
-            'title': '',
-            'category': default_category,
-            'prep_time': '',
-            'cook_time': '',
-            'servings': 4,
-            'difficulty': 'Medium',
-            'description': '',
-            'ingredients': '',
-            'instructions': '',
-            'notes': '',
-            'parsed_ingredients': []
-        }
-        
-        # Split text into lines
-        lines = text.split('\n')
-        current_section = None
-        section_content = []
-        
-        # Patterns to match common recipe field names
-        field_patterns = {
-            'title': r'^(?:recipe\s+name|title|name)\s*[:=]\s*(.+)$',
-            'category': r'^(?:category|type)\s*[:=]\s*(.+)$',
-            'prep_time': r'^(?:prep\s+time|preparation\s+time|prep)\s*[:=]\s*(.+)$',
-            'cook_time': r'^(?:cook\s+time|cooking\s+time|cook)\s*[:=]\s*(.+)$',
-            'servings': r'^(?:servings|serves|yield)\s*[:=]\s*(\d+)',
-            'difficulty': r'^(?:difficulty|level)\s*[:=]\s*(.+)$',
-            'description': r'^(?:description|about)\s*[:=]\s*(.+)$',
-        }
-        
-        section_patterns = {
-            'ingredients': r'^(?:ingredients|ingredient\s+list)\s*[:=]?\s*$',
-            'instructions': r'^(?:instructions|directions|steps|method|preparation)\s*[:=]?\s*$',
-            'notes': r'^(?:notes|tips|note)\s*[:=]?\s*$',
-        }
-        
-        for line in lines:
-            line_stripped = line.strip()
-            
-            if not line_stripped:
-                # Empty line - might be section separator
-                if section_content and current_section:
-                    # Save accumulated section content
-                    if current_section in ['ingredients', 'instructions', 'notes']:
-                        recipe_data[current_section] = '\n'.join(section_content).strip()
-                    section_content = []
-                continue
-            
-            # Check for field patterns (single-line fields)
-            matched_field = False
-            for field_name, pattern in field_patterns.items():
-                match = re.match(pattern, line_stripped, re.IGNORECASE)
-                if match:
-                    value = match.group(1).strip()
-                    if field_name == 'servings':
-                        try:
-                            recipe_data[field_name] = int(value)
-                        except ValueError:
-                            recipe_data[field_name] = 4
-                    else:
-                        recipe_data[field_name] = value
-                    matched_field = True
-                    break
-            
-            if matched_field:
-                continue
-            
-            # Check for section headers
-            matched_section = False
-            for section_name, pattern in section_patterns.items():
-                if re.match(pattern, line_stripped, re.IGNORECASE):
-                    # Save previous section if any
-                    if section_content and current_section:
-                        recipe_data[current_section] = '\n'.join(section_content).strip()
-                    
-                    # Start new section
-                    current_section = section_name
-                    section_content = []
-                    matched_section = True
-                    break
-            
-            if matched_section:
-                continue
-            
-            # Add line to current section
-            if current_section:
-                section_content.append(line_stripped)
-            elif not recipe_data['title']:
-                # If no title set yet and we have content, assume first line is title
-                recipe_data['title'] = line_stripped
-        
-        # Save last section
-        if section_content and current_section:
-            recipe_data[current_section] = '\n'.join(section_content).strip()
-        
-        # Parse ingredients into structured format
-        if recipe_data['ingredients']:
-            recipe_data['parsed_ingredients'] = self._parse_ingredients_list(recipe_data['ingredients'])
-        
-        # Validate required fields
-        if not recipe_data['title']:
-            # Try to extract title from first non-empty line
-            for line in lines:
-                if line.strip():
-                    recipe_data['title'] = line.strip()[:100]  # Limit title length
-                    break
-        
-        return recipe_data if recipe_data['title'] else None
+        message = (f"Imported {summary.imported}, updated {summary.updated} and skipped "
+                   f"{summary.skipped} recipes.")
+        QMessageBox.information(self, "Import Complete", message + self._import_details(summary))
+        return summary.last_recipe_id
     
-    def _parse_ingredients_list(self, ingredients_text):
-        """Parse ingredients text into structured list"""
-        import re
-        
-        parsed_ingredients = []
-        lines = ingredients_text.split('\n')
-        
-        # Common measurement patterns
-        measurement_pattern = r'^[\-\*\•]?\s*(\d+[\d\s\/\.]*)\s*([a-zA-Z]+)?\s+(.+)$'
-        simple_pattern = r'^[\-\*\•]?\s*(.+)$'
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Try to match quantity + unit + ingredient
-            match = re.match(measurement_pattern, line)
-            if match:
-                quantity = match.group(1).strip()
-                unit = match.group(2).strip() if match.group(2) else ''
-                name = match.group(3).strip()
-                
-                parsed_ingredients.append({
-                    'quantity': quantity,
-                    'unit': unit,
-                    'name': name,
-                    'notes': ''
-                })
-            else:
-                # Just ingredient name, no measurement
-                match = re.match(simple_pattern, line)
-                if match:
-                    parsed_ingredients.append({
-                        'quantity': '',
-                        'unit': '',
-                        'name': match.group(1).strip(),
-                        'notes': ''
-                    })
-        
-        return parsed_ingredients
+    def _import_details(self, summary):
+        """Near-duplicate and failed-file lines for an import report"""
+        details = ""
+        sections = (
+            ("near-duplicates of existing recipes were found",
+             [f"• {title} ≈ {existing} ({similarity:.0%})"
+              for title, existing, similarity in summary.near_duplicates]),
+            ("files could not be imported",
+             [f"• {os.path.basename(path) or path}: {error.splitlines()[0] if error else ''}"
+              for path, error in summary.errors.items()]),
+        )
+        for heading, lines in sections:
+            if lines:
+                details += f"\n\n{len(lines)} {heading}:\n" + "\n".join(lines[:10])
+                if len(lines) > 10:
+                    details += f"\n...and {len(lines) - 10} more"
+        return details
+    
\ No newline at end of file
@@ -13,34 +13,23 @@ from PySide6.QtWidgets import (
     QLineEdit, QTextEdit, QGroupBox, QRadioButton, QProgressBar,
     QFileDialog, QMessageBox, QFrame, QSplitter, QScrollArea
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont, QTextCursor
 
+from services.background_jobs import IMPORT, get_job_manager
 from utils.csv_import_service import CSVImportService
 from utils.db import get_connection
 from panels.base_panel import BasePanel
 from panels.context_menu_mixin import CSVImportContextMenuMixin
 
 
-class CSVImportWorker(QThread):
-    """Worker thread for CSV import operations"""
+def csv_import_job(context, file_path: Path) -> Dict[str, Any]:
+    """Background job importing a mobile CSV file on its own connection"""
+    from contextlib import closing
     
-    progress = Signal(str)
-    finished = Signal(dict)
-    error = Signal(str)
-    
-    def __init__(self, import_service: CSVImportService, file_path: Path):
-        super().__init__()
-        self.import_service = import_service
-        self.file_path = file_path
-    
-    def run(self):
-        try:
-            self.progress.emit("Starting import...")
-            result = self.import_service.import_csv_file(self.file_path)
-            self.finished.emit(result)
-        except Exception as e:
-            self.error.emit(str(e))
+    context.status("Starting import...")
+    with closing(get_connection()) as conn:
+        return CSVImportService(conn).import_csv_file(file_path)
 
 
 class CSVImportPanel(CSVImportContextMenuMixin, BasePanel):
@@ -50,7 +39,7 @@ class CSVImportPanel(CSVImportContextMenuMixin, BasePanel):
         super().__init__(master, app)
         self.db = get_connection()
         self.import_service = CSVImportService(self.db)
-        self.worker = None
+        self.import_job = None
         self.setup_ui()
     
     def setup_ui(self):
@@ -212,12 +201,12 @@ class CSVImportPanel(CSVImportContextMenuMixin, BasePanel):
             self.progress_label.setText("Importing CSV file...")
             self.import_button.setEnabled(False)
             
-            # Create and start worker thread
-            self.worker = CSVImportWorker(self.import_service, Path(file_path))
-            self.worker.progress.connect(self.progress_label.setText)
-            self.worker.finished.connect(self.import_finished)
-            self.worker.error.connect(self.import_error)
-            self.worker.start()
+            # Run the import as a background job
+            self.import_job = get_job_manager().submit(IMPORT, csv_import_job, Path(file_path),
+                                                   title="Mobile CSV import")
+            self.import_job.progress.connect(lambda done, total, message: self.progress_label.setText(message))
+            self.import_job.finished.connect(self.import_finished)
+            self.import_job.failed.connect(self.import_error)
             
         except Exception as e:
             self.progress_bar.setVisible(False)
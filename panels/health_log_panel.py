@@ -21,6 +21,7 @@ from PySide6.QtGui import QFont
 from panels.base_panel import BasePanel
 from panels.context_menu_mixin import HealthLogContextMenuMixin
 from services.care_provider_service import get_care_provider_service, CareProviderData
+from services.health_index import get_health_index
 from services.ingredient_correlator import ingredient_correlator
 
 
@@ -185,6 +186,8 @@ class CareProviderDialog(QDialog):
 class HealthLogPanel(HealthLogContextMenuMixin, BasePanel):
     """Health log panel for PySide6 with Gluten Guardian features and Care Provider management"""
     
+    tracked_tables = ('health_log', 'care_providers')
+    
     def __init__(self, master=None, app=None):
         # Initialize care provider service before calling super().__init__()
         # because setup_ui() will be called during super().__init__()
@@ -1245,93 +1248,52 @@ class HealthLogPanel(HealthLogContextMenuMixin, BasePanel):
     def analyze_patterns(self):
         """Analyze health patterns and correlations using ingredient correlator"""
         try:
-            # Get health logs from database
-            health_logs = self._get_health_logs_for_analysis()
-            meal_logs = self._get_meal_logs_for_analysis()
+            index = get_health_index()
+            db = index.conn
+            entries, meals = db.execute("""
+                SELECT COUNT(*), COUNT(NULLIF(items, ''))
+                FROM health_log
+                WHERE date >= date('now', '-30 days')
+            """).fetchone()
             
-            if not health_logs or not meal_logs:
+            if not entries or not meals:
                 QMessageBox.information(self, "Pattern Analysis", 
                     "Insufficient data for pattern analysis. Please log more meals and symptoms.")
                 return
             
-            # Perform correlation analysis
-            analysis_results = ingredient_correlator.analyze_ingredient_correlations(health_logs, meal_logs)
-            
-            # Show results dialog
-            self._show_pattern_analysis_results(analysis_results)
+            # Index sync, window join and counting run on the analysis runner's thread;
+            # unchanged data is answered from its cache
+            from services.health_analysis_jobs import get_health_analysis_runner
+            runner = get_health_analysis_runner()
+            if not getattr(self, '_analysis_connected', False):
+                runner.result_ready.connect(self._on_analysis_ready)
+                runner.dropped.connect(self._on_analysis_dropped)
+                self._analysis_connected = True
+            # A cached result is shown before start returns
+            if runner.start('correlations', days_back=30):
+                self.setCursor(Qt.BusyCursor)
             
         except Exception as e:
+            self.unsetCursor()
             QMessageBox.critical(self, "Analysis Error", f"Failed to analyze patterns: {str(e)}")
     
-    def _get_health_logs_for_analysis(self) -> List[Dict]:
-        """Get health logs formatted for analysis"""
-        try:
-            from utils.db import get_connection
-            
-            db = get_connection()
-            cursor = db.cursor()
-            cursor.execute("""
-                SELECT date, time, symptoms, severity, notes, meal_type, items
-                FROM health_log 
-                WHERE date >= date('now', '-30 days')
-                ORDER BY date DESC, time DESC
-            """)
-            
-            logs = []
-            for row in cursor.fetchall():
-                date, time, symptoms, severity, notes, meal_type, items = row
-                timestamp = f"{date} {time}" if time else date
-                
-                logs.append({
-                    'timestamp': timestamp,
-                    'symptoms': symptoms.split(',') if symptoms else [],
-                    'severity': severity or 0,
-                    'notes': notes or '',
-                    'meal_type': meal_type or '',
-                    'items': items.split(',') if items else []
-                })
-            
-            return logs
-            
-        except Exception as e:
-            print(f"Error getting health logs: {e}")
-            return []
+    def _on_analysis_ready(self, kind: str, analysis_results: Dict[str, Any]):
+        """Show the runner's correlation results"""
+        if kind != 'correlations':
+            return
+        self.unsetCursor()
+        if 'error' in analysis_results:
+            QMessageBox.critical(self, "Analysis Error",
+                                 f"Failed to analyze patterns: {analysis_results['error']}")
+            return
+        
+        # Show results dialog
+        self._show_pattern_analysis_results(analysis_results)
     
-    def _get_meal_logs_for_analysis(self) -> List[Dict]:
-        """Get meal logs formatted for analysis"""
-        # For now, create sample meal logs based on health log items
-        # In production, this would come from a separate meal logging system
-        try:
-            from utils.db import get_connection
-            
-            db = get_connection()
-            cursor = db.cursor()
-            cursor.execute("""
-                SELECT date, time, meal_type, items, notes
-                FROM health_log 
-                WHERE items IS NOT NULL AND items != ''
-                AND date >= date('now', '-30 days')
-                ORDER BY date DESC, time DESC
-            """)
-            
-            logs = []
-            for row in cursor.fetchall():
-                date, time, meal_type, items, notes = row
-                timestamp = f"{date} {time}" if time else date
-                
-                logs.append({
-                    'timestamp': timestamp,
-                    'meal_type': meal_type or 'unknown',
-                    'items': items.split(',') if items else [],
-                    'restaurant': '',
-                    'gluten_safety_confirmed': False
-                })
-            
-            return logs
-            
-        except Exception as e:
-            print(f"Error getting meal logs: {e}")
-            return []
+    def _on_analysis_dropped(self, kind: str):
+        """Stop waiting for a correlation analysis another analysis superseded"""
+        if kind == 'correlations':
+            self.unsetCursor()
     
     def _show_pattern_analysis_results(self, results: Dict[str, Any]):
         """Show pattern analysis results in a dialog"""
@@ -1445,6 +1407,8 @@ Most problematic ingredient: {summary.get('most_problematic_ingredient', 'None i
     
     def refresh(self):
         """Refresh panel data"""
+        if not self.data_changed():
+            return
         self.load_health_entries()
         self.refresh_providers()
     
@@ -1540,6 +1504,7 @@ Most problematic ingredient: {summary.get('most_problematic_ingredient', 'None i
             ))
             
             db.commit()
+            get_health_index().sync()
             return True
             
         except Exception as e:
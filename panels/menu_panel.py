@@ -20,7 +20,12 @@ from panels.context_menu_mixin import MenuContextMenuMixin
 class MenuPanel(MenuContextMenuMixin, BasePanel):
     """Menu panel for PySide6"""
     
+    tracked_tables = ('menu_plan', 'recipes', 'recipe_ingredients')
+    MEALS = ("Breakfast", "Lunch", "Dinner")
+    
     def __init__(self, master=None, app=None):
+        self.menu_nutrition = None
+        self._recipe_nutrition = None
         super().__init__(master, app)
     
     def setup_ui(self):
@@ -87,6 +92,11 @@ class MenuPanel(MenuContextMenuMixin, BasePanel):
         
         main_layout.addWidget(self.menu_table)
         
+        # Planned nutrition for the week, and the selected day
+        self.nutrition_label = QLabel("")
+        self.nutrition_label.setWordWrap(True)
+        main_layout.addWidget(self.nutrition_label)
+        
         # Action buttons
         button_layout = QHBoxLayout()
         self.edit_meal_btn = QPushButton("Edit Meal")
@@ -127,6 +137,8 @@ class MenuPanel(MenuContextMenuMixin, BasePanel):
 
     def refresh(self):
         """Refresh panel data"""
+        if not self.data_changed():
+            return
         self.load_week_menu()
     
     def apply_custom_table_styling(self):
@@ -170,11 +182,65 @@ class MenuPanel(MenuContextMenuMixin, BasePanel):
                 self.menu_table.setItem(row, 1, QTableWidgetItem(""))
                 self.menu_table.setItem(row, 2, QTableWidgetItem(""))
                 self.menu_table.setItem(row, 3, QTableWidgetItem(""))
+        
+        self._load_week_nutrition()
+    
+    def _week_start(self):
+        """Monday of the week selected in the week combo"""
+        from datetime import date, timedelta
+        today = date.today()
+        offset = max(self.week_combo.currentIndex(), 0)
+        return today - timedelta(days=today.weekday()) + timedelta(weeks=offset)
+    
+    def _day_date(self, row: int) -> str:
+        """ISO date of a table row in the selected week"""
+        from datetime import timedelta
+        return (self._week_start() + timedelta(days=row)).isoformat()
+    
+    def _load_week_nutrition(self):
+        """Show planned meals of the selected week and total their nutrition"""
+        try:
+            from services.menu_nutrition import MenuNutrition, RecipeNutritionCache
+            from utils.db import get_connection
+            
+            if self._recipe_nutrition is None:
+                self._recipe_nutrition = RecipeNutritionCache(get_connection())
+            conn = self._recipe_nutrition.conn
+            self.menu_nutrition = MenuNutrition.for_week(conn, self._week_start(), self._recipe_nutrition)
+            
+            days = self.menu_nutrition.days
+            for day, meal, title in conn.execute(
+                    "SELECT date, meal, title FROM menu_plan WHERE date BETWEEN ? AND ? ORDER BY id",
+                    (days[0], days[-1])):
+                if meal in self.MEALS and title:
+                    self.menu_table.setItem(days.index(day), self.MEALS.index(meal) + 1, QTableWidgetItem(title))
+        except Exception as e:
+            print(f"Error loading menu nutrition: {str(e)}")
+            self.menu_nutrition = None
+        self._update_nutrition_label()
+    
+    def _update_nutrition_label(self):
+        """Show the week's planned totals and the selected day's"""
+        if self.menu_nutrition is None:
+            self.nutrition_label.setText("")
+            return
+        
+        def describe(totals):
+            return (f"{totals['calories']:,.0f} kcal, {totals['protein_g']:,.0f} g protein, "
+                    f"{totals['fiber_g']:,.0f} g fiber, {totals['sodium_mg']:,.0f} mg sodium")
+        
+        text = f"Week: {describe(self.menu_nutrition.week_totals())}"
+        row = self.menu_table.currentRow()
+        if 0 <= row < len(self.menu_nutrition.days):
+            day = self.menu_table.item(row, 0).text()
+            text += f"\n{day}: {describe(self.menu_nutrition.day_totals(self.menu_nutrition.days[row]))}"
+        self.nutrition_label.setText(text)
     
     def on_selection_changed(self):
         """Handle table selection changes"""
         has_selection = len(self.menu_table.selectedItems()) > 0
         self.edit_meal_btn.setEnabled(has_selection)
+        self._update_nutrition_label()
     
     def on_table_resize(self, event):
         """Handle table resize to update minimum column widths"""
@@ -298,27 +364,37 @@ class MenuPanel(MenuContextMenuMixin, BasePanel):
                 self.menu_table.setItem(current_row, current_col, QTableWidgetItem(display_text))
                 
                 # Save to database
-                self._save_meal_to_database(day, meal_type, new_meal, notes, time, portion)
+                self._save_meal_to_database(self._day_date(current_row), meal_type, new_meal, notes, time, portion)
                 
                 QMessageBox.information(self, "Success", f"{meal_type} updated successfully!")
     
     def _save_meal_to_database(self, day: str, meal_type: str, recipe: str, notes: str, time: str, portion: str):
-        """Save meal to database"""
+        """Save meal to database and update the planned nutrition for that day"""
         try:
+            from services.menu_nutrition import PORTIONS
             from utils.db import get_connection
             
             conn = get_connection()
             cursor = conn.cursor()
             
-            # Insert or update meal (table already exists from migrations)
+            row = cursor.execute("SELECT id FROM recipes WHERE title = ?", (recipe,)).fetchone()
+            recipe_id = row[0] if row else None
+            portions = PORTIONS.get(portion, 1.0)
+            
+            # Replace the meal (table already exists from migrations)
+            cursor.execute("DELETE FROM menu_plan WHERE date = ? AND meal = ?", (day, meal_type))
             cursor.execute("""
-                INSERT OR REPLACE INTO menu_plan (date, meal, title, notes, time)
-                VALUES (?, ?, ?, ?, ?)
-            """, (day, meal_type, recipe, notes, time))
+                INSERT INTO menu_plan (date, meal, recipe_id, title, notes, time, portions)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (day, meal_type, recipe_id, recipe, notes, time, portions))
             
             conn.commit()
             conn.close()
             
+            if self.menu_nutrition is not None:
+                self.menu_nutrition.set_meal(day, meal_type, recipe_id, portions)
+                self._update_nutrition_label()
+            
         except Exception as e:
             print(f"Error saving meal to database: {str(e)}")
             # Don't show error to user as this is a background operation
@@ -1861,9 +1937,11 @@ class MenuPanel(MenuContextMenuMixin, BasePanel):
             mobile_sync = get_mobile_sync_service()
             success_count = 0
             
+            # Get full recipe details from database
+            details = self._get_recipe_details(recipe_data['name'] for recipe_data in selected_recipes)
+            
             for recipe_data in selected_recipes:
-                # Get full recipe details from database
-                recipe_details = self._get_recipe_details(recipe_data['name'])
+                recipe_details = details.get(recipe_data['name'])
                 
                 if recipe_details:
                     # Create mobile-optimized recipe format
@@ -1884,27 +1962,30 @@ class MenuPanel(MenuContextMenuMixin, BasePanel):
             print(f"Error pushing recipes to mobile sync: {str(e)}")
             return 0
     
-    def _get_recipe_details(self, recipe_name):
-        """Get full recipe details from database"""
+    def _get_recipe_details(self, recipe_names):
+        """Get full recipe details of several recipes from the database in one query"""
+        names = list(dict.fromkeys(recipe_names))
+        if not names:
+            return {}
         try:
             from utils.db import get_connection
             
             conn = get_connection()
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT id, name, description, ingredients, instructions, 
+            cursor.execute(f"""
+                SELECT id, title, description, ingredients, instructions, 
                        prep_time, cook_time, servings, category, 
-                       difficulty, image_path, nutrition_info, notes
+                       difficulty, image_path
                 FROM recipes 
-                WHERE name = ?
-            """, (recipe_name,))
+                WHERE title IN ({','.join('?' * len(names))})
+            """, names)
             
-            result = cursor.fetchone()
+            results = cursor.fetchall()
             conn.close()
             
-            if result:
-                return {
+            return {
+                result[1]: {
                     'id': result[0],
                     'name': result[1],
                     'description': result[2],
@@ -1916,15 +1997,15 @@ class MenuPanel(MenuContextMenuMixin, BasePanel):
                     'category': result[8],
                     'difficulty': result[9],
                     'image_path': result[10],
-                    'nutrition_info': result[11],
-                    'notes': result[12]
+                    'nutrition_info': None,
+                    'notes': None
                 }
-            
-            return None
+                for result in results
+            }
             
         except Exception as e:
             print(f"Error getting recipe details: {str(e)}")
-            return None
+            return {}
     
     def _create_mobile_recipe_format(self, recipe_details, push_options):
         """Create mobile-optimized recipe format"""
@@ -24,6 +24,21 @@ from panels.context_menu_mixin import PantryContextMenuMixin
 class PantryPanel(PantryContextMenuMixin, BasePanel):
     """Pantry management panel for PySide6"""
     
+    tracked_tables = ('pantry',)
+    
+    # Risk filter choices: (label, gluten_risk value)
+    UNSCORED = 'unscored'
+    RISK_FILTERS = [
+        ("All", None),
+        ("Safe", 'safe'),
+        ("Low Risk", 'low_risk'),
+        ("Unknown", 'unknown'),
+        ("Medium Risk", 'medium_risk'),
+        ("High Risk", 'high_risk'),
+        ("Unsafe", 'unsafe'),
+        ("Not Scored", UNSCORED),
+    ]
+    
     def __init__(self, master=None, app=None):
         super().__init__(master, app)
     
@@ -174,6 +189,20 @@ class PantryPanel(PantryContextMenuMixin, BasePanel):
         self.search_edit.setPlaceholderText("Search items...")
         self.search_edit.textChanged.connect(self.filter_items)
         search_layout.addWidget(self.search_edit)
+        
+        # Risk filter and sort, read from the columns the risk sweep fills in
+        search_layout.addWidget(QLabel("Risk:"))
+        self.risk_filter_combo = QComboBox()
+        for label, risk in self.RISK_FILTERS:
+            self.risk_filter_combo.addItem(label, risk)
+        self.risk_filter_combo.currentIndexChanged.connect(self.refresh_items)
+        search_layout.addWidget(self.risk_filter_combo)
+        
+        search_layout.addWidget(QLabel("Sort:"))
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(["Name", "Gluten Risk"])
+        self.sort_combo.currentIndexChanged.connect(self.refresh_items)
+        search_layout.addWidget(self.sort_combo)
         list_group_layout.addLayout(search_layout)
         
         # Items table
@@ -1007,53 +1036,50 @@ class PantryPanel(PantryContextMenuMixin, BasePanel):
                                "• Add gluten-free verification")
     
     def import_from_file(self, file_path, duplicate_handling, default_category):
-        """Import items from file"""
-        import csv
+        """Import items from file, streaming rows into the database in batches"""
+        from utils.csvio import executemany_batched, iter_csv_rows
         from utils.db import get_connection
         
-        conn = get_connection()
+        if not file_path.endswith('.csv'):
+            QMessageBox.warning(self, "File Format", 
+                              "Currently only CSV files are supported for bulk import.")
+            return
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                if file_path.endswith('.csv'):
-                    reader = csv.DictReader(file)
-                    imported_count = 0
-                    
-                    for row in reader:
-                        name = row.get('name', '').strip()
-                        brand = row.get('brand', '').strip()
-                        category = row.get('category', default_category).strip()
-                        expiry = row.get('expiry', '').strip()
-                        notes = row.get('notes', '').strip()
-                        
-                        if not name:
-                            continue
-                
-                        # Handle duplicates
-                        if duplicate_handling == "Skip duplicates":
-                            existing = conn.execute(
-                                "SELECT id FROM pantry WHERE name = ? AND brand = ?",
-                                (name, brand)
-                            ).fetchone()
-                            if existing:
-                                continue
-                        
-                        # Insert item
-                        conn.execute("""
-                            INSERT OR REPLACE INTO pantry 
-                            (name, brand, category, expiry_date, notes)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (name, brand, category, expiry, notes))
-                        imported_count += 1
-                    
-                    conn.commit()
-                    QMessageBox.information(self, "Import Complete", 
-                                          f"Successfully imported {imported_count} items from CSV file.")
-                
+        def params():
+            for row in iter_csv_rows(file_path):
+                name = (row.get('name') or '').strip()
+                if not name:
+                    continue
+                brand = (row.get('brand') or '').strip()
+                category = (row.get('category') or default_category).strip()
+                expiry = (row.get('expiry') or '').strip()
+                notes = (row.get('notes') or '').strip()
+                if skip_duplicates:
+                    yield (name, brand, category, expiry, notes, name, brand)
                 else:
-                    QMessageBox.warning(self, "File Format", 
-                                      "Currently only CSV files are supported for bulk import.")
+                    yield (name, brand, category, expiry, notes)
+        
+        skip_duplicates = duplicate_handling == "Skip duplicates"
+        if skip_duplicates:
+            # Checked in the INSERT itself, so rows earlier in the same file count too
+            sql = """
+                INSERT INTO pantry (name, brand, category, expiration, notes)
+                SELECT ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (SELECT 1 FROM pantry WHERE name = ? AND brand IS ?)
+            """
+        else:
+            sql = """
+                INSERT OR REPLACE INTO pantry 
+                (name, brand, category, expiration, notes)
+                VALUES (?, ?, ?, ?, ?)
+            """
         
+        conn = get_connection()
+        try:
+            imported_count = executemany_batched(conn, sql, params())
+            conn.commit()
+            QMessageBox.information(self, "Import Complete", 
+                                  f"Successfully imported {imported_count} items from CSV file.")
         except Exception as e:
             conn.rollback()
             raise e
@@ -1136,13 +1162,26 @@ class PantryPanel(PantryContextMenuMixin, BasePanel):
             db = get_connection()
             cursor = db.cursor()
             
+            # Risk filter and sort; both are served by the gluten risk indexes
+            risk = self.risk_filter_combo.currentData()
+            where_clause, params = "", []
+            if risk == self.UNSCORED:
+                where_clause = "WHERE gluten_risk IS NULL"
+            elif risk:
+                where_clause, params = "WHERE gluten_risk = ?", [risk]
+            order_clause = "ORDER BY name"
+            if self.sort_combo.currentText() == "Gluten Risk":
+                # Safest first; items not yet scored by the risk sweep go last
+                order_clause = "ORDER BY gluten_risk_score IS NULL, gluten_risk_score, name"
+            
             # Load pantry items from database
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT name, category, quantity, unit, expiration, 
-                       gf_flag, brand, '', notes, ''
+                       gf_flag, brand, '', notes, '', gluten_risk
                 FROM pantry 
-                ORDER BY name
-            """)
+                {where_clause}
+                {order_clause}
+            """, params)
             
             items = cursor.fetchall()
             
@@ -1150,7 +1189,7 @@ class PantryPanel(PantryContextMenuMixin, BasePanel):
             self.items_table.setRowCount(len(items))
             
             for row, item in enumerate(items):
-                name, category, quantity, unit, expiration, gf_flag, brand, upc_code, notes, created_at = item
+                name, category, quantity, unit, expiration, gf_flag, brand, upc_code, notes, created_at, gluten_risk = item
                 
                 # Populate table
                 self.items_table.setItem(row, 0, QTableWidgetItem(name or ""))
@@ -1158,12 +1197,16 @@ class PantryPanel(PantryContextMenuMixin, BasePanel):
                 self.items_table.setItem(row, 2, QTableWidgetItem(str(quantity) if quantity else ""))
                 self.items_table.setItem(row, 3, QTableWidgetItem(unit or ""))
                 self.items_table.setItem(row, 4, QTableWidgetItem(expiration or ""))
-                self.items_table.setItem(row, 5, QTableWidgetItem(gf_flag or "Unknown"))
+                gf_item = QTableWidgetItem(gf_flag or "Unknown")
+                if gluten_risk:
+                    gf_item.setToolTip(f"Detected gluten risk: {gluten_risk.replace('_', ' ')}")
+                self.items_table.setItem(row, 5, gf_item)
                 self.items_table.setItem(row, 6, QTableWidgetItem(brand or ""))
             
             # If no items in database, add sample items
-            if len(items) == 0:
+            if len(items) == 0 and not risk:
                 self._load_sample_items()
+            self.filter_items()
                 
         except Exception as e:
             print(f"Error loading pantry items from database: {e}")
@@ -1186,7 +1229,12 @@ class PantryPanel(PantryContextMenuMixin, BasePanel):
     
     def refresh(self):
         """Refresh panel data"""
+        if not self.data_changed():
+            return
         self.refresh_items()
+        # Score new or edited items; the sweep's writes trigger one more refresh
+        from services.risk_sweep import get_risk_sweep_service
+        get_risk_sweep_service().start()
     
     def _save_item_to_database(self):
         """Save pantry item to database and return item ID"""
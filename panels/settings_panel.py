@@ -6,7 +6,8 @@ Includes: Theme customization, Database settings, Import/Export, Recipe Search,
 
 import json
 import os
-import shutil
+import sqlite3
+from contextlib import closing
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
@@ -16,13 +17,17 @@ from PySide6.QtWidgets import (
     QFileDialog, QMessageBox, QColorDialog, QScrollArea, QGridLayout,
     QSlider, QFormLayout, QListWidget, QListWidgetItem, QSplitter,
     QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
-    QDialog, QDialogButtonBox, QFrame
+    QDialog, QDialogButtonBox, QFrame, QProgressDialog
 )
-from PySide6.QtCore import Qt, Signal, QThread, QTimer
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QFont, QPalette, QColor, QPixmap, QPainter
 
 from utils.db import get_connection
 from utils.settings import get_setting, set_setting
+from services.background_jobs import EXPORT, IMPORT, JobCancelled, JobContext, get_job_manager
+from services.snapshot_service import (
+    SnapshotCancelled, SnapshotSettings, copy_database, get_snapshot_service, restore_snapshot
+)
 from services.theme_creator import theme_creator
 
 
@@ -382,39 +387,70 @@ class ThemeEditorDialog(QDialog):
         }
 
 
-class DatabaseBackupThread(QThread):
-    """Thread for database backup operations"""
+def database_backup_job(context: JobContext, source_path: str, backup_path: str) -> str:
+    """Background job copying the database to a backup file"""
+    context.progress(10, 100, "Starting backup...")
+    
+    # Create backup directory if it doesn't exist
+    os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+    
+    context.status("Copying database pages...")
+    
+    # Online copy through the backup API: consistent with the WAL and never blocks writers
+    try:
+        with closing(sqlite3.connect(source_path)) as source:
+            copy_database(source, backup_path,
+                          progress=lambda done, total: context.progress(10 + int(done * 90 / max(total, 1)), 100),
+                          cancelled=context.token)
+    except SnapshotCancelled:
+        raise JobCancelled()
+    
+    context.progress(100, 100, "Backup completed successfully!")
+    return f"Database backed up to: {backup_path}"
+
+
+def archive_backup_job(context: JobContext, archive_path: str, restore: bool = False) -> str:
+    """Background job writing or restoring a full-backup archive on its own connection"""
+    from services.backup_archive import restore_archive, write_archive
+    
+    action = "Restoring" if restore else "Backing up"
+    
+    def report(done, total):
+        context.progress(int(done * 100 / max(total, 1)), 100, f"{action} data... {done} of {total} steps")
+    
+    with closing(get_connection()) as conn:
+        if restore:
+            counts = restore_archive(conn, archive_path, progress=report)
+            return f"Restored {sum(counts.values())} records from: {archive_path}"
+        manifest = write_archive(conn, archive_path, progress=report)
+        records = sum(entry['rows'] for entry in manifest['members'])
+        return f"Backed up {records} records to: {archive_path}"
+
+
+def import_panel_job(context: JobContext, panel_name: str, file_path: str, overwrite_mode: bool):
+    """Background job importing a file into a panel's tables"""
+    from services.import_export_service import ImportExportService
     
-    progress_updated = Signal(int)
-    status_updated = Signal(str)
-    finished = Signal(bool, str)
+    context.status(f"Importing {os.path.basename(file_path)}...")
+    return ImportExportService().import_panel_data(panel_name, file_path, overwrite_mode)
+
+
+def export_panel_job(context: JobContext, panel_name: str, file_path: str, format_type: str,
+                     include_metadata: bool, compress: bool) -> bool:
+    """Background job exporting a panel's data to a file"""
+    from services.import_export_service import ImportExportService
     
-    def __init__(self, source_path: str, backup_path: str):
-        super().__init__()
-        self.source_path = source_path
-        self.backup_path = backup_path
+    context.status(f"Exporting to {os.path.basename(file_path)}...")
+    return ImportExportService().export_panel_data(panel_name, file_path, format_type, include_metadata, compress)
+
+
+def export_all_job(context: JobContext, directory: str, format_type: str,
+                   include_metadata: bool, compress: bool) -> bool:
+    """Background job exporting every panel's data into a directory"""
+    from services.import_export_service import ImportExportService
     
-    def run(self):
-        """Perform database backup"""
-        try:
-            self.status_updated.emit("Starting backup...")
-            self.progress_updated.emit(10)
-            
-            # Create backup directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.backup_path), exist_ok=True)
-            
-            self.status_updated.emit("Copying database file...")
-            self.progress_updated.emit(50)
-            
-            shutil.copy2(self.source_path, self.backup_path)
-            
-            self.status_updated.emit("Backup completed successfully!")
-            self.progress_updated.emit(100)
-            
-            self.finished.emit(True, f"Database backed up to: {self.backup_path}")
-            
-        except Exception as e:
-            self.finished.emit(False, f"Backup failed: {str(e)}")
+    context.status("Exporting all data...")
+    return ImportExportService().export_all_data(directory, format_type, include_metadata, compress)
 
 
 class SettingsPanel(QWidget):
@@ -571,6 +607,58 @@ class SettingsPanel(QWidget):
         backup_buttons.addStretch()
         backup_layout.addLayout(backup_buttons)
         
+        # Full backup archive (all data in one compressed file)
+        archive_buttons = QHBoxLayout()
+        self.backup_archive_btn = QPushButton("Backup to Archive...")
+        self.backup_archive_btn.setToolTip("Save recipes, pantry, shopping, menus, health logs and calendar "
+                                           "into one compressed archive")
+        self.backup_archive_btn.clicked.connect(self.backup_to_archive)
+        archive_buttons.addWidget(self.backup_archive_btn)
+        
+        self.restore_archive_btn = QPushButton("Restore from Archive...")
+        self.restore_archive_btn.clicked.connect(self.restore_from_archive)
+        archive_buttons.addWidget(self.restore_archive_btn)
+        
+        archive_buttons.addStretch()
+        backup_layout.addLayout(archive_buttons)
+        
+        # Scheduled snapshots
+        snapshot_form = QFormLayout()
+        snapshot_dir_layout = QHBoxLayout()
+        self.snapshot_dir_edit = QLineEdit()
+        self.snapshot_dir_edit.setPlaceholderText("Default: data/snapshots")
+        snapshot_dir_layout.addWidget(self.snapshot_dir_edit)
+        browse_snapshot_btn = QPushButton("Browse")
+        browse_snapshot_btn.clicked.connect(self.browse_snapshot_directory)
+        snapshot_dir_layout.addWidget(browse_snapshot_btn)
+        snapshot_form.addRow("Snapshot Folder:", snapshot_dir_layout)
+        
+        self.snapshot_interval_spin = QSpinBox()
+        self.snapshot_interval_spin.setRange(0, 24 * 30)
+        self.snapshot_interval_spin.setSuffix(" hours")
+        self.snapshot_interval_spin.setSpecialValueText("Off")
+        snapshot_form.addRow("Snapshot Every:", self.snapshot_interval_spin)
+        
+        self.snapshot_keep_spin = QSpinBox()
+        self.snapshot_keep_spin.setRange(1, 365)
+        self.snapshot_keep_spin.setValue(7)
+        snapshot_form.addRow("Snapshots to Keep:", self.snapshot_keep_spin)
+        
+        self.snapshot_compress_checkbox = QCheckBox("Compress snapshots")
+        self.snapshot_compress_checkbox.setChecked(True)
+        snapshot_form.addRow("", self.snapshot_compress_checkbox)
+        
+        self.snapshot_encrypt_checkbox = QCheckBox("Encrypt snapshots")
+        snapshot_form.addRow("", self.snapshot_encrypt_checkbox)
+        backup_layout.addLayout(snapshot_form)
+        
+        snapshot_buttons = QHBoxLayout()
+        self.snapshot_now_btn = QPushButton("Take Snapshot Now")
+        self.snapshot_now_btn.clicked.connect(self.take_snapshot_now)
+        snapshot_buttons.addWidget(self.snapshot_now_btn)
+        snapshot_buttons.addStretch()
+        backup_layout.addLayout(snapshot_buttons)
+        
         layout.addWidget(backup_group)
         
         # Database Statistics
@@ -585,6 +673,11 @@ class SettingsPanel(QWidget):
         stats_layout.addRow("Total Records:", self.db_records_label)
         stats_layout.addRow("Last Backup:", self.last_backup_label)
         
+        rebuild_rollups_btn = QPushButton("Rebuild Health Summaries")
+        rebuild_rollups_btn.setToolTip("Recompute the daily, weekly and monthly health rollups from the logs")
+        rebuild_rollups_btn.clicked.connect(self.rebuild_health_rollups)
+        stats_layout.addRow("Maintenance:", rebuild_rollups_btn)
+        
         layout.addWidget(stats_group)
         layout.addStretch()
         
@@ -645,7 +738,7 @@ class SettingsPanel(QWidget):
         format_layout = QHBoxLayout()
         format_layout.addWidget(QLabel("Export Format:"))
         self.export_format_combo = QComboBox()
-        self.export_format_combo.addItems(["CSV", "JSON", "Excel", "PDF"])
+        self.export_format_combo.addItems(["CSV", "JSON", "NDJSON", "Excel", "PDF"])
         format_layout.addWidget(self.export_format_combo)
         format_layout.addStretch()
         export_layout.addLayout(format_layout)
@@ -667,6 +760,9 @@ class SettingsPanel(QWidget):
         self.include_metadata_checkbox.setChecked(True)
         settings_layout.addRow("Include Metadata:", self.include_metadata_checkbox)
         
+        self.compress_export_checkbox = QCheckBox("Compress CSV/JSON exports (gzip)")
+        settings_layout.addRow("Compression:", self.compress_export_checkbox)
+        
         layout.addWidget(settings_group)
         layout.addStretch()
         
@@ -934,6 +1030,13 @@ class SettingsPanel(QWidget):
             last_backup = get_setting(db, "last_backup", "Never")
             self.last_backup_label.setText(last_backup)
             
+            snapshots = SnapshotSettings.load(db)
+            self.snapshot_dir_edit.setText(snapshots.directory)
+            self.snapshot_interval_spin.setValue(snapshots.interval_hours)
+            self.snapshot_keep_spin.setValue(snapshots.keep)
+            self.snapshot_compress_checkbox.setChecked(snapshots.compress)
+            self.snapshot_encrypt_checkbox.setChecked(snapshots.encrypt)
+            
         except Exception as e:
             print(f"Error loading database settings: {e}")
     
@@ -1271,16 +1374,23 @@ class SettingsPanel(QWidget):
             self.backup_status.setVisible(True)
             self.backup_now_btn.setEnabled(False)
             
-            # Start backup thread
-            self.backup_thread = DatabaseBackupThread(source_path, backup_path)
-            self.backup_thread.progress_updated.connect(self.backup_progress.setValue)
-            self.backup_thread.status_updated.connect(self.backup_status.setText)
-            self.backup_thread.finished.connect(self.on_backup_finished)
-            self.backup_thread.start()
+            # Start backup job
+            job = get_job_manager().submit(EXPORT, database_backup_job, source_path, backup_path,
+                                           title="Database backup")
+            job.progress.connect(self._show_backup_progress)
+            job.finished.connect(lambda message: self.on_backup_finished(True, message))
+            job.failed.connect(lambda error: self.on_backup_finished(False, f"Backup failed: {error}"))
+            job.cancelled.connect(lambda _result: self.on_backup_finished(False, "Backup cancelled"))
             
         except Exception as e:
             QMessageBox.critical(self, "Backup Error", f"Failed to start backup: {e}")
     
+    def _show_backup_progress(self, done, total, message):
+        """Show a backup job's progress in the backup widgets"""
+        self.backup_progress.setValue(int(done * 100 / max(total, 1)))
+        if message:
+            self.backup_status.setText(message)
+    
     def on_backup_finished(self, success, message):
         """Handle backup completion"""
         self.backup_progress.setVisible(False)
@@ -1300,11 +1410,139 @@ class SettingsPanel(QWidget):
         else:
             QMessageBox.critical(self, "Backup Failed", message)
     
+    def browse_snapshot_directory(self):
+        """Browse for the snapshot directory"""
+        directory = QFileDialog.getExistingDirectory(self, "Select Snapshot Directory")
+        if directory:
+            self.snapshot_dir_edit.setText(directory)
+    
+    def take_snapshot_now(self):
+        """Take a snapshot in the background with the settings as entered"""
+        service = get_snapshot_service()
+        if not service.start(self.snapshot_settings(), rotate=True):
+            QMessageBox.information(self, "Snapshot Running", "A snapshot is already in progress.")
+            return
+        
+        self.backup_progress.setValue(0)
+        self.backup_progress.setVisible(True)
+        self.backup_status.setText("Taking snapshot...")
+        self.backup_status.setVisible(True)
+        self.snapshot_now_btn.setEnabled(False)
+        service.snapshot_progress.connect(self.on_snapshot_progress)
+        service.snapshot_finished.connect(self.on_snapshot_finished)
+    
+    def on_snapshot_progress(self, done, total):
+        """Show how many pages have been copied"""
+        self.backup_progress.setValue(int(done * 100 / max(total, 1)))
+    
+    def on_snapshot_finished(self, success, message):
+        """Handle snapshot completion"""
+        service = get_snapshot_service()
+        service.snapshot_progress.disconnect(self.on_snapshot_progress)
+        service.snapshot_finished.disconnect(self.on_snapshot_finished)
+        self.backup_progress.setVisible(False)
+        self.backup_status.setVisible(False)
+        self.snapshot_now_btn.setEnabled(True)
+        
+        if success:
+            self.last_backup_label.setText(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            QMessageBox.information(self, "Snapshot Complete", f"Database snapshot saved to:\n{message}")
+        else:
+            QMessageBox.critical(self, "Snapshot Failed", f"Snapshot failed: {message}")
+    
+    def backup_to_archive(self):
+        """Back up all data into a single compressed archive"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        archive_path, _ = QFileDialog.getSaveFileName(
+            self, "Backup to Archive", f"celiogix_backup_{timestamp}.zip",
+            "Zip Archives (*.zip);;Zstandard Tar Archives (*.tar.zst)"
+        )
+        if archive_path:
+            self._start_archive_job(archive_path, restore=False)
+    
+    def restore_from_archive(self):
+        """Replace all data with the contents of a backup archive"""
+        archive_path, _ = QFileDialog.getOpenFileName(
+            self, "Restore from Archive", "", "Backup Archives (*.zip *.tar.zst *.tzst)"
+        )
+        if not archive_path:
+            return
+        
+        reply = QMessageBox.question(
+            self, "Confirm Restore",
+            "This will replace your recipes, pantry, shopping list, menus, health logs and calendar "
+            "with the contents of the archive. Continue?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self._start_archive_job(archive_path, restore=True)
+    
+    def _start_archive_job(self, archive_path, restore):
+        """Run an archive backup or restore with the backup progress widgets"""
+        category = IMPORT if restore else EXPORT
+        if getattr(self, 'archive_job', None) is not None:
+            QMessageBox.information(self, "Backup Running", "A backup or restore is already in progress.")
+            return
+        
+        self.backup_progress.setValue(0)
+        self.backup_progress.setVisible(True)
+        self.backup_status.setVisible(True)
+        self.backup_archive_btn.setEnabled(False)
+        self.restore_archive_btn.setEnabled(False)
+        
+        self.archive_job = get_job_manager().submit(
+            category, archive_backup_job, archive_path, restore,
+            title="Archive restore" if restore else "Archive backup")
+        self.archive_job.progress.connect(self._show_backup_progress)
+        self.archive_job.finished.connect(lambda message: self.on_archive_finished(True, message, restore))
+        self.archive_job.failed.connect(lambda error: self.on_archive_finished(
+            False, f"{'Restore' if restore else 'Backup'} failed: {error}", restore))
+    
+    def on_archive_finished(self, success, message, restore):
+        """Handle archive backup or restore completion"""
+        self.archive_job = None
+        self.backup_progress.setVisible(False)
+        self.backup_status.setVisible(False)
+        self.backup_archive_btn.setEnabled(True)
+        self.restore_archive_btn.setEnabled(True)
+        
+        if not success:
+            QMessageBox.critical(self, "Restore Failed" if restore else "Backup Failed", message)
+            return
+        
+        if restore:
+            QMessageBox.information(self, "Restore Complete", message)
+            self.update_database_statistics()
+        else:
+            QMessageBox.information(self, "Backup Complete", message)
+            try:
+                db = get_connection()
+                set_setting(db, "last_backup", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                self.last_backup_label.setText(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            except:
+                pass
+    
+    def rebuild_health_rollups(self):
+        """Rebuild the daily health rollup table from the health logs"""
+        try:
+            from utils.health_rollups import ensure_health_rollups, rebuild_health_rollups
+            
+            db = get_connection()
+            ensure_health_rollups(db)
+            with db:
+                days = rebuild_health_rollups(db)
+            db.close()
+            QMessageBox.information(self, "Health Summaries Rebuilt",
+                                    f"Recomputed health summaries for {days} days.")
+        except Exception as e:
+            QMessageBox.critical(self, "Rebuild Error", f"Failed to rebuild health summaries: {e}")
+    
     def restore_database(self):
         """Restore database from backup"""
         try:
             backup_path, _ = QFileDialog.getOpenFileName(
-                self, "Select Backup File", "", "Database Files (*.db *.sqlite *.sqlite3)"
+                self, "Select Backup File", "",
+                "Database Files (*.db *.sqlite *.sqlite3);;Snapshots (*.db.gz *.db.enc *.db.gz.enc)"
             )
             
             if backup_path:
@@ -1318,13 +1556,14 @@ class SettingsPanel(QWidget):
                 if reply == QMessageBox.Yes:
                     source_path = self.db_path_edit.text()
                     
-                    # Create backup of current database first
-                    if os.path.exists(source_path):
-                        backup_current = f"{source_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                        shutil.copy2(source_path, backup_current)
-                    
-                    # Restore from backup
-                    shutil.copy2(backup_path, source_path)
+                    with closing(sqlite3.connect(source_path)) as live:
+                        # Create backup of current database first
+                        if os.path.exists(source_path):
+                            backup_current = f"{source_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                            copy_database(live, backup_current)
+                        
+                        # Restore through the backup API so open connections see the new pages
+                        restore_snapshot(live, backup_path)
                     
                     QMessageBox.information(self, "Restore Complete", "Database restored successfully!")
                     self.update_database_statistics()
@@ -1332,37 +1571,56 @@ class SettingsPanel(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Restore Error", f"Failed to restore database: {e}")
     
+    def _run_data_job(self, label, category, function, *args, on_finished=None):
+        """Run an import or export job behind a busy dialog"""
+        progress = QProgressDialog(label, None, 0, 0, self)
+        progress.setWindowTitle("Please Wait")
+        progress.setMinimumDuration(0)
+        
+        job = get_job_manager().submit(category, function, *args, title=label)
+        job.progress.connect(lambda done, total, message: progress.setLabelText(message or label))
+        job.finished.connect(lambda result: (progress.close(), on_finished(result)))
+        job.failed.connect(lambda error: (progress.close(),
+                                          QMessageBox.critical(self, "Error", f"{label} failed: {error}")))
+        job.cancelled.connect(lambda _result: progress.close())
+        return job
+    
     def import_panel_data(self, panel_name):
-        """Import data for a specific panel"""
+        """Import data for a specific panel in the background"""
         try:
             file_path, _ = QFileDialog.getOpenFileName(
                 self, f"Import {panel_name} Data", "", 
-                "CSV Files (*.csv);;JSON Files (*.json);;Excel Files (*.xlsx)"
+                "CSV Files (*.csv *.csv.gz);;JSON Files (*.json *.json.gz);;"
+                "NDJSON Files (*.ndjson *.ndjson.gz);;Excel Files (*.xlsx)"
             )
             
             if file_path:
-                from services.import_export_service import ImportExportService
-                ie_service = ImportExportService()
-                
                 # Get overwrite mode setting
                 overwrite_mode = self.overwrite_checkbox.isChecked()
                 
-                success, message = ie_service.import_panel_data(panel_name.lower().replace(' ', '_'), file_path, overwrite_mode)
+                def on_finished(result):
+                    success, message = result
+                    if success:
+                        QMessageBox.information(self, "Import Success", f"Successfully imported {panel_name} data:\n{message}")
+                    else:
+                        QMessageBox.warning(self, "Import Failed", f"Failed to import {panel_name} data:\n{message}")
                 
-                if success:
-                    QMessageBox.information(self, "Import Success", f"Successfully imported {panel_name} data:\n{message}")
-                else:
-                    QMessageBox.warning(self, "Import Failed", f"Failed to import {panel_name} data:\n{message}")
+                self._run_data_job(f"Importing {panel_name} data...", IMPORT, import_panel_job,
+                                   panel_name.lower().replace(' ', '_'), file_path, overwrite_mode,
+                                   on_finished=on_finished)
                 
         except Exception as e:
             QMessageBox.critical(self, "Import Error", f"Failed to import {panel_name} data: {e}")
     
     def export_panel_data(self, panel_name):
-        """Export data for a specific panel"""
+        """Export data for a specific panel in the background"""
         try:
             # Get export format
             format_type = self.export_format_combo.currentText().lower()
             file_extension = format_type if format_type != 'excel' else 'xlsx'
+            compress = format_type in ('csv', 'json', 'ndjson') and self.compress_export_checkbox.isChecked()
+            if compress:
+                file_extension += '.gz'
             
             file_path, _ = QFileDialog.getSaveFileName(
                 self, f"Export {panel_name} Data", f"{panel_name.lower().replace(' ', '_')}_export.{file_extension}",
@@ -1370,45 +1628,41 @@ class SettingsPanel(QWidget):
             )
             
             if file_path:
-                from services.import_export_service import ImportExportService
-                ie_service = ImportExportService()
-                
                 # Get metadata setting
                 include_metadata = self.include_metadata_checkbox.isChecked()
                 
-                success = ie_service.export_panel_data(
-                    panel_name.lower().replace(' ', '_'), 
-                    file_path, 
-                    format_type, 
-                    include_metadata
-                )
+                def on_finished(success):
+                    if success:
+                        QMessageBox.information(self, "Export Success", f"Successfully exported {panel_name} data to:\n{file_path}")
+                    else:
+                        QMessageBox.warning(self, "Export Failed", f"Failed to export {panel_name} data")
                 
-                if success:
-                    QMessageBox.information(self, "Export Success", f"Successfully exported {panel_name} data to:\n{file_path}")
-                else:
-                    QMessageBox.warning(self, "Export Failed", f"Failed to export {panel_name} data")
+                self._run_data_job(f"Exporting {panel_name} data...", EXPORT, export_panel_job,
+                                   panel_name.lower().replace(' ', '_'), file_path, format_type,
+                                   include_metadata, compress, on_finished=on_finished)
                 
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to export {panel_name} data: {e}")
     
     def export_all_data(self):
-        """Export all application data"""
+        """Export all application data in the background"""
         try:
             directory = QFileDialog.getExistingDirectory(self, "Select Export Directory")
             if directory:
-                from services.import_export_service import ImportExportService
-                ie_service = ImportExportService()
-                
                 # Get export format and metadata setting
                 format_type = self.export_format_combo.currentText().lower()
                 include_metadata = self.include_metadata_checkbox.isChecked()
                 
-                success = ie_service.export_all_data(directory, format_type, include_metadata)
+                compress = self.compress_export_checkbox.isChecked()
                 
-                if success:
-                    QMessageBox.information(self, "Export All Success", f"Successfully exported all data to:\n{directory}")
-                else:
-                    QMessageBox.warning(self, "Export All Failed", "Failed to export all data")
+                def on_finished(success):
+                    if success:
+                        QMessageBox.information(self, "Export All Success", f"Successfully exported all data to:\n{directory}")
+                    else:
+                        QMessageBox.warning(self, "Export All Failed", "Failed to export all data")
+                
+                self._run_data_job("Exporting all data...", EXPORT, export_all_job,
+                                   directory, format_type, include_metadata, compress, on_finished=on_finished)
                 
         except Exception as e:
             QMessageBox.critical(self, "Export Error", f"Failed to export all data: {e}")
@@ -1758,6 +2012,24 @@ class SettingsPanel(QWidget):
         except Exception as e:
             print(f"Error saving communication settings: {e}")
     
+    def snapshot_settings(self):
+        """Snapshot settings as currently entered"""
+        return SnapshotSettings(
+            directory=self.snapshot_dir_edit.text().strip(),
+            interval_hours=self.snapshot_interval_spin.value(),
+            keep=self.snapshot_keep_spin.value(),
+            compress=self.snapshot_compress_checkbox.isChecked(),
+            encrypt=self.snapshot_encrypt_checkbox.isChecked(),
+        )
+    
+    def save_database_settings(self):
+        """Save database snapshot settings"""
+        try:
+            db = get_connection()
+            self.snapshot_settings().save(db)
+        except Exception as e:
+            print(f"Error saving database settings: {e}")
+    
     def save_import_export_settings(self):
         """Save import/export settings"""
         try:
@@ -1973,6 +2245,7 @@ class SettingsPanel(QWidget):
             self.save_recipe_search_settings()
             self.save_communication_settings()
             self.save_import_export_settings()
+            self.save_database_settings()
         except Exception as e:
             print(f"Error saving settings on close: {e}")
 
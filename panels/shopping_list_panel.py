@@ -20,6 +20,8 @@ from services.enhanced_features import enhanced_features
 class ShoppingListPanel(ShoppingListContextMenuMixin, BasePanel):
     """Shopping list panel for PySide6"""
     
+    tracked_tables = ('shopping_list',)
+    
     def __init__(self, master=None, app=None):
         super().__init__(master, app)
     
@@ -169,6 +171,8 @@ class ShoppingListPanel(ShoppingListContextMenuMixin, BasePanel):
 
     def refresh(self):
         """Refresh panel data"""
+        if not self.data_changed():
+            return
         self.load_shopping_list()
     
     def load_shopping_list(self):
@@ -0,0 +1,278 @@
+# path: services/background_jobs.py
+"""
+Background jobs for CeliacShield
+
+Exports, imports and conversions run as jobs on thread pools instead of
+blocking the window or spinning the event loop until they finish. Each job
+category has its own QThreadPool, so its concurrency limit is enforced by
+the pool: imports run one at a time because they all write to the same
+database, while exports and conversions may overlap. Idle pool threads
+sleep until there is work, so a long job costs only the CPU it uses itself.
+
+A job function receives a JobContext as its first argument. It reports
+progress through the context and polls the context's CancellationToken;
+the token can be passed wherever a service takes a ``cancelled`` callable.
+Progress and outcome are relayed to the GUI thread, so handlers connected
+to a Job's signals may touch widgets directly.
+"""
+
+import itertools
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+# Job categories and the number of their jobs that may run at once
+EXPORT = 'export'
+IMPORT = 'import'
+CONVERSION = 'conversion'
+
+CATEGORY_LIMITS: Dict[str, int] = {
+    EXPORT: 2,
+    IMPORT: 1,
+    CONVERSION: 2,
+}
+
+# Limit of categories not listed above
+DEFAULT_LIMIT = 1
+
+# Job states
+PENDING = 'pending'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled"""
+
+
+class CancellationToken:
+    """Thread-safe cancel flag shared by a job and whoever started it"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def __call__(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        """Raise JobCancelled if the job has been cancelled"""
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class JobContext:
+    """Handed to a running job function: its cancellation token and progress reporting"""
+
+    def __init__(self, job: 'Job'):
+        self._job = job
+        self.token = job.token
+        self._done = 0
+        self._total = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def check(self):
+        """Raise JobCancelled if the job has been cancelled"""
+        self.token.check()
+
+    def progress(self, done: int, total: int = 100, message: str = ''):
+        """Report done of total steps, with an optional status message"""
+        self._done, self._total = int(done), int(total)
+        self._job._progress.emit(self._done, self._total, message)
+
+    def status(self, message: str):
+        """Report a status message without moving the progress"""
+        self._job._progress.emit(self._done, self._total, message)
+
+
+class Job(QObject):
+    """A submitted job; its public signals are emitted on the GUI thread"""
+
+    progress = Signal(int, int, str)  # done, total, message
+    finished = Signal(object)  # result
+    failed = Signal(str)  # error message
+    cancelled = Signal(object)  # partial result (None if the job never ran)
+
+    # Relays from the pool thread to this object's thread
+    _progress = Signal(int, int, str)
+    _completed = Signal(str, object, str)  # state, result, error
+
+    def __init__(self, job_id: int, category: str, title: str):
+        super().__init__()
+        self.id = job_id
+        self.category = category
+        self.title = title
+        self.token = CancellationToken()
+        self.state = PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self._progress.connect(self._on_progress)
+        self._completed.connect(self._on_completed)
+
+    def cancel(self):
+        """Ask the job to stop; a job still queued never starts"""
+        self.token.cancel()
+
+    def is_done(self) -> bool:
+        return self.state in (FINISHED, FAILED, CANCELLED)
+
+    @Slot(int, int, str)
+    def _on_progress(self, done: int, total: int, message: str):
+        if not self.is_done():
+            self.progress.emit(done, total, message)
+
+    @Slot(str, object, str)
+    def _on_completed(self, state: str, result: Any, error: str):
+        self.state = state
+        self.result = result
+        if state == FINISHED:
+            self.finished.emit(result)
+        elif state == FAILED:
+            self.error = error
+            self.failed.emit(error)
+        else:
+            self.cancelled.emit(result)
+
+
+class _JobRunnable(QRunnable):
+    """Runs one job function on a pool thread"""
+
+    def __init__(self, job: Job, function: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]):
+        super().__init__()
+        self.job = job
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        job = self.job
+        if job.token.cancelled:
+            job._completed.emit(CANCELLED, None, '')
+            return
+        job.state = RUNNING
+        try:
+            result = self.function(JobContext(job), *self.args, **self.kwargs)
+        except JobCancelled:
+            job._completed.emit(CANCELLED, None, '')
+        except Exception as e:
+            print(f"Error in background job '{job.title}': {e}")
+            traceback.print_exc()
+            job._completed.emit(FAILED, None, str(e))
+        else:
+            job._completed.emit(CANCELLED if job.token.cancelled else FINISHED, result, '')
+        finally:
+            # Drop references to the job's data as soon as it is done
+            self.function = self.args = self.kwargs = None
+
+
+class JobManager(QObject):
+    """Runs jobs on one thread pool per category"""
+
+    job_started = Signal(object)  # Job, when submitted
+    job_done = Signal(object)  # Job, after its outcome signal
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        """
+        Initialize the manager
+
+        Args:
+            limits: Concurrent jobs per category (CATEGORY_LIMITS if omitted)
+        """
+        super().__init__()
+        self.limits = dict(CATEGORY_LIMITS if limits is None else limits)
+        self._pools: Dict[str, QThreadPool] = {}
+        self._jobs: Dict[int, Job] = {}
+        self._ids = itertools.count(1)
+
+    def _pool(self, category: str) -> QThreadPool:
+        pool = self._pools.get(category)
+        if pool is None:
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(max(1, self.limits.get(category, DEFAULT_LIMIT)))
+            self._pools[category] = pool
+        return pool
+
+    def set_limit(self, category: str, limit: int):
+        """Change how many jobs of a category may run at once"""
+        self.limits[category] = limit
+        if category in self._pools:
+            self._pools[category].setMaxThreadCount(max(1, limit))
+
+    def submit(self, category: str, function: Callable[..., Any], *args,
+               title: str = '', **kwargs) -> Job:
+        """
+        Queue a job
+
+        Args:
+            category: EXPORT, IMPORT, CONVERSION or another category name
+            function: Called as function(context, *args, **kwargs) on a pool thread
+            title: Shown in messages about the job
+
+        Returns:
+            The job; connect to its signals before control returns to the event loop
+        """
+        job = Job(next(self._ids), category, title or getattr(function, '__name__', 'job'))
+        job.finished.connect(lambda _result, job=job: self._on_done(job))
+        job.failed.connect(lambda _error, job=job: self._on_done(job))
+        job.cancelled.connect(lambda _result, job=job: self._on_done(job))
+        self._jobs[job.id] = job
+        self._pool(category).start(_JobRunnable(job, function, args, kwargs))
+        self.job_started.emit(job)
+        return job
+
+    def active_jobs(self, category: Optional[str] = None) -> List[Job]:
+        """Jobs queued or running, oldest first"""
+        return [job for job in self._jobs.values() if category is None or job.category == category]
+
+    def is_busy(self, category: Optional[str] = None) -> bool:
+        return bool(self.active_jobs(category))
+
+    def cancel_all(self, category: Optional[str] = None):
+        """Cancel every queued and running job, or those of one category"""
+        for job in self.active_jobs(category):
+            job.cancel()
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """
+        Block until every pool is idle
+
+        Only for shutdown and tests; outcome signals are delivered by the event loop afterwards.
+
+        Returns:
+            False if msecs passed first
+        """
+        return all(pool.waitForDone(msecs) for pool in self._pools.values())
+
+    def shutdown(self, msecs: int = 5000):
+        """Cancel all jobs and wait for the running ones to stop"""
+        self.cancel_all()
+        self.wait_for_done(msecs)
+
+    def _on_done(self, job: Job):
+        self._jobs.pop(job.id, None)
+        self.job_done.emit(job)
+
+
+def get_job_manager() -> JobManager:
+    """Get singleton background job manager instance"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
+
+
+# Global job manager instance
+_job_manager = None
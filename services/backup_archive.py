@@ -0,0 +1,454 @@
+# path: services/backup_archive.py
+"""
+Full backups of CeliacShield data in a single compressed archive
+
+The database is first copied page by page with the SQLite backup API, so
+every domain (recipes, pantry, shopping, menus, health logs, calendar) is
+read from the same point in time while the app keeps writing. Worker
+processes then export the domains concurrently from read-only connections to
+the copy, one NDJSON member per table, and the calling thread streams each
+finished member into the archive as soon as it is ready. A backup therefore
+takes about as long as the largest domain rather than the sum of them.
+
+Archives are ``.zip`` files (members are gzipped NDJSON, stored as is) or,
+when the optional ``zstandard`` package is installed, ``.tar.zst`` files
+(plain NDJSON members in one zstd stream). ``manifest.json`` lists every
+member with its table, row count, SHA-256 and table schema.
+
+Restoring verifies the checksums and loads each domain into a staging
+database in parallel; a single writer then replaces the tables from the
+staging databases in one transaction, so a failed restore changes nothing.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import tarfile
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.export_stream import export_query
+
+# Tables of each backup domain, parents before children
+DOMAINS: Dict[str, tuple] = {
+    'recipes': ('recipes', 'recipe_ingredients', 'categories', 'recipe_categories'),
+    'pantry': ('pantry',),
+    'shopping': ('shopping_list',),
+    'menus': ('menu_plan',),
+    'health': ('health_log', 'hydration_log', 'fiber_log', 'bristol_log'),
+    'calendar': ('calendar_events',),
+}
+
+MANIFEST = 'manifest.json'
+ARCHIVE_FORMAT = 'celiacshield-backup'
+ARCHIVE_VERSION = 1
+
+# zstd level for .tar.zst archives; 3 is zstd's default trade-off
+ZSTD_LEVEL = 3
+
+# Rows inserted per executemany when loading a member
+LOAD_ROWS = 1000
+
+_HASH_CHUNK = 1 << 20
+
+
+def archive_kind(path: str) -> str:
+    """'zip' or 'tar.zst' from the archive's file name"""
+    name = path.lower()
+    if name.endswith('.zip'):
+        return 'zip'
+    if name.endswith(('.tar.zst', '.tzst')):
+        return 'tar.zst'
+    raise ValueError(f"Unsupported backup archive: {os.path.basename(path)} (use .zip or .tar.zst)")
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("The 'zstandard' package is required for .tar.zst backups; "
+                          "install it or save the backup as .zip")
+    return zstandard
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _domains(names: Optional[Iterable[str]]) -> List[str]:
+    names = list(DOMAINS) if names is None else list(names)
+    unknown = [name for name in names if name not in DOMAINS]
+    if unknown:
+        raise ValueError(f"Unknown backup domains: {', '.join(unknown)}")
+    return names
+
+
+def export_domain(snapshot_path: str, domain: str, staging_dir: str,
+                  compress: bool) -> List[Dict[str, Any]]:
+    """
+    Export the tables of one domain to NDJSON files; runs in pool workers as well as in-process
+
+    Returns:
+        Manifest entry of each table written (tables missing from the database are skipped)
+    """
+    uri = f"file:{snapshot_path}?mode=ro&immutable=1"
+    entries = []
+    with closing(sqlite3.connect(uri, uri=True)) as conn:
+        schemas = dict(conn.execute(
+            f"SELECT name, sql FROM sqlite_master WHERE type = 'table' "
+            f"AND name IN ({','.join('?' * len(DOMAINS[domain]))})", DOMAINS[domain]))
+        for table in DOMAINS[domain]:
+            if table not in schemas:
+                continue
+            name = f"{domain}/{table}.ndjson" + ('.gz' if compress else '')
+            path = os.path.join(staging_dir, name.replace('/', '__'))
+            rows = export_query(conn, f'SELECT * FROM "{table}"', path, 'ndjson', compress=compress)
+            entries.append({
+                'name': name,
+                'domain': domain,
+                'table': table,
+                'rows': rows,
+                'bytes': os.path.getsize(path),
+                'sha256': _sha256(path),
+                'schema': schemas[table],
+                'staged': path,
+            })
+    return entries
+
+
+class _ArchiveWriter:
+    """Appends staged files to a zip or tar.zst container"""
+
+    def __init__(self, path: str, kind: str):
+        self.kind = kind
+        if kind == 'zip':
+            self._zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED, allowZip64=True)
+        else:
+            self._raw = open(path, 'wb')
+            self._zstd = _zstandard().ZstdCompressor(level=ZSTD_LEVEL, threads=-1).stream_writer(self._raw)
+            self._tar = tarfile.open(fileobj=self._zstd, mode='w|')
+
+    def add_file(self, path: str, name: str):
+        if self.kind == 'zip':
+            self._zip.write(path, name)
+        else:
+            self._tar.add(path, name, recursive=False)
+
+    def add_bytes(self, data: bytes, name: str):
+        if self.kind == 'zip':
+            self._zip.writestr(name, data, zipfile.ZIP_DEFLATED)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(datetime.now().timestamp())
+            self._tar.addfile(info, fileobj=_BytesReader(data))
+
+    def close(self):
+        if self.kind == 'zip':
+            self._zip.close()
+        else:
+            self._tar.close()
+            self._zstd.close()
+            self._raw.close()
+
+
+class _BytesReader:
+    """Minimal file object over bytes for tarfile.addfile"""
+
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._data) if size < 0 else self._pos + size
+        chunk = self._data[self._pos:end].tobytes()
+        self._pos += len(chunk)
+        return chunk
+
+
+def write_archive(conn: sqlite3.Connection, path: str, domains: Optional[Iterable[str]] = None,
+                  workers: Optional[int] = None,
+                  progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Back up data domains into one archive
+
+    Args:
+        conn: Connection to the database to back up; only read
+        path: Archive to create, ending in .zip or .tar.zst
+        domains: Domain names from DOMAINS (all of them if omitted)
+        workers: Worker processes (one per domain, up to the CPU count, if omitted);
+            1 exports in-process
+        progress: Called with (domains done, domains to do)
+
+    Returns:
+        The manifest written into the archive
+    """
+    kind = archive_kind(path)
+    if kind == 'tar.zst':
+        _zstandard()
+    names = _domains(domains)
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    compress = kind == 'zip'
+    manifest = {
+        'format': ARCHIVE_FORMAT,
+        'version': ARCHIVE_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'schema_version': conn.execute("PRAGMA user_version").fetchone()[0],
+        'members': [],
+    }
+    done = 0
+    if progress:
+        progress(done, len(names))
+
+    with tempfile.TemporaryDirectory(prefix='celiacshield-backup-') as staging:
+        snapshot = os.path.join(staging, 'snapshot.db')
+        with closing(sqlite3.connect(snapshot)) as target:
+            conn.backup(target)
+
+        writer = _ArchiveWriter(path + '.partial', kind)
+        try:
+            if workers > 1:
+                with ProcessPoolExecutor(workers, mp_context=get_context('spawn')) as pool:
+                    futures = [pool.submit(export_domain, snapshot, name, staging, compress) for name in names]
+                    # Members go into the archive in completion order while other domains still export
+                    for future in as_completed(futures):
+                        done += 1
+                        _add_members(writer, manifest, future.result())
+                        if progress:
+                            progress(done, len(names))
+            else:
+                for name in names:
+                    done += 1
+                    _add_members(writer, manifest, export_domain(snapshot, name, staging, compress))
+                    if progress:
+                        progress(done, len(names))
+            manifest['members'].sort(key=lambda entry: (names.index(entry['domain']),
+                                                        DOMAINS[entry['domain']].index(entry['table'])))
+            writer.add_bytes(json.dumps(manifest, indent=2).encode('utf-8'), MANIFEST)
+        except BaseException:
+            writer.close()
+            os.remove(path + '.partial')
+            raise
+        writer.close()
+    os.replace(path + '.partial', path)
+    return manifest
+
+
+def _add_members(writer: _ArchiveWriter, manifest: Dict[str, Any], entries: List[Dict[str, Any]]):
+    for entry in entries:
+        staged = entry.pop('staged')
+        writer.add_file(staged, entry['name'])
+        os.remove(staged)
+        manifest['members'].append(entry)
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """The manifest of a backup archive"""
+    if archive_kind(path) == 'zip':
+        with zipfile.ZipFile(path) as archive:
+            return _check_manifest(json.loads(archive.read(MANIFEST)))
+    with _open_tar(path) as archive:
+        # The manifest is the last member of a tar archive
+        for member in archive:
+            if member.name == MANIFEST:
+                return _check_manifest(json.loads(archive.extractfile(member).read()))
+    raise ValueError("Backup archive has no manifest")
+
+
+def _check_manifest(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    if manifest.get('format') != ARCHIVE_FORMAT:
+        raise ValueError("Not a CeliacShield backup archive")
+    if manifest.get('version', 0) > ARCHIVE_VERSION:
+        raise ValueError("Backup archive was written by a newer version of CeliacShield")
+    return manifest
+
+
+def _open_tar(path: str) -> tarfile.TarFile:
+    raw = open(path, 'rb')
+    reader = _zstandard().ZstdDecompressor().stream_reader(raw, closefd=True)
+    return tarfile.open(fileobj=reader, mode='r|')
+
+
+class _HashingReader(io.RawIOBase):
+    """Passes reads through while hashing the bytes read"""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._raw.readinto(buffer)
+        self.digest.update(memoryview(buffer)[:count])
+        return count
+
+
+def load_domain(source: str, members: List[Dict[str, Any]], staging_path: str) -> Dict[str, int]:
+    """
+    Verify and load the members of one domain into a staging database; runs in
+    pool workers as well as in-process
+
+    Args:
+        source: A .zip archive, or the directory a .tar.zst archive was unpacked into
+        members: Manifest entries of the domain's tables
+        staging_path: SQLite file to create
+
+    Returns:
+        Rows loaded per table
+    """
+    counts = {}
+    archive = zipfile.ZipFile(source) if os.path.isfile(source) else None
+    try:
+        with closing(sqlite3.connect(staging_path)) as conn:
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            for entry in members:
+                if archive is not None:
+                    raw = archive.open(entry['name'])
+                else:
+                    raw = open(os.path.join(source, entry['name']), 'rb')
+                with raw:
+                    hashed = _HashingReader(raw)
+                    stream = gzip.GzipFile(fileobj=hashed) if entry['name'].endswith('.gz') \
+                        else io.BufferedReader(hashed)
+                    counts[entry['table']] = _load_rows(conn, entry, io.TextIOWrapper(stream, encoding='utf-8'))
+                    while hashed.read(_HASH_CHUNK):
+                        pass
+                if hashed.digest.hexdigest() != entry['sha256']:
+                    raise ValueError(f"Checksum mismatch in {entry['name']}; the backup is damaged")
+            conn.commit()
+    finally:
+        if archive is not None:
+            archive.close()
+    return counts
+
+
+def _load_rows(conn: sqlite3.Connection, entry: Dict[str, Any], lines: Iterable[str]) -> int:
+    conn.execute(entry['schema'])
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{entry["table"]}")')]
+    names = ", ".join('"%s"' % column for column in columns)
+    marks = ", ".join("?" * len(columns))
+    sql = f'INSERT INTO "{entry["table"]}" ({names}) VALUES ({marks})'
+    count = 0
+    block = []
+    for line in lines:
+        if line.strip():
+            row = json.loads(line)
+            block.append([row.get(column) for column in columns])
+        if len(block) >= LOAD_ROWS:
+            conn.executemany(sql, block)
+            count += len(block)
+            block = []
+    conn.executemany(sql, block)
+    count += len(block)
+    if count != entry['rows']:
+        raise ValueError(f"{entry['name']} has {count} rows, the manifest lists {entry['rows']}")
+    return count
+
+
+def restore_archive(conn: sqlite3.Connection, path: str, domains: Optional[Iterable[str]] = None,
+                    workers: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+    """
+    Replace data domains with the contents of a backup archive
+
+    Every member is checked against its manifest checksum before anything is
+    written; the tables are then replaced in a single transaction.
+
+    Args:
+        conn: Connection to the database to restore into; must have the current schema
+        path: Archive written by write_archive
+        domains: Domains to restore (every domain in the archive if omitted)
+        workers: Worker processes for verifying and loading (one per domain if omitted)
+        progress: Called with (domains done, domains to do); the final step is the write
+
+    Returns:
+        Rows restored per table
+    """
+    kind = archive_kind(path)
+    requested = _domains(domains)
+    with tempfile.TemporaryDirectory(prefix='celiacshield-restore-') as staging:
+        source = os.path.abspath(path)
+        if kind == 'zip':
+            manifest = read_manifest(path)
+        else:
+            # A tar stream can only be read front to back, so unpack it once
+            source = os.path.join(staging, 'archive')
+            with _open_tar(path) as archive:
+                archive.extractall(source, filter='data')
+            with open(os.path.join(source, MANIFEST), encoding='utf-8') as f:
+                manifest = _check_manifest(json.load(f))
+        by_domain: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in manifest['members']:
+            by_domain.setdefault(entry['domain'], []).append(entry)
+        names = [name for name in requested if name in by_domain]
+        workers = workers or min(len(names), os.cpu_count() or 1)
+        total = len(names) + 1
+        done = 0
+        if progress:
+            progress(done, total)
+
+        staged = {name: os.path.join(staging, f"{name}.db") for name in names}
+        counts: Dict[str, int] = {}
+        if workers > 1 and len(names) > 1:
+            with ProcessPoolExecutor(workers, mp_context=get_context('spawn')) as pool:
+                futures = [pool.submit(load_domain, source, by_domain[name], staged[name]) for name in names]
+                for future in as_completed(futures):
+                    counts.update(future.result())
+                    done += 1
+                    if progress:
+                        progress(done, total)
+        else:
+            for name in names:
+                counts.update(load_domain(source, by_domain[name], staged[name]))
+                done += 1
+                if progress:
+                    progress(done, total)
+
+        _replace_tables(conn, [(name, staged[name], by_domain[name]) for name in names])
+    if progress:
+        progress(total, total)
+    return counts
+
+
+def _replace_tables(conn: sqlite3.Connection, domains: List[tuple]):
+    """Copy staged tables over the live ones in one transaction"""
+    conn.commit()
+    aliases = []
+    try:
+        # ATTACH is not allowed inside a transaction
+        for i, (_, staging_path, _) in enumerate(domains):
+            conn.execute(f"ATTACH DATABASE ? AS restore_{i}", (staging_path,))
+            aliases.append(f"restore_{i}")
+        with conn:
+            # Children first, so foreign keys never point at a deleted parent
+            for _, _, entries in domains:
+                for entry in reversed(entries):
+                    conn.execute(f'DELETE FROM main."{entry["table"]}"')
+            for alias, (_, _, entries) in zip(aliases, domains):
+                for entry in entries:
+                    table = entry['table']
+                    # Columns added or dropped since the backup are left to their defaults
+                    live = {row[1] for row in conn.execute(f'PRAGMA main.table_info("{table}")')}
+                    columns = ", ".join(f'"{row[1]}"' for row in
+                                        conn.execute(f'PRAGMA {alias}.table_info("{table}")')
+                                        if row[1] in live)
+                    conn.execute(f'INSERT INTO main."{table}" ({columns}) '
+                                 f'SELECT {columns} FROM {alias}."{table}"')
+    finally:
+        for alias in aliases:
+            conn.execute(f"DETACH DATABASE {alias}")
@@ -0,0 +1,206 @@
+# path: services/calendar_event_index.py
+"""
+Calendar Event Index for fast month, week and year views
+
+Loads per-day event counts and title summaries for whole months with a
+single range query on calendar_events (served by idx_cal_date), caches them
+per month and prefetches the neighbouring months so navigation does not
+touch the database. The cache is dropped whenever the calendar_events data
+version changes, so writes from any connection are picked up.
+"""
+
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from utils.data_versions import get_versions
+
+_TITLE_SEPARATOR = "\x1f"
+
+
+@dataclass
+class DaySummary:
+    """Events scheduled on one day"""
+    date: str
+    count: int = 0
+    titles: List[str] = field(default_factory=list)
+
+
+def _month_start(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}-01"
+
+
+def _shift_month(year: int, month: int, delta: int) -> Tuple[int, int]:
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+class CalendarEventIndex:
+    """Per-month cache of calendar event summaries"""
+
+    def __init__(self, connection: Optional[sqlite3.Connection] = None,
+                 max_months: int = 36, max_titles: int = 3):
+        """
+        Initialize the index
+
+        Args:
+            connection: Database connection; opened on first use if omitted
+            max_months: Number of months kept in the cache
+            max_titles: Event titles kept per day for tooltips
+        """
+        self._conn = connection
+        self.max_months = max_months
+        self.max_titles = max_titles
+        self._months: "OrderedDict[Tuple[int, int], Dict[int, DaySummary]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self.query_count = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            from utils.db import get_connection
+            self._conn = get_connection()
+        return self._conn
+
+    def month(self, year: int, month: int, prefetch: bool = True) -> Dict[int, DaySummary]:
+        """
+        Get event summaries for a month
+
+        Args:
+            year: Calendar year
+            month: Month number (1-12)
+            prefetch: Also load the previous and next month in the same query
+
+        Returns:
+            Dict mapping day of month to its DaySummary; days without events are omitted
+        """
+        self._check_version()
+        key = (year, month)
+        if key not in self._months:
+            wanted = [key]
+            if prefetch:
+                wanted = [_shift_month(year, month, -1), key, _shift_month(year, month, 1)]
+            self._load_months([m for m in wanted if m not in self._months])
+        self._months.move_to_end(key)
+        return self._months[key]
+
+    def day_summaries(self, start: date, end: date) -> Dict[str, DaySummary]:
+        """
+        Get event summaries for an inclusive date range, e.g. a week
+
+        Returns:
+            Dict mapping ISO date to DaySummary for days with events
+        """
+        self._check_version()
+        months = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            months.append((year, month))
+            year, month = _shift_month(year, month, 1)
+        self._load_months([m for m in months if m not in self._months])
+
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        result = {}
+        for key in months:
+            for summary in self._months[key].values():
+                if start_iso <= summary.date <= end_iso:
+                    result[summary.date] = summary
+        return result
+
+    def year_counts(self, year: int) -> Dict[int, int]:
+        """
+        Get the number of events per month for a year
+
+        Returns:
+            Dict mapping month number to event count for months with events
+        """
+        self._check_version()
+        self._load_months([(year, m) for m in range(1, 13) if (year, m) not in self._months])
+        counts = {}
+        for month in range(1, 13):
+            days = self._months.get((year, month), {})
+            total = sum(s.count for s in days.values())
+            if total:
+                counts[month] = total
+        return counts
+
+    def events_between(self, start: str, end: str) -> List[Dict]:
+        """
+        Get full event rows for an inclusive ISO date range, ordered by date and time
+        """
+        end_exclusive = (date.fromisoformat(end) + timedelta(days=1)).isoformat()
+        cursor = self.conn.execute(
+            """
+            SELECT id, name, date, time, event_type, priority, description, reminder
+            FROM calendar_events
+            WHERE date >= ? AND date < ?
+            ORDER BY date, time
+            """,
+            (start, end_exclusive),
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def invalidate(self):
+        """Drop all cached months"""
+        self._months.clear()
+        self._version = None
+
+    def _check_version(self):
+        """Drop the cache if calendar_events changed since it was filled"""
+        version = get_versions(self.conn, ["calendar_events"]).get("calendar_events")
+        if version is None or version != self._version:
+            self._months.clear()
+            self._version = version
+
+    def _load_months(self, months: List[Tuple[int, int]]):
+        """Load the given months with one range query over their span"""
+        if not months:
+            return
+        months = sorted(months)
+        first, last = months[0], _shift_month(*months[-1], 1)
+        loaded: Dict[Tuple[int, int], Dict[int, DaySummary]] = {m: {} for m in months}
+
+        cursor = self.conn.execute(
+            f"""
+            SELECT date, COUNT(*), GROUP_CONCAT(name, '{_TITLE_SEPARATOR}')
+            FROM calendar_events
+            WHERE date >= ? AND date < ?
+            GROUP BY date
+            """,
+            (_month_start(*first), _month_start(*last)),
+        )
+        self.query_count += 1
+        for raw_date, count, titles in cursor.fetchall():
+            iso = str(raw_date)[:10]
+            try:
+                day_date = date.fromisoformat(iso)
+            except ValueError:
+                continue
+            days = loaded.get((day_date.year, day_date.month))
+            if days is None:
+                continue
+            summary = days.setdefault(day_date.day, DaySummary(iso))
+            summary.count += count
+            if titles:
+                remaining = self.max_titles - len(summary.titles)
+                summary.titles.extend(titles.split(_TITLE_SEPARATOR)[:max(remaining, 0)])
+
+        for key, days in loaded.items():
+            self._months[key] = days
+        while len(self._months) > self.max_months:
+            self._months.popitem(last=False)
+
+
+def get_calendar_event_index() -> CalendarEventIndex:
+    """Get singleton calendar event index instance"""
+    global _calendar_event_index
+    if _calendar_event_index is None:
+        _calendar_event_index = CalendarEventIndex()
+    return _calendar_event_index
+
+
+# Global index instance
+_calendar_event_index = None
@@ -16,6 +16,7 @@ from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import QMessageBox
 
 from utils.db import get_connection
+from utils.data_versions import ensure_version_tracking
 from services.mobile_sync import CareProviderData
 
 
@@ -75,6 +76,9 @@ class CareProviderService(QObject):
                 ON care_providers(emergency_contact)
             """)
             
+            # Let the health log panel skip reloads when providers are unchanged
+            ensure_version_tracking(self.conn, ["care_providers"])
+            
             self.conn.commit()
             
         except Exception as e:
@@ -11,50 +11,45 @@ import os
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Union
 from PySide6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
-from PySide6.QtCore import QThread, Signal, QObject
 import pandas as pd
 
+from services.background_jobs import EXPORT, JobContext, get_job_manager
 
-class ExportWorker(QObject):
-    """Worker thread for export operations"""
-    
-    progress = Signal(int)
-    finished = Signal(bool, str)
-    status = Signal(str)
+
+class ExportWorker:
+    """Export operation run as a background job"""
     
     def __init__(self, export_type: str, data: Any, file_path: str, options: Dict[str, Any] = None):
-        super().__init__()
         self.export_type = export_type
         self.data = data
         self.file_path = file_path
         self.options = options or {}
+        self.context = None
     
-    def run(self):
-        """Run export operation"""
-        try:
-            self.status.emit(f"Starting {self.export_type} export...")
-            
-            if self.export_type == "csv":
-                self.export_csv()
-            elif self.export_type == "json":
-                self.export_json()
-            elif self.export_type == "excel":
-                self.export_excel()
-            elif self.export_type == "pdf":
-                self.export_pdf()
-            elif self.export_type == "html":
-                self.export_html()
-            else:
-                raise ValueError(f"Unsupported export type: {self.export_type}")
-            
-            self.finished.emit(True, "Export completed successfully!")
-            
-        except Exception as e:
-            self.finished.emit(False, f"Export failed: {str(e)}")
+    def run(self, context: JobContext) -> str:
+        """Run export operation on a job thread"""
+        self.context = context
+        context.status(f"Starting {self.export_type} export...")
+        context.check()
+        
+        if self.export_type == "csv":
+            self.export_csv()
+        elif self.export_type == "json":
+            self.export_json()
+        elif self.export_type == "excel":
+            self.export_excel()
+        elif self.export_type == "pdf":
+            self.export_pdf()
+        elif self.export_type == "html":
+            self.export_html()
+        else:
+            raise ValueError(f"Unsupported export type: {self.export_type}")
+        
+        return "Export completed successfully!"
     
     def export_csv(self):
         """Export data to CSV"""
-        self.status.emit("Writing CSV file...")
+        self.context.status("Writing CSV file...")
         
         if isinstance(self.data, list) and len(self.data) > 0:
             # Determine if it's a list of dictionaries or list of lists
@@ -70,20 +65,20 @@ class ExportWorker(QObject):
         else:
             raise ValueError("Invalid data format for CSV export")
         
-        self.progress.emit(100)
+        self.context.progress(100)
     
     def export_json(self):
         """Export data to JSON"""
-        self.status.emit("Writing JSON file...")
+        self.context.status("Writing JSON file...")
         
         with open(self.file_path, 'w', encoding='utf-8') as jsonfile:
             json.dump(self.data, jsonfile, indent=2, ensure_ascii=False, default=str)
         
-        self.progress.emit(100)
+        self.context.progress(100)
     
     def export_excel(self):
         """Export data to Excel"""
-        self.status.emit("Writing Excel file...")
+        self.context.status("Writing Excel file...")
         
         if isinstance(self.data, dict):
             # Multiple sheets
@@ -104,11 +99,11 @@ class ExportWorker(QObject):
                     df = pd.DataFrame(self.data)
                 df.to_excel(self.file_path, index=False)
         
-        self.progress.emit(100)
+        self.context.progress(100)
     
     def export_pdf(self):
         """Export data to PDF"""
-        self.status.emit("Generating PDF...")
+        self.context.status("Generating PDF...")
         
         try:
             from reportlab.lib.pagesizes import letter, A4
@@ -179,11 +174,11 @@ class ExportWorker(QObject):
         except ImportError:
             raise ImportError("ReportLab is required for PDF export. Install with: pip install reportlab")
         
-        self.progress.emit(100)
+        self.context.progress(100)
     
     def export_html(self):
         """Export data to HTML"""
-        self.status.emit("Generating HTML...")
+        self.context.status("Generating HTML...")
         
         html_content = f"""
         <!DOCTYPE html>
@@ -241,7 +236,7 @@ class ExportWorker(QObject):
         with open(self.file_path, 'w', encoding='utf-8') as htmlfile:
             htmlfile.write(html_content)
         
-        self.progress.emit(100)
+        self.context.progress(100)
 
 
 class ExportService:
@@ -258,39 +253,33 @@ class ExportService:
     
     def export_data(self, parent_widget, data: Any, export_type: str, 
                    title: str = "Data Export", filename: str = None) -> bool:
-        """Export data to specified format"""
+        """
+        Export data to specified format as a background job
+
+        Returns:
+            True if the export was started; its outcome is shown when it finishes
+        """
         try:
             # Get file path
             file_path = self._get_export_path(parent_widget, export_type, filename)
             if not file_path:
                 return False
             
-            # Create and run export worker
             worker = ExportWorker(export_type, data, file_path, {'title': title})
+            job = get_job_manager().submit(EXPORT, worker.run, title=title)
             
-            # Show progress dialog
+            # Show progress dialog; cancelling it cancels the job
             progress_dialog = QProgressDialog(f"Exporting {export_type.upper()}...", "Cancel", 0, 100, parent_widget)
             progress_dialog.setWindowTitle("Export Progress")
             progress_dialog.setModal(True)
-            progress_dialog.show()
+            progress_dialog.canceled.connect(job.cancel)
             
             # Connect signals
-            worker.progress.connect(progress_dialog.setValue)
-            worker.status.connect(progress_dialog.setLabelText)
-            worker.finished.connect(lambda success, message: self._handle_export_finished(progress_dialog, success, message))
-            
-            # Start worker thread
-            thread = QThread()
-            worker.moveToThread(thread)
-            thread.started.connect(worker.run)
-            thread.start()
-            
-            # Wait for completion
-            while thread.isRunning():
-                QApplication.processEvents()
-            
-            thread.wait()
-            thread.deleteLater()
+            job.progress.connect(lambda done, total, message: self._update_progress(progress_dialog, done, total, message))
+            job.finished.connect(lambda message: self._handle_export_finished(progress_dialog, True, message))
+            job.failed.connect(lambda error: self._handle_export_finished(progress_dialog, False, f"Export failed: {error}"))
+            job.cancelled.connect(lambda _result: progress_dialog.close())
+            progress_dialog.show()
             
             return True
             
@@ -310,6 +299,13 @@ class ExportService:
         
         return file_path if file_path else None
     
+    def _update_progress(self, progress_dialog, done: int, total: int, message: str):
+        """Show a job's progress in its dialog"""
+        progress_dialog.setMaximum(max(total, 1))
+        progress_dialog.setValue(done)
+        if message:
+            progress_dialog.setLabelText(message)
+    
     def _handle_export_finished(self, progress_dialog, success: bool, message: str):
         """Handle export completion"""
         progress_dialog.close()
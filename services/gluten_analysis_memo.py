@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Memoized gluten analysis
+
+Ingredient strings such as "wheat flour" or "soy sauce" recur across pantry
+items, recipes, UPC scans and menus. GlutenAnalysisMemo remembers the lexicon
+hits for every text it has classified: an in-process LRU keyed by the raw
+text answers repeats without touching the matcher, and a SQLite memo table
+keyed by a hash of the normalized text keeps the hits across runs. The
+normalized text keeps the list separators the lexicon splits on, so
+"rice, flour" and "rice flour" are different texts.
+
+Rows are stored with the analysis version they were computed with (the memo
+format and the lexicon version); rows from any other version are purged
+when the memo is opened, so editing the term lists invalidates the memo
+automatically.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from services.gluten_lexicon import GlutenLexicon, Hit, LexiconMatch, get_gluten_lexicon, split_segments
+from utils.term_matcher import tokenize
+
+ENV_VAR = "CELIAC_CACHE_DB"
+
+# Bump when normalize_text or the stored hits change meaning
+MEMO_VERSION = 2
+
+_MemoEntry = Tuple[FrozenSet[Hit], LexiconMatch]
+
+
+def _default_path() -> Path:
+    return Path(os.getenv(ENV_VAR) or Path(__file__).resolve().parents[1] / "data" / "cache.db")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text the way the matcher sees it: lowercase words joined by
+    spaces within each list segment, segments joined by ", "
+    """
+    segments = (" ".join(tokenize(segment)) for segment in split_segments(text))
+    return ", ".join(segment for segment in segments if segment)
+
+
+def analysis_version(lexicon: Optional[GlutenLexicon] = None) -> str:
+    """Version of memoized analyses: the memo format and the lexicon version"""
+    return f"{MEMO_VERSION}.{(lexicon or get_gluten_lexicon()).version}"
+
+
+def text_key(normalized: str) -> str:
+    """Memo key for normalized text"""
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class GlutenAnalysisMemo:
+    """LRU plus SQLite memo of lexicon classifications"""
+
+    def __init__(self, lexicon: Optional[GlutenLexicon] = None,
+                 db_path: Optional[str] = None, max_entries: int = 8192,
+                 flush_every: int = 256):
+        """
+        Initialize the memo
+
+        Args:
+            lexicon: Lexicon to classify with (the shared one if omitted)
+            db_path: SQLite file for the memo table, ":memory:" for a
+                process-local memo, or None for data/cache.db
+            max_entries: Texts kept in the in-process LRU
+            flush_every: New results buffered before they are written
+        """
+        self.lexicon = lexicon or get_gluten_lexicon()
+        self.version = analysis_version(self.lexicon)
+        self.db_path = str(db_path or _default_path())
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self._lru: "OrderedDict[str, _MemoEntry]" = OrderedDict()
+        self._pending: Dict[str, FrozenSet[Hit]] = {}
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._persistent = True
+        self.stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0}
+
+    def classify(self, *texts: Optional[str]) -> LexiconMatch:
+        """
+        Classify texts like GlutenLexicon.classify, reusing earlier results
+
+        The returned LexiconMatch may be shared between callers and must not
+        be modified.
+        """
+        texts = [text for text in texts if text]
+        if len(texts) == 1:
+            return self._entry(texts[0])[1]
+        hits = set()
+        for text in texts:
+            hits.update(self._entry(text)[0])
+        return self.lexicon.build_match(hits)
+
+    def flush(self):
+        """Write buffered results to the memo table"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO gluten_analysis_memo(text_hash, lexicon_version, hits) "
+                        "VALUES (?, ?, ?)",
+                        [(key, self.version, json.dumps(sorted(hits, key=_hit_order)))
+                         for key, hits in pending.items()],
+                    )
+            except sqlite3.Error as e:
+                print(f"Error writing gluten analysis memo: {e}")
+
+    def clear(self):
+        """Forget all results, in memory and on disk"""
+        with self._lock:
+            self._lru.clear()
+            self._pending.clear()
+            conn = self._connection()
+            if conn is not None:
+                with conn:
+                    conn.execute("DELETE FROM gluten_analysis_memo")
+
+    def close(self):
+        """Flush and close the memo table"""
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _entry(self, text: str) -> _MemoEntry:
+        """Get hits and match for one text from the LRU, the memo table or the matcher"""
+        with self._lock:
+            entry = self._lru.get(text)
+            if entry is not None:
+                self._lru.move_to_end(text)
+                self.stats['memory_hits'] += 1
+                return entry
+
+            normalized = normalize_text(text)
+            key = text_key(normalized)
+            hits = self._pending.get(key)
+            if hits is None:
+                hits = self._load(key)
+            if hits is not None:
+                self.stats['db_hits'] += 1
+            else:
+                hits = self.lexicon.scan(normalized)
+                self.stats['misses'] += 1
+                self._pending[key] = hits
+                if len(self._pending) >= self.flush_every:
+                    self.flush()
+
+            entry = (hits, self.lexicon.build_match(hits))
+            self._lru[text] = entry
+            if len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+            return entry
+
+    def _load(self, key: str) -> Optional[FrozenSet[Hit]]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT hits FROM gluten_analysis_memo WHERE text_hash = ? AND lexicon_version = ?",
+                (key, self.version),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        return frozenset(tuple(hit) for hit in json.loads(row[0]))
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the memo table on first use, purging rows of other lexicon versions"""
+        if self._conn is None and self._persistent:
+            try:
+                if self.db_path != ":memory:":
+                    Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                with conn:
+                    conn.execute("""
+                        CREATE TABLE IF NOT EXISTS gluten_analysis_memo (
+                            text_hash TEXT NOT NULL,
+                            lexicon_version TEXT NOT NULL,
+                            hits TEXT NOT NULL,
+                            PRIMARY KEY (text_hash, lexicon_version)
+                        ) WITHOUT ROWID
+                    """)
+                    conn.execute(
+                        "DELETE FROM gluten_analysis_memo WHERE lexicon_version != ?",
+                        (self.version,),
+                    )
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                print(f"Gluten analysis memo unavailable, using memory only: {e}")
+                self._persistent = False
+        return self._conn
+
+
+def _hit_order(hit: Hit) -> Tuple[str, int]:
+    return hit[0], hit[1]
+
+
+def get_gluten_analysis_memo() -> GlutenAnalysisMemo:
+    """Get global gluten analysis memo, flushed at interpreter exit"""
+    global _gluten_analysis_memo
+    if _gluten_analysis_memo is None:
+        _gluten_analysis_memo = GlutenAnalysisMemo()
+        atexit.register(_gluten_analysis_memo.close)
+    return _gluten_analysis_memo
+
+
+def reset_gluten_analysis_memo():
+    """Close the global memo; the next get_gluten_analysis_memo() reopens it from CELIAC_CACHE_DB"""
+    global _gluten_analysis_memo
+    if _gluten_analysis_memo is not None:
+        atexit.unregister(_gluten_analysis_memo.close)
+        _gluten_analysis_memo.close()
+        _gluten_analysis_memo = None
+
+
+# Global memo instance
+_gluten_analysis_memo = None
@@ -8,11 +8,17 @@ Analyzes recipe ingredients and suggests gluten-free alternatives.
 from typing import Dict, List, Any, Optional
 import re
 
+from services.gluten_lexicon import get_gluten_lexicon
+from utils.term_matcher import tokenize
+
 
 class GlutenFreeConverter:
     """Service to convert recipes to gluten-free alternatives"""
     
     def __init__(self):
+        self.lexicon = get_gluten_lexicon()
+        
+        # Replacements for gluten terms; detection uses the shared lexicon
         self.gluten_ingredients = {
             # Wheat-based ingredients
             'wheat flour': 'gluten-free flour blend',
@@ -32,6 +38,7 @@ class GlutenFreeConverter:
             'pearl barley': 'quinoa or rice',
             'barley malt': 'rice malt or maple syrup',
             'malt extract': 'rice malt or maple syrup',
+            'malt': 'rice malt or maple syrup',
             'malt vinegar': 'apple cider vinegar',
             
             # Rye-based ingredients
@@ -64,6 +71,9 @@ class GlutenFreeConverter:
             'ale': 'gluten-free beer',
             'lager': 'gluten-free beer',
             'stout': 'gluten-free beer',
+            'oats': 'certified gluten-free oats',
+            'bread': 'gluten-free bread',
+            'pasta': 'gluten-free pasta',
         }
         
         self.gluten_free_flours = [
@@ -132,13 +142,22 @@ class GlutenFreeConverter:
         if ingredient_name in self.gluten_ingredients:
             return self.gluten_ingredients[ingredient_name]
         
-        # Partial match for compound ingredients
-        for gluten_ingredient, replacement in self.gluten_ingredients.items():
-            if gluten_ingredient in ingredient_name:
-                return replacement
+        match = self.lexicon.classify(ingredient_name)
+        gluten_terms = match.gluten_terms
+        if gluten_terms:
+            # Most specific gluten term with a known replacement
+            for term in sorted(gluten_terms, key=len, reverse=True):
+                if term in self.gluten_ingredients:
+                    return self.gluten_ingredients[term]
+            term = max(gluten_terms, key=len)
+            if 'flour' in term:
+                return 'gluten-free flour blend'
+            if self.lexicon.source_of(term):
+                return 'quinoa or rice'
+            return f"gluten-free {term}"
         
         # Check for flour patterns
-        if 'flour' in ingredient_name and not any(gf in ingredient_name for gf in self.gluten_free_flours):
+        if 'flour' in tokenize(ingredient_name) and not match.safe:
             return 'gluten-free flour blend'
         
         return None
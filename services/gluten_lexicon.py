@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Shared gluten lexicon for every risk-scoring service
+
+Holds the one vocabulary of gluten sources, hidden gluten terms, safe
+ingredients, gluten-free claims and cross-contamination phrases, compiles it
+once per process into a TermMatcher and exposes a single classify() call.
+GlutenRiskAnalyzer, UPCScanner, HealthPatternAnalyzer, IngredientCorrelator
+and GlutenFreeConverter all classify text through it, so they agree on what
+counts as gluten.
+
+Bump LEXICON_VERSION when the meaning of the terms changes; the content hash
+in GlutenLexicon.version changes with any edit to the lists.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from utils.term_matcher import TermMatcher, tokenize
+
+LEXICON_VERSION = 3
+
+# Raw matcher hit: (category, order within category, term, grain or None)
+Hit = Tuple[str, int, str, Optional[str]]
+
+# Severity levels for gluten terms
+LOW = 1
+MEDIUM = 2
+HIGH = 3
+
+# Definite gluten sources by grain; oats are MEDIUM (often cross-contaminated)
+GLUTEN_SOURCES: Dict[str, List[str]] = {
+    'wheat': [
+        'wheat', 'wheat flour', 'wheat starch', 'wheat protein', 'wheat bran',
+        'wheat germ', 'wheat berries', 'durum wheat', 'hard wheat', 'soft wheat',
+        'wheat gluten', 'vital wheat gluten', 'wheat malt', 'wheat dextrin',
+        'wheat fiber', 'wheat grass', 'wheat grass juice', 'wheat grass powder',
+        'whole wheat flour', 'hydrolyzed wheat protein', 'all-purpose flour',
+        'bread flour', 'cake flour', 'pastry flour', 'enriched flour', 'graham flour',
+        'semolina', 'durum', 'farina', 'einkorn', 'seitan', 'breadcrumbs', 'panko',
+        'flour'
+    ],
+    'rye': [
+        'rye', 'rye flour', 'rye bread', 'rye meal', 'rye malt', 'rye starch'
+    ],
+    'barley': [
+        'barley', 'barley flour', 'barley malt', 'barley extract', 'barley starch',
+        'barley protein', 'pearl barley', 'malt', 'malt extract', 'malt syrup',
+        'malt flavoring', 'malt vinegar', 'maltodextrin', 'barley grass',
+        'barley grass juice', "brewer's yeast", 'beer', 'lager', 'stout',
+        'pale ale', 'india pale ale', 'ipa', 'brown ale', 'amber ale', 'red ale',
+        'cream ale', 'blonde ale', 'golden ale', 'mild ale', 'scotch ale', 'barley wine'
+    ],
+    'oats': [
+        'oats', 'oat flour', 'oat bran', 'oat fiber', 'oat protein', 'oat starch',
+        'oat extract', 'oatmeal', 'rolled oats', 'steel cut oats', 'quick oats'
+    ],
+    'triticale': [
+        'triticale', 'triticale flour', 'triticale starch'
+    ],
+    'spelt': [
+        'spelt', 'spelt flour', 'spelt starch', 'spelt protein'
+    ],
+    'kamut': [
+        'kamut', 'kamut flour', 'kamut starch'
+    ],
+    'farro': [
+        'farro', 'farro flour', 'emmer', 'emmer flour'
+    ],
+    'bulgur': [
+        'bulgur', 'bulgur wheat', 'cracked wheat'
+    ],
+    'couscous': [
+        'couscous', 'pearl couscous', 'israeli couscous'
+    ],
+}
+
+SOURCE_SEVERITY: Dict[str, int] = {'oats': MEDIUM}
+
+# Bare terms that only count when no longer term ending on the same word
+# qualifies them: plain "flour" is wheat, "rice flour" is not
+QUALIFIABLE_TERMS: FrozenSet[str] = frozenset({'flour'})
+
+# Words that turn a following gluten-free claim into its opposite ("not gluten free")
+NEGATIONS: FrozenSet[str] = frozenset({'not', 'non', 'isn', 'isnt', 'never', 'nor'})
+NEGATION_WINDOW = 2  # words before a claim checked for a negation
+
+_SEGMENT_RE = re.compile(r'[,;()\[\]{}|\n\r]+')
+
+
+def split_segments(text: str) -> List[str]:
+    """Split text at the list separators no term spans (commas, semicolons, brackets, newlines)"""
+    return _SEGMENT_RE.split(text)
+
+# Ingredients that may hide gluten depending on how they were made
+HIDDEN_GLUTEN_TERMS: List[str] = [
+    'modified food starch', 'food starch', 'starch', 'modified starch',
+    'vegetable starch', 'corn starch', 'potato starch', 'tapioca starch',
+    'natural flavoring', 'artificial flavoring', 'flavoring', 'natural flavors',
+    'artificial flavors', 'spices', 'seasoning', 'seasonings', 'spice blend',
+    'hydrolyzed vegetable protein', 'hydrolyzed plant protein', 'hvp',
+    'textured vegetable protein', 'tvp', 'vegetable protein',
+    'caramel color', 'caramel coloring', 'caramel',
+    'dextrin', 'dextrose', 'glucose syrup', 'corn syrup',
+    'soy sauce', 'teriyaki sauce', 'worcestershire sauce',
+    'miso', 'tempeh', 'bread', 'pasta', 'imitation crab',
+    'baking powder', 'baking soda', 'yeast extract',
+    'mono and diglycerides', 'lecithin', 'lecithin (soy)',
+    'gum arabic', 'xanthan gum', 'guar gum', 'locust bean gum',
+    'vegetable oil', 'canola oil', 'soybean oil',
+    'rice vinegar', 'distilled vinegar', 'white vinegar',
+    'vanilla extract', 'vanilla flavoring',
+    'smoke flavoring', 'liquid smoke',
+    'broth', 'stock', 'bouillon', 'soup base',
+    'thickener', 'thickening agent', 'binding agent'
+]
+
+# Hidden terms that usually do contain gluten; the rest default to LOW
+HIDDEN_SEVERITY: Dict[str, int] = {
+    'soy sauce': HIGH, 'teriyaki sauce': HIGH,
+    'worcestershire sauce': MEDIUM, 'miso': MEDIUM, 'bread': MEDIUM, 'pasta': MEDIUM,
+    'imitation crab': MEDIUM, 'modified food starch': MEDIUM,
+    'hydrolyzed vegetable protein': MEDIUM, 'hydrolyzed plant protein': MEDIUM,
+    'hvp': MEDIUM, 'textured vegetable protein': MEDIUM, 'tvp': MEDIUM,
+}
+
+SAFE_INGREDIENTS: List[str] = [
+    'rice', 'rice flour', 'rice starch', 'rice bran',
+    'corn', 'corn flour', 'cornmeal', 'corn starch', 'corn syrup',
+    'potato', 'potato flour', 'potato starch', 'potato flakes',
+    'tapioca', 'tapioca flour', 'tapioca starch',
+    'quinoa', 'quinoa flour', 'quinoa flakes',
+    'buckwheat', 'buckwheat flour', 'buckwheat groats',
+    'amaranth', 'amaranth flour',
+    'millet', 'millet flour',
+    'sorghum', 'sorghum flour',
+    'teff', 'teff flour',
+    'arrowroot', 'arrowroot flour', 'arrowroot starch', 'arrowroot powder',
+    'cassava', 'cassava flour', 'yuca',
+    'coconut', 'coconut flour', 'coconut oil',
+    'almond', 'almond flour', 'almond meal',
+    'walnut', 'walnut flour',
+    'pecan', 'pecan flour',
+    'hazelnut', 'hazelnut flour',
+    'sunflower seeds', 'sunflower seed flour',
+    'pumpkin seeds', 'pumpkin seed flour',
+    'flax seeds', 'flax meal', 'flaxseed',
+    'chia seeds', 'chia flour',
+    'hemp seeds', 'hemp flour',
+    'chickpea flour', 'garbanzo flour', 'garbanzo bean flour', 'bean flour',
+    'lentil flour', 'pea flour', 'soy flour', 'banana flour', 'plantain flour',
+    'tiger nut flour', 'nut flour', 'gluten free flour',
+    'psyllium husk', 'psyllium powder', 'psyllium husk powder',
+    'xanthan gum', 'guar gum', 'locust bean gum',
+    'baking soda', 'baking powder (aluminum free)',
+    'cream of tartar', 'tartaric acid',
+    'salt', 'sea salt', 'kosher salt',
+    'sugar', 'brown sugar', 'coconut sugar', 'maple syrup',
+    'honey', 'agave nectar', 'stevia', 'erythritol',
+    'cocoa powder', 'chocolate', 'cacao',
+    'vanilla extract', 'vanilla bean',
+    'cinnamon', 'nutmeg', 'ginger', 'turmeric',
+    'garlic', 'onion', 'lemon', 'lime', 'orange'
+]
+
+GLUTEN_FREE_CLAIMS: List[str] = [
+    'gluten free', 'gf', 'celiac safe', 'certified gluten free',
+    'gfco certified', 'gfco', 'gluten free certification organization',
+    'nsf gluten free', 'nsf certified gluten free',
+    'beyond celiac', 'celiac disease foundation', 'no gluten', 'free from gluten'
+]
+
+MANUFACTURING_RISK_PHRASES: List[str] = [
+    'processed in facility with wheat', 'made in facility that processes wheat',
+    'may contain wheat', 'processed on shared equipment',
+    'shared equipment', 'manufactured in facility that processes wheat',
+    'may contain gluten', 'processed in facility with gluten',
+    'made on shared equipment with wheat', 'cross contamination',
+    'facility also processes wheat', 'equipment also used for wheat',
+    'may be processed on equipment that also processes wheat'
+]
+
+# Spelling variants reported as their canonical term
+SYNONYMS: Dict[str, str] = {
+    'malted': 'malt',
+    'malted barley': 'barley malt',
+    'oat': 'oats',
+    'brewers yeast': "brewer's yeast",
+    'bread crumbs': 'breadcrumbs',
+    'cornstarch': 'corn starch',
+    'cornflour': 'corn flour',
+}
+
+# Contribution of each category to the 0..1 risk score
+CATEGORY_WEIGHTS: Dict[str, float] = {
+    'source': 1.0,
+    'hidden': 0.7,
+    'manufacturing': 0.5,
+    'claim': -0.3,
+}
+
+
+@dataclass
+class LexiconMatch:
+    """Lexicon hits in a text, each list in lexicon order"""
+    sources: List[Tuple[str, str]] = field(default_factory=list)  # (term, grain)
+    hidden: List[str] = field(default_factory=list)
+    safe: List[str] = field(default_factory=list)
+    claims: List[str] = field(default_factory=list)
+    manufacturing: List[str] = field(default_factory=list)
+    severity: int = 0  # Highest severity of the gluten terms found
+
+    @property
+    def gluten_terms(self) -> List[str]:
+        """Terms that count as gluten: grain sources and MEDIUM+ hidden terms"""
+        return [term for term, _ in self.sources] + [
+            term for term in self.hidden if HIDDEN_SEVERITY.get(term, LOW) >= MEDIUM
+        ]
+
+    @property
+    def contains_gluten(self) -> bool:
+        return bool(self.gluten_terms)
+
+    @property
+    def gluten_free_claim(self) -> bool:
+        return bool(self.claims)
+
+    @property
+    def cross_contamination(self) -> bool:
+        return bool(self.manufacturing)
+
+    @property
+    def risk_score(self) -> float:
+        """Weighted 0..1 risk score over the categories present"""
+        score = 0.0
+        for category, hits in (('source', self.sources), ('hidden', self.hidden),
+                               ('manufacturing', self.manufacturing), ('claim', self.claims)):
+            if hits:
+                score += CATEGORY_WEIGHTS[category]
+        return min(1.0, max(0.0, score))
+
+
+class GlutenLexicon:
+    """Compiled gluten vocabulary"""
+
+    def __init__(self):
+        self.gluten_sources = GLUTEN_SOURCES
+        self.hidden_terms = [t for t in HIDDEN_GLUTEN_TERMS if self.source_of(t) is None]
+        self.safe_ingredients = SAFE_INGREDIENTS
+        self.gluten_free_claims = GLUTEN_FREE_CLAIMS
+        self.manufacturing_phrases = MANUFACTURING_RISK_PHRASES
+        self.synonyms = SYNONYMS
+        self.version = f"{LEXICON_VERSION}.{self._content_hash()}"
+        self._severity = self._build_severity()
+        self._matcher = self._compile()
+
+    def classify(self, *texts: Optional[str]) -> LexiconMatch:
+        """
+        Classify one or more texts in a single pass each
+
+        Args:
+            *texts: Texts to scan (e.g. ingredients, product name); None is skipped
+
+        Returns:
+            LexiconMatch with the union of hits across the texts
+        """
+        hits = set()
+        for text in texts:
+            hits.update(self.scan(text))
+        return self.build_match(hits)
+
+    def scan(self, text: Optional[str]) -> FrozenSet[Hit]:
+        """
+        Find the raw lexicon hits in a text
+
+        Returns:
+            Set of (category, order, term, grain) hits; build_match turns a
+            union of these into a LexiconMatch
+        """
+        if not text:
+            return frozenset()
+        hits = set()
+        # Terms never span list separators, so "rice, flour" is not "rice flour"
+        for segment in split_segments(text):
+            tokens = tokenize(segment)
+            spans = list(self._matcher.iter_spans(tokens))
+            longest_at = {}
+            for start, end, _ in spans:
+                longest_at[end] = max(longest_at.get(end, 0), end - start)
+
+            for start, end, hit in spans:
+                category, _, term, _ = hit
+                if term in QUALIFIABLE_TERMS and longest_at[end] > end - start:
+                    continue  # "rice flour", "wheat flour": the longer term decides
+                if category == 'claim' and NEGATIONS.intersection(tokens[max(0, start - NEGATION_WINDOW):start]):
+                    continue
+                hits.add(hit)
+        return frozenset(hits)
+
+    def build_match(self, hits: Iterable[Hit]) -> LexiconMatch:
+        """Build a LexiconMatch from raw hits"""
+        match = LexiconMatch()
+        for category, _, term, grain in sorted(hits, key=itemgetter(0, 1)):
+            if category == 'source':
+                match.sources.append((term, grain))
+            elif category == 'hidden':
+                match.hidden.append(term)
+            elif category == 'safe':
+                match.safe.append(term)
+            elif category == 'claim':
+                match.claims.append(term)
+            else:
+                match.manufacturing.append(term)
+            if category in ('source', 'hidden'):
+                match.severity = max(match.severity, self._severity.get(term, LOW))
+        return match
+
+    def severity(self, term: str) -> int:
+        """Severity of a gluten term (0 if the term is not a gluten term)"""
+        term = self.synonyms.get(term.lower(), term.lower())
+        return self._severity.get(term, 0)
+
+    def source_of(self, term: str) -> Optional[str]:
+        """Grain a term belongs to, if it is a definite gluten source"""
+        term = SYNONYMS.get(term.lower(), term.lower())
+        for grain, terms in GLUTEN_SOURCES.items():
+            if term in terms:
+                return grain
+        return None
+
+    def _build_severity(self) -> Dict[str, int]:
+        severity = {}
+        for grain, terms in self.gluten_sources.items():
+            for term in terms:
+                severity[term] = SOURCE_SEVERITY.get(grain, HIGH)
+        for term in self.hidden_terms:
+            severity[term] = HIDDEN_SEVERITY.get(term, LOW)
+        return severity
+
+    def _compile(self) -> TermMatcher:
+        """Compile all categories and synonyms into one matcher"""
+        payloads: Dict[str, List[tuple]] = {}
+        order = 0
+        for grain, terms in self.gluten_sources.items():
+            for term in terms:
+                payloads.setdefault(term, []).append(('source', order, term, grain))
+                order += 1
+        for category, terms in (('hidden', self.hidden_terms),
+                                ('safe', self.safe_ingredients),
+                                ('claim', self.gluten_free_claims),
+                                ('manufacturing', self.manufacturing_phrases)):
+            for index, term in enumerate(terms):
+                payloads.setdefault(term, []).append((category, index, term, None))
+
+        matcher = TermMatcher()
+        for term, term_payloads in payloads.items():
+            for payload in term_payloads:
+                matcher.add(term, payload)
+        for variant, canonical in self.synonyms.items():
+            for payload in payloads.get(canonical, []):
+                matcher.add(variant, payload)
+        matcher.compile()
+        return matcher
+
+    def _content_hash(self) -> str:
+        content = json.dumps([
+            self.gluten_sources, SOURCE_SEVERITY, self.hidden_terms, HIDDEN_SEVERITY,
+            self.safe_ingredients, self.gluten_free_claims, self.manufacturing_phrases,
+            self.synonyms, CATEGORY_WEIGHTS, sorted(QUALIFIABLE_TERMS), sorted(NEGATIONS),
+            NEGATION_WINDOW,
+        ], sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+
+
+# Global lexicon instance
+_gluten_lexicon = None
+
+
+def get_gluten_lexicon() -> GlutenLexicon:
+    """Get global gluten lexicon, compiled on first use"""
+    global _gluten_lexicon
+    if _gluten_lexicon is None:
+        _gluten_lexicon = GlutenLexicon()
+    return _gluten_lexicon
@@ -5,11 +5,14 @@ Gluten risk analyzer for barcode scanning and ingredient analysis
 
 import re
 import hashlib
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Union
 from dataclasses import dataclass
 from enum import Enum
 from PySide6.QtCore import QObject, Signal
 
+from services.gluten_lexicon import get_gluten_lexicon
+from services.gluten_analysis_memo import get_gluten_analysis_memo
+
 
 class RiskLevel(Enum):
     """Risk level enumeration"""
@@ -56,144 +59,41 @@ class GlutenRiskAnalyzer(QObject):
     
     # Signals
     analysis_completed = Signal(GlutenRiskResult)
-    risk_detected = Signal(RiskLevel, List[str])  # risk_level, problematic_ingredients
+    risk_detected = Signal(object, list)  # risk_level, problematic_ingredients
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.lexicon = get_gluten_lexicon()
         self.gluten_sources = self._load_gluten_sources()
         self.hidden_gluten_terms = self._load_hidden_gluten_terms()
         self.safe_ingredients = self._load_safe_ingredients()
         self.certification_keywords = self._load_certification_keywords()
         self.manufacturing_risk_terms = self._load_manufacturing_risk_terms()
     
+    @property
+    def memo(self):
+        """Shared classification memo (looked up per use so it can be reset)"""
+        return get_gluten_analysis_memo()
+    
     def _load_gluten_sources(self) -> Dict[GlutenSource, List[str]]:
         """Load gluten source terms"""
-        return {
-            GlutenSource.WHEAT: [
-                'wheat', 'wheat flour', 'wheat starch', 'wheat protein', 'wheat bran',
-                'wheat germ', 'wheat berries', 'durum wheat', 'hard wheat', 'soft wheat',
-                'wheat gluten', 'vital wheat gluten', 'wheat malt', 'wheat dextrin',
-                'wheat fiber', 'wheat grass', 'wheat grass juice', 'wheat grass powder'
-            ],
-            GlutenSource.RYE: [
-                'rye', 'rye flour', 'rye bread', 'rye meal', 'rye malt', 'rye starch'
-            ],
-            GlutenSource.BARLEY: [
-                'barley', 'barley flour', 'barley malt', 'barley extract', 'barley starch',
-                'barley protein', 'malt', 'malt extract', 'malt syrup', 'malt flavoring',
-                'malt vinegar', 'maltodextrin', 'barley grass', 'barley grass juice'
-            ],
-            GlutenSource.OATS: [
-                'oats', 'oat flour', 'oat bran', 'oat fiber', 'oat protein', 'oat starch',
-                'oat extract', 'oatmeal', 'rolled oats', 'steel cut oats', 'quick oats'
-            ],
-            GlutenSource.TRITICALE: [
-                'triticale', 'triticale flour', 'triticale starch'
-            ],
-            GlutenSource.SPELT: [
-                'spelt', 'spelt flour', 'spelt starch', 'spelt protein'
-            ],
-            GlutenSource.KAMUT: [
-                'kamut', 'kamut flour', 'kamut starch'
-            ],
-            GlutenSource.FARRO: [
-                'farro', 'farro flour', 'emmer', 'emmer flour'
-            ],
-            GlutenSource.BULGUR: [
-                'bulgur', 'bulgur wheat', 'cracked wheat'
-            ],
-            GlutenSource.COUSCOUS: [
-                'couscous', 'pearl couscous', 'israeli couscous'
-            ]
-        }
+        return {GlutenSource(grain): terms for grain, terms in self.lexicon.gluten_sources.items()}
     
     def _load_hidden_gluten_terms(self) -> List[str]:
         """Load hidden gluten terms that may not be obvious"""
-        return [
-            'modified food starch', 'food starch', 'starch', 'modified starch',
-            'vegetable starch', 'corn starch', 'potato starch', 'tapioca starch',
-            'natural flavoring', 'artificial flavoring', 'flavoring', 'natural flavors',
-            'artificial flavors', 'spices', 'seasoning', 'seasonings', 'spice blend',
-            'hydrolyzed vegetable protein', 'hydrolyzed plant protein', 'hvp',
-            'textured vegetable protein', 'tvp', 'vegetable protein',
-            'caramel color', 'caramel coloring', 'caramel',
-            'dextrin', 'dextrose', 'glucose syrup', 'corn syrup',
-            'soy sauce', 'teriyaki sauce', 'worcestershire sauce',
-            'miso', 'tempeh', 'seitan', 'vital wheat gluten',
-            'baking powder', 'baking soda', 'yeast extract',
-            'mono and diglycerides', 'lecithin', 'lecithin (soy)',
-            'gum arabic', 'xanthan gum', 'guar gum', 'locust bean gum',
-            'vegetable oil', 'canola oil', 'soybean oil',
-            'rice vinegar', 'distilled vinegar', 'white vinegar',
-            'vanilla extract', 'vanilla flavoring',
-            'smoke flavoring', 'liquid smoke',
-            'broth', 'stock', 'bouillon', 'soup base',
-            'thickener', 'thickening agent', 'binding agent'
-        ]
+        return self.lexicon.hidden_terms
     
     def _load_safe_ingredients(self) -> List[str]:
         """Load known safe ingredients"""
-        return [
-            'rice', 'rice flour', 'rice starch', 'rice bran',
-            'corn', 'corn flour', 'cornmeal', 'corn starch', 'corn syrup',
-            'potato', 'potato flour', 'potato starch', 'potato flakes',
-            'tapioca', 'tapioca flour', 'tapioca starch',
-            'quinoa', 'quinoa flour', 'quinoa flakes',
-            'buckwheat', 'buckwheat flour', 'buckwheat groats',
-            'amaranth', 'amaranth flour',
-            'millet', 'millet flour',
-            'sorghum', 'sorghum flour',
-            'teff', 'teff flour',
-            'arrowroot', 'arrowroot flour', 'arrowroot starch',
-            'cassava', 'cassava flour', 'yuca',
-            'coconut', 'coconut flour', 'coconut oil',
-            'almond', 'almond flour', 'almond meal',
-            'walnut', 'walnut flour',
-            'pecan', 'pecan flour',
-            'hazelnut', 'hazelnut flour',
-            'sunflower seeds', 'sunflower seed flour',
-            'pumpkin seeds', 'pumpkin seed flour',
-            'flax seeds', 'flax meal', 'flaxseed',
-            'chia seeds', 'chia flour',
-            'hemp seeds', 'hemp flour',
-            'psyllium husk', 'psyllium powder',
-            'xanthan gum', 'guar gum', 'locust bean gum',
-            'baking soda', 'baking powder (aluminum free)',
-            'cream of tartar', 'tartaric acid',
-            'salt', 'sea salt', 'kosher salt',
-            'sugar', 'brown sugar', 'coconut sugar', 'maple syrup',
-            'honey', 'agave nectar', 'stevia', 'erythritol',
-            'cocoa powder', 'chocolate', 'cacao',
-            'vanilla extract', 'vanilla bean',
-            'cinnamon', 'nutmeg', 'ginger', 'turmeric',
-            'garlic', 'onion', 'lemon', 'lime', 'orange'
-        ]
+        return self.lexicon.safe_ingredients
     
     def _load_certification_keywords(self) -> List[str]:
         """Load gluten-free certification keywords"""
-        return [
-            'gluten free', 'gluten-free', 'gf', 'celiac safe',
-            'certified gluten free', 'certified gluten-free',
-            'gfco certified', 'gfco', 'gluten free certification organization',
-            'nsf gluten free', 'nsf certified gluten free',
-            'beyond celiac', 'celiac disease foundation',
-            'may contain gluten', 'processed in facility with wheat',
-            'made in facility that processes wheat', 'may contain wheat',
-            'processed on shared equipment', 'shared equipment',
-            'manufactured in facility that processes wheat'
-        ]
+        return self.lexicon.gluten_free_claims
     
     def _load_manufacturing_risk_terms(self) -> List[str]:
         """Load manufacturing risk terms"""
-        return [
-            'processed in facility with wheat', 'made in facility that processes wheat',
-            'may contain wheat', 'processed on shared equipment',
-            'shared equipment', 'manufactured in facility that processes wheat',
-            'may contain gluten', 'processed in facility with gluten',
-            'made on shared equipment with wheat', 'cross contamination',
-            'facility also processes wheat', 'equipment also used for wheat',
-            'may be processed on equipment that also processes wheat'
-        ]
+        return self.lexicon.manufacturing_phrases
     
     def analyze_product(self, product_name: str, ingredients: str, 
                        barcode: Optional[str] = None, 
@@ -210,50 +110,66 @@ class GlutenRiskAnalyzer(QObject):
         Returns:
             GlutenRiskResult with analysis
         """
-        # Normalize inputs
-        ingredients_lower = ingredients.lower()
-        product_name_lower = product_name.lower()
-        additional_lower = (additional_info or "").lower()
-        
-        # Analyze ingredients
-        detected_sources = []
-        problematic_ingredients = []
-        safe_ingredients = []
-        cross_contamination_risk = False
-        manufacturing_notes = []
-        certification_status = None
+        result = self._analyze(product_name, ingredients, barcode, additional_info)
+        
+        # Emit signals
+        self.analysis_completed.emit(result)
+        if result.risk_level in [RiskLevel.HIGH_RISK, RiskLevel.UNSAFE]:
+            self.risk_detected.emit(result.risk_level, result.problematic_ingredients)
+        
+        return result
+    
+    def analyze_many(self, products: Iterable[Union[Dict[str, Any], Tuple]]) -> List[GlutenRiskResult]:
+        """
+        Analyze a batch of products without emitting per-product signals
+        
+        Args:
+            products: Dicts with 'product_name' (or 'name'), 'ingredients' and
+                optional 'barcode' and 'additional_info' keys, or tuples in
+                analyze_product argument order
+            
+        Returns:
+            List of GlutenRiskResult in input order
+        """
+        results = []
+        for product in products:
+            if isinstance(product, dict):
+                results.append(self._analyze(
+                    product.get('product_name') or product.get('name') or "",
+                    product.get('ingredients') or "",
+                    product.get('barcode'),
+                    product.get('additional_info'),
+                ))
+            else:
+                results.append(self._analyze(*product))
+        self.memo.flush()
+        return results
+    
+    def _analyze(self, product_name: str, ingredients: str,
+                 barcode: Optional[str] = None,
+                 additional_info: Optional[str] = None) -> GlutenRiskResult:
+        """Analyze one product; analyze_product without the signals"""
+        match = self.memo.classify(ingredients)
+        labels = self.memo.classify(product_name, additional_info)
         
-        # Check for direct gluten sources
-        for source, terms in self.gluten_sources.items():
-            for term in terms:
-                if term in ingredients_lower:
-                    detected_sources.append(source)
-                    problematic_ingredients.append(term)
-        
-        # Check for hidden gluten terms
-        for term in self.hidden_gluten_terms:
-            if term in ingredients_lower:
-                problematic_ingredients.append(term)
-        
-        # Check for safe ingredients
-        for term in self.safe_ingredients:
-            if term in ingredients_lower:
-                safe_ingredients.append(term)
-        
-        # Check for certification keywords
-        for term in self.certification_keywords:
-            if term in ingredients_lower or term in product_name_lower or term in additional_lower:
-                if 'gluten free' in term or 'gf' in term:
-                    certification_status = "certified_gluten_free"
-                elif 'may contain' in term or 'processed in facility' in term:
-                    cross_contamination_risk = True
-                    manufacturing_notes.append(term)
-        
-        # Check for manufacturing risk terms
-        for term in self.manufacturing_risk_terms:
-            if term in ingredients_lower or term in additional_lower:
-                cross_contamination_risk = True
-                manufacturing_notes.append(term)
+        # Direct gluten sources
+        detected_sources = [GlutenSource(grain) for _, grain in match.sources]
+        problematic_ingredients = [term for term, _ in match.sources]
+        
+        # Hidden gluten terms
+        problematic_ingredients.extend(match.hidden)
+        
+        # Safe ingredients
+        safe_ingredients = list(match.safe)
+        
+        # Gluten-free claims and cross-contamination warnings on the label
+        certification_status = None
+        if match.gluten_free_claim or labels.gluten_free_claim:
+            certification_status = "certified_gluten_free"
+        manufacturing_notes = match.manufacturing + [
+            phrase for phrase in labels.manufacturing if phrase not in match.manufacturing
+        ]
+        cross_contamination_risk = bool(manufacturing_notes)
         
         # Determine risk level and confidence
         risk_level, confidence = self._calculate_risk_level(
@@ -266,7 +182,7 @@ class GlutenRiskAnalyzer(QObject):
             risk_level, detected_sources, cross_contamination_risk, certification_status
         )
         
-        result = GlutenRiskResult(
+        return GlutenRiskResult(
             product_name=product_name,
             barcode=barcode,
             risk_level=risk_level,
@@ -279,13 +195,6 @@ class GlutenRiskAnalyzer(QObject):
             certification_status=certification_status,
             recommendation=recommendation
         )
-        
-        # Emit signals
-        self.analysis_completed.emit(result)
-        if risk_level in [RiskLevel.HIGH_RISK, RiskLevel.UNSAFE]:
-            self.risk_detected.emit(risk_level, problematic_ingredients)
-        
-        return result
     
     def _calculate_risk_level(self, detected_sources: List[GlutenSource],
                             problematic_ingredients: List[str],
@@ -360,8 +269,6 @@ class GlutenRiskAnalyzer(QObject):
     
     def analyze_ingredient_list(self, ingredients: str) -> Dict[str, Any]:
         """Analyze ingredient list and return detailed breakdown"""
-        ingredients_lower = ingredients.lower()
-        
         analysis = {
             'total_ingredients': len(ingredients.split(',')),
             'gluten_sources_found': [],
@@ -372,43 +279,16 @@ class GlutenRiskAnalyzer(QObject):
             'risk_score': 0.0
         }
         
-        # Check each category
-        for source, terms in self.gluten_sources.items():
-            for term in terms:
-                if term in ingredients_lower:
-                    analysis['gluten_sources_found'].append({
-                        'source': source.value,
-                        'term': term
-                    })
-        
-        for term in self.hidden_gluten_terms:
-            if term in ingredients_lower:
-                analysis['hidden_gluten_found'].append(term)
-        
-        for term in self.safe_ingredients:
-            if term in ingredients_lower:
-                analysis['safe_ingredients_found'].append(term)
-        
-        for term in self.certification_keywords:
-            if term in ingredients_lower:
-                analysis['certification_keywords'].append(term)
-        
-        for term in self.manufacturing_risk_terms:
-            if term in ingredients_lower:
-                analysis['manufacturing_risks'].append(term)
-        
-        # Calculate risk score
-        risk_score = 0.0
-        if analysis['gluten_sources_found']:
-            risk_score += 1.0
-        if analysis['hidden_gluten_found']:
-            risk_score += 0.7
-        if analysis['manufacturing_risks']:
-            risk_score += 0.5
-        if analysis['certification_keywords'] and 'gluten free' in ' '.join(analysis['certification_keywords']):
-            risk_score -= 0.3
-        
-        analysis['risk_score'] = min(1.0, max(0.0, risk_score))
+        # One pass over the text finds every category
+        match = self.memo.classify(ingredients)
+        analysis['gluten_sources_found'] = [
+            {'source': grain, 'term': term} for term, grain in match.sources
+        ]
+        analysis['hidden_gluten_found'] = list(match.hidden)
+        analysis['safe_ingredients_found'] = list(match.safe)
+        analysis['certification_keywords'] = list(match.claims)
+        analysis['manufacturing_risks'] = list(match.manufacturing)
+        analysis['risk_score'] = match.risk_score
         
         return analysis
     
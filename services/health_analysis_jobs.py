@@ -0,0 +1,263 @@
+# path: services/health_analysis_jobs.py
+"""
+Background health analysis jobs for CeliacShield
+
+Runs HealthPatternAnalyzer insights and IngredientCorrelator correlations
+on a worker thread with its own database connection, so large logs no
+longer freeze the window. Jobs report progress and poll for cancellation
+between steps. Finished results are cached under the data versions of the
+health tables, so asking again about an unchanged range is answered at
+once; starting a new analysis cancels the one still running.
+"""
+
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from services.gluten_lexicon import get_gluten_lexicon
+from utils.data_versions import get_versions
+
+# Tables the analyses read, directly or through the health rollups and index
+HEALTH_TABLES = ('health_log', 'hydration_log', 'fiber_log', 'bristol_log')
+
+Progress = Callable[[str, int], None]
+Cancelled = Callable[[], bool]
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside a job when it has been cancelled"""
+
+
+def _check(cancelled: Cancelled):
+    if cancelled():
+        raise AnalysisCancelled()
+
+
+def run_insights(db_path: str, days_back: int, progress: Progress, cancelled: Cancelled) -> Dict[str, Any]:
+    """Health insights for the last days_back days, plus the long-term rollup view"""
+    from services.health_pattern_analyzer import HealthPatternAnalyzer
+
+    progress("Initializing analyzer...", 10)
+    analyzer = HealthPatternAnalyzer(db_path)
+    _check(cancelled)
+
+    progress("Fetching health data...", 30)
+    entries = analyzer.get_health_frame(days_back)
+    _check(cancelled)
+
+    progress("Analyzing symptom patterns...", 50)
+    insights = analyzer.generate_health_insights(entries)
+    _check(cancelled)
+
+    progress("Summarizing the last year...", 80)
+    insights['long_term'] = analyzer.get_long_term_insights()
+    return insights
+
+
+def run_correlations(db_path: str, days_back: int, progress: Progress, cancelled: Cancelled) -> Dict[str, Any]:
+    """Ingredient/symptom correlations for the last days_back days"""
+    from services.health_index import HealthIndex
+    from services.ingredient_correlator import ingredient_correlator
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        progress("Indexing new entries...", 20)
+        HealthIndex(conn).sync()
+        _check(cancelled)
+
+        progress("Counting ingredients and symptoms...", 60)
+        start = (date.today() - timedelta(days=days_back)).isoformat()
+        return ingredient_correlator.analyze_database_correlations(conn, start, '9999-12-31')
+
+
+# Analysis kinds the runner accepts
+ANALYSES: Dict[str, Callable[[str, int, Progress, Cancelled], Dict[str, Any]]] = {
+    'insights': run_insights,
+    'correlations': run_correlations,
+}
+
+
+class HealthAnalysisWorker(QObject):
+    """Worker running one analysis on its own thread"""
+
+    progress = Signal(int, str, int)  # job id, message, percentage
+    finished = Signal(int, object)  # job id, result (None if cancelled)
+
+    def __init__(self, job_id: int, kind: str, db_path: str, days_back: int):
+        super().__init__()
+        self.job_id = job_id
+        self.kind = kind
+        self.db_path = db_path
+        self.days_back = days_back
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _report(self, message: str, percentage: int):
+        self.progress.emit(self.job_id, message, percentage)
+
+    def run(self):
+        """Run the analysis"""
+        try:
+            result = ANALYSES[self.kind](self.db_path, self.days_back, self._report,
+                                         lambda: self._cancelled)
+            if not self._cancelled:
+                self._report("Analysis complete!", 100)
+            else:
+                result = None
+        except AnalysisCancelled:
+            result = None
+        except Exception as e:
+            print(f"Error during {self.kind} analysis: {e}")
+            result = {'error': str(e)}
+        self.finished.emit(self.job_id, result)
+
+
+class HealthAnalysisRunner(QObject):
+    """Runs health analyses in the background, one current job at a time, with a result cache"""
+
+    progress = Signal(str, int)
+    result_ready = Signal(str, object)  # kind, result dict (shared with the cache)
+    dropped = Signal(str)  # kind of a job cancelled or superseded, which reports no result
+
+    def __init__(self, max_cached: int = 8):
+        """
+        Initialize the runner
+
+        Args:
+            max_cached: Finished results kept, least recently used dropped first
+        """
+        super().__init__()
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._jobs: Dict[int, Tuple[QThread, HealthAnalysisWorker, Optional[Tuple]]] = {}
+        self._current: Optional[int] = None
+        self._next_id = 0
+        self.jobs_started = 0
+
+    def is_running(self) -> bool:
+        return self._current is not None
+
+    def cache_key(self, kind: str, days_back: int, db_path: Optional[str] = None) -> Optional[Tuple]:
+        """
+        Key of an analysis result: its parameters, today's date (the range
+        ends today), the lexicon version and the health table versions
+
+        Returns:
+            None if the database has no version counters, so results are not cached
+        """
+        db_path = self._resolve(db_path)
+        try:
+            with closing(sqlite3.connect(db_path)) as conn:
+                versions = get_versions(conn, HEALTH_TABLES)
+        except sqlite3.Error:
+            return None
+        if not versions:
+            return None
+        return (kind, days_back, db_path, date.today().isoformat(), get_gluten_lexicon().version,
+                tuple(sorted(versions.items())))
+
+    def cached(self, kind: str, days_back: int, db_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get a finished result for unchanged data, if there is one"""
+        key = self.cache_key(kind, days_back, db_path)
+        if key is None or key not in self._cache:
+            return None
+        self._cache.move_to_end(key)
+        return self._cache[key]
+
+    def start(self, kind: str, days_back: int = 90, db_path: Optional[str] = None) -> bool:
+        """
+        Start an analysis, cancelling the current one
+
+        A cached result for unchanged data is emitted through result_ready
+        before this returns.
+
+        Args:
+            kind: 'insights' or 'correlations'
+            days_back: Number of days to analyze, ending today
+            db_path: Database to analyze (the app database if omitted)
+
+        Returns:
+            True if a job was started, False if the result came from the cache
+        """
+        db_path = self._resolve(db_path)
+        key = self.cache_key(kind, days_back, db_path)
+        self.cancel()
+        if key is not None and key in self._cache:
+            self._cache.move_to_end(key)
+            self.result_ready.emit(kind, self._cache[key])
+            return False
+
+        self._next_id += 1
+        job_id = self._next_id
+        thread = QThread()
+        worker = HealthAnalysisWorker(job_id, kind, db_path, days_back)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_progress)
+        worker.finished.connect(self._on_finished)
+        self._jobs[job_id] = (thread, worker, key)
+        self._current = job_id
+        self.jobs_started += 1
+        thread.start()
+        return True
+
+    def cancel(self, kind: Optional[str] = None):
+        """
+        Cancel the current job; its result is dropped when it stops
+
+        Emits dropped, so whoever waits for the job's result can stop waiting.
+
+        Args:
+            kind: Only cancel the job if it runs this kind of analysis
+        """
+        if self._current is None:
+            return
+        worker = self._jobs[self._current][1]
+        if kind is None or worker.kind == kind:
+            worker.cancel()
+            self._current = None
+            self.dropped.emit(worker.kind)
+
+    def _resolve(self, db_path: Optional[str]) -> str:
+        if db_path:
+            return str(db_path)
+        from utils.db import _db_path
+        return str(_db_path())
+
+    def _on_progress(self, job_id: int, message: str, percentage: int):
+        if job_id == self._current:
+            self.progress.emit(message, percentage)
+
+    def _on_finished(self, job_id: int, result: Optional[Dict[str, Any]]):
+        thread, worker, key = self._jobs.pop(job_id)
+        thread.quit()
+        thread.wait()
+        thread.deleteLater()
+        worker.deleteLater()
+        if job_id != self._current:
+            return  # Cancelled or superseded
+        self._current = None
+        if result is None:
+            return
+        if key is not None and 'error' not in result:
+            self._cache[key] = result
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        self.result_ready.emit(worker.kind, result)
+
+
+def get_health_analysis_runner() -> HealthAnalysisRunner:
+    """Get singleton health analysis runner instance"""
+    global _health_analysis_runner
+    if _health_analysis_runner is None:
+        _health_analysis_runner = HealthAnalysisRunner()
+    return _health_analysis_runner
+
+
+# Global runner instance
+_health_analysis_runner = None
@@ -0,0 +1,146 @@
+# path: services/health_frame.py
+"""
+Columnar view of a health log window for vectorized analysis
+
+HealthFrame holds one window of health_log entries as NumPy arrays: dates
+as day ordinals, symptom mentions as a boolean row x symptom matrix, and
+severity, Bristol type, energy, hydration, fiber and mood as numeric
+columns. Symptom and food-item text is parsed once per distinct string when
+the frame is built, so every analysis pass works on the arrays alone.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, List, Sequence
+
+import numpy as np
+
+from services.gluten_analysis_memo import get_gluten_analysis_memo
+
+# Common celiac symptoms, matched as substrings of the symptoms text
+CELIAC_SYMPTOMS = (
+    'diarrhea', 'constipation', 'bloating', 'gas', 'abdominal pain',
+    'nausea', 'vomiting', 'fatigue', 'headache', 'brain fog',
+    'joint pain', 'skin rash', 'mouth sores', 'depression', 'anxiety',
+    'weight loss', 'weight gain', 'malnutrition', 'anemia'
+)
+
+# Mood codes
+MOOD_OTHER = 0
+MOOD_GOOD = 1   # excellent, great, good
+MOOD_POOR = 2   # poor, terrible
+MOOD_AWFUL = 3  # awful
+
+_MOOD_CODES = {
+    'excellent': MOOD_GOOD, 'great': MOOD_GOOD, 'good': MOOD_GOOD,
+    'poor': MOOD_POOR, 'terrible': MOOD_POOR, 'awful': MOOD_AWFUL,
+}
+
+_ITEM_SPLIT_RE = re.compile(r'[,;|\n\r]+')
+
+
+def _day_ordinal(value: str) -> int:
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return -1
+
+
+def split_food_items(items_text: str) -> List[str]:
+    """Split a free-text list of foods into trimmed items"""
+    if not items_text:
+        return []
+    return [item.strip() for item in _ITEM_SPLIT_RE.split(items_text) if item.strip()]
+
+
+@dataclass
+class HealthFrame:
+    """Health log entries as parallel arrays, one element per entry"""
+    dates: np.ndarray            # ISO date strings as given (sorting matches the text)
+    days: np.ndarray             # int32 day ordinals, -1 if the date is unparsable
+    severity: np.ndarray         # float64 recorded severity
+    stool: np.ndarray            # int8 Bristol type
+    energy: np.ndarray           # float64 energy level
+    hydration: np.ndarray        # float64 liters
+    fiber: np.ndarray            # float64 grams
+    mood: np.ndarray             # int8 mood code
+    has_symptom_text: np.ndarray  # bool, symptoms field not empty
+    symptoms: np.ndarray         # bool matrix, entries x symptom_names
+    symptom_names: List[str]
+    has_gluten: np.ndarray       # bool, any food item contains gluten
+    gluten_items: List[List[str]]  # gluten-containing food items per entry
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @property
+    def bad_stool(self) -> np.ndarray:
+        """Bristol types 1-2 or 6-7"""
+        return (self.stool <= 2) | (self.stool >= 6)
+
+    @classmethod
+    def build(cls, rows: Iterable[Sequence], symptom_names: Sequence[str]) -> "HealthFrame":
+        """
+        Build a frame from entry tuples
+
+        Args:
+            rows: (date, items, severity, stool, symptoms, hydration_liters,
+                fiber_grams, mood, energy_level) per entry, with the defaults
+                of HealthEntry already applied
+            symptom_names: Symptoms to flag, matched as substrings of the
+                lowercased symptoms text
+
+        Returns:
+            HealthFrame in row order
+        """
+        rows = list(rows)
+        symptom_names = list(symptom_names)
+        n = len(rows)
+
+        symptom_codes = np.empty(n, dtype=np.int64)
+        symptom_texts = {}
+        item_codes = np.empty(n, dtype=np.int64)
+        item_texts = {}
+        for i, row in enumerate(rows):
+            symptom_codes[i] = symptom_texts.setdefault(row[4], len(symptom_texts))
+            item_codes[i] = item_texts.setdefault(row[1], len(item_texts))
+
+        # Parse each distinct text once, then gather per row
+        symptom_table = np.zeros((len(symptom_texts), len(symptom_names)), dtype=bool)
+        for text, code in symptom_texts.items():
+            lowered = text.lower()
+            symptom_table[code] = [name in lowered for name in symptom_names]
+
+        memo = get_gluten_analysis_memo()
+        gluten_table = [None] * len(item_texts)
+        for text, code in item_texts.items():
+            gluten_table[code] = [
+                item for item in split_food_items(text) if memo.classify(item).contains_gluten
+            ]
+
+        gluten_items = [gluten_table[code] for code in item_codes]
+        return cls(
+            dates=np.array([row[0] for row in rows], dtype=str),
+            days=np.fromiter((_day_ordinal(row[0]) for row in rows), dtype=np.int32, count=n),
+            severity=np.fromiter((row[2] for row in rows), dtype=np.float64, count=n),
+            stool=np.fromiter((row[3] for row in rows), dtype=np.int8, count=n),
+            energy=np.fromiter((row[8] for row in rows), dtype=np.float64, count=n),
+            hydration=np.fromiter((row[5] for row in rows), dtype=np.float64, count=n),
+            fiber=np.fromiter((row[6] for row in rows), dtype=np.float64, count=n),
+            mood=np.fromiter((_MOOD_CODES.get(row[7], MOOD_OTHER) for row in rows), dtype=np.int8, count=n),
+            has_symptom_text=np.fromiter((bool(row[4]) for row in rows), dtype=bool, count=n),
+            symptoms=symptom_table[symptom_codes] if n else np.zeros((0, len(symptom_names)), dtype=bool),
+            symptom_names=symptom_names,
+            has_gluten=np.fromiter((bool(items) for items in gluten_items), dtype=bool, count=n),
+            gluten_items=gluten_items,
+        )
+
+    @classmethod
+    def from_entries(cls, entries: Iterable, symptom_names: Sequence[str]) -> "HealthFrame":
+        """Build a frame from HealthEntry objects"""
+        return cls.build(
+            ((e.date, e.items, e.severity, e.stool, e.symptoms, e.hydration_liters,
+              e.fiber_grams, e.mood, e.energy_level) for e in entries),
+            symptom_names,
+        )
@@ -0,0 +1,154 @@
+# path: services/health_index.py
+"""
+Health Index Service for CeliacShield
+
+Parses health_log symptoms and food items once, when entries are written,
+into the normalized symptom/health_log_symptom and ingredient/meal_item
+tables (see utils.health_index), so pattern queries such as "bloating within
+6 hours of dairy" run as indexed joins instead of re-tokenizing the log.
+"""
+
+import re
+import sqlite3
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from services.health_frame import CELIAC_SYMPTOMS
+from services.ingredient_correlator import ingredient_correlator
+from utils.health_index import (
+    get_entry_ingredients, get_entry_symptoms, pending_count, queue_all,
+    symptoms_after_ingredients, sync_health_index
+)
+
+_SYMPTOM_SPLIT_RE = re.compile(r'[,;|\n\r]+')
+_SPACES_RE = re.compile(r'\s+')
+
+# Ingredient groups accepted wherever ingredient names are
+INGREDIENT_GROUPS = {
+    'dairy': ('cheese', 'milk', 'butter', 'cream', 'yogurt'),
+}
+
+
+def parse_symptoms(symptoms_text: str) -> List[str]:
+    """
+    Split a free-text symptom list into symptom names
+
+    Parts mentioning known celiac symptoms map to those names (the same
+    substring matching HealthPatternAnalyzer uses); other parts are kept as
+    their lowercased, whitespace-collapsed text.
+    """
+    names = []
+    for part in _SYMPTOM_SPLIT_RE.split(symptoms_text.lower()):
+        part = _SPACES_RE.sub(' ', part).strip()
+        if not part:
+            continue
+        known = [symptom for symptom in CELIAC_SYMPTOMS if symptom in part]
+        for name in known or [part]:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+class HealthIndex:
+    """Keeps the normalized symptom and meal-item tables in step with health_log"""
+
+    def __init__(self, connection: Optional[sqlite3.Connection] = None):
+        """
+        Initialize the index
+
+        Args:
+            connection: Database connection; opened on first use if omitted
+        """
+        self._conn = connection
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            from utils.db import get_connection
+            self._conn = get_connection()
+        return self._conn
+
+    def sync(self) -> int:
+        """
+        Parse entries written since the last sync
+
+        Returns:
+            Number of entries parsed
+        """
+        try:
+            if not pending_count(self.conn):
+                return 0
+            return sync_health_index(self.conn, parse_symptoms, ingredient_correlator.extract_meal_ingredients)
+        except sqlite3.Error as e:
+            print(f"Error updating health index: {e}")
+            return 0
+
+    def rebuild(self) -> int:
+        """
+        Re-parse every entry, e.g. after the symptom list or lexicon changed
+
+        Returns:
+            Number of entries parsed
+        """
+        with self.conn:
+            queue_all(self.conn)
+        return self.sync()
+
+    def entry_symptoms(self, entry_ids: Iterable[int]) -> Dict[int, List[str]]:
+        """Symptom names per entry id"""
+        self.sync()
+        return get_entry_symptoms(self.conn, list(entry_ids))
+
+    def entry_ingredients(self, entry_ids: Iterable[int]) -> Dict[int, List[str]]:
+        """Canonical ingredient names per entry id"""
+        self.sync()
+        return get_entry_ingredients(self.conn, list(entry_ids))
+
+    def symptoms_after(self, symptom: str, ingredients: Iterable[str], within_hours: float = 6.0,
+                       start: str = "0000-00-00", end: str = "9999-12-31") -> List[Dict]:
+        """
+        Entries reporting a symptom within a window after eating any of the ingredients
+
+        Args:
+            symptom: Symptom name, e.g. 'bloating'
+            ingredients: Ingredient names or groups from INGREDIENT_GROUPS, e.g. ['dairy']
+            within_hours: Longest delay between meal and symptom
+            start: First date to consider (ISO)
+            end: Last date to consider (ISO)
+
+        Returns:
+            One dict per symptom entry with health_log_id, date, time, the
+            closest preceding meal_id and hours_after
+        """
+        names = []
+        for name in ingredients:
+            names.extend(INGREDIENT_GROUPS.get(name, (name,)))
+        self.sync()
+        return symptoms_after_ingredients(self.conn, symptom.lower(), names, within_hours, start, end)
+
+
+# Global health index instance
+_health_index = None
+
+
+def get_health_index() -> HealthIndex:
+    """Get global health index instance"""
+    global _health_index
+    if _health_index is None:
+        _health_index = HealthIndex()
+    return _health_index
+
+
+def main(argv: List[str]) -> int:
+    """Backfill or rebuild the index of the app database, or of the database given as argument"""
+    conn = sqlite3.connect(argv[0]) if argv else None
+    if conn is not None:
+        from utils.migrations import ensure_schema
+        ensure_schema(conn)
+    parsed = HealthIndex(conn).rebuild()
+    print(f"Indexed {parsed} health log entries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -7,12 +7,16 @@ gluten exposure tracking, and nutritional impact assessment.
 """
 
 import sqlite3
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Sequence, Union
 from dataclasses import dataclass
-from collections import defaultdict, Counter
-import statistics
-import re
+
+import numpy as np
+
+from services.gluten_lexicon import get_gluten_lexicon
+from services.health_frame import CELIAC_SYMPTOMS, HealthFrame, MOOD_GOOD, MOOD_POOR, split_food_items
+from utils.health_rollups import get_daily_rollups, get_weekly_rollups, get_monthly_rollups
 
 
 @dataclass
@@ -36,6 +40,14 @@ class HealthEntry:
     energy_level: int
 
 
+_ENTRY_COLUMNS = """id, date, time, meal, items, risk, onset_min, severity,
+                       stool, recipe, symptoms, notes, hydration_liters,
+                       fiber_grams, mood, energy_level"""
+
+# Analyses accept entry lists or a prebuilt HealthFrame
+Entries = Union[List[HealthEntry], HealthFrame]
+
+
 @dataclass
 class SymptomPattern:
     """Data class for identified symptom patterns"""
@@ -84,23 +96,11 @@ class HealthPatternAnalyzer:
     def __init__(self, db_path: str = "data/celiogix.db"):
         self.db_path = db_path
         
-        # Gluten-containing ingredients to watch for
-        self.gluten_ingredients = [
-            'wheat', 'barley', 'rye', 'oats', 'malt', 'brewer\'s yeast',
-            'flour', 'bread', 'pasta', 'couscous', 'bulgur', 'seitan',
-            'soy sauce', 'teriyaki sauce', 'miso', 'beer', 'ale', 'lager',
-            'malt vinegar', 'malt extract', 'malt syrup', 'malt flavoring',
-            'hydrolyzed wheat protein', 'wheat starch', 'wheat germ',
-            'barley malt', 'rye flour', 'spelt', 'triticale', 'kamut'
-        ]
+        # Shared gluten terms to watch for
+        self.lexicon = get_gluten_lexicon()
         
         # Common celiac symptoms
-        self.celiac_symptoms = [
-            'diarrhea', 'constipation', 'bloating', 'gas', 'abdominal pain',
-            'nausea', 'vomiting', 'fatigue', 'headache', 'brain fog',
-            'joint pain', 'skin rash', 'mouth sores', 'depression', 'anxiety',
-            'weight loss', 'weight gain', 'malnutrition', 'anemia'
-        ]
+        self.celiac_symptoms = list(CELIAC_SYMPTOMS)
         
         # Bristol Stool Scale descriptions
         self.bristol_descriptions = {
@@ -123,14 +123,12 @@ class HealthPatternAnalyzer:
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=days_back)
             
-            cursor.execute("""
-                SELECT id, date, time, meal, items, risk, onset_min, severity,
-                       stool, recipe, symptoms, notes, hydration_liters, 
-                       fiber_grams, mood, energy_level
+            cursor.execute(f"""
+                SELECT {_ENTRY_COLUMNS}
                 FROM health_log
                 WHERE date >= ? AND date <= ?
                 ORDER BY date DESC
-            """, (start_date, end_date))
+            """, (start_date.isoformat(), end_date.isoformat()))
             
             entries = []
             for row in cursor.fetchall():
@@ -160,167 +158,314 @@ class HealthPatternAnalyzer:
             print(f"Error fetching health entries: {str(e)}")
             return []
     
-    def analyze_symptom_patterns(self, entries: List[HealthEntry]) -> List[SymptomPattern]:
-        """Analyze patterns in symptoms"""
-        symptom_frequency = defaultdict(int)
-        symptom_severity = defaultdict(list)
-        symptom_duration = defaultdict(list)
-        symptom_triggers = defaultdict(set)
-        
-        for entry in entries:
-            if entry.symptoms:
-                symptoms = self._extract_symptoms(entry.symptoms)
-                items = self._extract_food_items(entry.items_consumed)
-                
-                for symptom in symptoms:
-                    symptom_frequency[symptom] += 1
-                    symptom_severity[symptom].append(self._estimate_symptom_severity(entry))
-                    symptom_duration[symptom].append(self._estimate_symptom_duration(entry))
-                    
-                    # Track potential triggers
-                    for item in items:
-                        if self._contains_gluten_ingredients(item):
-                            symptom_triggers[symptom].add(item)
-        
-        # Create symptom patterns
-        patterns = []
-        for symptom, frequency in symptom_frequency.items():
-            if frequency >= 3:  # Only include symptoms that occurred 3+ times
-                avg_severity = statistics.mean(symptom_severity[symptom]) if symptom_severity[symptom] else 0
-                avg_duration = statistics.mean(symptom_duration[symptom]) if symptom_duration[symptom] else 0
-                confidence = min(1.0, frequency / 10.0)  # Higher frequency = higher confidence
-                
-                patterns.append(SymptomPattern(
-                    symptoms=[symptom],
-                    frequency=frequency,
-                    severity_avg=avg_severity,
-                    duration_avg=avg_duration,
-                    trigger_foods=list(symptom_triggers[symptom]),
-                    confidence=confidence
-                ))
+    def get_health_frame(self, days_back: int = 90) -> HealthFrame:
+        """Load the health log window straight into a HealthFrame"""
+        rows = []
+        try:
+            conn = sqlite3.connect(self.db_path)
+            end_date = datetime.now().date()
+            start_date = end_date - timedelta(days=days_back)
+            
+            # Same defaults as get_health_entries, applied in SQL
+            rows = conn.execute("""
+                SELECT date, COALESCE(items, ''), COALESCE(severity, 0),
+                       COALESCE(NULLIF(stool, 0), 4), COALESCE(symptoms, ''),
+                       COALESCE(hydration_liters, 0.0), COALESCE(fiber_grams, 0.0),
+                       COALESCE(NULLIF(mood, ''), 'neutral'), COALESCE(NULLIF(energy_level, 0), 5)
+                FROM health_log
+                WHERE date >= ? AND date <= ?
+                ORDER BY date DESC
+            """, (start_date.isoformat(), end_date.isoformat())).fetchall()
+            conn.close()
+        except Exception as e:
+            print(f"Error fetching health entries: {str(e)}")
+        return HealthFrame.build(rows, self.celiac_symptoms)
+    
+    def get_rollups(self, period: str = 'weekly', days_back: int = 365) -> List[Dict[str, Any]]:
+        """
+        Get pre-aggregated health rollups for long-range charts and trends
         
-        # Sort by frequency and confidence
-        patterns.sort(key=lambda x: (x.frequency, x.confidence), reverse=True)
-        return patterns
+        Args:
+            period: 'daily', 'weekly' or 'monthly'
+            days_back: Number of days to cover, ending today
+            
+        Returns:
+            One dict per period with entry, symptom and meal counts, severity
+            mean and max, hydration and fiber totals, bristol_1..bristol_7 and
+            'symptoms', the number of entries naming each symptom
+        """
+        fetch = {
+            'daily': get_daily_rollups,
+            'weekly': get_weekly_rollups,
+            'monthly': get_monthly_rollups,
+        }[period]
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days_back)
+        from services.health_index import HealthIndex
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                # Symptom counts follow the parsed symptoms, so parse new entries first
+                HealthIndex(conn).sync()
+                return fetch(conn, start_date.isoformat(), end_date.isoformat())
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error fetching health rollups: {str(e)}")
+            return []
     
-    def detect_gluten_exposures(self, entries: List[HealthEntry]) -> List[GlutenExposure]:
-        """Detect potential gluten exposure incidents"""
-        exposures = []
-        
-        for entry in entries:
-            if entry.items:
-                items = self._extract_food_items(entry.items)
-                gluten_items = [item for item in items if self._contains_gluten_ingredients(item)]
-                
-                if gluten_items and entry.symptoms:
-                    symptoms = self._extract_symptoms(entry.symptoms)
-                    severity = self._calculate_gluten_reaction_severity(entry)
-                    
-                    if severity > 0.3:  # Only include significant reactions
-                        exposures.append(GlutenExposure(
-                            date=entry.date,
-                            suspected_food=", ".join(gluten_items),
-                            symptoms=symptoms,
-                            severity=severity,
-                            duration_hours=self._estimate_symptom_duration(entry),
-                            recovery_time=self._estimate_recovery_time(entry)
-                        ))
-        
-        return exposures
+    def get_long_term_insights(self, days_back: int = 365) -> Dict[str, Any]:
+        """
+        Summary and trends over a long range, read from the monthly rollups
+        
+        Args:
+            days_back: Number of days to cover, ending today
+            
+        Returns:
+            Dict with 'summary' (see summarize_rollups) and 'trends'
+            (see analyze_rollup_trends)
+        """
+        rollups = self.get_rollups('monthly', days_back)
+        return {
+            'summary': self.summarize_rollups(rollups),
+            'trends': self.analyze_rollup_trends(rollups),
+        }
     
-    def analyze_nutritional_impact(self, entries: List[HealthEntry]) -> List[NutritionalImpact]:
-        """Analyze nutritional impact on health"""
-        nutritional_impacts = []
+    def summarize_rollups(self, rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Totals over a list of weekly or monthly rollups"""
+        days = sum(r['days_logged'] for r in rollups)
+        if not days:
+            return {}
+        entries = sum(r['entries'] for r in rollups)
+        symptom_entries = sum(r['symptom_entries'] for r in rollups)
+        # Period means weighted by their entry counts
+        severities = [(r['severity_mean'], r['entries']) for r in rollups if r['severity_mean'] is not None]
+        weight = sum(count for _, count in severities)
+        bristol = [sum(r[f'bristol_{k}'] for r in rollups) for k in range(1, 8)]
+        symptom_counts = Counter()
+        for r in rollups:
+            symptom_counts.update(r.get('symptoms', {}))
+        return {
+            'periods': len(rollups),
+            'days_logged': days,
+            'entries': entries,
+            'symptom_entries': symptom_entries,
+            'symptom_frequency': symptom_entries / entries if entries else 0,
+            'average_severity': sum(m * c for m, c in severities) / weight if weight else 0,
+            'hydration_liters_per_day': sum(r['hydration_liters'] for r in rollups) / days,
+            'fiber_grams_per_day': sum(r['fiber_grams'] for r in rollups) / days,
+            'most_common_bristol': bristol.index(max(bristol)) + 1 if any(bristol) else None,
+            'symptom_counts': dict(symptom_counts.most_common()),
+            'most_common_symptom': symptom_counts.most_common(1)[0][0] if symptom_counts else None,
+        }
+    
+    def analyze_rollup_trends(self, rollups: List[Dict[str, Any]]) -> List[HealthTrend]:
+        """
+        Compare the first and second half of a list of rollups
         
-        # Analyze hydration impact
-        hydration_data = [(entry.hydration_liters, self._get_health_score(entry)) 
-                         for entry in entries if entry.hydration_liters > 0]
-        if hydration_data:
-            hydration_correlation = self._calculate_correlation(
-                [d[0] for d in hydration_data], 
-                [d[1] for d in hydration_data]
-            )
-            avg_hydration = statistics.mean([d[0] for d in hydration_data])
+        Like analyze_health_trends, but over pre-aggregated periods, so it
+        covers years of logs while reading one row per month.
+        """
+        trends = []
+        if len(rollups) < 2:
+            return trends
+        half = len(rollups) // 2
+        
+        # (metric, summarize_rollups key, whether higher is better)
+        metrics = (
+            ('Symptom Frequency', 'symptom_frequency', False),
+            ('Severity', 'average_severity', False),
+            ('Hydration', 'hydration_liters_per_day', True),
+            ('Fiber', 'fiber_grams_per_day', True),
+        )
+        first, second = self.summarize_rollups(rollups[:half]), self.summarize_rollups(rollups[half:])
+        for metric, key, higher_is_better in metrics:
+            first_avg, second_avg = first.get(key, 0), second.get(key, 0)
+            change_percentage = ((second_avg - first_avg) / first_avg * 100) if first_avg > 0 else 0
+            if not higher_is_better:
+                change_percentage = -change_percentage
             
-            nutritional_impacts.append(NutritionalImpact(
-                nutrient="Hydration (L/day)",
-                deficiency_risk=1.0 if avg_hydration < 2.0 else 0.0,
-                correlation_with_symptoms=abs(hydration_correlation),
-                recommended_intake=2.5,
-                current_avg=avg_hydration
+            if change_percentage > 5:
+                trend_direction = 'improving'
+            elif change_percentage < -5:
+                trend_direction = 'declining'
+            else:
+                trend_direction = 'stable'
+            
+            trends.append(HealthTrend(
+                metric=metric,
+                time_period=f"{len(rollups)} months",
+                trend_direction=trend_direction,
+                change_percentage=abs(change_percentage),
+                significance=min(1.0, len(rollups) / 12.0)  # A year of months = full significance
             ))
         
-        # Analyze fiber impact
-        fiber_data = [(entry.fiber_grams, self._get_health_score(entry)) 
-                     for entry in entries if entry.fiber_grams > 0]
-        if fiber_data:
-            fiber_correlation = self._calculate_correlation(
-                [d[0] for d in fiber_data], 
-                [d[1] for d in fiber_data]
+        return trends
+    
+    def analyze_symptom_patterns(self, entries: Entries) -> List[SymptomPattern]:
+        """Analyze patterns in symptoms"""
+        frame = self._frame(entries)
+        flags = frame.symptoms & frame.has_symptom_text[:, None]
+        frequency = flags.sum(axis=0)
+        recurring = np.flatnonzero(frequency >= 3)  # Only symptoms that occurred 3+ times
+        if not len(recurring):
+            return []
+        
+        weights = flags[:, recurring].T.astype(np.float64)
+        severity_avg = (weights @ self._symptom_severity(frame)) / frequency[recurring]
+        duration_avg = (weights @ self._symptom_duration(frame)) / frequency[recurring]
+        
+        patterns = []
+        for k, column in enumerate(recurring):
+            rows = np.flatnonzero(flags[:, column] & frame.has_gluten)
+            triggers = {item for row in rows for item in frame.gluten_items[row]}
+            count = int(frequency[column])
+            patterns.append((int(np.argmax(flags[:, column])), int(column), SymptomPattern(
+                symptoms=[frame.symptom_names[column]],
+                frequency=count,
+                severity_avg=float(severity_avg[k]),
+                duration_avg=float(duration_avg[k]),
+                trigger_foods=sorted(triggers),
+                confidence=min(1.0, count / 10.0)  # Higher frequency = higher confidence
+            )))
+        
+        # Most frequent first; ties keep the order symptoms were first seen
+        patterns.sort(key=lambda p: (p[0], p[1]))
+        result = [p[2] for p in patterns]
+        result.sort(key=lambda x: (x.frequency, x.confidence), reverse=True)
+        return result
+    
+    def detect_gluten_exposures(self, entries: Entries) -> List[GlutenExposure]:
+        """Detect potential gluten exposure incidents"""
+        frame = self._frame(entries)
+        severity = self._gluten_reaction_severity(frame)
+        duration = self._symptom_duration(frame)
+        
+        # Only significant reactions after eating something with gluten
+        rows = np.flatnonzero(frame.has_gluten & frame.has_symptom_text & (severity > 0.3))
+        return [
+            GlutenExposure(
+                date=str(frame.dates[row]),
+                suspected_food=", ".join(frame.gluten_items[row]),
+                symptoms=[frame.symptom_names[c] for c in np.flatnonzero(frame.symptoms[row])],
+                severity=float(severity[row]),
+                duration_hours=float(duration[row]),
+                recovery_time=24.0 * float(severity[row])  # Assume 1 day per severity unit
             )
-            avg_fiber = statistics.mean([d[0] for d in fiber_data])
-            
+            for row in rows
+        ]
+    
+    def analyze_nutritional_impact(self, entries: Entries) -> List[NutritionalImpact]:
+        """Analyze nutritional impact on health"""
+        frame = self._frame(entries)
+        scores = self._health_scores(frame)
+        nutritional_impacts = []
+        
+        for nutrient, values, threshold, recommended in (
+            ("Hydration (L/day)", frame.hydration, 2.0, 2.5),
+            ("Fiber (g/day)", frame.fiber, 25.0, 30.0),
+        ):
+            logged = values > 0
+            if not logged.any():
+                continue
+            x = values[logged]
+            average = float(x.mean())
             nutritional_impacts.append(NutritionalImpact(
-                nutrient="Fiber (g/day)",
-                deficiency_risk=1.0 if avg_fiber < 25.0 else 0.0,
-                correlation_with_symptoms=abs(fiber_correlation),
-                recommended_intake=30.0,
-                current_avg=avg_fiber
+                nutrient=nutrient,
+                deficiency_risk=1.0 if average < threshold else 0.0,
+                correlation_with_symptoms=abs(self._calculate_correlation(x, scores[logged])),
+                recommended_intake=recommended,
+                current_avg=average
             ))
         
         return nutritional_impacts
     
-    def analyze_health_trends(self, entries: List[HealthEntry]) -> List[HealthTrend]:
+    def analyze_health_trends(self, entries: Entries) -> List[HealthTrend]:
         """Analyze health trends over time"""
+        frame = self._frame(entries)
         trends = []
         
-        if len(entries) < 7:  # Need at least a week of data
+        if len(frame) < 7:  # Need at least a week of data
             return trends
         
-        # Sort entries by date
-        entries.sort(key=lambda x: x.date)
-        
-        # Analyze different metrics
+        # Compare the first and second half of the window in date order
+        order = np.argsort(frame.dates, kind='stable')
+        half = len(order) // 2
         metrics = {
-            'energy_level': [entry.energy_level for entry in entries],
-            'bristol_scale': [entry.stool for entry in entries],
-            'hydration': [entry.hydration_liters for entry in entries],
-            'fiber': [entry.fiber_grams for entry in entries]
+            'energy_level': frame.energy,
+            'bristol_scale': frame.stool.astype(np.float64),
+            'hydration': frame.hydration,
+            'fiber': frame.fiber
         }
         
         for metric_name, values in metrics.items():
-            if len(values) >= 7:
-                # Calculate trend over time
-                first_half = values[:len(values)//2]
-                second_half = values[len(values)//2:]
-                
-                first_avg = statistics.mean(first_half)
-                second_avg = statistics.mean(second_half)
-                
-                change_percentage = ((second_avg - first_avg) / first_avg * 100) if first_avg > 0 else 0
-                
-                # Determine trend direction
-                if change_percentage > 5:
-                    trend_direction = 'improving'
-                elif change_percentage < -5:
-                    trend_direction = 'declining'
-                else:
-                    trend_direction = 'stable'
-                
-                # Calculate significance (how confident we are in this trend)
-                significance = min(1.0, len(values) / 30.0)  # More data = more significant
-                
-                trends.append(HealthTrend(
-                    metric=metric_name.replace('_', ' ').title(),
-                    time_period=f"{len(entries)} days",
-                    trend_direction=trend_direction,
-                    change_percentage=abs(change_percentage),
-                    significance=significance
-                ))
+            values = values[order]
+            first_avg = float(values[:half].mean())
+            second_avg = float(values[half:].mean())
+            
+            change_percentage = ((second_avg - first_avg) / first_avg * 100) if first_avg > 0 else 0
+            
+            # Determine trend direction
+            if change_percentage > 5:
+                trend_direction = 'improving'
+            elif change_percentage < -5:
+                trend_direction = 'declining'
+            else:
+                trend_direction = 'stable'
+            
+            trends.append(HealthTrend(
+                metric=metric_name.replace('_', ' ').title(),
+                time_period=f"{len(frame)} days",
+                trend_direction=trend_direction,
+                change_percentage=abs(change_percentage),
+                significance=min(1.0, len(values) / 30.0)  # More data = more significant
+            ))
         
         return trends
     
-    def generate_health_insights(self, entries: List[HealthEntry]) -> Dict[str, Any]:
+    def analyze_symptom_lag(self, entries: Entries, max_lag_days: int = 3) -> List[Dict[str, float]]:
+        """
+        Measure how often symptoms follow gluten-containing meals
+        
+        Args:
+            entries: Health entries or a HealthFrame
+            max_lag_days: Longest delay between meal and symptoms to check
+            
+        Returns:
+            One dict per lag (0..max_lag_days) with the share of days with
+            symptoms that many days after a gluten day ('rate'), the share
+            over all days ('baseline') and their ratio ('lift')
+        """
+        frame = self._frame(entries)
+        valid = frame.days >= 0
+        if not valid.any():
+            return []
+        
+        # Per-day flags over the whole span, including days without entries
+        first_day = int(frame.days[valid].min())
+        day_index = frame.days[valid] - first_day
+        span = int(day_index.max()) + 1
+        symptom_day = np.zeros(span, dtype=bool)
+        gluten_day = np.zeros(span, dtype=bool)
+        symptom_day[day_index[frame.symptoms[valid].any(axis=1)]] = True
+        gluten_day[day_index[frame.has_gluten[valid]]] = True
+        baseline = float(symptom_day.mean())
+        
+        lags = []
+        for lag in range(max_lag_days + 1):
+            exposed = gluten_day[:span - lag]
+            if not exposed.any():
+                break
+            rate = float(symptom_day[lag:][exposed].mean())
+            lags.append({
+                'lag_days': lag,
+                'rate': rate,
+                'baseline': baseline,
+                'lift': rate / baseline if baseline > 0 else 0.0
+            })
+        return lags
+    
+    def generate_health_insights(self, entries: Entries) -> Dict[str, Any]:
         """Generate comprehensive health insights"""
         insights = {
             'summary': {},
@@ -328,21 +473,24 @@ class HealthPatternAnalyzer:
             'gluten_exposures': [],
             'nutritional_impacts': [],
             'health_trends': [],
+            'symptom_lag': [],
             'recommendations': []
         }
         
-        if not entries:
+        frame = self._frame(entries)
+        if not len(frame):
             insights['summary'] = {'message': 'No health data available for analysis'}
             return insights
         
         # Generate summary statistics
-        insights['summary'] = self._generate_summary_stats(entries)
+        insights['summary'] = self._generate_summary_stats(frame)
         
-        # Analyze different aspects
-        insights['symptom_patterns'] = self.analyze_symptom_patterns(entries)
-        insights['gluten_exposures'] = self.detect_gluten_exposures(entries)
-        insights['nutritional_impacts'] = self.analyze_nutritional_impact(entries)
-        insights['health_trends'] = self.analyze_health_trends(entries)
+        # Analyze different aspects over the same arrays
+        insights['symptom_patterns'] = self.analyze_symptom_patterns(frame)
+        insights['gluten_exposures'] = self.detect_gluten_exposures(frame)
+        insights['nutritional_impacts'] = self.analyze_nutritional_impact(frame)
+        insights['health_trends'] = self.analyze_health_trends(frame)
+        insights['symptom_lag'] = self.analyze_symptom_lag(frame)
         
         # Generate recommendations
         insights['recommendations'] = self._generate_recommendations(insights)
@@ -351,6 +499,12 @@ class HealthPatternAnalyzer:
     
     # Helper methods
     
+    def _frame(self, entries: Entries) -> HealthFrame:
+        """Columnar view of entries, built once per analysis"""
+        if isinstance(entries, HealthFrame):
+            return entries
+        return HealthFrame.from_entries(entries, self.celiac_symptoms)
+    
     def _extract_symptoms(self, symptoms_text: str) -> List[str]:
         """Extract individual symptoms from text"""
         if not symptoms_text:
@@ -367,129 +521,97 @@ class HealthPatternAnalyzer:
     
     def _extract_food_items(self, items_text: str) -> List[str]:
         """Extract food items from text"""
-        if not items_text:
-            return []
-        
-        # Split by common delimiters and clean up
-        items = re.split(r'[,;|\n\r]+', items_text)
-        return [item.strip() for item in items if item.strip()]
+        return split_food_items(items_text)
     
     def _contains_gluten_ingredients(self, food_item: str) -> bool:
         """Check if food item contains gluten ingredients"""
-        food_item = food_item.lower()
-        return any(ingredient in food_item for ingredient in self.gluten_ingredients)
+        return self.lexicon.classify(food_item).contains_gluten
     
-    def _estimate_symptom_severity(self, entry: HealthEntry) -> float:
-        """Estimate symptom severity based on entry data"""
-        severity = 0.0
+    def _symptom_severity(self, frame: HealthFrame) -> np.ndarray:
+        """Estimated symptom severity per entry (0-1)"""
+        severity = np.zeros(len(frame))
         
         # Bristol scale severity (1-2 or 6-7 are concerning)
-        if entry.stool in [1, 2, 6, 7]:
-            severity += 0.4
+        severity += np.where(frame.bad_stool, 0.4, 0.0)
         
         # Low energy level
-        if entry.energy_level <= 3:
-            severity += 0.3
+        severity += np.where(frame.energy <= 3, 0.3, 0.0)
         
         # Poor mood
-        if entry.mood in ['poor', 'terrible', 'awful']:
-            severity += 0.3
+        severity += np.where(frame.mood >= MOOD_POOR, 0.3, 0.0)
         
-        return min(1.0, severity)
+        return np.minimum(1.0, severity)
     
-    def _estimate_symptom_duration(self, entry: HealthEntry) -> float:
-        """Estimate symptom duration in hours"""
+    def _symptom_duration(self, frame: HealthFrame) -> np.ndarray:
+        """Estimated symptom duration in hours per entry"""
         # This is a simplified estimation - in a real app you'd track actual duration
-        if entry.stool in [1, 2, 6, 7]:
-            return 24.0  # Assume digestive symptoms last about a day
-        return 8.0  # Assume other symptoms last about 8 hours
+        # Digestive symptoms last about a day, others about 8 hours
+        return np.where(frame.bad_stool, 24.0, 8.0)
     
-    def _calculate_gluten_reaction_severity(self, entry: HealthEntry) -> float:
-        """Calculate severity of potential gluten reaction"""
-        severity = 0.0
-        
-        # Check for digestive symptoms
-        digestive_symptoms = ['diarrhea', 'constipation', 'bloating', 'gas', 'abdominal pain']
-        symptoms = self._extract_symptoms(entry.symptoms)
-        
-        for symptom in symptoms:
-            if symptom in digestive_symptoms:
-                severity += 0.3
-            elif symptom in ['nausea', 'vomiting']:
-                severity += 0.4
-            elif symptom in ['fatigue', 'brain fog']:
-                severity += 0.2
+    def _gluten_reaction_severity(self, frame: HealthFrame) -> np.ndarray:
+        """Severity of a potential gluten reaction per entry (0-1)"""
+        weights = {'diarrhea': 0.3, 'constipation': 0.3, 'bloating': 0.3, 'gas': 0.3,
+                   'abdominal pain': 0.3, 'nausea': 0.4, 'vomiting': 0.4,
+                   'fatigue': 0.2, 'brain fog': 0.2}
+        severity = np.zeros(len(frame))
+        
+        # Symptoms add up in symptom order
+        for column, symptom in enumerate(frame.symptom_names):
+            if symptom in weights:
+                severity += np.where(frame.symptoms[:, column], weights[symptom], 0.0)
         
         # Check Bristol scale
-        if entry.stool in [1, 2, 6, 7]:
-            severity += 0.3
+        severity += np.where(frame.bad_stool, 0.3, 0.0)
         
-        return min(1.0, severity)
-    
-    def _estimate_recovery_time(self, entry: HealthEntry) -> float:
-        """Estimate recovery time in hours"""
-        severity = self._calculate_gluten_reaction_severity(entry)
-        return 24.0 * severity  # Assume 1 day per severity unit
+        return np.minimum(1.0, severity)
     
-    def _get_health_score(self, entry: HealthEntry) -> float:
-        """Calculate overall health score for an entry (0-1, higher is better)"""
-        score = 0.5  # Base score
+    def _health_scores(self, frame: HealthFrame) -> np.ndarray:
+        """Overall health score per entry (0-1, higher is better)"""
+        score = np.full(len(frame), 0.5)  # Base score
         
         # Bristol scale (4 is ideal)
-        if entry.stool == 4:
-            score += 0.2
-        elif entry.stool in [3, 5]:
-            score += 0.1
+        score += np.where(frame.stool == 4, 0.2, np.where((frame.stool == 3) | (frame.stool == 5), 0.1, 0.0))
         
         # Energy level (higher is better)
-        score += (entry.energy_level - 5) * 0.1
+        score += (frame.energy - 5) * 0.1
         
         # Mood
-        if entry.mood in ['excellent', 'great', 'good']:
-            score += 0.2
-        elif entry.mood in ['poor', 'terrible']:
-            score -= 0.2
+        score += np.where(frame.mood == MOOD_GOOD, 0.2, np.where(frame.mood == MOOD_POOR, -0.2, 0.0))
         
         # Hydration (optimal around 2.5L)
-        if 2.0 <= entry.hydration_liters <= 3.0:
-            score += 0.1
+        score += np.where((frame.hydration >= 2.0) & (frame.hydration <= 3.0), 0.1, 0.0)
         
-        return max(0.0, min(1.0, score))
+        return np.clip(score, 0.0, 1.0)
     
-    def _calculate_correlation(self, x_values: List[float], y_values: List[float]) -> float:
-        """Calculate correlation coefficient between two lists"""
-        if len(x_values) != len(y_values) or len(x_values) < 2:
+    def _calculate_correlation(self, x_values: Sequence[float], y_values: Sequence[float]) -> float:
+        """Calculate Pearson correlation coefficient between two sequences"""
+        x = np.asarray(x_values, dtype=np.float64)
+        y = np.asarray(y_values, dtype=np.float64)
+        if x.shape != y.shape or len(x) < 2:
             return 0.0
         
-        try:
-            x_mean = statistics.mean(x_values)
-            y_mean = statistics.mean(y_values)
-            
-            numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_values, y_values))
-            x_variance = sum((x - x_mean) ** 2 for x in x_values)
-            y_variance = sum((y - y_mean) ** 2 for y in y_values)
-            
-            if x_variance == 0 or y_variance == 0:
-                return 0.0
-            
-            correlation = numerator / (x_variance * y_variance) ** 0.5
-            return correlation
-        except:
+        dx = x - x.mean()
+        dy = y - y.mean()
+        x_variance = float(dx @ dx)
+        y_variance = float(dy @ dy)
+        if x_variance == 0 or y_variance == 0:
             return 0.0
+        return float(dx @ dy) / (x_variance * y_variance) ** 0.5
     
-    def _generate_summary_stats(self, entries: List[HealthEntry]) -> Dict[str, Any]:
+    def _generate_summary_stats(self, entries: Entries) -> Dict[str, Any]:
         """Generate summary statistics"""
-        if not entries:
+        frame = self._frame(entries)
+        if not len(frame):
             return {}
         
-        total_days = len(entries)
-        symptoms_days = len([e for e in entries if e.symptoms])
-        avg_energy = statistics.mean([e.energy_level for e in entries]) if entries else 0
-        avg_bristol = statistics.mean([e.stool for e in entries]) if entries else 0
-        hydration_values = [e.hydration_liters for e in entries if e.hydration_liters > 0]
-        avg_hydration = statistics.mean(hydration_values) if hydration_values else 0
-        fiber_values = [e.fiber_grams for e in entries if e.fiber_grams > 0]
-        avg_fiber = statistics.mean(fiber_values) if fiber_values else 0
+        total_days = len(frame)
+        symptoms_days = int(frame.has_symptom_text.sum())
+        avg_energy = float(frame.energy.mean())
+        avg_bristol = float(frame.stool.mean())
+        hydration_values = frame.hydration[frame.hydration > 0]
+        avg_hydration = float(hydration_values.mean()) if len(hydration_values) else 0
+        fiber_values = frame.fiber[frame.fiber > 0]
+        avg_fiber = float(fiber_values.mean()) if len(fiber_values) else 0
         
         return {
             'total_days_tracked': total_days,
@@ -545,19 +667,16 @@ class HealthPatternAnalyzer:
 def analyze_health_patterns(db_path: str = "data/celiogix.db", days_back: int = 90) -> Dict[str, Any]:
     """Analyze health patterns from the database"""
     analyzer = HealthPatternAnalyzer(db_path)
-    entries = analyzer.get_health_entries(days_back)
-    return analyzer.generate_health_insights(entries)
+    return analyzer.generate_health_insights(analyzer.get_health_frame(days_back))
 
 
 def get_symptom_correlations(db_path: str = "data/celiogix.db") -> List[SymptomPattern]:
     """Get symptom correlation patterns"""
     analyzer = HealthPatternAnalyzer(db_path)
-    entries = analyzer.get_health_entries()
-    return analyzer.analyze_symptom_patterns(entries)
+    return analyzer.analyze_symptom_patterns(analyzer.get_health_frame())
 
 
 def detect_gluten_exposures(db_path: str = "data/celiogix.db") -> List[GlutenExposure]:
     """Detect potential gluten exposure incidents"""
     analyzer = HealthPatternAnalyzer(db_path)
-    entries = analyzer.get_health_entries()
-    return analyzer.detect_gluten_exposures(entries)
+    return analyzer.detect_gluten_exposures(analyzer.get_health_frame())
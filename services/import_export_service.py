@@ -6,6 +6,7 @@ Handles bulk import/export operations for all panels
 
 import json
 import csv
+import gzip
 import os
 import shutil
 from datetime import datetime
@@ -20,6 +21,7 @@ from reportlab.lib import colors
 from reportlab.lib.units import inch
 
 from utils.db import get_connection
+from utils.export_stream import FORMATS as STREAM_FORMATS, export_query
 from utils.recipes import RecipeManager
 from services.pantry import PantryService
 from utils.shopping_list import ShoppingListManager
@@ -27,6 +29,43 @@ from utils.menu_planner import MenuPlanner
 from utils.calendar import CalendarManager
 from utils.health_log import HealthLogManager
 
+# Export query per panel; rows are streamed in this order
+EXPORT_QUERIES = {
+    'cookbook': """
+        SELECT r.id, r.title, r.description, r.instructions, r.prep_time, r.cook_time,
+               r.servings, r.difficulty, r.category, r.tags, r.source, r.url, r.rating,
+               (SELECT json_group_array(json_object('name', i.ingredient_name, 'quantity', i.quantity,
+                                                    'unit', i.unit, 'notes', i.notes))
+                FROM recipe_ingredients i WHERE i.recipe_id = r.id) AS ingredients
+        FROM recipes r ORDER BY r.title
+    """,
+    'pantry': """
+        SELECT id, name, brand, category, subcategory, quantity, unit, net_weight,
+               store, expiration, gf_flag, tags, notes
+        FROM pantry ORDER BY name
+    """,
+    'calendar': """
+        SELECT id, name, date, time, event_type, priority, description, reminder, created_date
+        FROM calendar_events ORDER BY date, time
+    """,
+    'menu_planner': """
+        SELECT id, date, meal, time, recipe_id, title, portions, notes
+        FROM menu_plan ORDER BY date, meal
+    """,
+    'health_log': """
+        SELECT id, date, time, meal, meal_type, items, risk, onset_min, severity, stool,
+               recipe, symptoms, notes, hydration_liters, fiber_grams, mood, energy_level
+        FROM health_log ORDER BY date DESC, time DESC
+    """,
+    'shopping_list': """
+        SELECT id, item_name, quantity, category, store, priority, notes, created_date
+        FROM shopping_list ORDER BY priority DESC, item_name
+    """,
+}
+
+# Query columns holding JSON text that the JSON exports nest
+EXPORT_JSON_COLUMNS = ('ingredients',)
+
 
 class ImportExportService:
     """Service for handling bulk import/export operations"""
@@ -42,8 +81,6 @@ class ImportExportService:
         
         # Supported formats
         self.supported_formats = {
-            'csv': self._export_csv,
-            'json': self._export_json,
             'excel': self._export_excel,
             'pdf': self._export_pdf
         }
@@ -51,13 +88,32 @@ class ImportExportService:
         self.import_formats = {
             'csv': self._import_csv,
             'json': self._import_json,
+            'ndjson': self._import_ndjson,
             'excel': self._import_excel
         }
     
     def export_panel_data(self, panel_name: str, file_path: str, format_type: str = 'csv', 
-                         include_metadata: bool = True) -> bool:
-        """Export data for a specific panel"""
+                         include_metadata: bool = True, compress: Optional[bool] = None) -> bool:
+        """
+        Export data for a specific panel
+
+        CSV, JSON and NDJSON are streamed from the database block by block;
+        compress (or a path ending in .gz) gzips them. Cookbook PDFs are
+        written one recipe page at a time.
+        """
         try:
+            if format_type in STREAM_FORMATS:
+                if panel_name not in EXPORT_QUERIES:
+                    raise ValueError(f"No data found for panel: {panel_name}")
+                self._stream_panel(panel_name, file_path, format_type, include_metadata, compress)
+                return True
+
+            if format_type == 'pdf' and panel_name == 'cookbook':
+                # Recipes are rendered as a cookbook, streamed page by page
+                from services.recipe_pdf import export_recipes_pdf
+                export_recipes_pdf(self.db, file_path)
+                return True
+
             if format_type not in self.supported_formats:
                 raise ValueError(f"Unsupported format: {format_type}")
             
@@ -98,26 +154,30 @@ class ImportExportService:
             return False, f"Error importing {panel_name} data: {e}"
     
     def export_all_data(self, output_dir: str, format_type: str = 'json', 
-                       include_metadata: bool = True) -> bool:
-        """Export all application data"""
+                       include_metadata: bool = True, compress: bool = False) -> bool:
+        """Export all application data, one file per panel"""
         try:
             os.makedirs(output_dir, exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            panels = ['cookbook', 'pantry', 'calendar', 'menu_planner', 'health_log', 'shopping_list']
-            
-            for panel in panels:
-                data = self._get_panel_data(panel)
-                if data:
-                    filename = f"{panel}_export_{timestamp}.{format_type}"
-                    file_path = os.path.join(output_dir, filename)
-                    
-                    export_func = self.supported_formats[format_type]
-                    export_func(data, file_path, panel, include_metadata)
+            extension = 'xlsx' if format_type == 'excel' else format_type
+            
+            counts = {}
+            for panel in EXPORT_QUERIES:
+                filename = f"{panel}_export_{timestamp}.{extension}"
+                file_path = os.path.join(output_dir, filename)
+                if format_type in STREAM_FORMATS:
+                    if compress:
+                        file_path += '.gz'
+                    counts[panel] = self._stream_panel(panel, file_path, format_type, include_metadata, compress)
+                else:
+                    data = self._get_panel_data(panel)
+                    counts[panel] = len(data)
+                    if data:
+                        self.supported_formats[format_type](data, file_path, panel, include_metadata)
             
             # Create summary file
             summary_file = os.path.join(output_dir, f"export_summary_{timestamp}.txt")
-            self._create_export_summary(summary_file, panels)
+            self._create_export_summary(summary_file, counts)
             
             return True
             
@@ -125,287 +185,56 @@ class ImportExportService:
             print(f"Error exporting all data: {e}")
             return False
     
+    def _stream_panel(self, panel_name: str, file_path: str, format_type: str,
+                      include_metadata: bool = True, compress: Optional[bool] = None) -> int:
+        """
+        Stream a panel's rows to a file without loading them
+
+        Returns:
+            Number of records written
+        """
+        export_date = datetime.now()
+        comments = []
+        if format_type == 'csv' and include_metadata:
+            comments = [
+                f"CeliacShield Export - {panel_name}",
+                f"Export Date: {export_date.strftime('%Y-%m-%d %H:%M:%S')}",
+                "Application Version: 1.0",
+                "",
+            ]
+        header = {'panel': panel_name, 'export_date': export_date.isoformat()}
+
+        def trailer(count: int) -> Dict[str, Any]:
+            fields = {'record_count': count}
+            if include_metadata:
+                fields['metadata'] = {'version': '1.0', 'application': 'CeliacShield', 'format': 'json'}
+            return fields
+
+        return export_query(
+            self.db, EXPORT_QUERIES[panel_name], file_path, format_type,
+            compress=compress, comments=comments, header=header, trailer=trailer,
+            json_columns=EXPORT_JSON_COLUMNS,
+        )
+    
     def _get_panel_data(self, panel_name: str) -> List[Dict[str, Any]]:
-        """Get data for a specific panel"""
+        """Get data for a specific panel as a list (for the Excel and PDF exports)"""
         try:
-            if panel_name == 'cookbook':
-                return self._get_recipe_data()
-            elif panel_name == 'pantry':
-                return self._get_pantry_data()
-            elif panel_name == 'calendar':
-                return self._get_calendar_data()
-            elif panel_name == 'menu_planner':
-                return self._get_menu_data()
-            elif panel_name == 'health_log':
-                return self._get_health_data()
-            elif panel_name == 'shopping_list':
-                return self._get_shopping_data()
-            else:
+            if panel_name not in EXPORT_QUERIES:
                 return []
+            cursor = self.db.execute(EXPORT_QUERIES[panel_name])
+            columns = [d[0] for d in cursor.description]
+            rows = []
+            for row in cursor:
+                item = dict(zip(columns, row))
+                for column in EXPORT_JSON_COLUMNS:
+                    if isinstance(item.get(column), str):
+                        item[column] = json.loads(item[column])
+                rows.append(item)
+            return rows
         except Exception as e:
             print(f"Error getting {panel_name} data: {e}")
             return []
     
-    def _get_recipe_data(self) -> List[Dict[str, Any]]:
-        """Get recipe data"""
-        try:
-            cursor = self.db.cursor()
-            cursor.execute("""
-                SELECT id, title, description, instructions, prep_time, cook_time,
-                       servings, difficulty, category, tags, created_at, updated_at
-                FROM recipes ORDER BY title
-            """)
-            
-            recipes = []
-            for row in cursor.fetchall():
-                recipes.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'description': row[2],
-                    'instructions': row[3],
-                    'prep_time': row[4],
-                    'cook_time': row[5],
-                    'servings': row[6],
-                    'difficulty': row[7],
-                    'category': row[8],
-                    'tags': row[9],
-                    'created_at': row[10],
-                    'updated_at': row[11]
-                })
-            
-            # Get ingredients for each recipe
-            for recipe in recipes:
-                cursor.execute("""
-                    SELECT ingredient_name, quantity, unit, notes
-                    FROM recipe_ingredients WHERE recipe_id = ?
-                    ORDER BY ingredient_name
-                """, (recipe['id'],))
-                
-                ingredients = []
-                for ing_row in cursor.fetchall():
-                    ingredients.append({
-                        'name': ing_row[0],
-                        'quantity': ing_row[1],
-                        'unit': ing_row[2],
-                        'notes': ing_row[3]
-                    })
-                
-                recipe['ingredients'] = ingredients
-            
-            return recipes
-            
-        except Exception as e:
-            print(f"Error getting recipe data: {e}")
-            return []
-    
-    def _get_pantry_data(self) -> List[Dict[str, Any]]:
-        """Get pantry data"""
-        try:
-            cursor = self.db.cursor()
-            cursor.execute("""
-                SELECT id, name, category, quantity, unit, expiration_date,
-                       gluten_free, notes, created_at, updated_at
-                FROM pantry_items ORDER BY name
-            """)
-            
-            items = []
-            for row in cursor.fetchall():
-                items.append({
-                    'id': row[0],
-                    'name': row[1],
-                    'category': row[2],
-                    'quantity': row[3],
-                    'unit': row[4],
-                    'expiration_date': row[5],
-                    'gluten_free': row[6],
-                    'notes': row[7],
-                    'created_at': row[8],
-                    'updated_at': row[9]
-                })
-            
-            return items
-            
-        except Exception as e:
-            print(f"Error getting pantry data: {e}")
-            return []
-    
-    def _get_calendar_data(self) -> List[Dict[str, Any]]:
-        """Get calendar data"""
-        try:
-            cursor = self.db.cursor()
-            cursor.execute("""
-                SELECT id, title, description, start_date, end_date, event_type,
-                       priority, reminder_minutes, created_at, updated_at
-                FROM calendar_events ORDER BY start_date
-            """)
-            
-            events = []
-            for row in cursor.fetchall():
-                events.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'description': row[2],
-                    'start_date': row[3],
-                    'end_date': row[4],
-                    'event_type': row[5],
-                    'priority': row[6],
-                    'reminder_minutes': row[7],
-                    'created_at': row[8],
-                    'updated_at': row[9]
-                })
-            
-            return events
-            
-        except Exception as e:
-            print(f"Error getting calendar data: {e}")
-            return []
-    
-    def _get_menu_data(self) -> List[Dict[str, Any]]:
-        """Get menu planner data"""
-        try:
-            cursor = self.db.cursor()
-            cursor.execute("""
-                SELECT id, date, meal_type, recipe_id, recipe_title, servings,
-                       notes, created_at, updated_at
-                FROM menu_plans ORDER BY date, meal_type
-            """)
-            
-            meals = []
-            for row in cursor.fetchall():
-                meals.append({
-                    'id': row[0],
-                    'date': row[1],
-                    'meal_type': row[2],
-                    'recipe_id': row[3],
-                    'recipe_title': row[4],
-                    'servings': row[5],
-                    'notes': row[6],
-                    'created_at': row[7],
-                    'updated_at': row[8]
-                })
-            
-            return meals
-            
-        except Exception as e:
-            print(f"Error getting menu data: {e}")
-            return []
-    
-    def _get_health_data(self) -> List[Dict[str, Any]]:
-        """Get health log data"""
-        try:
-            cursor = self.db.cursor()
-            cursor.execute("""
-                SELECT id, date, symptoms, severity, notes, gluten_exposure,
-                       created_at, updated_at
-                FROM health_log ORDER BY date DESC
-            """)
-            
-            entries = []
-            for row in cursor.fetchall():
-                entries.append({
-                    'id': row[0],
-                    'date': row[1],
-                    'symptoms': row[2],
-                    'severity': row[3],
-                    'notes': row[4],
-                    'gluten_exposure': row[5],
-                    'created_at': row[6],
-                    'updated_at': row[7]
-                })
-            
-            return entries
-            
-        except Exception as e:
-            print(f"Error getting health data: {e}")
-            return []
-    
-    def _get_shopping_data(self) -> List[Dict[str, Any]]:
-        """Get shopping list data"""
-        try:
-            cursor = self.db.cursor()
-            cursor.execute("""
-                SELECT id, item_name, category, quantity, unit, store,
-                       priority, notes, completed, created_at, updated_at
-                FROM shopping_items ORDER BY priority DESC, item_name
-            """)
-            
-            items = []
-            for row in cursor.fetchall():
-                items.append({
-                    'id': row[0],
-                    'item_name': row[1],
-                    'category': row[2],
-                    'quantity': row[3],
-                    'unit': row[4],
-                    'store': row[5],
-                    'priority': row[6],
-                    'notes': row[7],
-                    'completed': row[8],
-                    'created_at': row[9],
-                    'updated_at': row[10]
-                })
-            
-            return items
-            
-        except Exception as e:
-            print(f"Error getting shopping data: {e}")
-            return []
-    
-    def _export_csv(self, data: List[Dict[str, Any]], file_path: str, 
-                   panel_name: str, include_metadata: bool = True) -> bool:
-        """Export data to CSV format"""
-        try:
-            if not data:
-                return False
-            
-            # Flatten nested data for CSV
-            flattened_data = self._flatten_data_for_csv(data)
-            
-            # Get fieldnames from first item
-            fieldnames = list(flattened_data[0].keys()) if flattened_data else []
-            
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(flattened_data)
-            
-            # Add metadata if requested
-            if include_metadata:
-                self._add_csv_metadata(file_path, panel_name, len(data))
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error exporting CSV: {e}")
-            return False
-    
-    def _export_json(self, data: List[Dict[str, Any]], file_path: str, 
-                    panel_name: str, include_metadata: bool = True) -> bool:
-        """Export data to JSON format"""
-        try:
-            export_data = {
-                'panel': panel_name,
-                'export_date': datetime.now().isoformat(),
-                'record_count': len(data),
-                'data': data
-            }
-            
-            if include_metadata:
-                export_data['metadata'] = {
-                    'version': '1.0',
-                    'application': 'CeliacShield',
-                    'format': 'json'
-                }
-            
-            with open(file_path, 'w', encoding='utf-8') as jsonfile:
-                json.dump(export_data, jsonfile, indent=2, ensure_ascii=False)
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error exporting JSON: {e}")
-            return False
-    
     def _export_excel(self, data: List[Dict[str, Any]], file_path: str, 
                      panel_name: str, include_metadata: bool = True) -> bool:
         """Export data to Excel format"""
@@ -545,37 +374,25 @@ class ImportExportService:
         
         return flattened
     
-    def _add_csv_metadata(self, file_path: str, panel_name: str, record_count: int):
-        """Add metadata to CSV file"""
-        try:
-            # Read existing content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Create metadata comment
-            metadata = f"# CeliacShield Export - {panel_name}\n"
-            metadata += f"# Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            metadata += f"# Record Count: {record_count}\n"
-            metadata += f"# Application Version: 1.0\n"
-            metadata += f"#\n"
-            
-            # Write back with metadata
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(metadata + content)
-                
-        except Exception as e:
-            print(f"Error adding CSV metadata: {e}")
-    
     def _get_file_format(self, file_path: str) -> str:
         """Determine file format from extension"""
-        ext = Path(file_path).suffix.lower().lstrip('.')
+        suffixes = [suffix.lower().lstrip('.') for suffix in Path(file_path).suffixes]
+        if suffixes and suffixes[-1] == 'gz':
+            suffixes.pop()
+        ext = suffixes[-1] if suffixes else ''
         return ext if ext in self.import_formats else 'unknown'
     
+    def _open_text(self, file_path: str):
+        """Open an export for reading, decompressing .gz files"""
+        if file_path.lower().endswith('.gz'):
+            return gzip.open(file_path, 'rt', encoding='utf-8', newline='')
+        return open(file_path, 'r', encoding='utf-8', newline='')
+    
     def _import_csv(self, file_path: str) -> List[Dict[str, Any]]:
         """Import data from CSV file"""
         try:
             data = []
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
+            with self._open_text(file_path) as csvfile:
                 # Skip metadata lines
                 lines = csvfile.readlines()
                 data_lines = []
@@ -604,7 +421,7 @@ class ImportExportService:
     def _import_json(self, file_path: str) -> List[Dict[str, Any]]:
         """Import data from JSON file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as jsonfile:
+            with self._open_text(file_path) as jsonfile:
                 import_data = json.load(jsonfile)
             
             # Handle different JSON structures
@@ -622,6 +439,15 @@ class ImportExportService:
             print(f"Error importing JSON: {e}")
             return []
     
+    def _import_ndjson(self, file_path: str) -> List[Dict[str, Any]]:
+        """Import data from a newline-delimited JSON file"""
+        try:
+            with self._open_text(file_path) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except Exception as e:
+            print(f"Error importing NDJSON: {e}")
+            return []
+    
     def _import_excel(self, file_path: str) -> List[Dict[str, Any]]:
         """Import data from Excel file"""
         try:
@@ -1034,7 +860,7 @@ class ImportExportService:
             self.db.rollback()
             return False, f"Error importing shopping items: {e}"
     
-    def _create_export_summary(self, file_path: str, panels: List[str]):
+    def _create_export_summary(self, file_path: str, counts: Dict[str, int]):
         """Create a summary file for the export"""
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -1042,12 +868,10 @@ class ImportExportService:
                 f.write("=" * 40 + "\n\n")
                 f.write(f"Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write(f"Application: CeliacShield v1.0\n")
-                f.write(f"Exported Panels: {', '.join(panels)}\n\n")
+                f.write(f"Exported Panels: {', '.join(counts)}\n\n")
                 
                 # Add record counts
-                for panel in panels:
-                    data = self._get_panel_data(panel)
-                    count = len(data) if data else 0
+                for panel, count in counts.items():
                     f.write(f"{panel.replace('_', ' ').title()}: {count} records\n")
                 
                 f.write(f"\nExport completed successfully.\n")
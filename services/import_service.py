@@ -9,12 +9,26 @@ import csv
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, List, Optional, Union
 from PySide6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
 from PySide6.QtCore import QThread, Signal, QObject
 import pandas as pd
 from pathlib import Path
 
+from utils.csvio import executemany_batched, iter_csv_rows, parse_float, parse_int
+
+# Spreadsheet-style headers of exported files, after lowercasing
+IMPORT_ALIASES = {
+    'expiry date': 'expiry_date',
+    'gluten free': 'gluten_free',
+    'item name': 'item_name',
+    'bristol scale': 'bristol_scale',
+    'prep time': 'prep_time',
+    'cook time': 'cook_time',
+    'meal type': 'meal_type',
+    'event type': 'event_type',
+}
+
 
 class ImportWorker(QObject):
     """Worker thread for import operations"""
@@ -345,9 +359,8 @@ class ImportService:
     def _import_csv_data(self, parent, panel_type: str, file_path: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
         """Import CSV data"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                data = list(reader)
+            # Stream the rows: the panel importers insert them batch by batch
+            data = iter_csv_rows(file_path, IMPORT_ALIASES)
             
             if panel_type in self.panel_mappings:
                 return self.panel_mappings[panel_type](data, options)
@@ -409,13 +422,27 @@ class ImportService:
                 'imported_count': 0
             }
     
-    def _import_pantry_data(self, data: List[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Import pantry data"""
+    def _import_rows(self, label: str, sql: str, params: Iterable[tuple]) -> Dict[str, Any]:
+        """Insert parameter tuples in fixed-size batches in one transaction"""
+        from utils.db import get_connection
+        conn = get_connection()
         try:
-            from utils.db import get_connection
-            conn = get_connection()
-            imported_count = 0
-            
+            imported_count = executemany_batched(conn, sql, params)
+            conn.commit()
+            return {
+                'success': True,
+                'message': f'Successfully imported {imported_count} {label}',
+                'imported_count': imported_count
+            }
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            conn.close()
+    
+    def _import_pantry_data(self, data: Iterable[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Import pantry data"""
+        def params():
             for item in data:
                 # Map CSV columns to database columns
                 name = item.get('name', item.get('item_name', item.get('Name', '')))
@@ -423,24 +450,18 @@ class ImportService:
                 unit = item.get('unit', item.get('Unit', ''))
                 category = item.get('category', item.get('Category', 'Other'))
                 expiry_date = item.get('expiry_date', item.get('Expiry Date', ''))
-                gluten_free = item.get('gluten_free', item.get('Gluten Free', 'Yes'))
+                gluten_free = item.get('gluten_free', item.get('gf_flag', item.get('Gluten Free', 'Yes')))
                 notes = item.get('notes', item.get('Notes', ''))
                 
                 if name:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO pantry_items 
-                        (name, quantity, unit, category, expiry_date, gluten_free, notes, created_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (name, quantity, unit, category, expiry_date, gluten_free, notes, datetime.now().isoformat()))
-                    imported_count += 1
-            
-            conn.commit()
-            return {
-                'success': True,
-                'message': f'Successfully imported {imported_count} pantry items',
-                'imported_count': imported_count
-            }
-            
+                    yield (name, parse_float(quantity, 1.0), unit, category, expiry_date, gluten_free, notes)
+        
+        try:
+            return self._import_rows('pantry items', """
+                INSERT OR REPLACE INTO pantry 
+                (name, quantity, unit, category, expiration, gf_flag, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, params())
         except Exception as e:
             return {
                 'success': False,
@@ -448,13 +469,9 @@ class ImportService:
                 'imported_count': 0
             }
     
-    def _import_health_data(self, data: List[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _import_health_data(self, data: Iterable[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
         """Import health log data"""
-        try:
-            from utils.db import get_connection
-            conn = get_connection()
-            imported_count = 0
-            
+        def params():
             for entry in data:
                 # Map CSV columns to database columns
                 date = entry.get('date', entry.get('Date', ''))
@@ -470,20 +487,14 @@ class ImportService:
                 notes = entry.get('notes', entry.get('Notes', ''))
                 
                 if date:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO health_log 
-                        (date, time, meal, items, symptoms, stool, hydration_liters, fiber_grams, mood, energy_level, notes)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (date, time, meal, items, symptoms, stool, hydration, fiber, mood, energy, notes))
-                    imported_count += 1
-            
-            conn.commit()
-            return {
-                'success': True,
-                'message': f'Successfully imported {imported_count} health entries',
-                'imported_count': imported_count
-            }
-            
+                    yield (date, time, meal, items, symptoms, stool, hydration, fiber, mood, energy, notes)
+        
+        try:
+            return self._import_rows('health entries', """
+                INSERT OR REPLACE INTO health_log 
+                (date, time, meal, items, symptoms, stool, hydration_liters, fiber_grams, mood, energy_level, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, params())
         except Exception as e:
             return {
                 'success': False,
@@ -491,43 +502,31 @@ class ImportService:
                 'imported_count': 0
             }
     
-    def _import_recipe_data(self, data: List[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _import_recipe_data(self, data: Iterable[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
         """Import recipe data"""
-        try:
-            from utils.db import get_connection
-            conn = get_connection()
-            imported_count = 0
-            
+        def params():
             for recipe in data:
                 title = recipe.get('title', recipe.get('Title', recipe.get('name', '')))
                 description = recipe.get('description', recipe.get('Description', ''))
-                prep_time = recipe.get('prep_time', recipe.get('Prep Time', '0'))
-                cook_time = recipe.get('cook_time', recipe.get('Cook Time', '0'))
+                prep_time = recipe.get('prep_time', recipe.get('Prep Time', ''))
+                cook_time = recipe.get('cook_time', recipe.get('Cook Time', ''))
                 servings = recipe.get('servings', recipe.get('Servings', '1'))
                 difficulty = recipe.get('difficulty', recipe.get('Difficulty', 'Medium'))
-                cuisine_type = recipe.get('cuisine', recipe.get('Cuisine', ''))
+                category = recipe.get('category', recipe.get('Category', 'Main Course'))
                 ingredients = recipe.get('ingredients', recipe.get('Ingredients', ''))
                 instructions = recipe.get('instructions', recipe.get('Instructions', ''))
-                notes = recipe.get('notes', recipe.get('Notes', ''))
-                gluten_free = recipe.get('gluten_free', recipe.get('Gluten Free', 'Yes'))
                 
                 if title:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO recipes 
-                        (title, description, prep_time_minutes, cook_time_minutes, servings, 
-                         difficulty, cuisine_type, ingredients, instructions, notes, gluten_free, created_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (title, description, prep_time, cook_time, servings, difficulty, 
-                          cuisine_type, ingredients, instructions, notes, gluten_free, datetime.now().isoformat()))
-                    imported_count += 1
-            
-            conn.commit()
-            return {
-                'success': True,
-                'message': f'Successfully imported {imported_count} recipes',
-                'imported_count': imported_count
-            }
-            
+                    yield (title, description, prep_time, cook_time, parse_int(servings, 1),
+                           difficulty, category, ingredients, instructions)
+        
+        try:
+            return self._import_rows('recipes', """
+                INSERT OR REPLACE INTO recipes 
+                (title, description, prep_time, cook_time, servings, 
+                 difficulty, category, ingredients, instructions)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, params())
         except Exception as e:
             return {
                 'success': False,
@@ -535,13 +534,9 @@ class ImportService:
                 'imported_count': 0
             }
     
-    def _import_shopping_data(self, data: List[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _import_shopping_data(self, data: Iterable[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
         """Import shopping list data"""
-        try:
-            from utils.db import get_connection
-            conn = get_connection()
-            imported_count = 0
-            
+        def params():
             for item in data:
                 name = item.get('item', item.get('Item', item.get('name', '')))
                 quantity = item.get('quantity', item.get('Quantity', '1'))
@@ -551,20 +546,14 @@ class ImportService:
                 notes = item.get('notes', item.get('Notes', ''))
                 
                 if name:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO shopping_list 
-                        (item, quantity, category, store, priority, notes, created_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (name, quantity, category, store, priority, notes, datetime.now().isoformat()))
-                    imported_count += 1
-            
-            conn.commit()
-            return {
-                'success': True,
-                'message': f'Successfully imported {imported_count} shopping items',
-                'imported_count': imported_count
-            }
-            
+                    yield (name, quantity, category, store, priority, notes, datetime.now().isoformat())
+        
+        try:
+            return self._import_rows('shopping items', """
+                INSERT OR REPLACE INTO shopping_list 
+                (item, quantity, category, store, priority, notes, created_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, params())
         except Exception as e:
             return {
                 'success': False,
@@ -572,13 +561,9 @@ class ImportService:
                 'imported_count': 0
             }
     
-    def _import_menu_data(self, data: List[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _import_menu_data(self, data: Iterable[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
         """Import menu planning data"""
-        try:
-            from utils.db import get_connection
-            conn = get_connection()
-            imported_count = 0
-            
+        def params():
             for meal in data:
                 date = meal.get('date', meal.get('Date', ''))
                 meal_type = meal.get('meal_type', meal.get('Meal Type', meal.get('meal', '')))
@@ -587,20 +572,14 @@ class ImportService:
                 time = meal.get('time', meal.get('Time', '12:00'))
                 
                 if date and recipe:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO menu_plan 
-                        (date, meal, title, notes, time)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (date, meal_type, recipe, notes, time))
-                    imported_count += 1
-            
-            conn.commit()
-            return {
-                'success': True,
-                'message': f'Successfully imported {imported_count} menu items',
-                'imported_count': imported_count
-            }
-            
+                    yield (date, meal_type, recipe, notes, time)
+        
+        try:
+            return self._import_rows('menu items', """
+                INSERT OR REPLACE INTO menu_plan 
+                (date, meal, title, notes, time)
+                VALUES (?, ?, ?, ?, ?)
+            """, params())
         except Exception as e:
             return {
                 'success': False,
@@ -608,13 +587,9 @@ class ImportService:
                 'imported_count': 0
             }
     
-    def _import_calendar_data(self, data: List[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _import_calendar_data(self, data: Iterable[Dict], options: Dict[str, Any] = None) -> Dict[str, Any]:
         """Import calendar event data"""
-        try:
-            from utils.db import get_connection
-            conn = get_connection()
-            imported_count = 0
-            
+        def params():
             for event in data:
                 name = event.get('name', event.get('Name', event.get('title', '')))
                 date = event.get('date', event.get('Date', ''))
@@ -625,20 +600,14 @@ class ImportService:
                 reminder = event.get('reminder', event.get('Reminder', 'None'))
                 
                 if name and date:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO calendar_events 
-                        (name, date, time, event_type, priority, description, reminder, created_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (name, date, time, event_type, priority, description, reminder, datetime.now().isoformat()))
-                    imported_count += 1
-            
-            conn.commit()
-            return {
-                'success': True,
-                'message': f'Successfully imported {imported_count} calendar events',
-                'imported_count': imported_count
-            }
-            
+                    yield (name, date, time, event_type, priority, description, reminder, datetime.now().isoformat())
+        
+        try:
+            return self._import_rows('calendar events', """
+                INSERT OR REPLACE INTO calendar_events 
+                (name, date, time, event_type, priority, description, reminder, created_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, params())
         except Exception as e:
             return {
                 'success': False,
@@ -5,11 +5,31 @@ Ingredient Correlation Service for CeliacShield
 Analyzes correlations between ingredients and health symptoms for better tracking.
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import json
-from collections import defaultdict, Counter
+import math
+import sqlite3
+from collections import defaultdict, Counter, deque
+
+from services.gluten_lexicon import get_gluten_lexicon, HIGH, MEDIUM
+from services.health_frame import split_food_items
+from utils.health_index import correlation_aggregates
+from utils.term_matcher import TermMatcher
+
+CROSS_CONTAMINATION = 'cross-contamination'
+
+# Common ingredient keywords tracked alongside gluten terms
+INGREDIENT_KEYWORDS = [
+    'flour', 'bread', 'pasta', 'noodles', 'pizza', 'cake', 'cookie',
+    'sauce', 'dressing', 'marinade', 'seasoning', 'spice',
+    'cheese', 'milk', 'butter', 'cream', 'yogurt',
+    'chicken', 'beef', 'pork', 'fish', 'salmon', 'tuna',
+    'rice', 'quinoa', 'potato', 'corn', 'beans', 'lentils',
+    'tomato', 'onion', 'garlic', 'pepper', 'mushroom',
+    'oil', 'vinegar', 'lemon', 'herbs'
+]
 
 
 @dataclass
@@ -22,6 +42,9 @@ class IngredientCorrelation:
     confidence_level: str  # 'low', 'medium', 'high'
     risk_assessment: str  # 'safe', 'caution', 'avoid'
     notes: str = ""
+    lift: float = 1.0  # P(symptom | ingredient) / P(symptom)
+    pmi: float = 0.0  # log2 of lift
+    conditional_probability: float = 0.0  # P(symptom | ingredient)
 
 
 @dataclass
@@ -39,21 +62,26 @@ class SymptomPattern:
 class IngredientCorrelator:
     """Analyzes ingredient-symptom correlations for better health tracking"""
     
-    def __init__(self):
+    def __init__(self, lag_window: Tuple[timedelta, timedelta] = (timedelta(minutes=30), timedelta(hours=24))):
+        """
+        Initialize the correlator
+        
+        Args:
+            lag_window: Shortest and longest delay between a meal and the
+                symptoms it may explain
+        """
         self.correlation_threshold = 0.3  # Minimum correlation to report
         self.min_occurrences = 3  # Minimum occurrences for reliable correlation
+        self.min_pattern_entries = 3  # Minimum entries for an ingredient combination pattern
+        self.lag_window = lag_window
         
-        # Known problematic ingredients for celiacs
-        self.known_triggers = {
-            'wheat': {'risk': 'high', 'symptoms': ['bloating', 'diarrhea', 'fatigue', 'headache']},
-            'barley': {'risk': 'high', 'symptoms': ['stomach pain', 'nausea', 'fatigue']},
-            'rye': {'risk': 'high', 'symptoms': ['digestive issues', 'fatigue', 'brain fog']},
-            'oats': {'risk': 'medium', 'symptoms': ['mild bloating', 'digestive discomfort']},
-            'soy sauce': {'risk': 'high', 'symptoms': ['immediate reaction', 'stomach pain']},
-            'beer': {'risk': 'high', 'symptoms': ['bloating', 'diarrhea', 'headache']},
-            'malt': {'risk': 'high', 'symptoms': ['severe reaction', 'multiple symptoms']},
-            'cross-contamination': {'risk': 'medium', 'symptoms': ['mild to moderate symptoms']}
-        }
+        # Work counters: meals parsed for ingredients, meals visited in entry windows
+        self.meal_parse_count = 0
+        self.window_visits = 0
+        
+        # Known problematic ingredients for celiacs come from the shared lexicon
+        self.lexicon = get_gluten_lexicon()
+        self.keyword_matcher = TermMatcher((keyword, keyword) for keyword in INGREDIENT_KEYWORDS)
     
     def analyze_ingredient_correlations(self, health_logs: List[Dict], 
                                       meal_logs: List[Dict]) -> Dict[str, Any]:
@@ -80,97 +108,191 @@ class IngredientCorrelator:
             'safe_ingredients': self._identify_safe_ingredients(combined_data, correlations)
         }
     
+    def analyze_database_correlations(self, conn: sqlite3.Connection,
+                                      start: str, end: str) -> Dict[str, Any]:
+        """
+        Analyze the health log between two dates inside SQLite
+        
+        Gives the same result as analyze_ingredient_correlations on the
+        entries of that range (meals being the entries with food items),
+        but the window join and the counting run as queries over the
+        health index tables, so only aggregate rows are loaded.
+        
+        Args:
+            conn: Database connection with an up-to-date health index
+            start: First date to analyze (ISO)
+            end: Last date to analyze (ISO)
+        """
+        min_lag, max_lag = self.lag_window
+        aggregates = correlation_aggregates(
+            conn, start, end,
+            min_lag.total_seconds() / 3600, max_lag.total_seconds() / 3600,
+            self.min_pattern_entries
+        )
+        counts = {
+            'entries': aggregates['entries'],
+            'ingredients': Counter(aggregates['ingredients']),
+            'symptoms': Counter(aggregates['symptoms']),
+            'pairs': Counter(aggregates['pairs']),
+            'weights': Counter(aggregates['weights']),
+        }
+        correlations = self._correlations_from_counts(counts)
+        patterns = self._patterns_from_combinations(aggregates['combinations'])
+        recommendations = self._generate_recommendations(correlations, patterns)
+        
+        return {
+            'correlations': correlations,
+            'patterns': patterns,
+            'recommendations': recommendations,
+            'summary': self._generate_summary(correlations, patterns),
+            'risk_ingredients': self._identify_risk_ingredients(correlations),
+            'safe_ingredients': self._safe_ingredients(counts['ingredients'], correlations)
+        }
+    
     def _combine_health_meal_data(self, health_logs: List[Dict], 
                                  meal_logs: List[Dict]) -> List[Dict]:
-        """Combine health and meal logs for correlation analysis"""
-        combined_data = []
-        
-        for health_log in health_logs:
-            health_time = datetime.fromisoformat(health_log.get('timestamp', ''))
-            symptoms = health_log.get('symptoms', [])
-            severity = health_log.get('severity', 0)
+        """
+        Combine health and meal logs for correlation analysis
+        
+        Sort-merge join over the time-ordered logs: a window of meals eaten
+        between lag_window[0] and lag_window[1] before the current health
+        entry slides forward as the entries advance, so each meal is parsed
+        and visited once per entry it precedes instead of once per entry.
+        Entries keep their input order; entries without related meals or
+        with an unparsable timestamp are left out.
+        """
+        min_lag, max_lag = self.lag_window
+        
+        meals = []
+        for meal_log in meal_logs:
+            meal_time = self._parse_timestamp(meal_log.get('timestamp', ''))
+            if meal_time is not None:
+                meals.append((meal_time, meal_log))
+        meals.sort(key=lambda meal: meal[0])
+        
+        # Ingredient tokens are extracted once per meal
+        meal_ingredients = [frozenset(self._meal_ingredients(meal_log)) for _, meal_log in meals]
+        self.meal_parse_count += len(meals)
+        
+        entries = []
+        for position, health_log in enumerate(health_logs):
+            health_time = self._parse_timestamp(health_log.get('timestamp', ''))
+            if health_time is not None:
+                entries.append((health_time, position, health_log))
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        
+        combined = []
+        window = deque()  # indexes into meals, oldest first
+        next_meal = 0
+        for health_time, position, health_log in entries:
+            # Admit meals at least min_lag before the entry, drop those over max_lag
+            while next_meal < len(meals) and meals[next_meal][0] <= health_time - min_lag:
+                window.append(next_meal)
+                next_meal += 1
+            while window and meals[window[0]][0] < health_time - max_lag:
+                window.popleft()
+            if not window:
+                continue
+            self.window_visits += len(window)
             
-            # Find meals within 24 hours before symptoms
             related_meals = []
-            for meal_log in meal_logs:
-                meal_time = datetime.fromisoformat(meal_log.get('timestamp', ''))
-                time_diff = health_time - meal_time
-                
-                # Consider meals from 30 minutes to 24 hours before symptoms
-                if timedelta(minutes=30) <= time_diff <= timedelta(hours=24):
-                    related_meals.append({
-                        'items': meal_log.get('items', []),
-                        'time_before_symptoms': time_diff.total_seconds() / 3600,  # hours
-                        'meal_type': meal_log.get('meal_type', ''),
-                        'restaurant': meal_log.get('restaurant', ''),
-                        'gluten_safety_confirmed': meal_log.get('gluten_safety_confirmed', False)
-                    })
-            
-            if related_meals:  # Only include health logs with related meals
-                combined_data.append({
-                    'health_log': health_log,
-                    'symptoms': symptoms,
-                    'severity': severity,
-                    'timestamp': health_time,
-                    'related_meals': related_meals
+            ingredients = set()
+            for index in window:
+                meal_time, meal_log = meals[index]
+                ingredients |= meal_ingredients[index]
+                related_meals.append({
+                    'items': meal_log.get('items', []),
+                    'ingredients': meal_ingredients[index],
+                    'time_before_symptoms': (health_time - meal_time).total_seconds() / 3600,  # hours
+                    'meal_type': meal_log.get('meal_type', ''),
+                    'restaurant': meal_log.get('restaurant', ''),
+                    'gluten_safety_confirmed': meal_log.get('gluten_safety_confirmed', False)
                 })
-        
-        return combined_data
+            
+            combined.append((position, {
+                'health_log': health_log,
+                'symptoms': health_log.get('symptoms', []),
+                'severity': health_log.get('severity', 0),
+                'timestamp': health_time,
+                'related_meals': related_meals,
+                'ingredients': frozenset(ingredients)
+            }))
+        
+        combined.sort(key=lambda entry: entry[0])
+        return [entry for _, entry in combined]
+    
+    @staticmethod
+    def _parse_timestamp(timestamp: str) -> Optional[datetime]:
+        """Parse an ISO timestamp, None if it is missing or malformed"""
+        try:
+            return datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            return None
+    
+    def _count_cooccurrences(self, combined_data: Iterable[Dict]) -> Dict[str, Any]:
+        """
+        Accumulate entry, ingredient, symptom and pair counts in one pass
+        
+        Each entry counts once per ingredient in its window and once per
+        distinct symptom, and pair weights add the entry severity once per
+        distinct symptom, as correlation_aggregates does from the index.
+        """
+        totals = {
+            'entries': 0,
+            'ingredients': Counter(),
+            'symptoms': Counter(),
+            'pairs': Counter(),
+            'weights': Counter(),
+        }
+        for entry in combined_data:
+            symptoms = set(entry['symptoms'])
+            ingredients = entry['ingredients']
+            totals['entries'] += 1
+            totals['ingredients'].update(ingredients)
+            totals['symptoms'].update(symptoms)
+            for ingredient in ingredients:
+                for symptom in symptoms:
+                    totals['pairs'][ingredient, symptom] += 1
+                    totals['weights'][ingredient, symptom] += entry['severity']  # Weight by severity
+        return totals
     
     def _calculate_correlations(self, combined_data: List[Dict]) -> List[IngredientCorrelation]:
         """Calculate ingredient-symptom correlations"""
+        return self._correlations_from_counts(self._count_cooccurrences(combined_data))
+    
+    def _correlations_from_counts(self, counts: Dict[str, Any]) -> List[IngredientCorrelation]:
+        """Correlations from the totals of _count_cooccurrences or correlation_aggregates"""
         correlations = []
+        total_entries = counts['entries']
         
-        # Count ingredient-symptom co-occurrences
-        ingredient_symptom_counts = defaultdict(lambda: defaultdict(int))
-        ingredient_total_counts = defaultdict(int)
-        symptom_total_counts = defaultdict(int)
-        total_entries = len(combined_data)
-        
-        for entry in combined_data:
-            symptoms = entry['symptoms']
-            severity = entry['severity']
+        for (ingredient, symptom), pair_count in counts['pairs'].items():
+            ingredient_count = counts['ingredients'][ingredient]
+            if ingredient_count < self.min_occurrences:
+                continue
             
-            # Extract ingredients from related meals
-            ingredients = set()
-            for meal in entry['related_meals']:
-                for item in meal['items']:
-                    # Simple ingredient extraction (in production, use NLP)
-                    ingredients.update(self._extract_ingredients(item))
+            # Severity-weighted strength, normalized to 0-1
+            weighted_count = counts['weights'][ingredient, symptom]
+            correlation = min(1.0, weighted_count / (ingredient_count * 10))
+            if correlation < self.correlation_threshold:
+                continue
             
-            # Count co-occurrences
-            for ingredient in ingredients:
-                ingredient_total_counts[ingredient] += 1
-                for symptom in symptoms:
-                    ingredient_symptom_counts[ingredient][symptom] += severity  # Weight by severity
-                    symptom_total_counts[symptom] += 1
-        
-        # Calculate correlation coefficients
-        for ingredient, symptom_counts in ingredient_symptom_counts.items():
-            for symptom, weighted_count in symptom_counts.items():
-                if ingredient_total_counts[ingredient] >= self.min_occurrences:
-                    # Simple correlation calculation
-                    correlation = weighted_count / (ingredient_total_counts[ingredient] * 10)  # Normalize
-                    correlation = min(1.0, correlation)  # Cap at 1.0
-                    
-                    if correlation >= self.correlation_threshold:
-                        confidence = self._calculate_confidence(
-                            ingredient_total_counts[ingredient],
-                            weighted_count,
-                            total_entries
-                        )
-                        
-                        risk_assessment = self._assess_risk(ingredient, correlation, confidence)
-                        
-                        correlations.append(IngredientCorrelation(
-                            ingredient=ingredient,
-                            symptom=symptom,
-                            correlation_strength=correlation,
-                            occurrences=ingredient_total_counts[ingredient],
-                            confidence_level=confidence,
-                            risk_assessment=risk_assessment,
-                            notes=self._get_correlation_notes(ingredient, symptom, correlation)
-                        ))
+            # P(symptom | ingredient), its ratio to P(symptom) and log2 of that
+            conditional = pair_count / ingredient_count
+            lift = conditional / (counts['symptoms'][symptom] / total_entries)
+            
+            confidence = self._calculate_confidence(ingredient_count, weighted_count, total_entries)
+            correlations.append(IngredientCorrelation(
+                ingredient=ingredient,
+                symptom=symptom,
+                correlation_strength=correlation,
+                occurrences=ingredient_count,
+                confidence_level=confidence,
+                risk_assessment=self._assess_risk(ingredient, correlation, confidence),
+                notes=self._get_correlation_notes(ingredient, symptom, correlation),
+                lift=lift,
+                pmi=math.log2(lift),
+                conditional_probability=conditional
+            ))
         
         # Sort by correlation strength
         correlations.sort(key=lambda x: x.correlation_strength, reverse=True)
@@ -179,32 +301,50 @@ class IngredientCorrelator:
     def _extract_ingredients(self, food_item: str) -> List[str]:
         """Extract ingredients from food item description"""
         # Simple keyword extraction (in production, use NLP/ML)
-        food_item_lower = food_item.lower()
+        match = self.lexicon.classify(food_item)
         
-        ingredients = []
+        # Known problematic ingredients
+        ingredients = list(match.gluten_terms)
+        if match.cross_contamination:
+            ingredients.append(CROSS_CONTAMINATION)
         
-        # Check for known problematic ingredients
-        for trigger in self.known_triggers.keys():
-            if trigger in food_item_lower:
-                ingredients.append(trigger)
-        
-        # Common ingredient keywords
-        ingredient_keywords = [
-            'flour', 'bread', 'pasta', 'noodles', 'pizza', 'cake', 'cookie',
-            'sauce', 'dressing', 'marinade', 'seasoning', 'spice',
-            'cheese', 'milk', 'butter', 'cream', 'yogurt',
-            'chicken', 'beef', 'pork', 'fish', 'salmon', 'tuna',
-            'rice', 'quinoa', 'potato', 'corn', 'beans', 'lentils',
-            'tomato', 'onion', 'garlic', 'pepper', 'mushroom',
-            'oil', 'vinegar', 'lemon', 'herbs'
-        ]
-        
-        for keyword in ingredient_keywords:
-            if keyword in food_item_lower:
+        # Common ingredient keywords; gluten terms come from the lexicon match
+        # alone, so "flour" inside "rice flour" is not a gluten risk
+        for keyword in self.keyword_matcher.find(food_item):
+            if keyword not in ingredients and not self.lexicon.severity(keyword):
                 ingredients.append(keyword)
         
         return ingredients
     
+    def extract_meal_ingredients(self, items_text: str) -> List[str]:
+        """Canonical ingredients of a free-text list of foods"""
+        ingredients = []
+        for item in split_food_items(items_text):
+            for ingredient in self._extract_ingredients(item):
+                if ingredient not in ingredients:
+                    ingredients.append(ingredient)
+        return ingredients
+    
+    def _meal_ingredients(self, meal: Dict) -> List[str]:
+        """Ingredients of a related meal, pre-parsed by the health index when available"""
+        if meal.get('ingredients') is not None:
+            return meal['ingredients']
+        ingredients = []
+        for item in meal['items']:
+            ingredients.extend(self._extract_ingredients(item))
+        return ingredients
+    
+    def _known_risk(self, ingredient: str) -> Optional[str]:
+        """Known gluten risk of an ingredient: 'high', 'medium' or None"""
+        if ingredient == CROSS_CONTAMINATION:
+            return 'medium'
+        severity = self.lexicon.severity(ingredient)
+        if severity >= HIGH:
+            return 'high'
+        if severity >= MEDIUM:
+            return 'medium'
+        return None
+    
     def _calculate_confidence(self, ingredient_count: int, co_occurrence: int, 
                             total_entries: int) -> str:
         """Calculate confidence level for correlation"""
@@ -218,8 +358,8 @@ class IngredientCorrelator:
     def _assess_risk(self, ingredient: str, correlation: float, confidence: str) -> str:
         """Assess risk level for ingredient"""
         # Check known triggers first
-        if ingredient in self.known_triggers:
-            known_risk = self.known_triggers[ingredient]['risk']
+        known_risk = self._known_risk(ingredient)
+        if known_risk:
             if known_risk == 'high':
                 return 'avoid'
             elif known_risk == 'medium':
@@ -235,8 +375,9 @@ class IngredientCorrelator:
     
     def _get_correlation_notes(self, ingredient: str, symptom: str, correlation: float) -> str:
         """Generate notes for correlation"""
-        if ingredient in self.known_triggers:
-            return f"Known gluten-containing ingredient. {self.known_triggers[ingredient]['risk'].title()} risk."
+        known_risk = self._known_risk(ingredient)
+        if known_risk:
+            return f"Known gluten-containing ingredient. {known_risk.title()} risk."
         
         if correlation >= 0.8:
             return "Strong correlation detected. Consider avoiding this ingredient."
@@ -247,63 +388,66 @@ class IngredientCorrelator:
     
     def _identify_patterns(self, combined_data: List[Dict]) -> List[SymptomPattern]:
         """Identify symptom patterns"""
-        patterns = []
-        
         # Group by ingredient combinations
         combination_patterns = defaultdict(list)
         
         for entry in combined_data:
             # Get all ingredients from related meals
-            all_ingredients = set()
-            for meal in entry['related_meals']:
-                for item in meal['items']:
-                    all_ingredients.update(self._extract_ingredients(item))
+            all_ingredients = entry['ingredients']
             
             # Create combination key (sorted for consistency)
             if len(all_ingredients) >= 2:  # Only consider combinations
                 combo_key = tuple(sorted(all_ingredients))
                 combination_patterns[combo_key].append(entry)
         
-        # Analyze patterns with sufficient data
-        pattern_id = 1
+        combinations = []
         for combo, entries in combination_patterns.items():
-            if len(entries) >= 3:  # Minimum occurrences for pattern
-                symptoms = []
-                severities = []
-                time_patterns = []
-                
-                for entry in entries:
-                    symptoms.extend(entry['symptoms'])
-                    severities.append(entry['severity'])
-                    
-                    # Analyze timing
-                    avg_time = sum(meal['time_before_symptoms'] 
-                                 for meal in entry['related_meals']) / len(entry['related_meals'])
-                    if avg_time <= 2:
-                        time_patterns.append('immediate')
-                    elif avg_time <= 8:
-                        time_patterns.append('delayed')
-                    else:
-                        time_patterns.append('variable')
-                
-                # Determine dominant time pattern
-                time_pattern_counts = Counter(time_patterns)
-                dominant_time_pattern = time_pattern_counts.most_common(1)[0][0]
-                
-                # Calculate confidence based on consistency
-                confidence = len(entries) / 10.0  # Simple confidence calculation
-                confidence = min(1.0, confidence)
-                
-                patterns.append(SymptomPattern(
-                    pattern_id=f"pattern_{pattern_id}",
-                    ingredients_involved=list(combo),
-                    symptoms=list(set(symptoms)),  # Unique symptoms
-                    frequency=len(entries),
-                    severity_avg=sum(severities) / len(severities),
-                    time_pattern=dominant_time_pattern,
-                    confidence=confidence
-                ))
-                pattern_id += 1
+            if len(entries) < self.min_pattern_entries:
+                continue
+            
+            # Analyze timing
+            timing = {'immediate': 0, 'delayed': 0, 'variable': 0}
+            for entry in entries:
+                avg_time = sum(meal['time_before_symptoms'] 
+                             for meal in entry['related_meals']) / len(entry['related_meals'])
+                if avg_time <= 2:
+                    timing['immediate'] += 1
+                elif avg_time <= 8:
+                    timing['delayed'] += 1
+                else:
+                    timing['variable'] += 1
+            
+            combinations.append({
+                'ingredients': list(combo),
+                'entries': len(entries),
+                'severity_avg': sum(entry['severity'] for entry in entries) / len(entries),
+                'symptoms': sorted({symptom for entry in entries for symptom in entry['symptoms']}),
+                'timing': timing
+            })
+        
+        return self._patterns_from_combinations(combinations)
+    
+    def _patterns_from_combinations(self, combinations: List[Dict[str, Any]]) -> List[SymptomPattern]:
+        """Patterns from per-combination totals, see correlation_aggregates"""
+        patterns = []
+        for pattern_id, combination in enumerate(combinations, 1):
+            # Dominant time pattern; ties go to the shorter delay
+            timing = combination['timing']
+            dominant_time_pattern = max(timing, key=timing.get)
+            
+            # Calculate confidence based on consistency
+            confidence = combination['entries'] / 10.0  # Simple confidence calculation
+            confidence = min(1.0, confidence)
+            
+            patterns.append(SymptomPattern(
+                pattern_id=f"pattern_{pattern_id}",
+                ingredients_involved=combination['ingredients'],
+                symptoms=combination['symptoms'],  # Unique symptoms
+                frequency=combination['entries'],
+                severity_avg=combination['severity_avg'],
+                time_pattern=dominant_time_pattern,
+                confidence=confidence
+            ))
         
         return patterns
     
@@ -387,6 +531,8 @@ class IngredientCorrelator:
                     'ingredient': correlation.ingredient,
                     'risk_level': correlation.risk_assessment,
                     'correlation_strength': correlation.correlation_strength,
+                    'lift': correlation.lift,
+                    'pmi': correlation.pmi,
                     'primary_symptoms': correlation.symptom,
                     'confidence': correlation.confidence_level,
                     'recommendation': self._get_ingredient_recommendation(correlation)
@@ -400,19 +546,21 @@ class IngredientCorrelator:
         # Get all ingredients that appear in meals
         all_ingredients = set()
         for entry in combined_data:
-            for meal in entry['related_meals']:
-                for item in meal['items']:
-                    all_ingredients.update(self._extract_ingredients(item))
-        
+            all_ingredients.update(entry['ingredients'])
+        return self._safe_ingredients(all_ingredients, correlations)
+    
+    def _safe_ingredients(self, all_ingredients: Iterable[str],
+                          correlations: List[IngredientCorrelation]) -> List[str]:
+        """Ingredients eaten without significant correlations or known risk"""
         # Get ingredients with correlations
         correlated_ingredients = {c.ingredient for c in correlations}
         
         # Safe ingredients are those without significant correlations
-        safe_ingredients = list(all_ingredients - correlated_ingredients)
+        safe_ingredients = sorted(set(all_ingredients) - correlated_ingredients)
         
         # Filter out known problematic ingredients
         safe_ingredients = [ing for ing in safe_ingredients 
-                          if ing not in self.known_triggers]
+                          if not self._known_risk(ing)]
         
         return safe_ingredients[:10]  # Return top 10 safe ingredients
     
@@ -0,0 +1,237 @@
+# path: services/menu_nutrition.py
+"""
+Menu nutrition rollups for CeliacShield
+
+RecipeNutritionCache computes a recipe's nutrients per serving once and keeps
+the vector in the recipe_nutrition table, where triggers drop it as soon as
+the recipe's ingredients or servings change. MenuNutrition holds a week's
+plan as a sparse days x recipes matrix of portions; the day totals are that
+matrix times the recipes x nutrients matrix of cached vectors, and editing a
+meal only subtracts the old recipe's row from its day and adds the new one.
+"""
+
+import re
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from services.nutrient_database import NutrientDatabase, get_nutrient_database
+from services.nutrition_analyzer import NutritionAnalyzer
+from services.recipe_scaling_service import recipe_scaling_service
+from utils.data_versions import get_versions
+from utils.nutrient_db import NUTRIENT_FIELDS
+from utils.recipe_nutrition import cached_vectors, recipe_ingredients, store_vectors
+
+# Grams per unit; volumes assume the density of water
+GRAMS_PER_UNIT = {
+    'gram': 1, 'kilogram': 1000, 'ounce': 28.35, 'pound': 453.6,
+    'ml': 1, 'liter': 1000, 'teaspoon': 5, 'tablespoon': 15, 'fl oz': 29.57,
+    'cup': 240, 'pint': 473, 'quart': 946, 'gallon': 3785,
+}
+
+# Weight assumed for a counted ingredient ("2 eggs", "1 onion")
+DEFAULT_ITEM_GRAMS = 50
+
+PORTIONS = {'Small': 0.75, 'Medium': 1.0, 'Large': 1.25, 'Extra Large': 1.5}
+
+_LINE_RE = re.compile(r"^\s*(\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?)?\s*(.*)$")
+
+MealKey = Tuple[str, str]  # (ISO date, meal)
+PlannedMeal = Tuple[int, float, np.ndarray]  # recipe id, portions, nutrients added to the day
+
+
+def ingredient_grams(quantity: str, unit: str) -> float:
+    """Approximate weight in grams of a quantity and unit"""
+    amount = recipe_scaling_service.parse_amount(str(quantity or ''))
+    unit = recipe_scaling_service.normalize_unit(unit or '')
+    if unit in GRAMS_PER_UNIT:
+        return (amount or 1) * GRAMS_PER_UNIT[unit]
+    return (amount or 1) * DEFAULT_ITEM_GRAMS
+
+
+def parse_ingredient_line(line: str) -> Tuple[str, str, str]:
+    """Split "1 1/2 cups rice flour" into ("rice flour", "1 1/2", "cups")"""
+    match = _LINE_RE.match(line.strip(' -*•\t'))
+    quantity, rest = match.group(1) or '', match.group(2).strip()
+    words = rest.split(None, 1)
+    if len(words) == 2 and recipe_scaling_service.normalize_unit(words[0]) in GRAMS_PER_UNIT:
+        return words[1], quantity, words[0]
+    return rest, quantity, ''
+
+
+def recipe_servings(servings) -> float:
+    """Number of servings: the first of text such as "4-6" or "4 people", 1 if there is none"""
+    quantity = _LINE_RE.match(str(servings or '')).group(1) or ''
+    return max(recipe_scaling_service.parse_amount(quantity), 1)
+
+
+class RecipeNutritionCache:
+    """Per-serving recipe nutrient vectors, computed once and cached in the database"""
+
+    def __init__(self, conn: sqlite3.Connection, nutrient_db: Optional[NutrientDatabase] = None):
+        """
+        Initialize the cache
+
+        Args:
+            conn: Database connection (the schema must include recipe_nutrition)
+            nutrient_db: Nutrient lookup (the shared one if omitted)
+        """
+        self.conn = conn
+        self.nutrient_db = nutrient_db or get_nutrient_database()
+        self.analyzer = NutritionAnalyzer(self.nutrient_db)
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._versions: Optional[Dict[str, int]] = None
+        self.computed = 0
+
+    def vectors(self, recipe_ids: Iterable[int]) -> Dict[int, np.ndarray]:
+        """
+        Per-serving nutrient vectors (NUTRIENT_FIELDS order) of recipes
+
+        Recipes that no longer exist are left out.
+        """
+        ids = sorted(set(recipe_ids))
+        self._drop_invalidated()
+        missing = [recipe_id for recipe_id in ids if recipe_id not in self._vectors]
+        if missing:
+            source = self.nutrient_db.source
+            stored = cached_vectors(self.conn, missing, source)
+            self._vectors.update((recipe_id, np.array(vector)) for recipe_id, vector in stored.items())
+            to_compute = [recipe_id for recipe_id in missing if recipe_id not in stored]
+            if to_compute:
+                computed = self._compute(to_compute)
+                self._vectors.update(computed)
+                try:
+                    with self.conn:
+                        store_vectors(self.conn, {k: v.tolist() for k, v in computed.items()}, source)
+                except sqlite3.Error as e:
+                    print(f"Error caching recipe nutrition: {e}")
+        return {recipe_id: self._vectors[recipe_id] for recipe_id in ids if recipe_id in self._vectors}
+
+    def _drop_invalidated(self):
+        """Forget vectors whose rows the triggers deleted since the last call"""
+        versions = get_versions(self.conn, ('recipes', 'recipe_ingredients'))
+        if versions and versions == self._versions:
+            return
+        self._versions = versions
+        if self._vectors:
+            ids = list(self._vectors)
+            current = cached_vectors(self.conn, ids, self.nutrient_db.source)
+            for recipe_id in ids:
+                if recipe_id not in current:
+                    del self._vectors[recipe_id]
+
+    def _compute(self, recipe_ids: List[int]) -> Dict[int, np.ndarray]:
+        vectors = {}
+        for recipe_id, recipe in recipe_ingredients(self.conn, recipe_ids).items():
+            rows = recipe['rows'] or [parse_ingredient_line(line)
+                                      for line in recipe['text'].splitlines() if line.strip()]
+            total = np.zeros(len(NUTRIENT_FIELDS))
+            for name, quantity, unit in rows:
+                nutrition = self.analyzer.get_ingredient_nutrition(
+                    {'name': name, 'quantity': ingredient_grams(quantity, unit)})
+                total += [getattr(nutrition, field) for field in NUTRIENT_FIELDS]
+            vectors[recipe_id] = total / recipe_servings(recipe['servings'])
+            self.computed += 1
+        return vectors
+
+
+class MenuNutrition:
+    """Daily and weekly nutrient totals of a menu plan, updated meal by meal"""
+
+    def __init__(self, recipes: RecipeNutritionCache, days: List[str]):
+        """
+        Initialize an empty plan
+
+        Args:
+            recipes: Source of per-serving recipe vectors
+            days: ISO dates of the plan, in order
+        """
+        self.recipes = recipes
+        self.days = list(days)
+        self._day_index = {day: i for i, day in enumerate(self.days)}
+        self._meals: Dict[MealKey, PlannedMeal] = {}
+        self._day_totals = np.zeros((len(self.days), len(NUTRIENT_FIELDS)))
+        self._week_totals = np.zeros(len(NUTRIENT_FIELDS))
+
+    @classmethod
+    def for_week(cls, conn: sqlite3.Connection, start: date,
+                 recipes: Optional[RecipeNutritionCache] = None) -> "MenuNutrition":
+        """Plan of the seven days from start, loaded from menu_plan"""
+        days = [(start + timedelta(days=i)).isoformat() for i in range(7)]
+        plan = cls(recipes or RecipeNutritionCache(conn), days)
+        rows = conn.execute(
+            "SELECT m.date, m.meal, COALESCE(m.recipe_id, r.id), COALESCE(m.portions, 1.0) FROM menu_plan m "
+            "LEFT JOIN recipes r ON m.recipe_id IS NULL AND r.title = m.title "
+            "WHERE m.date BETWEEN ? AND ? ORDER BY m.id", (days[0], days[-1])).fetchall()
+        plan.load({(day, meal): (recipe_id, portions)
+                   for day, meal, recipe_id, portions in rows if recipe_id is not None})
+        return plan
+
+    def load(self, meals: Dict[MealKey, Tuple[int, float]]):
+        """
+        Replace the plan and recompute every total
+
+        Args:
+            meals: (date, meal) -> (recipe id, portions); dates outside the plan are ignored
+        """
+        meals = {key: value for key, value in meals.items() if key[0] in self._day_index}
+        vectors = self.recipes.vectors(recipe_id for recipe_id, _ in meals.values())
+        entries = [(key, recipe_id, portions) for key, (recipe_id, portions) in meals.items()
+                   if recipe_id in vectors]
+        self._meals = {}
+        self._day_totals[:] = 0
+        if entries:
+            # Sparse days x recipes matrix of portions times the recipes x nutrients matrix
+            columns = {recipe_id: i for i, recipe_id in enumerate(vectors)}
+            matrix = np.array(list(vectors.values()))
+            day_idx = np.array([self._day_index[key[0]] for key, _, _ in entries])
+            recipe_idx = np.array([columns[recipe_id] for _, recipe_id, _ in entries])
+            portions = np.array([portions for _, _, portions in entries])
+            contributions = matrix[recipe_idx] * portions[:, None]
+            np.add.at(self._day_totals, day_idx, contributions)
+            for (key, recipe_id, amount), contribution in zip(entries, contributions):
+                self._meals[key] = (recipe_id, amount, contribution)
+        self._week_totals = self._day_totals.sum(axis=0)
+
+    def set_meal(self, day: str, meal: str, recipe_id: Optional[int], portions: float = 1.0):
+        """
+        Plan a recipe for a meal (None clears it), updating only that day's totals
+
+        Args:
+            day: ISO date within the plan
+            meal: Meal name, e.g. "Dinner"
+            recipe_id: Recipe to plan, or None to clear the meal
+            portions: Servings of the recipe
+        """
+        if day not in self._day_index:
+            return
+        key = (day, meal)
+        delta = np.zeros(len(NUTRIENT_FIELDS))
+        old = self._meals.pop(key, None)
+        if old is not None:
+            delta -= old[2]
+        vector = self.recipes.vectors([recipe_id]).get(recipe_id) if recipe_id is not None else None
+        if vector is not None:
+            contribution = vector * portions
+            self._meals[key] = (recipe_id, portions, contribution)
+            delta += contribution
+        self._day_totals[self._day_index[day]] += delta
+        self._week_totals += delta
+
+    def day_totals(self, day: str) -> Dict[str, float]:
+        """Nutrient totals of one day of the plan"""
+        return dict(zip(NUTRIENT_FIELDS, self._day_totals[self._day_index[day]].tolist()))
+
+    def week_totals(self) -> Dict[str, float]:
+        """Nutrient totals of the whole plan"""
+        return dict(zip(NUTRIENT_FIELDS, self._week_totals.tolist()))
+
+    def daily_average(self) -> Dict[str, float]:
+        """Mean nutrients per planned day"""
+        return {field: value / max(len(self.days), 1) for field, value in self.week_totals().items()}
+
+    def meals(self) -> Dict[MealKey, Tuple[int, float]]:
+        """Planned (recipe id, portions) per (date, meal)"""
+        return {key: (recipe_id, portions) for key, (recipe_id, portions, _) in self._meals.items()}
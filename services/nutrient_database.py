@@ -0,0 +1,240 @@
+# path: services/nutrient_database.py
+"""
+Offline nutrient lookup for CeliacShield
+
+Matches free-text ingredient names ("2 large eggs", "brocoli", "boneless
+chicken breast") to foods in the local USDA nutrient database and returns
+their per-100 g nutrient vectors, without any network access. Matches are
+tried in order of confidence: exact common name (as written, then without
+preparation and size words), all words through the FTS5 index, then similar
+spelling of every word through the trigram index. Word and spelling matches
+look only at the food's name, and a compound name such as "Lemon juice" has
+to be covered by the ingredient, so "water" or "juice" alone match nothing
+rather than tuna canned in water or lemon juice. Results, including misses, are memoized per normalized name
+and nutrient vectors per food, so a recipe that repeats ingredients costs a
+few dictionary lookups.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils import nutrient_db
+from utils.term_matcher import tokenize
+
+# Words that describe preparation or size rather than the food itself; "gluten
+# free" is kept, as it picks a different food ("gf soy sauce" is tamari)
+DESCRIPTOR_WORDS = frozenset({
+    'fresh', 'frozen', 'chopped', 'diced', 'minced', 'sliced', 'grated', 'shredded', 'crushed',
+    'ground', 'melted', 'softened', 'beaten', 'peeled', 'boneless', 'skinless', 'large', 'medium',
+    'small', 'organic', 'certified', 'of', 'cup', 'cups', 'tbsp', 'tsp',
+    'tablespoon', 'tablespoons', 'teaspoon', 'teaspoons', 'g', 'grams', 'oz', 'ounce', 'ounces',
+    'lb', 'lbs', 'pound', 'pounds', 'pinch', 'to', 'taste', 'optional', 'red', 'yellow', 'white',
+    'green', 'purple', 'baby', 'raw', 'leaves', 'fillet', 'fillets',
+})
+
+# Least spelling similarity (Dice coefficient of padded trigrams) of every word in a fuzzy match
+MIN_SIMILARITY = 0.5
+
+
+@dataclass(frozen=True)
+class FoodMatch:
+    """A food matched to an ingredient name"""
+    food_id: int
+    description: str
+    method: str  # 'alias', 'words' or 'trigram'
+    score: float = 1.0
+
+
+def _trigrams(word: str) -> set:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def spelling_similarity(query: List[str], description: str) -> float:
+    """
+    How well the worst-matched query word matches its closest description word
+
+    Every word has to be found, so "almond milk" does not match "Milk, whole".
+    """
+    targets = [_trigrams(word) for word in tokenize(description)]
+    if not query or not targets:
+        return 0.0
+    return min(
+        max(2 * len(grams & target) / (len(grams) + len(target)) for target in targets)
+        for grams in map(_trigrams, query))
+
+
+def covers_name(query: List[str], description: str) -> bool:
+    """
+    Whether query words name a food rather than part of it
+
+    A compound name has to be covered as a whole, so "juice" does not match
+    "Lemon juice, raw" nor "sauce" any soy sauce.
+    """
+    head = nutrient_db.head_words(description)
+    return len(head) < 2 or spelling_similarity(head, " ".join(query)) >= MIN_SIMILARITY
+
+
+class NutrientDatabase:
+    """Memoized ingredient matching against the offline nutrient database"""
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 4096):
+        """
+        Initialize the lookup
+
+        Args:
+            db_path: Nutrient database file (CELIAC_NUTRIENT_DB or the one built
+                from the bundled CSV if omitted)
+            max_entries: Ingredient names kept in the match memo
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._matches: "OrderedDict[str, Optional[FoodMatch]]" = OrderedDict()
+        self._vectors: Dict[int, Tuple[float, ...]] = {}
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._available = True
+        self._source: Optional[str] = None
+        self.stats = {'memory_hits': 0, 'lookups': 0, 'misses': 0}
+
+    def match(self, name: str) -> Optional[FoodMatch]:
+        """
+        Match an ingredient name to a food
+
+        Returns:
+            The best match, or None if no food is close enough
+        """
+        key = nutrient_db.normalize_name(name)
+        if not key:
+            return None
+        with self._lock:
+            if key in self._matches:
+                self._matches.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return self._matches[key]
+
+            conn = self._connection()
+            if conn is None:
+                return None
+            self.stats['lookups'] += 1
+            try:
+                found = self._lookup(conn, key)
+            except sqlite3.Error as e:
+                print(f"Error matching '{name}' to nutrient data: {e}")
+                found = None
+            if found is None:
+                self.stats['misses'] += 1
+
+            self._matches[key] = found
+            if len(self._matches) > self.max_entries:
+                self._matches.popitem(last=False)
+            return found
+
+    def nutrients(self, food_id: int) -> Optional[Tuple[float, ...]]:
+        """Per-100 g nutrient vector of a food, in nutrient_db.NUTRIENT_FIELDS order"""
+        with self._lock:
+            vector = self._vectors.get(food_id)
+            if vector is None:
+                conn = self._connection()
+                if conn is None:
+                    return None
+                vector = nutrient_db.food_nutrients(conn, food_id)
+                if vector is not None:
+                    self._vectors[food_id] = vector
+            return vector
+
+    def per_100g(self, name: str) -> Optional[Tuple[float, ...]]:
+        """Per-100 g nutrient vector of the food an ingredient name matches"""
+        found = self.match(name)
+        return self.nutrients(found.food_id) if found else None
+
+    @property
+    def source(self) -> str:
+        """Source the open database was built from, 'unavailable' if it could not be opened"""
+        with self._lock:
+            if self._source is None:
+                conn = self._connection()
+                try:
+                    self._source = (nutrient_db.read_source(conn) if conn else None) or 'unavailable'
+                except sqlite3.Error:
+                    self._source = 'unavailable'
+            return self._source
+
+    def close(self):
+        """Close the database and forget memoized results"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._matches.clear()
+            self._vectors.clear()
+            self._source = None
+
+    def _lookup(self, conn: sqlite3.Connection, key: str) -> Optional[FoodMatch]:
+        words = [word for word in key.split() if word not in DESCRIPTOR_WORDS and not word.isdigit()]
+        if not words:
+            return None
+
+        # Common names, as written and without descriptors ("boneless chicken breast")
+        for phrase in (key, " ".join(words)):
+            food_id = nutrient_db.alias_food(conn, phrase)
+            if food_id is not None:
+                return self._food(conn, food_id, 'alias')
+
+        for food_id, description in nutrient_db.word_candidates(conn, words):
+            if covers_name(words, description):
+                return FoodMatch(food_id, description, 'words')
+
+        grams = set()
+        for word in words:
+            grams.update(word[i:i + 3] for i in range(len(word) - 2))
+        best = None
+        for food_id, description in nutrient_db.trigram_candidates(conn, grams, limit=50):
+            score = spelling_similarity(words, nutrient_db.food_name(description))
+            if (score >= MIN_SIMILARITY and (best is None or score > best.score)
+                    and covers_name(words, description)):
+                best = FoodMatch(food_id, description, 'trigram', score)
+        return best
+
+    def _food(self, conn: sqlite3.Connection, food_id: int, method: str) -> Optional[FoodMatch]:
+        row = conn.execute("SELECT description FROM food WHERE id = ?", (food_id,)).fetchone()
+        return FoodMatch(food_id, row[0], method) if row else None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the database read-only on first use, building the bundled one if needed"""
+        if self._conn is None and self._available:
+            try:
+                if self.db_path:
+                    path = Path(self.db_path)
+                elif os.getenv(nutrient_db.ENV_VAR):
+                    path = nutrient_db.default_db_path()
+                else:
+                    path = nutrient_db.ensure_seed_database(nutrient_db.default_db_path())
+                conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+                try:
+                    conn.execute("SELECT 1 FROM food LIMIT 1")
+                except sqlite3.Error:
+                    conn.close()
+                    raise
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                print(f"Nutrient database unavailable, using built-in values: {e}")
+                self._available = False
+        return self._conn
+
+
+def get_nutrient_database() -> NutrientDatabase:
+    """Get singleton nutrient database instance"""
+    global _nutrient_database
+    if _nutrient_database is None:
+        _nutrient_database = NutrientDatabase()
+    return _nutrient_database
+
+
+# Global nutrient database instance
+_nutrient_database = None
@@ -7,8 +7,9 @@ Provides comprehensive nutrition calculations and analysis for recipes and meals
 
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-import requests
-import json
+
+from services.nutrient_database import NutrientDatabase, get_nutrient_database
+from utils.nutrient_db import NUTRIENT_FIELDS
 
 
 @dataclass
@@ -32,8 +33,8 @@ class NutritionData:
 class NutritionAnalyzer:
     """Professional nutrition analysis service"""
     
-    def __init__(self):
-        self.usda_api_key = "DEMO_KEY"  # Replace with actual API key
+    def __init__(self, nutrient_db: Optional[NutrientDatabase] = None):
+        self._nutrient_db = nutrient_db
         self.nutrition_cache = {}
         
         # Gluten-free nutrition guidelines
@@ -46,6 +47,13 @@ class NutritionAnalyzer:
             'vitamin_d_daily_min': 20  # mcg
         }
     
+    @property
+    def nutrient_db(self) -> NutrientDatabase:
+        """Offline USDA nutrient lookup (the shared one unless given)"""
+        if self._nutrient_db is None:
+            self._nutrient_db = get_nutrient_database()
+        return self._nutrient_db
+    
     def analyze_recipe_nutrition(self, recipe: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze complete nutrition profile of a recipe"""
         total_nutrition = NutritionData()
@@ -60,15 +68,8 @@ class NutritionAnalyzer:
             })
             
             # Add to totals
-            total_nutrition.calories += ing_nutrition.calories
-            total_nutrition.protein_g += ing_nutrition.protein_g
-            total_nutrition.carbs_g += ing_nutrition.carbs_g
-            total_nutrition.fiber_g += ing_nutrition.fiber_g
-            total_nutrition.fat_g += ing_nutrition.fat_g
-            total_nutrition.sodium_mg += ing_nutrition.sodium_mg
-            total_nutrition.calcium_mg += ing_nutrition.calcium_mg
-            total_nutrition.iron_mg += ing_nutrition.iron_mg
-            total_nutrition.folate_mcg += ing_nutrition.folate_mcg
+            for field in NUTRIENT_FIELDS:
+                setattr(total_nutrition, field, getattr(total_nutrition, field) + getattr(ing_nutrition, field))
         
         # Calculate per-serving nutrition
         servings = recipe.get('servings', 1)
@@ -94,8 +95,8 @@ class NutritionAnalyzer:
         if cache_key in self.nutrition_cache:
             return self.nutrition_cache[cache_key]
         
-        # Try USDA FoodData Central API
-        nutrition_data = self._query_usda_nutrition(ingredient_name, quantity)
+        # Look up the offline USDA nutrient database
+        nutrition_data = self._get_usda_nutrition(ingredient_name, quantity)
         
         if not nutrition_data:
             # Fallback to built-in nutrition database
@@ -105,69 +106,14 @@ class NutritionAnalyzer:
         self.nutrition_cache[cache_key] = nutrition_data
         return nutrition_data
     
-    def _query_usda_nutrition(self, ingredient_name: str, quantity: float) -> Optional[NutritionData]:
-        """Query USDA FoodData Central for nutrition information"""
-        try:
-            # Search for food item
-            search_url = f"https://api.nal.usda.gov/fdc/v1/foods/search"
-            search_params = {
-                'query': ingredient_name,
-                'api_key': self.usda_api_key,
-                'pageSize': 1
-            }
-            
-            response = requests.get(search_url, params=search_params, timeout=5)
-            if response.status_code != 200:
-                return None
-            
-            search_data = response.json()
-            if not search_data.get('foods'):
-                return None
-            
-            # Get detailed nutrition for first result
-            food_id = search_data['foods'][0]['fdcId']
-            detail_url = f"https://api.nal.usda.gov/fdc/v1/food/{food_id}"
-            detail_params = {'api_key': self.usda_api_key}
-            
-            detail_response = requests.get(detail_url, params=detail_params, timeout=5)
-            if detail_response.status_code != 200:
-                return None
-            
-            food_data = detail_response.json()
-            return self._parse_usda_nutrition(food_data, quantity)
-            
-        except Exception as e:
-            print(f"USDA API error for {ingredient_name}: {e}")
+    def _get_usda_nutrition(self, ingredient_name: str, quantity: float) -> Optional[NutritionData]:
+        """Get nutrition from the matched food's per-100g vector in the local USDA database"""
+        per_100g = self.nutrient_db.per_100g(ingredient_name)
+        if per_100g is None:
             return None
-    
-    def _parse_usda_nutrition(self, food_data: Dict, quantity: float) -> NutritionData:
-        """Parse USDA nutrition data"""
-        nutrition = NutritionData()
-        
-        # Map USDA nutrient IDs to our fields
-        nutrient_map = {
-            1008: 'calories',      # Energy
-            1003: 'protein_g',     # Protein
-            1005: 'carbs_g',       # Carbohydrate
-            1079: 'fiber_g',       # Fiber
-            1063: 'sugar_g',       # Sugars
-            1004: 'fat_g',         # Total lipid (fat)
-            1258: 'saturated_fat_g', # Saturated fatty acids
-            1093: 'sodium_mg',     # Sodium
-            1087: 'calcium_mg',    # Calcium
-            1089: 'iron_mg',       # Iron
-            1114: 'vitamin_d_mcg', # Vitamin D
-            1177: 'folate_mcg'     # Folate
-        }
-        
-        for nutrient in food_data.get('foodNutrients', []):
-            nutrient_id = nutrient.get('nutrient', {}).get('id')
-            if nutrient_id in nutrient_map:
-                field_name = nutrient_map[nutrient_id]
-                value = nutrient.get('amount', 0) * quantity / 100  # Per 100g to actual quantity
-                setattr(nutrition, field_name, value)
-        
-        return nutrition
+        scale_factor = quantity / 100
+        return NutritionData(**{field: value * scale_factor
+                                for field, value in zip(NUTRIENT_FIELDS, per_100g)})
     
     def _get_builtin_nutrition(self, ingredient_name: str, quantity: float) -> NutritionData:
         """Get nutrition from built-in database"""
@@ -0,0 +1,1433 @@
+# path: services/recipe_import.py
+"""
+Parallel recipe import for CeliacShield
+
+Parses a folder of recipe files (CSV, JSON, XML, YAML, Markdown, text, PDF,
+Word, Excel) into normalized recipe dicts. Large batches are parsed in a
+process pool, so every core works on parsing, while a single writer on the
+calling thread inserts the results in batched transactions, keeping SQLite
+writes serialized. Each file is parsed in isolation: a file that fails to
+read or parse is reported in the summary and the rest are still imported.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from itertools import repeat
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.csvio import iter_csv_rows
+from utils.recipe_minhash import (
+    DEFAULT_THRESHOLD, index_missing, index_recipes, near_duplicates, recipe_tokens, signature,
+    store_signatures
+)
+
+# Duplicate handling choices offered by the cookbook import dialog
+SKIP_DUPLICATES = "Skip duplicates"
+UPDATE_EXISTING = "Update existing"
+CREATE_NEW = "Create new entries"
+
+# Columns written for each imported recipe
+RECIPE_COLUMNS = ('title', 'category', 'servings', 'cook_time', 'prep_time',
+                  'ingredients', 'instructions', 'notes', 'difficulty', 'description')
+
+RECIPE_DEFAULTS = {'servings': 4, 'difficulty': 'Medium'}
+
+
+@dataclass
+class ParsedFile:
+    """Recipes parsed from one file, or the reason it could not be parsed"""
+    path: str
+    recipes: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class ImportSummary:
+    """Outcome of importing a set of files"""
+    files: int = 0
+    files_done: int = 0
+    imported: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    # (imported title, existing title, similarity) of recipes added although their content nearly
+    # matches an existing recipe with another title
+    near_duplicates: List[Tuple[str, str, float]] = field(default_factory=list)
+    last_recipe_id: Optional[int] = None
+    cancelled: bool = False
+
+
+def extract_pdf_text(file_path: str) -> str:
+    """
+    Extract the text of a PDF with the first available PDF library
+
+    Raises:
+        ImportError: If none of PyPDF2, pdfplumber or pdfminer.six is installed
+    """
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            return "\n".join(page.extract_text() or "" for page in pdf_reader.pages).strip()
+    except ImportError:
+        pass
+
+    try:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return "\n".join(page.extract_text() or "" for page in pdf.pages).strip()
+    except ImportError:
+        pass
+
+    try:
+        from pdfminer.high_level import extract_text
+        return extract_text(file_path).strip()
+    except ImportError:
+        pass
+
+    raise ImportError("No PDF processing library found.\n"
+                      "Please install one of the following:\n"
+                      "• pip install PyPDF2\n"
+                      "• pip install pdfplumber\n"
+                      "• pip install pdfminer.six")
+
+
+def _docx_text(file_path: str, tables: bool = True) -> str:
+    from docx import Document
+    doc = Document(file_path)
+    text_parts = [paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()]
+    if tables:
+        # Ingredients are often laid out in tables
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                if row_text:
+                    text_parts.append(' | '.join(row_text))
+    return '\n'.join(text_parts)
+
+
+def extract_word_text(file_path: str) -> str:
+    """
+    Extract the text of a .docx (python-docx) or .doc (textract) document
+
+    Raises:
+        ImportError: If the library for the format is not installed
+        ValueError: If the format is not supported or the file cannot be read
+    """
+    file_ext = os.path.splitext(file_path)[1].lower()
+    if file_ext == '.docx':
+        try:
+            return _docx_text(file_path)
+        except ImportError:
+            raise ImportError("python-docx library is required for .docx import.\n"
+                              "Please install it with: pip install python-docx")
+    if file_ext == '.doc':
+        try:
+            import textract
+        except ImportError:
+            raise ImportError("textract library is required for .doc import.\n"
+                              "Please install it with: pip install textract\n"
+                              "Note: .doc format support may require additional dependencies.")
+        try:
+            return textract.process(file_path).decode('utf-8')
+        except Exception as e:
+            # Some .doc files are really .docx
+            try:
+                return _docx_text(file_path, tables=False)
+            except Exception:
+                raise ValueError(f"Could not process .doc file: {e}\n"
+                                 "Please convert to .docx format or install textract.")
+    raise ValueError(f"File format {file_ext} is not supported.\n"
+                     "Please use .docx or .doc format.")
+
+
+def normalize_recipe(recipe_data, default_category):
+    """Normalize JSON recipe data to standard format"""
+    try:
+        # Handle different field names
+        title = (recipe_data.get('title') or recipe_data.get('name') or 
+                recipe_data.get('recipe_name') or '').strip()
+
+        if not title:
+            return None
+
+        # Extract other fields with fallbacks
+        category = (recipe_data.get('category') or recipe_data.get('type') or 
+                  recipe_data.get('cuisine') or default_category).strip()
+
+        servings = recipe_data.get('servings') or recipe_data.get('serving_size') or 4
+        try:
+            servings = int(servings)
+        except (ValueError, TypeError):
+            servings = 4
+
+        cook_time = (recipe_data.get('cook_time') or recipe_data.get('cooking_time') or 
+                    recipe_data.get('total_time') or '').strip()
+
+        prep_time = (recipe_data.get('prep_time') or recipe_data.get('preparation_time') or 
+                    recipe_data.get('prep') or '').strip()
+
+        difficulty = (recipe_data.get('difficulty') or recipe_data.get('level') or 
+                     recipe_data.get('skill_level') or 'Medium').strip()
+
+        description = (recipe_data.get('description') or recipe_data.get('summary') or 
+                      recipe_data.get('intro') or '').strip()
+
+        notes = (recipe_data.get('notes') or recipe_data.get('tips') or 
+                recipe_data.get('comments') or '').strip()
+
+        # Handle ingredients - can be list or string
+        ingredients = recipe_data.get('ingredients') or recipe_data.get('ingredient_list') or []
+        if isinstance(ingredients, str):
+            ingredients = ingredients.strip()
+        elif isinstance(ingredients, list):
+            # Convert list to string
+            ingredients = '\n'.join(str(ing) for ing in ingredients)
+        else:
+            ingredients = ''
+
+        # Handle instructions - can be list or string
+        instructions = recipe_data.get('instructions') or recipe_data.get('directions') or recipe_data.get('steps') or []
+        if isinstance(instructions, str):
+            instructions = instructions.strip()
+        elif isinstance(instructions, list):
+            # Convert list to string
+            instructions = '\n'.join(str(step) for step in instructions)
+        else:
+            instructions = ''
+
+        return {
+            'title': title,
+            'category': category,
+            'servings': servings,
+            'cook_time': cook_time,
+            'prep_time': prep_time,
+            'difficulty': difficulty,
+            'description': description,
+            'notes': notes,
+            'ingredients': ingredients,
+            'instructions': instructions
+        }
+
+    except Exception as e:
+        print(f"Error normalizing JSON recipe: {e}")
+        return None
+
+
+def normalize_excel_recipe(recipe_data, default_category):
+    """Normalize Excel recipe data to standard format"""
+    try:
+        # Handle different column names (case-insensitive)
+        title = None
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['title', 'name', 'recipe_name', 'recipe']:
+                title = str(recipe_data[key]).strip()
+                break
+
+        if not title or title.lower() in ['nan', 'none', '']:
+            return None
+
+        # Extract other fields with flexible column names
+        category = default_category
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['category', 'type', 'cuisine', 'kind']:
+                cat_val = str(recipe_data[key]).strip()
+                if cat_val.lower() not in ['nan', 'none', '']:
+                    category = cat_val
+                break
+
+        servings = 4
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['servings', 'serving_size', 'serves', 'yield']:
+                try:
+                    servings = int(float(str(recipe_data[key])))
+                    break
+                except (ValueError, TypeError):
+                    pass
+
+        cook_time = ''
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['cook_time', 'cooking_time', 'total_time', 'time']:
+                time_val = str(recipe_data[key]).strip()
+                if time_val.lower() not in ['nan', 'none', '']:
+                    cook_time = time_val
+                break
+
+        prep_time = ''
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['prep_time', 'preparation_time', 'prep']:
+                time_val = str(recipe_data[key]).strip()
+                if time_val.lower() not in ['nan', 'none', '']:
+                    prep_time = time_val
+                break
+
+        difficulty = 'Medium'
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['difficulty', 'level', 'skill_level', 'hardness']:
+                diff_val = str(recipe_data[key]).strip()
+                if diff_val.lower() not in ['nan', 'none', '']:
+                    difficulty = diff_val
+                break
+
+        description = ''
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['description', 'summary', 'intro', 'about']:
+                desc_val = str(recipe_data[key]).strip()
+                if desc_val.lower() not in ['nan', 'none', '']:
+                    description = desc_val
+                break
+
+        notes = ''
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['notes', 'tips', 'comments', 'remarks']:
+                notes_val = str(recipe_data[key]).strip()
+                if notes_val.lower() not in ['nan', 'none', '']:
+                    notes = notes_val
+                break
+
+        ingredients = ''
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['ingredients', 'ingredient_list', 'ingredient']:
+                ing_val = str(recipe_data[key]).strip()
+                if ing_val.lower() not in ['nan', 'none', '']:
+                    ingredients = ing_val
+                break
+
+        instructions = ''
+        for key in recipe_data.keys():
+            if key and str(key).lower() in ['instructions', 'directions', 'steps', 'method']:
+                inst_val = str(recipe_data[key]).strip()
+                if inst_val.lower() not in ['nan', 'none', '']:
+                    instructions = inst_val
+                break
+
+        return {
+            'title': title,
+            'category': category,
+            'servings': servings,
+            'cook_time': cook_time,
+            'prep_time': prep_time,
+            'difficulty': difficulty,
+            'description': description,
+            'notes': notes,
+            'ingredients': ingredients,
+            'instructions': instructions
+        }
+
+    except Exception as e:
+        print(f"Error normalizing Excel recipe: {e}")
+        return None
+
+
+def parse_xml_recipe(recipe_elem, default_category):
+    """Parse recipe from XML element"""
+    try:
+        # Extract title
+        title = recipe_elem.find('title')
+        if title is None:
+            title = recipe_elem.find('name')
+        if title is None:
+            title = recipe_elem.get('name', '')
+        else:
+            title = title.text or ''
+
+        if not title.strip():
+            return None
+
+        # Extract other fields
+        category = default_category
+        cat_elem = recipe_elem.find('category')
+        if cat_elem is not None:
+            category = cat_elem.text or default_category
+
+        servings = 4
+        servings_elem = recipe_elem.find('servings')
+        if servings_elem is not None:
+            try:
+                servings = int(servings_elem.text or 4)
+            except (ValueError, TypeError):
+                servings = 4
+
+        cook_time = ''
+        cook_elem = recipe_elem.find('cook_time')
+        if cook_elem is not None:
+            cook_time = cook_elem.text or ''
+
+        prep_time = ''
+        prep_elem = recipe_elem.find('prep_time')
+        if prep_elem is not None:
+            prep_time = prep_elem.text or ''
+
+        difficulty = 'Medium'
+        diff_elem = recipe_elem.find('difficulty')
+        if diff_elem is not None:
+            difficulty = diff_elem.text or 'Medium'
+
+        description = ''
+        desc_elem = recipe_elem.find('description')
+        if desc_elem is not None:
+            description = desc_elem.text or ''
+
+        notes = ''
+        notes_elem = recipe_elem.find('notes')
+        if notes_elem is not None:
+            notes = notes_elem.text or ''
+
+        # Extract ingredients
+        ingredients = ''
+        ing_elem = recipe_elem.find('ingredients')
+        if ing_elem is not None:
+            # Try to get text content or join child elements
+            if ing_elem.text:
+                ingredients = ing_elem.text.strip()
+            else:
+                # Join all text from child elements
+                ingredient_items = []
+                for item in ing_elem.findall('ingredient'):
+                    if item.text:
+                        ingredient_items.append(item.text.strip())
+                ingredients = '\n'.join(ingredient_items)
+
+        # Extract instructions
+        instructions = ''
+        inst_elem = recipe_elem.find('instructions')
+        if inst_elem is None:
+            inst_elem = recipe_elem.find('directions')
+        if inst_elem is None:
+            inst_elem = recipe_elem.find('steps')
+
+        if inst_elem is not None:
+            # Try to get text content or join child elements
+            if inst_elem.text:
+                instructions = inst_elem.text.strip()
+            else:
+                # Join all text from child elements
+                step_items = []
+                for step in inst_elem.findall('step'):
+                    if step.text:
+                        step_items.append(step.text.strip())
+                instructions = '\n'.join(step_items)
+
+        return {
+            'title': title.strip(),
+            'category': category.strip(),
+            'servings': servings,
+            'cook_time': cook_time.strip(),
+            'prep_time': prep_time.strip(),
+            'difficulty': difficulty.strip(),
+            'description': description.strip(),
+            'notes': notes.strip(),
+            'ingredients': ingredients.strip(),
+            'instructions': instructions.strip()
+        }
+
+    except Exception as e:
+        print(f"Error parsing XML recipe: {e}")
+        return None
+
+
+def parse_markdown_recipe(content, default_category):
+    """Parse recipe from Markdown content"""
+    try:
+        lines = content.split('\n')
+
+        # Extract title (first # heading)
+        title = ''
+        for line in lines:
+            if line.strip().startswith('# '):
+                title = line.strip()[2:].strip()
+                break
+
+        if not title:
+            return None
+
+        # Extract metadata from frontmatter or headers
+        category = default_category
+        servings = 4
+        cook_time = ''
+        prep_time = ''
+        difficulty = 'Medium'
+        description = ''
+        notes = ''
+
+        # Look for metadata in various formats
+        for line in lines:
+            line = line.strip()
+            if line.startswith('**') and line.endswith('**'):
+                # Bold metadata
+                if 'Category:' in line or 'Type:' in line:
+                    category = line.split(':', 1)[1].replace('**', '').strip()
+                elif 'Servings:' in line:
+                    try:
+                        servings = int(line.split(':', 1)[1].replace('**', '').strip())
+                    except (ValueError, TypeError):
+                        pass
+                elif 'Cook Time:' in line:
+                    cook_time = line.split(':', 1)[1].replace('**', '').strip()
+                elif 'Prep Time:' in line:
+                    prep_time = line.split(':', 1)[1].replace('**', '').strip()
+                elif 'Difficulty:' in line:
+                    difficulty = line.split(':', 1)[1].replace('**', '').strip()
+            elif ':' in line and not line.startswith('#'):
+                # Regular metadata
+                if 'Category:' in line or 'Type:' in line:
+                    category = line.split(':', 1)[1].strip()
+                elif 'Servings:' in line:
+                    try:
+                        servings = int(line.split(':', 1)[1].strip())
+                    except (ValueError, TypeError):
+                        pass
+                elif 'Cook Time:' in line:
+                    cook_time = line.split(':', 1)[1].strip()
+                elif 'Prep Time:' in line:
+                    prep_time = line.split(':', 1)[1].strip()
+                elif 'Difficulty:' in line:
+                    difficulty = line.split(':', 1)[1].strip()
+
+        # Extract ingredients (look for ## Ingredients or similar)
+        ingredients = ''
+        in_ingredients = False
+        for line in lines:
+            line_stripped = line.strip()
+            if line_stripped.lower().startswith('## ingredients') or line_stripped.lower().startswith('### ingredients'):
+                in_ingredients = True
+                continue
+            elif in_ingredients:
+                if line_stripped.startswith('##') or line_stripped.startswith('###'):
+                    break
+                if line_stripped.startswith('- ') or line_stripped.startswith('* '):
+                    ingredients += line_stripped[2:] + '\n'
+                elif line_stripped and not line_stripped.startswith('#'):
+                    ingredients += line_stripped + '\n'
+
+        # Extract instructions (look for ## Instructions or similar)
+        instructions = ''
+        in_instructions = False
+        for line in lines:
+            line_stripped = line.strip()
+            if line_stripped.lower().startswith('## instructions') or line_stripped.lower().startswith('## directions') or line_stripped.lower().startswith('## steps'):
+                in_instructions = True
+                continue
+            elif in_instructions:
+                if line_stripped.startswith('##') or line_stripped.startswith('###'):
+                    break
+                if line_stripped and not line_stripped.startswith('#'):
+                    instructions += line_stripped + '\n'
+
+        # Extract description (text before ingredients)
+        description_lines = []
+        in_description = False
+        for line in lines:
+            line_stripped = line.strip()
+            if line_stripped.startswith('# '):
+                in_description = True
+                continue
+            elif line_stripped.lower().startswith('## ingredients') or line_stripped.lower().startswith('## instructions'):
+                break
+            elif in_description and line_stripped and not line_stripped.startswith('#'):
+                description_lines.append(line_stripped)
+
+        description = ' '.join(description_lines)
+
+        return {
+            'title': title,
+            'category': category,
+            'servings': servings,
+            'cook_time': cook_time,
+            'prep_time': prep_time,
+            'difficulty': difficulty,
+            'description': description,
+            'notes': notes,
+            'ingredients': ingredients.strip(),
+            'instructions': instructions.strip()
+        }
+
+    except Exception as e:
+        print(f"Error parsing Markdown recipe: {e}")
+        return None
+
+
+def parse_recipe_text(text, default_category):
+    """Parse recipe from text content
+
+    Supports formats like:
+    - Recipe Name: ...
+    - Category: ...
+    - Ingredients: (or Ingredients list)
+    - Instructions: (or Directions:, Steps:, Method:)
+    """
+    recipe_data = {
+        'title': '',
+        'category': default_category,
+        'prep_time': '',
+        'cook_time': '',
+        'servings': 4,
+        'difficulty': 'Medium',
+        'description': '',
+        'ingredients': '',
+        'instructions': '',
+        'notes': '',
+        'parsed_ingredients': []
+    }
+
+    # Split text into lines
+    lines = text.split('\n')
+    current_section = None
+    section_content = []
+
+    # Patterns to match common recipe field names
+    field_patterns = {
+        'title': r'^(?:recipe\s+name|title|name)\s*[:=]\s*(.+)$',
+        'category': r'^(?:category|type)\s*[:=]\s*(.+)$',
+        'prep_time': r'^(?:prep\s+time|preparation\s+time|prep)\s*[:=]\s*(.+)$',
+        'cook_time': r'^(?:cook\s+time|cooking\s+time|cook)\s*[:=]\s*(.+)$',
+        'servings': r'^(?:servings|serves|yield)\s*[:=]\s*(\d+)',
+        'difficulty': r'^(?:difficulty|level)\s*[:=]\s*(.+)$',
+        'description': r'^(?:description|about)\s*[:=]\s*(.+)$',
+    }
+
+    section_patterns = {
+        'ingredients': r'^(?:ingredients|ingredient\s+list)\s*[:=]?\s*$',
+        'instructions': r'^(?:instructions|directions|steps|method|preparation)\s*[:=]?\s*$',
+        'notes': r'^(?:notes|tips|note)\s*[:=]?\s*$',
+    }
+
+    for line in lines:
+        line_stripped = line.strip()
+
+        if not line_stripped:
+            # Empty line - might be section separator
+            if section_content and current_section:
+                # Save accumulated section content
+                if current_section in ['ingredients', 'instructions', 'notes']:
+                    recipe_data[current_section] = '\n'.join(section_content).strip()
+                section_content = []
+            continue
+
+        # Check for field patterns (single-line fields)
+        matched_field = False
+        for field_name, pattern in field_patterns.items():
+            match = re.match(pattern, line_stripped, re.IGNORECASE)
+            if match:
+                value = match.group(1).strip()
+                if field_name == 'servings':
+                    try:
+                        recipe_data[field_name] = int(value)
+                    except ValueError:
+                        recipe_data[field_name] = 4
+                else:
+                    recipe_data[field_name] = value
+                matched_field = True
+                break
+
+        if matched_field:
+            continue
+
+        # Check for section headers
+        matched_section = False
+        for section_name, pattern in section_patterns.items():
+            if re.match(pattern, line_stripped, re.IGNORECASE):
+                # Save previous section if any
+                if section_content and current_section:
+                    recipe_data[current_section] = '\n'.join(section_content).strip()
+
+                # Start new section
+                current_section = section_name
+                section_content = []
+                matched_section = True
+                break
+
+        if matched_section:
+            continue
+
+        # Add line to current section
+        if current_section:
+            section_content.append(line_stripped)
+        elif not recipe_data['title']:
+            # If no title set yet and we have content, assume first line is title
+            recipe_data['title'] = line_stripped
+
+    # Save last section
+    if section_content and current_section:
+        recipe_data[current_section] = '\n'.join(section_content).strip()
+
+    # Parse ingredients into structured format
+    if recipe_data['ingredients']:
+        recipe_data['parsed_ingredients'] = parse_ingredients_list(recipe_data['ingredients'])
+
+    # Validate required fields
+    if not recipe_data['title']:
+        # Try to extract title from first non-empty line
+        for line in lines:
+            if line.strip():
+                recipe_data['title'] = line.strip()[:100]  # Limit title length
+                break
+
+    return recipe_data if recipe_data['title'] else None
+
+
+def parse_ingredients_list(ingredients_text):
+    """Parse ingredients text into structured list"""
+    parsed_ingredients = []
+    lines = ingredients_text.split('\n')
+
+    # Common measurement patterns
+    measurement_pattern = r'^[\-\*\•]?\s*(\d+[\d\s\/\.]*)\s*([a-zA-Z]+)?\s+(.+)$'
+    simple_pattern = r'^[\-\*\•]?\s*(.+)$'
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Try to match quantity + unit + ingredient
+        match = re.match(measurement_pattern, line)
+        if match:
+            quantity = match.group(1).strip()
+            unit = match.group(2).strip() if match.group(2) else ''
+            name = match.group(3).strip()
+
+            parsed_ingredients.append({
+                'quantity': quantity,
+                'unit': unit,
+                'name': name,
+                'notes': ''
+            })
+        else:
+            # Just ingredient name, no measurement
+            match = re.match(simple_pattern, line)
+            if match:
+                parsed_ingredients.append({
+                    'quantity': '',
+                    'unit': '',
+                    'name': match.group(1).strip(),
+                    'notes': ''
+                })
+
+    return parsed_ingredients
+
+
+def parse_pdf_recipe(pdf_text, default_category):
+    """Parse recipe from extracted PDF text"""
+    try:
+        lines = pdf_text.split('\n')
+
+        # Clean up the text - remove extra whitespace and normalize
+        cleaned_lines = []
+        for line in lines:
+            line = line.strip()
+            if line:
+                cleaned_lines.append(line)
+
+        if not cleaned_lines:
+            return None
+
+        # Extract title - look for the first substantial line or common patterns
+        title = ''
+        for i, line in enumerate(cleaned_lines[:10]):  # Check first 10 lines
+            # Skip common PDF artifacts
+            if any(skip in line.lower() for skip in ['page', 'copyright', 'www.', 'http', 'recipe']):
+                continue
+            # Look for title patterns
+            if len(line) > 3 and len(line) < 100 and not line.isdigit():
+                title = line
+                break
+
+        if not title:
+            # Fallback: use first non-empty line
+            title = cleaned_lines[0] if cleaned_lines else "Imported Recipe"
+
+        # Extract metadata using various patterns
+        category = default_category
+        servings = 4
+        cook_time = ''
+        prep_time = ''
+        difficulty = 'Medium'
+        description = ''
+        notes = ''
+
+        # Look for metadata patterns
+        for line in cleaned_lines:
+            line_lower = line.lower()
+
+            # Category detection
+            if any(cat in line_lower for cat in ['appetizer', 'main course', 'dessert', 'side dish', 'beverage']):
+                for cat in ['appetizer', 'main course', 'dessert', 'side dish', 'beverage']:
+                    if cat in line_lower:
+                        category = cat.title()
+                        break
+
+            # Servings detection
+            servings_match = re.search(r'(\d+)\s*(servings?|serves?|people)', line_lower)
+            if servings_match:
+                try:
+                    servings = int(servings_match.group(1))
+                except (ValueError, TypeError):
+                    pass
+
+            # Time detection
+            time_patterns = [
+                r'cook(?:ing)?\s*time[:\s]*(\d+(?:\s*\d+)?\s*(?:min|minutes?|hr|hour|hours?))',
+                r'total\s*time[:\s]*(\d+(?:\s*\d+)?\s*(?:min|minutes?|hr|hour|hours?))',
+                r'prep(?:aration)?\s*time[:\s]*(\d+(?:\s*\d+)?\s*(?:min|minutes?|hr|hour|hours?))'
+            ]
+
+            for pattern in time_patterns:
+                match = re.search(pattern, line_lower)
+                if match:
+                    time_value = match.group(1)
+                    if 'cook' in pattern or 'total' in pattern:
+                        cook_time = time_value
+                    elif 'prep' in pattern:
+                        prep_time = time_value
+                    break
+
+            # Difficulty detection
+            if any(diff in line_lower for diff in ['easy', 'medium', 'hard', 'difficult', 'beginner', 'intermediate', 'advanced']):
+                for diff in ['easy', 'medium', 'hard', 'difficult', 'beginner', 'intermediate', 'advanced']:
+                    if diff in line_lower:
+                        if diff in ['beginner']:
+                            difficulty = 'Easy'
+                        elif diff in ['intermediate']:
+                            difficulty = 'Medium'
+                        elif diff in ['advanced', 'difficult']:
+                            difficulty = 'Hard'
+                        else:
+                            difficulty = diff.title()
+                        break
+
+        # Extract ingredients - look for common patterns
+        ingredients = []
+        in_ingredients = False
+
+        ingredient_keywords = ['ingredients', 'ingredient list', 'you will need']
+        instruction_keywords = ['instructions', 'directions', 'steps', 'method', 'how to']
+
+        for i, line in enumerate(cleaned_lines):
+            line_lower = line.lower()
+
+            # Check if we're entering ingredients section
+            if any(keyword in line_lower for keyword in ingredient_keywords):
+                in_ingredients = True
+                continue
+
+            # Check if we're entering instructions section
+            if any(keyword in line_lower for keyword in instruction_keywords):
+                break
+
+            # If we're in ingredients section, collect ingredient lines
+            if in_ingredients:
+                # Skip empty lines and section headers
+                if not line or line.startswith('#') or len(line) < 3:
+                    continue
+
+                # Look for bullet points or numbered lists
+                if re.match(r'^[\d\-\*\•]\s+', line):
+                    ingredient = re.sub(r'^[\d\-\*\•]\s+', '', line).strip()
+                    if ingredient:
+                        ingredients.append(ingredient)
+                # Look for lines that seem like ingredients (contain measurements)
+                elif re.search(r'\d+\s*(cup|cups|tbsp|tsp|oz|lb|pound|gram|g|ml|l|liter)', line_lower):
+                    ingredients.append(line)
+
+        # If no ingredients found with section detection, try pattern matching
+        if not ingredients:
+            for line in cleaned_lines:
+                # Look for lines with measurements
+                if re.search(r'\d+\s*(cup|cups|tbsp|tsp|oz|lb|pound|gram|g|ml|l|liter)', line.lower()):
+                    ingredients.append(line)
+
+        # Extract instructions - look for common patterns
+        instructions = []
+        in_instructions = False
+
+        for i, line in enumerate(cleaned_lines):
+            line_lower = line.lower()
+
+            # Check if we're entering instructions section
+            if any(keyword in line_lower for keyword in instruction_keywords):
+                in_instructions = True
+                continue
+
+            # If we're in instructions section, collect instruction lines
+            if in_instructions:
+                # Skip empty lines and section headers
+                if not line or line.startswith('#') or len(line) < 3:
+                    continue
+
+                # Look for numbered steps
+                if re.match(r'^\d+[\.\)]\s+', line):
+                    instruction = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
+                    if instruction:
+                        instructions.append(instruction)
+                # Look for any substantial text
+                elif len(line) > 10:
+                    instructions.append(line)
+
+        # If no instructions found with section detection, try pattern matching
+        if not instructions:
+            # Look for numbered steps anywhere in the text
+            for line in cleaned_lines:
+                if re.match(r'^\d+[\.\)]\s+', line) and len(line) > 10:
+                    instruction = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
+                    if instruction:
+                        instructions.append(instruction)
+
+        # Extract description from text before ingredients
+        description_lines = []
+        found_ingredients = False
+
+        for line in cleaned_lines:
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in ingredient_keywords):
+                found_ingredients = True
+                break
+            if line and len(line) > 10 and not line.isdigit():
+                description_lines.append(line)
+
+        if description_lines:
+            description = ' '.join(description_lines[:3])  # Take first 3 lines
+
+        return {
+            'title': title,
+            'category': category,
+            'servings': servings,
+            'cook_time': cook_time,
+            'prep_time': prep_time,
+            'difficulty': difficulty,
+            'description': description,
+            'notes': notes,
+            'ingredients': '\n'.join(ingredients),
+            'instructions': '\n'.join(instructions)
+        }
+
+    except Exception as e:
+        print(f"Error parsing PDF recipe: {e}")
+        return None
+
+
+def parse_word_recipe(word_text, default_category):
+    """Parse recipe from extracted Word document text"""
+    try:
+        lines = word_text.split('\n')
+
+        # Clean up the text - remove extra whitespace and normalize
+        cleaned_lines = []
+        for line in lines:
+            line = line.strip()
+            if line and line not in ['|', '||', '|||']:  # Remove table separators
+                cleaned_lines.append(line)
+
+        if not cleaned_lines:
+            return None
+
+        # Extract title - look for the first substantial line
+        title = ''
+        for i, line in enumerate(cleaned_lines[:10]):  # Check first 10 lines
+            # Skip common document artifacts
+            if any(skip in line.lower() for skip in ['recipe', 'document', 'page', 'copyright']):
+                if len(cleaned_lines) > i + 1:
+                    continue
+            # Look for title patterns - substantial text, not too long
+            if len(line) > 3 and len(line) < 100 and not line.isdigit():
+                # Check if it's styled like a title (all caps, title case, etc.)
+                title = line
+                break
+
+        if not title:
+            # Fallback: use first non-empty line
+            title = cleaned_lines[0] if cleaned_lines else "Imported Recipe"
+
+        # Extract metadata using various patterns
+        category = default_category
+        servings = 4
+        cook_time = ''
+        prep_time = ''
+        difficulty = 'Medium'
+        description = ''
+        notes = ''
+
+        # Look for metadata patterns (often in Word docs as "Label: Value")
+        for line in cleaned_lines:
+            line_lower = line.lower()
+
+            # Category detection
+            if 'category:' in line_lower or 'type:' in line_lower or 'cuisine:' in line_lower:
+                parts = line.split(':', 1)
+                if len(parts) > 1:
+                    category = parts[1].strip()
+            elif any(cat in line_lower for cat in ['appetizer', 'main course', 'dessert', 'side dish', 'beverage', 'breakfast', 'lunch', 'dinner']):
+                for cat in ['appetizer', 'main course', 'dessert', 'side dish', 'beverage', 'breakfast', 'lunch', 'dinner']:
+                    if cat in line_lower:
+                        category = cat.title()
+                        break
+
+            # Servings detection
+            if 'servings:' in line_lower or 'serves:' in line_lower or 'yield:' in line_lower:
+                servings_match = re.search(r'(\d+)', line)
+                if servings_match:
+                    try:
+                        servings = int(servings_match.group(1))
+                    except (ValueError, TypeError):
+                        pass
+            else:
+                servings_match = re.search(r'(\d+)\s*(servings?|serves?|people)', line_lower)
+                if servings_match:
+                    try:
+                        servings = int(servings_match.group(1))
+                    except (ValueError, TypeError):
+                        pass
+
+            # Time detection
+            if 'cook time:' in line_lower or 'cooking time:' in line_lower:
+                parts = line.split(':', 1)
+                if len(parts) > 1:
+                    cook_time = parts[1].strip()
+            elif 'prep time:' in line_lower or 'preparation time:' in line_lower:
+                parts = line.split(':', 1)
+                if len(parts) > 1:
+                    prep_time = parts[1].strip()
+            elif 'total time:' in line_lower:
+                parts = line.split(':', 1)
+                if len(parts) > 1 and not cook_time:
+                    cook_time = parts[1].strip()
+
+            # Difficulty detection
+            if 'difficulty:' in line_lower or 'level:' in line_lower:
+                parts = line.split(':', 1)
+                if len(parts) > 1:
+                    difficulty = parts[1].strip().title()
+            elif any(diff in line_lower for diff in ['easy', 'medium', 'hard', 'beginner', 'intermediate', 'advanced']):
+                for diff in ['easy', 'medium', 'hard', 'beginner', 'intermediate', 'advanced']:
+                    if diff in line_lower:
+                        if diff == 'beginner':
+                            difficulty = 'Easy'
+                        elif diff == 'intermediate':
+                            difficulty = 'Medium'
+                        elif diff in ['advanced', 'difficult']:
+                            difficulty = 'Hard'
+                        else:
+                            difficulty = diff.title()
+                        break
+
+        # Extract ingredients - look for common patterns
+        ingredients = []
+        in_ingredients = False
+
+        ingredient_keywords = ['ingredients', 'ingredient list', 'you will need', 'what you need']
+        instruction_keywords = ['instructions', 'directions', 'steps', 'method', 'how to make', 'preparation']
+
+        for i, line in enumerate(cleaned_lines):
+            line_lower = line.lower()
+
+            # Check if we're entering ingredients section
+            if any(keyword in line_lower for keyword in ingredient_keywords):
+                in_ingredients = True
+                continue
+
+            # Check if we're entering instructions section
+            if any(keyword in line_lower for keyword in instruction_keywords):
+                in_ingredients = False
+                break
+
+            # If we're in ingredients section, collect ingredient lines
+            if in_ingredients:
+                # Skip empty lines and section headers
+                if not line or len(line) < 2:
+                    continue
+
+                # Handle table format (with | separator)
+                if '|' in line:
+                    parts = line.split('|')
+                    # Combine amount and ingredient if in separate columns
+                    combined = ' '.join(p.strip() for p in parts if p.strip())
+                    if combined:
+                        ingredients.append(combined)
+                # Look for bullet points or numbered lists
+                elif re.match(r'^[\d\-\*\•·]\s+', line):
+                    ingredient = re.sub(r'^[\d\-\*\•·]\s+', '', line).strip()
+                    if ingredient:
+                        ingredients.append(ingredient)
+                # Look for lines that seem like ingredients
+                elif re.search(r'\d+\s*(cup|cups|tbsp|tsp|oz|lb|pound|gram|g|ml|l|liter|tablespoon|teaspoon)', line_lower) or len(line) < 60:
+                    ingredients.append(line)
+
+        # If no ingredients found with section detection, try pattern matching
+        if not ingredients:
+            for line in cleaned_lines:
+                # Look for lines with measurements
+                if re.search(r'\d+\s*(cup|cups|tbsp|tsp|oz|lb|pound|gram|g|ml|l|liter|tablespoon|teaspoon)', line.lower()):
+                    ingredients.append(line)
+
+        # Extract instructions - look for common patterns
+        instructions = []
+        in_instructions = False
+
+        for i, line in enumerate(cleaned_lines):
+            line_lower = line.lower()
+
+            # Check if we're entering instructions section
+            if any(keyword in line_lower for keyword in instruction_keywords):
+                in_instructions = True
+                continue
+
+            # If we're in instructions section, collect instruction lines
+            if in_instructions:
+                # Skip empty lines and very short lines
+                if not line or len(line) < 5:
+                    continue
+
+                # Skip lines that look like section headers
+                if line.lower() in ['notes', 'tips', 'nutrition']:
+                    break
+
+                # Look for numbered steps
+                if re.match(r'^\d+[\.\)]\s+', line):
+                    instruction = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
+                    if instruction:
+                        instructions.append(instruction)
+                # Look for any substantial text
+                elif len(line) > 15:
+                    instructions.append(line)
+
+        # If no instructions found with section detection, try pattern matching
+        if not instructions:
+            # Look for numbered steps anywhere in the text
+            for line in cleaned_lines:
+                if re.match(r'^\d+[\.\)]\s+', line) and len(line) > 15:
+                    instruction = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
+                    if instruction:
+                        instructions.append(instruction)
+
+        # Extract description from text before ingredients
+        description_lines = []
+        found_ingredients = False
+
+        for line in cleaned_lines:
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in ingredient_keywords):
+                found_ingredients = True
+                break
+            if line and line != title and len(line) > 15 and not line.isdigit():
+                # Skip metadata lines
+                if ':' not in line or len(line) > 50:
+                    description_lines.append(line)
+
+        if description_lines:
+            description = ' '.join(description_lines[:3])  # Take first 3 lines
+
+        return {
+            'title': title,
+            'category': category,
+            'servings': servings,
+            'cook_time': cook_time,
+            'prep_time': prep_time,
+            'difficulty': difficulty,
+            'description': description,
+            'notes': notes,
+            'ingredients': '\n'.join(ingredients),
+            'instructions': '\n'.join(instructions)
+        }
+
+    except Exception as e:
+        print(f"Error parsing Word recipe: {e}")
+        return None
+
+
+def _structured_recipes(data: Any) -> List[Any]:
+    """Recipe entries of a JSON or YAML document: a list, {'recipes': [...]} or one recipe"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return data['recipes'] if 'recipes' in data else [data]
+    raise ValueError("File must contain a recipe or list of recipes.")
+
+
+def _parse_json(path: str, default_category: str) -> List[Optional[Dict[str, Any]]]:
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    return [normalize_recipe(recipe, default_category) for recipe in _structured_recipes(data)]
+
+
+def _parse_yaml(path: str, default_category: str) -> List[Optional[Dict[str, Any]]]:
+    try:
+        import yaml
+    except ImportError:
+        raise ImportError("PyYAML library is required for YAML import.\n"
+                          "Please install it with: pip install pyyaml")
+    with open(path, 'r', encoding='utf-8') as file:
+        data = yaml.safe_load(file)
+    return [normalize_recipe(recipe, default_category) for recipe in _structured_recipes(data)]
+
+
+def _parse_csv(path: str, default_category: str) -> List[Optional[Dict[str, Any]]]:
+    return [normalize_recipe(row, default_category) for row in iter_csv_rows(path)]
+
+
+def _parse_xml(path: str, default_category: str) -> List[Optional[Dict[str, Any]]]:
+    import xml.etree.ElementTree as ET
+    root = ET.parse(path).getroot()
+    elements = [root] if root.tag.lower() == 'recipe' else root.findall('.//recipe')
+    return [parse_xml_recipe(element, default_category) for element in elements]
+
+
+def _parse_excel(path: str, default_category: str) -> List[Optional[Dict[str, Any]]]:
+    import pandas as pd
+    return [normalize_excel_recipe(row, default_category)
+            for row in pd.read_excel(path).to_dict('records')]
+
+
+def _read_text(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+# Parser for each supported extension: (path, default category) -> recipes (None for unparseable entries)
+PARSERS: Dict[str, Callable[[str, str], List[Optional[Dict[str, Any]]]]] = {
+    '.csv': _parse_csv,
+    '.json': _parse_json,
+    '.yaml': _parse_yaml,
+    '.yml': _parse_yaml,
+    '.xml': _parse_xml,
+    '.md': lambda path, category: [parse_markdown_recipe(_read_text(path), category)],
+    '.markdown': lambda path, category: [parse_markdown_recipe(_read_text(path), category)],
+    '.txt': lambda path, category: [parse_recipe_text(_read_text(path), category)],
+    '.pdf': lambda path, category: [parse_pdf_recipe(extract_pdf_text(path), category)],
+    '.docx': lambda path, category: [parse_word_recipe(extract_word_text(path), category)],
+    '.doc': lambda path, category: [parse_word_recipe(extract_word_text(path), category)],
+    '.xlsx': _parse_excel,
+    '.xls': _parse_excel,
+}
+
+
+def find_recipe_files(directory: str) -> List[str]:
+    """Supported recipe files under a directory, recursively, in path order"""
+    return sorted(str(path) for path in Path(directory).rglob('*')
+                  if path.is_file() and path.suffix.lower() in PARSERS)
+
+
+def complete_recipe(recipe: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the columns a parser left out"""
+    for column in RECIPE_COLUMNS:
+        if recipe.get(column) is None:
+            recipe[column] = RECIPE_DEFAULTS.get(column, '')
+    return recipe
+
+
+def parse_recipe_file(path: str, default_category: str = 'Main Course') -> ParsedFile:
+    """
+    Parse one recipe file; runs in pool workers as well as in-process
+
+    Never raises: any failure is returned as the file's error.
+    """
+    parser = PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser is None:
+        return ParsedFile(path, error="Unsupported file type")
+    try:
+        recipes = [complete_recipe(recipe) for recipe in parser(path, default_category)
+                   if recipe and str(recipe.get('title') or '').strip()]
+    except Exception as e:
+        return ParsedFile(path, error=str(e) or type(e).__name__)
+    if not recipes:
+        return ParsedFile(path, error="No recipes found")
+    return ParsedFile(path, recipes)
+
+
+class RecipeImportPipeline:
+    """Parses recipe files in parallel and writes them through one batched writer"""
+
+    def __init__(self, connection: Optional[sqlite3.Connection] = None,
+                 workers: Optional[int] = None, batch_size: int = 200,
+                 min_parallel: int = 20, threshold: float = DEFAULT_THRESHOLD):
+        """
+        Initialize the pipeline
+
+        Args:
+            connection: Database connection; opened on first use if omitted.
+                Must belong to the thread that calls run().
+            workers: Worker processes for large imports (CPU count if omitted)
+            batch_size: Recipes written per transaction
+            min_parallel: Fewer files than this are parsed in-process
+            threshold: Least estimated similarity of title and ingredients
+                that counts as a near-duplicate
+        """
+        self._conn = connection
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.batch_size = batch_size
+        self.min_parallel = min_parallel
+        self.threshold = threshold
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            from utils.db import get_connection
+            self._conn = get_connection()
+        return self._conn
+
+    def run(self, paths: Iterable[str], duplicate_handling: str = SKIP_DUPLICATES,
+            default_category: str = 'Main Course',
+            progress: Optional[Callable[[int, int], None]] = None,
+            cancelled: Optional[Callable[[], bool]] = None) -> ImportSummary:
+        """
+        Import recipe files
+
+        Args:
+            paths: Files to import
+            duplicate_handling: What to do with a recipe whose title exists: skip it
+                (SKIP_DUPLICATES), merge it into that recipe (UPDATE_EXISTING) or add
+                it anyway (CREATE_NEW). A recipe whose title and ingredients only
+                nearly match an existing one is always added and listed in the summary.
+            default_category: Category of recipes that do not name one
+            progress: Called with (files done, files to do) after each file
+            cancelled: Polled between files; recipes parsed so far are still written
+
+        Returns:
+            Counts of imported, updated and skipped recipes and the error of each failed file
+        """
+        paths = list(paths)
+        summary = ImportSummary(files=len(paths))
+        if progress:
+            progress(0, summary.files)
+        if not paths:
+            return summary
+
+        existing = self._prepare()
+        pending: List[Dict[str, Any]] = []
+        pool = None
+        if len(paths) >= self.min_parallel and self.workers > 1:
+            pool = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+        try:
+            if pool:
+                chunksize = max(1, min(32, len(paths) // (self.workers * 4)))
+                results = pool.map(parse_recipe_file, paths, repeat(default_category), chunksize=chunksize)
+            else:
+                results = map(parse_recipe_file, paths, repeat(default_category))
+            for parsed in results:
+                if cancelled and cancelled():
+                    summary.cancelled = True
+                    break
+                if parsed.error:
+                    summary.errors[parsed.path] = parsed.error
+                pending.extend(parsed.recipes)
+                if len(pending) >= self.batch_size:
+                    self._write(pending, duplicate_handling, existing, summary)
+                    pending = []
+                summary.files_done += 1
+                if progress:
+                    progress(summary.files_done, summary.files)
+            if pending:
+                self._write(pending, duplicate_handling, existing, summary)
+        finally:
+            if pool:
+                pool.shutdown(wait=True, cancel_futures=True)
+        return summary
+
+    def import_recipes(self, recipes: Iterable[Dict[str, Any]],
+                       duplicate_handling: str = SKIP_DUPLICATES) -> ImportSummary:
+        """Write recipes that were already parsed (e.g. pasted text) like run() would"""
+        summary = ImportSummary()
+        self._write([complete_recipe(recipe) for recipe in recipes], duplicate_handling,
+                    self._prepare(), summary)
+        return summary
+
+    def _prepare(self) -> Dict[str, int]:
+        """Sign recipes added or edited since the last import and map titles to ids"""
+        with self.conn:
+            index_missing(self.conn)
+        return {title: recipe_id for recipe_id, title in self.conn.execute("SELECT id, title FROM recipes")}
+
+    def _similar(self, sig) -> Optional[Tuple[int, str, float]]:
+        """The existing recipe most similar in title and ingredients, if any reaches the threshold"""
+        if sig is None:
+            return None
+        matches = near_duplicates(self.conn, sig, self.threshold)
+        return matches[0] if matches else None
+
+    def _insert_ingredients(self, recipe_id: int, recipe: Dict[str, Any]):
+        """Insert the ingredient rows of a recipe"""
+        self.conn.executemany(
+            "INSERT INTO recipe_ingredients (recipe_id, ingredient_name, quantity, unit, notes) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(recipe_id, ingredient.get('name', ''), ingredient.get('quantity', ''),
+              ingredient.get('unit', ''), ingredient.get('notes', ''))
+             for ingredient in recipe.get('parsed_ingredients') or ()])
+
+    def _write(self, recipes: List[Dict[str, Any]], duplicate_handling: str,
+               existing: Dict[str, int], summary: ImportSummary):
+        """Write one batch of recipes in a single transaction"""
+        columns = ", ".join(RECIPE_COLUMNS)
+        assignments = ", ".join(f"{column} = ?" for column in RECIPE_COLUMNS[1:])
+        batch = ImportSummary()
+        added: Dict[str, int] = {}
+        updated = []
+        try:
+            with self.conn:
+                for recipe in recipes:
+                    values = [recipe[column] for column in RECIPE_COLUMNS]
+                    sig = signature(recipe_tokens(recipe['title'], str(recipe['ingredients'])))
+                    match_id = added.get(recipe['title'], existing.get(recipe['title']))
+                    if match_id is None:
+                        # Different dishes can share every ingredient, so a content match is
+                        # only reported; skipping and merging need the same title
+                        similar = self._similar(sig)
+                        if similar is not None:
+                            batch.near_duplicates.append((recipe['title'], similar[1], similar[2]))
+                    elif duplicate_handling == SKIP_DUPLICATES:
+                        batch.skipped += 1
+                        continue
+                    elif duplicate_handling == UPDATE_EXISTING:
+                        self.conn.execute(f"UPDATE recipes SET {assignments} WHERE id = ?", (*values[1:], match_id))
+                        # The ingredient rows follow the merged ingredient text
+                        self.conn.execute("DELETE FROM recipe_ingredients WHERE recipe_id = ?", (match_id,))
+                        self._insert_ingredients(match_id, recipe)
+                        updated.append(match_id)
+                        batch.last_recipe_id = match_id
+                        continue
+                    cursor = self.conn.execute(
+                        f"INSERT INTO recipes ({columns}) VALUES ({', '.join('?' * len(RECIPE_COLUMNS))})",
+                        values)
+                    recipe_id = cursor.lastrowid
+                    self._insert_ingredients(recipe_id, recipe)
+                    # Signed after the ingredient rows, whose triggers drop signatures
+                    if sig is not None:
+                        store_signatures(self.conn, {recipe_id: sig})
+                    added.setdefault(recipe['title'], recipe_id)
+                    batch.last_recipe_id = recipe_id
+                    batch.imported += 1
+                # Merged recipes keep their title but may have new ingredients
+                index_recipes(self.conn, updated)
+        except sqlite3.Error as e:
+            print(f"Error writing imported recipes: {e}")
+            summary.errors['database'] = f"{len(recipes)} recipes not saved: {e}"
+            return
+        for title, recipe_id in added.items():
+            existing.setdefault(title, recipe_id)
+        summary.imported += batch.imported
+        summary.updated += len(updated)
+        summary.skipped += batch.skipped
+        summary.near_duplicates.extend(batch.near_duplicates)
+        summary.last_recipe_id = batch.last_recipe_id or summary.last_recipe_id
+
+
+def import_recipes_job(context, paths: Iterable[str], duplicate_handling: str = SKIP_DUPLICATES,
+                       default_category: str = 'Main Course') -> ImportSummary:
+    """Background job running a RecipeImportPipeline on its own connection"""
+    from utils.db import get_connection
+
+    paths = list(paths)
+    summary = ImportSummary(files=len(paths))
+    try:
+        with closing(get_connection()) as conn:
+            summary = RecipeImportPipeline(conn).run(
+                paths, duplicate_handling, default_category, context.progress, context.token)
+    except Exception as e:
+        print(f"Error during recipe import: {e}")
+        summary.errors['import'] = str(e)
+    return summary
@@ -0,0 +1,325 @@
+# path: services/recipe_pdf.py
+"""
+Streaming recipe PDF export for CeliacShield
+
+Recipes are rendered one at a time with QTextDocument onto a QPdfWriter,
+which writes each finished page to the file, so memory stays flat however
+many recipes the cookbook has. Everything that does not depend on the recipe
+is resolved once per export and reused: page geometry, fonts, the HTML style
+sheet and scaled recipe images (kept in a small LRU cache). Recipes are read
+from the database in blocks, and the export reports progress per recipe, so a
+2,000-recipe cookbook moves at an even pace and can be cancelled between
+recipes. export_cookbook_job runs an export as a background job.
+"""
+
+import html
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from PySide6.QtCore import QMarginsF, QRectF, QSizeF, Qt, QUrl
+from PySide6.QtGui import (
+    QFont, QImage, QPageLayout, QPageSize, QPainter, QPdfWriter, QTextDocument
+)
+
+from utils.export_stream import iter_blocks
+
+# Device resolution of the PDF; layout sizes below are in these pixels
+RESOLUTION = 96
+
+# Largest size a recipe image is drawn at
+IMAGE_MAX_WIDTH = 480
+IMAGE_MAX_HEIGHT = 320
+
+# Scaled images kept for reuse across recipes
+IMAGE_CACHE_SIZE = 64
+
+# Recipes read from the database at a time
+FETCH_RECIPES = 100
+
+RECIPE_SQL = """
+    SELECT r.id, r.title, r.category, r.description, r.ingredients, r.instructions,
+           r.prep_time, r.cook_time, r.servings, r.difficulty, r.notes, r.image_path,
+           (SELECT GROUP_CONCAT(line, char(10)) FROM (
+                SELECT TRIM(COALESCE(i.quantity, '') || ' ' || COALESCE(i.unit, '') || ' ' ||
+                            i.ingredient_name) AS line
+                FROM recipe_ingredients i WHERE i.recipe_id = r.id ORDER BY i.id
+            )) AS ingredient_rows
+    FROM recipes r
+"""
+
+_STYLE_SHEET = """
+    h1 { font-size: 20pt; color: #2c3e50; margin-bottom: 4px; }
+    h2 { font-size: 13pt; color: #2c3e50; margin-top: 12px; margin-bottom: 4px; }
+    p.meta { font-size: 9pt; color: #555555; }
+    p.category { font-size: 9pt; color: #7f8c8d; text-transform: uppercase; }
+    ul { margin-left: 12px; }
+    li { margin-bottom: 2px; }
+    p.cover-title { font-size: 28pt; color: #2c3e50; }
+    p.cover-info { font-size: 11pt; color: #555555; }
+"""
+
+
+class RecipePdfLayout:
+    """Page geometry, fonts, style sheet and scaled images shared by every recipe of an export"""
+
+    def __init__(self, page_size: QPageSize.PageSizeId = QPageSize.PageSizeId.A4,
+                 margin_mm: float = 18.0, font_family: str = "Helvetica", font_size: float = 10.5):
+        """
+        Initialize the layout
+
+        Args:
+            page_size: Paper size
+            margin_mm: Margin on every side
+            font_family: Body font; Qt substitutes the closest installed family once
+            font_size: Body font size in points
+        """
+        self.page_layout = QPageLayout(QPageSize(page_size), QPageLayout.Orientation.Portrait,
+                                       QMarginsF(margin_mm, margin_mm, margin_mm, margin_mm),
+                                       QPageLayout.Unit.Millimeter)
+        rect = self.page_layout.paintRectPixels(RESOLUTION)
+        self.page_width = float(rect.width())
+        self.page_height = float(rect.height())
+        self.font = QFont(font_family)
+        self.font.setPointSizeF(font_size)
+        self.style_sheet = _STYLE_SHEET
+        self._images: "OrderedDict[str, Optional[QImage]]" = OrderedDict()
+        self.image_loads = 0
+
+    def scaled_image(self, path: str) -> Optional[QImage]:
+        """A recipe image scaled to fit IMAGE_MAX_WIDTH x IMAGE_MAX_HEIGHT, or None if it cannot be read"""
+        if not path:
+            return None
+        if path in self._images:
+            self._images.move_to_end(path)
+            return self._images[path]
+        self.image_loads += 1
+        image = QImage(path) if os.path.isfile(path) else QImage()
+        if image.isNull():
+            image = None
+        elif image.width() > IMAGE_MAX_WIDTH or image.height() > IMAGE_MAX_HEIGHT:
+            image = image.scaled(IMAGE_MAX_WIDTH, IMAGE_MAX_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        self._images[path] = image
+        if len(self._images) > IMAGE_CACHE_SIZE:
+            self._images.popitem(last=False)
+        return image
+
+    def document(self, body_html: str, images: Dict[str, QImage] = None) -> QTextDocument:
+        """A text document laid out to the page, using the shared font and style sheet"""
+        document = QTextDocument()
+        document.setDefaultFont(self.font)
+        document.setDefaultStyleSheet(self.style_sheet)
+        document.setDocumentMargin(0)
+        for name, image in (images or {}).items():
+            document.addResource(QTextDocument.ResourceType.ImageResource, QUrl(name), image)
+        document.setHtml(body_html)
+        document.setPageSize(QSizeF(self.page_width, self.page_height))
+        return document
+
+
+def _text(value: Any) -> str:
+    return html.escape(str(value or '').strip())
+
+
+def _lines(value: Any) -> List[str]:
+    if isinstance(value, (list, tuple)):
+        items = value
+    else:
+        items = str(value or '').splitlines()
+    lines = []
+    for item in items:
+        if isinstance(item, dict):
+            item = " ".join(str(item.get(key) or '') for key in ('quantity', 'unit', 'name')).strip()
+        item = str(item).strip().lstrip('-•*').strip()
+        if item:
+            lines.append(item)
+    return lines
+
+
+def recipe_html(recipe: Dict[str, Any], image_name: Optional[str] = None) -> str:
+    """HTML body of one recipe page"""
+    parts = [f"<h1>{_text(recipe.get('title') or recipe.get('name') or 'Untitled Recipe')}</h1>"]
+    if recipe.get('category'):
+        parts.append(f"<p class='category'>{_text(recipe['category'])}</p>")
+    meta = [f"{label}: {_text(recipe.get(key))}" for key, label in
+            (('prep_time', 'Prep'), ('cook_time', 'Cook'), ('servings', 'Serves'),
+             ('difficulty', 'Difficulty')) if recipe.get(key)]
+    if meta:
+        parts.append(f"<p class='meta'>{' &nbsp;|&nbsp; '.join(meta)}</p>")
+    if image_name:
+        parts.append(f"<p><img src='{image_name}'></p>")
+    if recipe.get('description'):
+        parts.append(f"<p>{_text(recipe['description'])}</p>")
+    ingredients = _lines(recipe.get('ingredient_rows') or recipe.get('ingredients'))
+    if ingredients:
+        parts.append("<h2>Ingredients</h2><ul>"
+                     + "".join(f"<li>{html.escape(line)}</li>" for line in ingredients) + "</ul>")
+    steps = _lines(recipe.get('instructions'))
+    if steps:
+        parts.append("<h2>Instructions</h2><ol>"
+                     + "".join(f"<li>{html.escape(step)}</li>" for step in steps) + "</ol>")
+    if recipe.get('notes'):
+        parts.append(f"<h2>Notes</h2><p>{_text(recipe['notes'])}</p>")
+    return "".join(parts)
+
+
+class RecipePdfWriter:
+    """Writes recipes to a PDF file page by page"""
+
+    def __init__(self, file_path: str, layout: Optional[RecipePdfLayout] = None,
+                 title: str = "Gluten-Free Cookbook"):
+        """
+        Open the PDF file
+
+        Args:
+            file_path: PDF file to write
+            layout: Shared layout (a default A4 layout if omitted)
+            title: Document title, shown on the cover page and in the PDF metadata
+        """
+        self.layout = layout or RecipePdfLayout()
+        self.title = title
+        self._writer = QPdfWriter(file_path)
+        self._writer.setResolution(RESOLUTION)
+        self._writer.setPageLayout(self.layout.page_layout)
+        self._writer.setTitle(title)
+        self._writer.setCreator("CeliacShield")
+        self._painter = QPainter()
+        if not self._painter.begin(self._writer):
+            raise IOError(f"Cannot write PDF file: {file_path}")
+        self._pages = 0
+
+    @property
+    def pages(self) -> int:
+        return self._pages
+
+    def _draw(self, document: QTextDocument):
+        """Draw a laid-out document, one page at a time"""
+        height = self.layout.page_height
+        for page in range(document.pageCount()):
+            if self._pages:
+                self._writer.newPage()
+            self._painter.save()
+            self._painter.translate(0, -page * height)
+            document.drawContents(self._painter, QRectF(0, page * height, self.layout.page_width, height))
+            self._painter.restore()
+            self._pages += 1
+
+    def add_cover(self, recipe_count: Optional[int] = None):
+        """Add a title page"""
+        info = f"Exported on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        if recipe_count is not None:
+            info += f" &nbsp;|&nbsp; {recipe_count} recipes"
+        self._draw(self.layout.document(
+            f"<p class='cover-title'>{_text(self.title)}</p><p class='cover-info'>{info}</p>"))
+
+    def add_recipe(self, recipe: Dict[str, Any]) -> int:
+        """
+        Render one recipe starting on a new page
+
+        Returns:
+            Number of pages the recipe took
+        """
+        image = self.layout.scaled_image(recipe.get('image_path') or '')
+        images = {'recipe-image': image} if image is not None else {}
+        document = self.layout.document(recipe_html(recipe, 'recipe-image' if images else None), images)
+        before = self._pages
+        self._draw(document)
+        return self._pages - before
+
+    def write(self, recipes: Iterable[Dict[str, Any]], total: Optional[int] = None,
+              progress: Optional[Callable[[int, int], None]] = None,
+              cancelled: Optional[Callable[[], bool]] = None, cover: bool = True) -> int:
+        """
+        Render recipes in order
+
+        Args:
+            recipes: Recipe dicts; consumed lazily
+            total: Number of recipes, for the cover page and progress
+            progress: Called with (recipes done, total) after each recipe
+            cancelled: Polled between recipes; rendering stops when it returns True
+
+        Returns:
+            Number of recipes rendered
+        """
+        if cover:
+            self.add_cover(total)
+        done = 0
+        for recipe in recipes:
+            if cancelled and cancelled():
+                break
+            self.add_recipe(recipe)
+            done += 1
+            if progress:
+                progress(done, total if total is not None else done)
+        return done
+
+    def close(self):
+        """Finish the file"""
+        if self._painter.isActive():
+            self._painter.end()
+
+    def __enter__(self) -> 'RecipePdfWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_recipes(conn: sqlite3.Connection, recipe_ids: Optional[List[int]] = None,
+                 size: int = FETCH_RECIPES) -> Iterator[Dict[str, Any]]:
+    """Recipes with their ingredient rows, read in blocks and ordered by title"""
+    sql = RECIPE_SQL
+    params: List[Any] = []
+    if recipe_ids is not None:
+        sql += " WHERE r.id IN (SELECT value FROM json_each(?))"
+        params.append("[" + ",".join(str(int(recipe_id)) for recipe_id in recipe_ids) + "]")
+    cursor = conn.execute(sql + " ORDER BY r.title COLLATE NOCASE, r.id", params)
+    try:
+        columns = [d[0] for d in cursor.description]
+        for rows in iter_blocks(cursor, size):
+            for row in rows:
+                yield dict(zip(columns, row))
+    finally:
+        cursor.close()
+
+
+def export_recipes_pdf(conn: sqlite3.Connection, file_path: str, recipe_ids: Optional[List[int]] = None,
+                       title: str = "Gluten-Free Cookbook", layout: Optional[RecipePdfLayout] = None,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Stream recipes from the database into a PDF cookbook
+
+    Args:
+        recipe_ids: Recipes to export (all if omitted)
+
+    Returns:
+        Number of recipes written
+    """
+    if recipe_ids is None:
+        total = conn.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+    else:
+        total = len(set(recipe_ids))
+    if progress:
+        progress(0, total)
+    with RecipePdfWriter(file_path, layout, title) as writer:
+        return writer.write(iter_recipes(conn, recipe_ids), total, progress, cancelled)
+
+
+def export_cookbook_job(context, file_path: str, recipe_ids: Optional[List[int]] = None,
+                        title: str = "Gluten-Free Cookbook") -> int:
+    """
+    Background job exporting recipes to PDF on its own connection
+
+    Returns:
+        Number of recipes written (fewer if the job was cancelled)
+    """
+    from utils.db import get_connection
+
+    with closing(get_connection()) as conn:
+        return export_recipes_pdf(conn, file_path, recipe_ids, title,
+                                  progress=context.progress, cancelled=context.token)
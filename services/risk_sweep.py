@@ -0,0 +1,308 @@
+# path: services/risk_sweep.py
+"""
+Background gluten risk sweep for pantry items and recipes
+
+Scores every pantry item and recipe with GlutenRiskAnalyzer and stores the
+result in the indexed gluten_risk / gluten_risk_score columns, so panels can
+filter and sort by risk with a plain query. Each row also records a hash of
+the text it was scored from (and the analysis version: memo format and
+lexicon); later sweeps only re-score rows whose hash no longer matches, and
+a new lexicon or memo version re-scores every row. Large sweeps are spread
+over a process pool, while results are written from the sweeping thread
+only.
+"""
+
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from multiprocessing import get_context
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from services.gluten_analysis_memo import analysis_version
+from utils.data_versions import get_versions
+
+# Sortable 0..1 score for each RiskLevel value
+RISK_SCORES: Dict[str, float] = {
+    'safe': 0.0,
+    'low_risk': 0.25,
+    'unknown': 0.4,
+    'medium_risk': 0.5,
+    'high_risk': 0.75,
+    'unsafe': 1.0,
+}
+
+# Text each table is scored from: product name, ingredients, additional info
+_SOURCE_SQL = {
+    'pantry': """
+        SELECT id, gluten_risk_hash,
+               TRIM(COALESCE(brand, '') || ' ' || name),
+               name,
+               COALESCE(tags, '') || '; ' || COALESCE(notes, '')
+        FROM pantry
+    """,
+    'recipes': """
+        SELECT r.id, r.gluten_risk_hash,
+               r.title,
+               COALESCE(r.ingredients, '') || ', ' || COALESCE((
+                   SELECT GROUP_CONCAT(name, ', ') FROM (
+                       SELECT ingredient_name AS name FROM recipe_ingredients
+                       WHERE recipe_id = r.id ORDER BY id
+                   )
+               ), ''),
+               COALESCE(r.tags, '')
+        FROM recipes r
+    """,
+}
+
+# Tables whose writes can change a risk column
+SOURCE_TABLES = ('pantry', 'recipes', 'recipe_ingredients')
+
+SweepRow = Tuple[int, str, str, str, str]  # id, hash, product name, ingredients, additional info
+ScoredRow = Tuple[str, float, str, int]  # risk, score, hash, id
+SweepState = Tuple[str, Dict[str, int]]  # analysis version, source table versions
+
+
+def _score_rows(rows: List[SweepRow]) -> List[ScoredRow]:
+    """Score a chunk of rows; runs in pool workers as well as in-process"""
+    from services.gluten_risk_analyzer import get_gluten_risk_analyzer
+
+    results = get_gluten_risk_analyzer().analyze_many(
+        [(product, ingredients, None, info) for _, _, product, ingredients, info in rows]
+    )
+    scored = []
+    for (row_id, row_hash, *_), result in zip(rows, results):
+        risk = result.risk_level.value
+        scored.append((risk, RISK_SCORES.get(risk, RISK_SCORES['unknown']), row_hash, row_id))
+    return scored
+
+
+class RiskSweep:
+    """Incremental gluten risk scoring of pantry and recipe rows"""
+
+    TABLES = ('pantry', 'recipes')
+
+    def __init__(self, connection: Optional[sqlite3.Connection] = None,
+                 workers: Optional[int] = None, chunk_size: int = 250,
+                 min_parallel: int = 1000):
+        """
+        Initialize the sweep
+
+        Args:
+            connection: Database connection; opened on first use if omitted.
+                Must belong to the thread that calls run().
+            workers: Worker processes for large sweeps (CPU count if omitted)
+            chunk_size: Rows scored and written per batch
+            min_parallel: Fewer changed rows than this are scored in-process
+        """
+        self._conn = connection
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.chunk_size = chunk_size
+        self.min_parallel = min_parallel
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            from utils.db import get_connection
+            self._conn = get_connection()
+        return self._conn
+
+    def data_state(self) -> Optional[SweepState]:
+        """
+        Get the analysis version and the data versions of the source tables
+
+        Returns:
+            The state, or None if the database has no version counters
+        """
+        versions = get_versions(self.conn, SOURCE_TABLES)
+        if not versions:
+            return None
+        return analysis_version(), versions
+
+    @staticmethod
+    def swept_state(before: Optional[SweepState], counts: Dict[str, int]) -> Optional[SweepState]:
+        """
+        Get the state a completed sweep leaves behind
+
+        The sweep's own writes bump each table's version once per re-scored
+        row, so the result equals the current state unless something else
+        wrote to the source tables while the sweep ran.
+
+        Args:
+            before: data_state() read before the sweep
+            counts: Rows re-scored per table, as returned by run()
+        """
+        if before is None:
+            return None
+        version, versions = before
+        return version, {table: version + counts.get(table, 0)
+                                 for table, version in versions.items()}
+
+    def pending(self, table: str) -> List[SweepRow]:
+        """
+        Get the rows of a table whose scored text changed since the last sweep
+
+        Returns:
+            (id, new hash, product name, ingredients, additional info) tuples
+        """
+        version = analysis_version()
+        rows = []
+        for row_id, old_hash, product, ingredients, info in self.conn.execute(_SOURCE_SQL[table]):
+            content = "\x1f".join((version, product or "", ingredients or "", info or ""))
+            new_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+            if new_hash != old_hash:
+                rows.append((row_id, new_hash, product or "", ingredients or "", info or ""))
+        return rows
+
+    def run(self, tables: Iterable[str] = TABLES,
+            progress: Optional[Callable[[int, int], None]] = None,
+            cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """
+        Re-score changed rows and write their risk columns
+
+        Args:
+            tables: Tables to sweep ('pantry', 'recipes')
+            progress: Called with (rows done, rows to do) after each batch
+            cancelled: Polled between batches; the sweep stops when it returns True.
+                Rows written so far are kept, the rest are picked up next time.
+
+        Returns:
+            Dict mapping table name to the number of rows re-scored
+        """
+        work = {table: self.pending(table) for table in tables}
+        total = sum(len(rows) for rows in work.values())
+        done = 0
+        counts = {table: 0 for table in work}
+        if progress:
+            progress(0, total)
+        if not total:
+            return counts
+
+        pool = None
+        if total >= self.min_parallel and self.workers > 1:
+            pool = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+        try:
+            for table, rows in work.items():
+                chunks = [rows[i:i + self.chunk_size] for i in range(0, len(rows), self.chunk_size)]
+                scored_chunks = pool.map(_score_rows, chunks) if pool else map(_score_rows, chunks)
+                for scored in scored_chunks:
+                    if cancelled and cancelled():
+                        return counts
+                    with self.conn:
+                        self.conn.executemany(
+                            f"UPDATE {table} SET gluten_risk = ?, gluten_risk_score = ?, "
+                            f"gluten_risk_hash = ? WHERE id = ?",
+                            scored,
+                        )
+                    counts[table] += len(scored)
+                    done += len(scored)
+                    if progress:
+                        progress(done, total)
+        finally:
+            if pool:
+                pool.shutdown(wait=True, cancel_futures=True)
+        return counts
+
+
+class RiskSweepWorker(QObject):
+    """Worker running a RiskSweep on its own thread and connection"""
+
+    progress = Signal(int, int)
+    finished = Signal(dict, object)  # counts, swept state (None unless the sweep completed)
+
+    def __init__(self, tables: Iterable[str] = RiskSweep.TABLES):
+        super().__init__()
+        self.tables = tuple(tables)
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        """Run the sweep"""
+        from utils.db import get_connection
+
+        counts, state = {}, None
+        try:
+            with closing(get_connection()) as conn:
+                sweep = RiskSweep(conn)
+                before = sweep.data_state()
+                counts = sweep.run(self.tables, self.progress.emit, lambda: self._cancelled)
+                if not self._cancelled and set(self.tables) == set(RiskSweep.TABLES):
+                    state = sweep.swept_state(before, counts)
+        except Exception as e:
+            print(f"Error during gluten risk sweep: {e}")
+        self.finished.emit(counts, state)
+
+
+class RiskSweepService(QObject):
+    """Starts background risk sweeps, one at a time and only when the data changed"""
+
+    sweep_finished = Signal(dict)
+
+    def __init__(self):
+        super().__init__()
+        self._thread: Optional[QThread] = None
+        self._worker: Optional[RiskSweepWorker] = None
+        self._sweep: Optional[RiskSweep] = None
+        self._swept: Optional[SweepState] = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def is_current(self) -> bool:
+        """Check whether the last completed sweep saw the current data and lexicon"""
+        if self._swept is None:
+            return False
+        if self._sweep is None:
+            self._sweep = RiskSweep()
+        try:
+            return self._sweep.data_state() == self._swept
+        except sqlite3.Error:
+            return False
+
+    def start(self, tables: Iterable[str] = RiskSweep.TABLES) -> bool:
+        """
+        Start a sweep on a background thread
+
+        Returns:
+            False if a sweep is already running or nothing changed since the last one
+        """
+        if self._thread is not None or self.is_current():
+            return False
+        self._thread = QThread()
+        self._worker = RiskSweepWorker(tables)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.finished.connect(self._on_finished)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def _on_finished(self, counts: dict, state: Optional[SweepState]):
+        self._swept = state
+        self._thread.quit()
+        self._thread.wait()
+        self._thread.deleteLater()
+        self._worker.deleteLater()
+        self._thread = None
+        self._worker = None
+        self.sweep_finished.emit(counts)
+
+
+def get_risk_sweep_service() -> RiskSweepService:
+    """Get singleton risk sweep service instance"""
+    global _risk_sweep_service
+    if _risk_sweep_service is None:
+        _risk_sweep_service = RiskSweepService()
+    return _risk_sweep_service
+
+
+# Global service instance
+_risk_sweep_service = None
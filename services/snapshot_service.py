@@ -0,0 +1,426 @@
+# path: services/snapshot_service.py
+"""
+Online database snapshots for CeliacShield
+
+Snapshots are taken with the SQLite backup API rather than a file copy, so
+they are always consistent (committed WAL frames included, half-written
+transactions excluded) and the app keeps working while they run. The copy is
+made PAGES_PER_STEP pages at a time with a short pause between steps on a
+background thread; in WAL mode a step only holds a read transaction, so
+writers are never blocked, and a write made through another connection
+simply makes SQLite re-copy the pages it changed. If writes keep restarting
+the copy, the rest is finished in a single step.
+
+A finished snapshot can be gzipped and then encrypted with the app's data
+key, both streamed so a multi-GB database never has to fit in memory.
+Scheduled snapshots are rotated: only the newest ``keep`` files are kept.
+"""
+
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Union
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+# Pages copied per backup step (1 MiB with 4 KiB pages)
+PAGES_PER_STEP = 256
+
+# Pause between backup steps, leaving the database to other connections
+STEP_SLEEP = 0.005
+
+# Restarts caused by other connections' writes before finishing in one step
+MAX_RESTARTS = 3
+
+SNAPSHOT_PREFIX = "celiacshield_snapshot_"
+SNAPSHOT_SUFFIXES = (".db", ".db.gz", ".db.enc", ".db.gz.enc")
+
+_COPY_CHUNK = 1 << 20
+
+
+class SnapshotCancelled(Exception):
+    """Raised when a snapshot is cancelled; the partial file is removed"""
+
+
+class _CopyRestarted(Exception):
+    pass
+
+
+@dataclass
+class SnapshotSettings:
+    """Snapshot schedule and format, stored in app_settings"""
+    directory: str = ""
+    interval_hours: int = 0  # 0 turns scheduled snapshots off
+    keep: int = 7
+    compress: bool = True
+    encrypt: bool = False
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> 'SnapshotSettings':
+        from utils.settings import get_bool, get_int, get_setting
+
+        return cls(
+            directory=get_setting(conn, "snapshot_dir", "") or "",
+            interval_hours=get_int(conn, "snapshot_interval_hours", 0),
+            keep=get_int(conn, "snapshot_keep", 7),
+            compress=get_bool(conn, "snapshot_compress", True),
+            encrypt=get_bool(conn, "snapshot_encrypt", False),
+        )
+
+    def save(self, conn: sqlite3.Connection):
+        from utils.settings import set_setting
+
+        set_setting(conn, "snapshot_dir", self.directory)
+        set_setting(conn, "snapshot_interval_hours", self.interval_hours)
+        set_setting(conn, "snapshot_keep", self.keep)
+        set_setting(conn, "snapshot_compress", self.compress)
+        set_setting(conn, "snapshot_encrypt", self.encrypt)
+
+    def snapshot_dir(self) -> str:
+        """Configured directory, or data/snapshots next to the database"""
+        if self.directory:
+            return self.directory
+        from utils.db import _db_path
+        return str(_db_path().parent / "snapshots")
+
+
+def copy_database(source: sqlite3.Connection, target_path: str, pages: int = PAGES_PER_STEP,
+                  sleep: float = STEP_SLEEP,
+                  progress: Optional[Callable[[int, int], None]] = None,
+                  cancelled: Optional[Callable[[], bool]] = None) -> str:
+    """
+    Copy a live database to a standalone file with the backup API
+
+    Args:
+        source: Connection to the database to copy
+        target_path: File to write; replaced only once the copy is complete
+        pages: Pages copied per step
+        sleep: Seconds to pause between steps
+        progress: Called with (pages done, pages total) after each step
+        cancelled: Polled after each step; raises SnapshotCancelled when it returns True
+
+    Returns:
+        target_path
+    """
+    partial = f"{target_path}.partial"
+    restarts = 0
+    remaining_before = None
+
+    def step(status, remaining, total):
+        nonlocal restarts, remaining_before
+        if cancelled and cancelled():
+            raise SnapshotCancelled()
+        if remaining_before is not None and remaining > remaining_before:
+            restarts += 1
+            if restarts > MAX_RESTARTS:
+                raise _CopyRestarted()
+        remaining_before = remaining
+        if progress:
+            progress(total - remaining, total)
+
+    try:
+        with closing(sqlite3.connect(partial)) as target:
+            try:
+                source.backup(target, pages=pages, progress=step, sleep=sleep)
+            except _CopyRestarted:
+                source.backup(target, pages=-1)
+            # The copy inherits WAL mode; a snapshot should be one self-contained file
+            target.execute("PRAGMA journal_mode=DELETE")
+        os.replace(partial, target_path)
+    except BaseException:
+        for leftover in (partial, f"{partial}-wal", f"{partial}-shm", f"{partial}-journal"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+    return target_path
+
+
+def _gzip_file(source_path: str, target_path: str):
+    with open(source_path, 'rb') as source, gzip.open(target_path, 'wb', compresslevel=6) as target:
+        shutil.copyfileobj(source, target, _COPY_CHUNK)
+
+
+def _gunzip_file(source_path: str, target_path: str):
+    with gzip.open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+        shutil.copyfileobj(source, target, _COPY_CHUNK)
+
+
+def _encryption(password: Optional[str]):
+    from utils.encryption import DataEncryption, get_general_encryption
+    return DataEncryption(password) if password else get_general_encryption()
+
+
+def take_snapshot(source: Union[sqlite3.Connection, str], directory: str, compress: bool = True,
+                  encrypt: bool = False, password: Optional[str] = None,
+                  pages: int = PAGES_PER_STEP, sleep: float = STEP_SLEEP,
+                  progress: Optional[Callable[[int, int], None]] = None,
+                  cancelled: Optional[Callable[[], bool]] = None) -> str:
+    """
+    Write a timestamped snapshot of a database into a directory
+
+    Args:
+        source: Connection to the database, or the path of its file
+        directory: Snapshot directory; created if missing
+        compress: Gzip the snapshot
+        encrypt: Encrypt the snapshot (after compressing) with the app's data key,
+            or with a key derived from password if given
+        pages, sleep, progress, cancelled: See copy_database
+
+    Returns:
+        Path of the snapshot file
+    """
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    name = f"{SNAPSHOT_PREFIX}{stamp}.db"
+    counter = 1
+    while any(os.path.exists(os.path.join(directory, name + suffix[3:])) for suffix in SNAPSHOT_SUFFIXES):
+        name = f"{SNAPSHOT_PREFIX}{stamp}_{counter}.db"
+        counter += 1
+
+    with tempfile.TemporaryDirectory(prefix="celiacshield-snapshot-", dir=directory) as staging:
+        path = os.path.join(staging, name)
+        if isinstance(source, sqlite3.Connection):
+            copy_database(source, path, pages, sleep, progress, cancelled)
+        else:
+            with closing(sqlite3.connect(source)) as conn:
+                copy_database(conn, path, pages, sleep, progress, cancelled)
+        if compress:
+            _gzip_file(path, path + ".gz")
+            os.remove(path)
+            path += ".gz"
+        if encrypt:
+            with open(path, 'rb') as plain, open(path + ".enc", 'wb') as sealed:
+                _encryption(password).encrypt_stream(plain, sealed)
+            os.remove(path)
+            path += ".enc"
+        final = os.path.join(directory, os.path.basename(path))
+        os.replace(path, final)
+    return final
+
+
+def open_snapshot(path: str, directory: str, password: Optional[str] = None) -> str:
+    """
+    Decrypt and decompress a snapshot into a plain database file in directory
+
+    Returns:
+        Path of the plain database file (the snapshot itself if it is neither
+        compressed nor encrypted)
+    """
+    current = path
+    name = os.path.basename(path)
+    if name.endswith(".enc"):
+        name = name[:-4]
+        plain = os.path.join(directory, name)
+        with open(current, 'rb') as sealed, open(plain, 'wb') as target:
+            _encryption(password).decrypt_stream(sealed, target)
+        current = plain
+    if name.endswith(".gz"):
+        name = name[:-3]
+        unpacked = os.path.join(directory, name + ".unpacked")
+        _gunzip_file(current, unpacked)
+        if current != path:
+            os.remove(current)
+        current = unpacked
+    return current
+
+
+def restore_snapshot(target: sqlite3.Connection, path: str, password: Optional[str] = None,
+                     pages: int = PAGES_PER_STEP, sleep: float = STEP_SLEEP,
+                     progress: Optional[Callable[[int, int], None]] = None):
+    """
+    Replace a live database with a snapshot through the backup API
+
+    The snapshot is checked with PRAGMA quick_check first, so a damaged or
+    wrongly decrypted file never overwrites the database.
+
+    Args:
+        target: Connection to the database to overwrite
+        path: Snapshot file (.db, optionally .gz and/or .enc)
+        password: Password the snapshot was encrypted with, if not the app's key
+    """
+    with tempfile.TemporaryDirectory(prefix="celiacshield-restore-") as staging:
+        plain = open_snapshot(path, staging, password)
+        with closing(sqlite3.connect(plain)) as source:
+            try:
+                result = source.execute("PRAGMA quick_check").fetchone()[0]
+            except sqlite3.DatabaseError as e:
+                raise ValueError(f"Not a valid database snapshot: {e}")
+            if result != "ok":
+                raise ValueError(f"Snapshot failed its integrity check: {result}")
+            target.commit()
+            source.backup(target, pages=pages, progress=(lambda status, remaining, total:
+                                                          progress(total - remaining, total))
+                          if progress else None, sleep=sleep)
+
+
+def list_snapshots(directory: str) -> List[str]:
+    """Snapshot files in a directory, newest first"""
+    if not os.path.isdir(directory):
+        return []
+    names = [name for name in os.listdir(directory)
+             if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIXES)]
+    paths = [os.path.join(directory, name) for name in names]
+    return sorted(paths, key=lambda path: (os.path.getmtime(path), path), reverse=True)
+
+
+def prune_snapshots(directory: str, keep: int) -> List[str]:
+    """
+    Delete all but the newest keep snapshots
+
+    Returns:
+        Paths of the deleted snapshots
+    """
+    removed = []
+    for path in list_snapshots(directory)[max(keep, 1):]:
+        try:
+            os.remove(path)
+            removed.append(path)
+        except OSError as e:
+            print(f"Error removing old snapshot {path}: {e}")
+    return removed
+
+
+def snapshot_due(directory: str, interval_hours: int, now: Optional[datetime] = None) -> bool:
+    """Check whether the newest snapshot is older than the interval"""
+    if interval_hours <= 0:
+        return False
+    snapshots = list_snapshots(directory)
+    if not snapshots:
+        return True
+    age = (now or datetime.now()) - datetime.fromtimestamp(os.path.getmtime(snapshots[0]))
+    return age.total_seconds() >= interval_hours * 3600
+
+
+class SnapshotWorker(QObject):
+    """Worker taking a snapshot on its own thread and connection"""
+
+    progress = Signal(int, int)
+    finished = Signal(bool, str)  # success, snapshot path or error message
+
+    def __init__(self, settings: SnapshotSettings, rotate: bool = False):
+        super().__init__()
+        self.settings = settings
+        self.rotate = rotate
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        """Take the snapshot and, for scheduled ones, prune old snapshots"""
+        from utils.db import get_connection
+
+        try:
+            directory = self.settings.snapshot_dir()
+            with closing(get_connection()) as conn:
+                path = take_snapshot(conn, directory, self.settings.compress, self.settings.encrypt,
+                                     progress=self.progress.emit, cancelled=lambda: self._cancelled)
+            if self.rotate:
+                prune_snapshots(directory, self.settings.keep)
+            self.finished.emit(True, path)
+        except SnapshotCancelled:
+            self.finished.emit(False, "Snapshot cancelled")
+        except Exception as e:
+            print(f"Error taking database snapshot: {e}")
+            self.finished.emit(False, str(e))
+
+
+class SnapshotService(QObject):
+    """Takes snapshots on a background thread, one at a time, and on a schedule"""
+
+    snapshot_progress = Signal(int, int)
+    snapshot_finished = Signal(bool, str)
+
+    # How often the schedule checks whether a snapshot is due
+    CHECK_INTERVAL_MS = 15 * 60 * 1000
+
+    def __init__(self):
+        super().__init__()
+        self._thread: Optional[QThread] = None
+        self._worker: Optional[SnapshotWorker] = None
+        self._timer: Optional[QTimer] = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def settings(self) -> SnapshotSettings:
+        from utils.db import get_connection
+
+        with closing(get_connection()) as conn:
+            return SnapshotSettings.load(conn)
+
+    def start(self, settings: Optional[SnapshotSettings] = None, rotate: bool = False) -> bool:
+        """
+        Start a snapshot on a background thread
+
+        Returns:
+            False if a snapshot is already running
+        """
+        if self._thread is not None:
+            return False
+        self._thread = QThread()
+        self._worker = SnapshotWorker(settings or self.settings(), rotate)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.progress.connect(self.snapshot_progress)
+        self._worker.finished.connect(self._on_finished)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def start_schedule(self):
+        """Take a snapshot now if one is due, then check again periodically"""
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.timeout.connect(self.run_if_due)
+            self._timer.start(self.CHECK_INTERVAL_MS)
+        self.run_if_due()
+
+    def run_if_due(self) -> bool:
+        """Start a rotating snapshot if the newest one is older than the configured interval"""
+        try:
+            settings = self.settings()
+            if not snapshot_due(settings.snapshot_dir(), settings.interval_hours):
+                return False
+        except Exception as e:
+            print(f"Error checking snapshot schedule: {e}")
+            return False
+        return self.start(settings, rotate=True)
+
+    def _on_finished(self, success: bool, message: str):
+        self._thread.quit()
+        self._thread.wait()
+        self._thread.deleteLater()
+        self._worker.deleteLater()
+        self._thread = None
+        self._worker = None
+        if success:
+            try:
+                from utils.db import get_connection
+                from utils.settings import set_setting
+
+                with closing(get_connection()) as conn:
+                    set_setting(conn, "last_backup", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            except Exception as e:
+                print(f"Error recording snapshot time: {e}")
+        self.snapshot_finished.emit(success, message)
+
+
+def get_snapshot_service() -> SnapshotService:
+    """Get singleton snapshot service instance"""
+    global _snapshot_service
+    if _snapshot_service is None:
+        _snapshot_service = SnapshotService()
+    return _snapshot_service
+
+
+# Global service instance
+_snapshot_service = None
@@ -5,6 +5,7 @@ Theme Creator Service for PySide6 Application
 Provides theme creation, editing, and management functionality.
 """
 
+import hashlib
 import json
 import os
 from typing import Dict, Any, List, Optional
@@ -13,13 +14,19 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QPalette, QFont
 
 
+# Bump when _generate_stylesheet changes so cached stylesheets are rebuilt
+STYLESHEET_VERSION = 2
+
+
 class ThemeCreator:
     """Theme creation and management system"""
     
     def __init__(self, themes_dir: str = "data/themes"):
         self.themes_dir = themes_dir
+        self.cache_dir = os.path.join(themes_dir, ".cache")
         self.current_theme = None
         self.settings_file = "data/theme_settings.json"
+        self._stylesheet_cache: Dict[str, str] = {}
         self.ensure_themes_directory()
         self.load_current_theme_setting()
     
@@ -389,28 +396,65 @@ class ThemeCreator:
     
     def _apply_stylesheet(self, app: QApplication, theme_data: Dict[str, Any]):
         """Apply stylesheet to application"""
-        colors = theme_data.get('colors', {})
-        typography = theme_data.get('typography', {})
-        components = theme_data.get('components', {})
+        stylesheet = self.get_compiled_stylesheet(theme_data)
+        
+        # setStyleSheet re-polishes every widget, so skip it when the theme
+        # is re-applied unchanged. Qt schedules the resulting repaints itself.
+        if app.styleSheet() != stylesheet:
+            app.setStyleSheet(stylesheet)
+    
+    def get_compiled_stylesheet(self, theme_data: Dict[str, Any]) -> str:
+        """
+        Get the stylesheet for a theme, generating it only on a cache miss
         
-        stylesheet = self._generate_stylesheet(colors, typography, components)
-        print(f"DEBUG: Applying stylesheet with background: {colors.get('background', '#fafafa')}")
-        app.setStyleSheet(stylesheet)
+        Compiled stylesheets are kept in memory and persisted under
+        themes_dir/.cache, keyed by a hash of the theme JSON.
+        """
+        key = self._stylesheet_cache_key(theme_data)
+        stylesheet = self._stylesheet_cache.get(key)
+        if stylesheet is not None:
+            return stylesheet
         
-        # Force a repaint of all widgets to ensure stylesheet is applied
+        cache_file = os.path.join(self.cache_dir, f"{key}.qss")
         try:
-            for widget in app.allWidgets():
-                if hasattr(widget, 'update'):
-                    try:
-                        widget.update()
-                    except TypeError:
-                        # Some widgets require arguments for update()
-                        pass
-                if hasattr(widget, 'repaint'):
-                    widget.repaint()
-        except AttributeError:
-            # allWidgets() method doesn't exist in this Qt version
-            pass
+            if os.path.exists(cache_file):
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    stylesheet = f.read()
+        except Exception as e:
+            print(f"Error reading cached stylesheet: {str(e)}")
+        
+        if stylesheet is None:
+            stylesheet = self._generate_stylesheet(
+                theme_data.get('colors', {}),
+                theme_data.get('typography', {}),
+                theme_data.get('components', {})
+            )
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(cache_file, 'w', encoding='utf-8') as f:
+                    f.write(stylesheet)
+            except Exception as e:
+                print(f"Error writing cached stylesheet: {str(e)}")
+        
+        self._stylesheet_cache[key] = stylesheet
+        return stylesheet
+    
+    def clear_stylesheet_cache(self):
+        """Remove compiled stylesheets from memory and disk"""
+        self._stylesheet_cache.clear()
+        try:
+            if os.path.isdir(self.cache_dir):
+                for filename in os.listdir(self.cache_dir):
+                    if filename.endswith('.qss'):
+                        os.remove(os.path.join(self.cache_dir, filename))
+        except Exception as e:
+            print(f"Error clearing stylesheet cache: {str(e)}")
+    
+    def _stylesheet_cache_key(self, theme_data: Dict[str, Any]) -> str:
+        """Hash the theme JSON together with the stylesheet template version"""
+        payload = json.dumps(theme_data, sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha256(f"{STYLESHEET_VERSION}:{payload}".encode('utf-8'))
+        return digest.hexdigest()[:32]
     
     def _generate_stylesheet(self, colors: Dict[str, str], typography: Dict[str, Any], components: Dict[str, Any]) -> str:
         """Generate stylesheet from theme data"""
@@ -420,6 +464,11 @@ class ThemeCreator:
         font_family = typography.get('font_family', 'Segoe UI')
         font_size = typography.get('font_size', 9)
         button_font_size = typography.get('button_font_size', 10)
+        header_bg = colors.get('background', '#fafafa')
+        chrome_border = (colors.get('border_color') or
+                         colors.get('border') or
+                         colors.get('surface_variant') or
+                         '#c8e6c9')
         
         return f"""
         /* Theme Stylesheet - Clean Selection Design */
@@ -759,6 +808,48 @@ class ThemeCreator:
             font-weight: normal !important;
         }}
         
+        /* Main window chrome - widgets opt in through the "role" property */
+        QWidget[role="nav-bar"] {{
+            background-color: {header_bg};
+            border-bottom: 1px solid {chrome_border};
+        }}
+        
+        QLabel[role="app-title"] {{
+            color: {colors.get('text_primary', '#212121')};
+            margin: 15px;
+            padding: 15px;
+            background-color: {header_bg};
+            border: none;
+        }}
+        
+        QPushButton[role="nav-button"] {{
+            background-color: transparent;
+            color: {colors.get('text_primary', '#212121')};
+            border: 1px solid {chrome_border};
+            padding: 8px 15px;
+            font-family: '{font_family}', sans-serif;
+            font-size: 11px;
+            border-radius: 4px;
+            min-width: 80px;
+            font-weight: normal;
+        }}
+        
+        QPushButton[role="nav-button"]:hover {{
+            background-color: {colors.get('primary_light', '#e8f5e8')};
+            border-color: {colors.get('primary', '#1b5e20')};
+        }}
+        
+        QPushButton[role="nav-button"]:pressed,
+        QPushButton[role="nav-button"][active="true"] {{
+            background-color: {colors.get('primary', '#1b5e20')};
+            color: {colors.get('text_on_primary', '#ffffff')};
+            border-color: {colors.get('primary_dark', '#2e7d32')};
+        }}
+        
+        QPushButton[role="nav-button"][active="true"] {{
+            font-weight: bold;
+        }}
+        
         QMenu {{
             background-color: {colors.get('surface', '#ffffff')};
             border: 1px solid {colors.get('border', '#e0e0e0')};
@@ -11,6 +11,7 @@ from typing import Dict, Optional, Any, List
 from dataclasses import dataclass
 from datetime import datetime
 from services.nutrition_analyzer import nutrition_analyzer, NutritionData
+from services.gluten_lexicon import get_gluten_lexicon
 
 
 @dataclass
@@ -39,21 +40,8 @@ class UPCScanner:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         
-        # Gluten-containing ingredients to watch for
-        self.gluten_ingredients = [
-            'wheat', 'barley', 'rye', 'oats', 'malt', 'brewer\'s yeast',
-            'flour', 'bread', 'pasta', 'couscous', 'bulgur', 'seitan',
-            'soy sauce', 'teriyaki sauce', 'miso', 'beer', 'ale', 'lager',
-            'malt vinegar', 'malt extract', 'malt syrup', 'malt flavoring',
-            'hydrolyzed wheat protein', 'wheat starch', 'wheat germ',
-            'barley malt', 'rye flour', 'spelt', 'triticale', 'kamut'
-        ]
-        
-        # Gluten-free certification indicators
-        self.gf_certifications = [
-            'gluten-free', 'gluten free', 'gf', 'certified gluten-free',
-            'celiac safe', 'no gluten', 'free from gluten'
-        ]
+        # Shared gluten terms and gluten-free certification indicators
+        self.lexicon = get_gluten_lexicon()
     
     def scan_upc(self, upc_code: str) -> Optional[ProductInfo]:
         """Scan UPC code and return product information with gluten safety check"""
@@ -418,22 +406,19 @@ class UPCScanner:
         product_category = product_data.get('category', '').lower()
         product_brand = product_data.get('brand', '').lower()
         
-        # Combine all text for analysis
-        all_text = f"{product_name} {product_brand} {product_category} {ingredients_text}"
+        # Classify all text in one pass per field
+        match = self.lexicon.classify(product_name, product_brand, product_category, ingredients_text)
         
         print(f"    Analyzing gluten safety for: {product_data.get('name', 'Unknown')}")
         print(f"    Sources: {product_data.get('source', 'Unknown')}")
         
         # Check for gluten-free certifications
-        gf_certified = any(cert in all_text for cert in self.gf_certifications)
+        gf_certified = match.gluten_free_claim
         if gf_certified:
             print(f"    [CERTIFIED] Found gluten-free certification indicators")
         
         # Check for gluten-containing ingredients
-        gluten_ingredients_found = []
-        for gluten_ing in self.gluten_ingredients:
-            if gluten_ing in all_text:
-                gluten_ingredients_found.append(gluten_ing)
+        gluten_ingredients_found = match.gluten_terms
         
         if gluten_ingredients_found:
             print(f"    [WARNING] Found potential gluten ingredients: {', '.join(gluten_ingredients_found)}")
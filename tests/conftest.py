@@ -26,6 +26,17 @@ def qt_app():
         yield QApplication.instance()
 
 
+@pytest.fixture(autouse=True)
+def gluten_analysis_cache(tmp_path, monkeypatch):
+    """Keep each test's gluten analysis memo in its own temporary cache file"""
+    from services.gluten_analysis_memo import ENV_VAR, reset_gluten_analysis_memo
+
+    monkeypatch.setenv(ENV_VAR, str(tmp_path / "cache.db"))
+    reset_gluten_analysis_memo()
+    yield
+    reset_gluten_analysis_memo()
+
+
 @pytest.fixture
 def temp_database():
     """Create temporary database for testing"""
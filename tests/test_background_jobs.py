@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the background job framework
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QApplication
+
+from services.background_jobs import (
+    CANCELLED, EXPORT, FAILED, FINISHED, IMPORT, JobCancelled, JobManager
+)
+
+
+class TestBackgroundJobs(unittest.TestCase):
+    """Test cases for JobManager, job signals and cancellation"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up Qt application for the event loop"""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        """Set up each test with its own manager"""
+        self.manager = JobManager({EXPORT: 2, IMPORT: 1})
+        self.running = 0
+        self.most_running = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.manager.shutdown()
+
+    def wait_idle(self, timeout_ms=5000):
+        loop = QEventLoop()
+        quit_when_idle = lambda _job: None if self.manager.is_busy() else loop.quit()
+        self.manager.job_done.connect(quit_when_idle)
+        QTimer.singleShot(timeout_ms, loop.quit)
+        if self.manager.is_busy():
+            loop.exec()
+        self.manager.job_done.disconnect(quit_when_idle)
+        self.assertFalse(self.manager.is_busy())
+
+    def counted(self, context, seconds=0.05):
+        """Job tracking how many jobs run at the same time"""
+        with self.lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+        return threading.current_thread() is threading.main_thread()
+
+    def test_progress_and_result_on_gui_thread(self):
+        """Test progress arrives in order and the result is delivered on the GUI thread"""
+        def job(context, steps):
+            for step in range(1, steps + 1):
+                context.progress(step, steps, f"step {step}")
+            return steps * 10
+
+        seen, results = [], []
+        handle = self.manager.submit(EXPORT, job, 3, title="numbers")
+        handle.progress.connect(
+            lambda done, total, message: seen.append((done, total, message, threading.current_thread() is threading.main_thread())))
+        handle.finished.connect(results.append)
+        self.wait_idle()
+
+        self.assertEqual(results, [30])
+        self.assertEqual(seen, [(i, 3, f"step {i}", True) for i in (1, 2, 3)])
+        self.assertEqual((handle.state, handle.result), (FINISHED, 30))
+
+    def test_failure_is_reported(self):
+        """Test an exception in a job becomes a failed signal"""
+        def job(context):
+            raise ValueError("bad file")
+
+        errors = []
+        handle = self.manager.submit(IMPORT, job)
+        handle.failed.connect(errors.append)
+        self.wait_idle()
+
+        self.assertEqual(errors, ["bad file"])
+        self.assertEqual(handle.state, FAILED)
+
+    def test_cancellation_token(self):
+        """Test a running job stops at its next check and a queued job never starts"""
+        started = threading.Event()
+        ran = []
+
+        def endless(context):
+            started.set()
+            while True:
+                context.check()
+                time.sleep(0.01)
+
+        running = self.manager.submit(IMPORT, endless)
+        queued = self.manager.submit(IMPORT, lambda context: ran.append(True))
+        cancelled = []
+        running.cancelled.connect(cancelled.append)
+        queued.cancelled.connect(cancelled.append)
+
+        self.assertTrue(started.wait(5))
+        queued.cancel()
+        running.cancel()
+        self.wait_idle()
+
+        self.assertEqual((running.state, queued.state), (CANCELLED, CANCELLED))
+        self.assertEqual(cancelled, [None, None])
+        self.assertEqual(ran, [])
+        self.assertRaises(JobCancelled, running.token.check)
+        # The token doubles as a service's cancelled callable
+        self.assertTrue(running.token())
+
+    def test_concurrency_limit_per_category(self):
+        """Test imports run one at a time while exports overlap"""
+        for _ in range(3):
+            self.manager.submit(IMPORT, self.counted)
+        self.wait_idle()
+        self.assertEqual(self.most_running, 1)
+
+        results = []
+        for _ in range(4):
+            self.manager.submit(EXPORT, self.counted, 0.2).finished.connect(results.append)
+        self.wait_idle()
+        self.assertEqual(self.most_running, 2)
+        # Jobs ran on pool threads
+        self.assertEqual(results, [False] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
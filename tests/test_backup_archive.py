@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Unit tests for full-backup archives
+"""
+
+import unittest
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import zipfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.backup_archive import DOMAINS, MANIFEST, read_manifest, restore_archive, write_archive
+from utils.migrations import ensure_schema
+
+
+class TestBackupArchive(unittest.TestCase):
+    """Test cases for write_archive and restore_archive"""
+
+    def setUp(self):
+        """Set up each test with a scratch directory and a populated schema"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        self.conn.executemany("INSERT INTO recipes (title, ingredients) VALUES (?, ?)",
+                              [(f"Recipe {i}", "rice\nbeans") for i in range(300)])
+        self.conn.executemany("INSERT INTO recipe_ingredients (recipe_id, ingredient_name) VALUES (?, 'rice')",
+                              [(i,) for i in range(1, 301)])
+        self.conn.executemany("INSERT INTO pantry (name, quantity) VALUES (?, ?)",
+                              [(f"Item {i}", i / 2) for i in range(50)])
+        self.conn.execute("INSERT INTO health_log (date, symptoms, severity) VALUES ('2024-03-01', 'bloating', 3)")
+        self.conn.execute("INSERT INTO calendar_events (name, date) VALUES ('Dietitian', '2024-03-02')")
+        self.conn.commit()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def count(self, table):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_archive_has_manifest_and_checksums(self):
+        """Test one member per table, listed in the manifest with row counts"""
+        seen = []
+        path = self.path("backup.zip")
+        manifest = write_archive(self.conn, path, workers=1, progress=lambda done, total: seen.append(done))
+        self.assertEqual(seen, list(range(len(DOMAINS) + 1)))
+        self.assertEqual(read_manifest(path), manifest)
+        members = {entry['table']: entry for entry in manifest['members']}
+        self.assertEqual((members['recipes']['rows'], members['pantry']['rows']), (300, 50))
+        self.assertEqual(members['recipe_ingredients']['name'], "recipes/recipe_ingredients.ndjson.gz")
+        with zipfile.ZipFile(path) as archive:
+            self.assertEqual(sorted(archive.namelist()),
+                             sorted([MANIFEST] + [entry['name'] for entry in manifest['members']]))
+        self.assertFalse(os.path.exists(path + ".partial"))
+
+    def test_parallel_round_trip(self):
+        """Test a backup written and restored by worker processes replaces the data"""
+        path = self.path("backup.zip")
+        write_archive(self.conn, path, workers=2)
+        self.conn.execute("DELETE FROM pantry WHERE id > 10")
+        self.conn.execute("UPDATE recipes SET title = 'Changed' WHERE id = 1")
+        self.conn.execute("INSERT INTO calendar_events (name, date) VALUES ('Extra', '2024-04-01')")
+        self.conn.commit()
+
+        counts = restore_archive(self.conn, path, workers=2)
+        self.assertEqual((counts['pantry'], counts['recipe_ingredients']), (50, 300))
+        self.assertEqual((self.count("pantry"), self.count("calendar_events")), (50, 1))
+        self.assertEqual(self.conn.execute("SELECT title FROM recipes WHERE id = 1").fetchone()[0], "Recipe 0")
+        self.assertEqual(self.conn.execute("SELECT quantity FROM pantry WHERE name = 'Item 3'").fetchone()[0], 1.5)
+
+    def test_restore_selected_domains(self):
+        """Test restoring some domains leaves the others alone"""
+        path = self.path("backup.zip")
+        write_archive(self.conn, path, domains=["pantry", "calendar"], workers=1)
+        self.conn.execute("DELETE FROM pantry")
+        self.conn.execute("DELETE FROM recipes WHERE id > 100")
+        self.conn.commit()
+        restore_archive(self.conn, path, workers=1)
+        self.assertEqual((self.count("pantry"), self.count("recipes")), (50, 100))
+
+    def test_damaged_member_changes_nothing(self):
+        """Test a checksum mismatch aborts the restore before any table is touched"""
+        path = self.path("backup.zip")
+        manifest = write_archive(self.conn, path, workers=1)
+        manifest['members'][0]['sha256'] = "0" * 64
+        damaged = self.path("damaged.zip")
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(damaged, "w") as target:
+            for name in source.namelist():
+                data = json.dumps(manifest).encode() if name == MANIFEST else source.read(name)
+                target.writestr(name, data)
+        self.conn.execute("DELETE FROM pantry")
+        self.conn.commit()
+        with self.assertRaises(ValueError):
+            restore_archive(self.conn, damaged, workers=1)
+        self.assertEqual(self.count("pantry"), 0)
+        with self.assertRaises(ValueError):
+            write_archive(self.conn, self.path("backup.rar"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the calendar event index
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+from datetime import date, timedelta
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.calendar_event_index import CalendarEventIndex
+from utils.migrations import ensure_schema
+
+
+class TestCalendarEventIndex(unittest.TestCase):
+    """Test cases for CalendarEventIndex"""
+
+    def setUp(self):
+        """Set up each test with an in-memory schema"""
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        self.add_event("Doctor Appointment", "2024-01-05")
+        self.add_event("Blood Test", "2024-01-05")
+        self.add_event("Cooking Class", "2024-01-31")
+        self.add_event("Nutritionist Visit", "2024-02-01")
+        self.add_event("Family Dinner", "2024-03-15")
+        self.index = CalendarEventIndex(self.conn)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+
+    def add_event(self, name, day):
+        self.conn.execute(
+            "INSERT INTO calendar_events(name, date, event_type) VALUES (?, ?, 'Health')",
+            (name, day),
+        )
+        self.conn.commit()
+
+    def test_month_summaries(self):
+        """Test per-day counts and titles for a month"""
+        january = self.index.month(2024, 1)
+        self.assertEqual(sorted(january), [5, 31])
+        self.assertEqual(january[5].count, 2)
+        self.assertEqual(sorted(january[5].titles), ["Blood Test", "Doctor Appointment"])
+        self.assertEqual(self.index.month(2024, 4), {})
+
+    def test_adjacent_months_are_prefetched(self):
+        """Test navigating to a neighbouring month needs no query"""
+        self.index.month(2024, 2)
+        self.assertEqual(self.index.query_count, 1)
+        self.assertIn(31, self.index.month(2024, 1))
+        self.assertIn(15, self.index.month(2024, 3))
+        self.assertEqual(self.index.query_count, 1)
+
+    def test_writes_invalidate_cache(self):
+        """Test inserts and deletes are reflected on the next lookup"""
+        self.assertNotIn(20, self.index.month(2024, 1))
+        self.add_event("Lab Results", "2024-01-20")
+        self.assertEqual(self.index.month(2024, 1)[20].count, 1)
+
+        self.conn.execute("DELETE FROM calendar_events WHERE date = '2024-01-05'")
+        self.conn.commit()
+        self.assertNotIn(5, self.index.month(2024, 1))
+
+    def test_week_spanning_months(self):
+        """Test day summaries across a month boundary"""
+        week = self.index.day_summaries(date(2024, 1, 28), date(2024, 2, 3))
+        self.assertEqual(sorted(week), ["2024-01-31", "2024-02-01"])
+
+    def test_year_counts(self):
+        """Test per-month totals for the year view"""
+        self.assertEqual(self.index.year_counts(2024), {1: 3, 2: 1, 3: 1})
+        self.assertEqual(self.index.year_counts(2023), {})
+
+    def test_events_between(self):
+        """Test full rows for an inclusive date range"""
+        events = self.index.events_between("2024-01-31", "2024-02-01")
+        self.assertEqual([e["name"] for e in events], ["Cooking Class", "Nutritionist Visit"])
+
+    def test_titles_are_capped(self):
+        """Test tooltips keep a bounded number of titles on busy days"""
+        for i in range(10):
+            self.add_event(f"Reminder {i}", "2024-05-10")
+        summary = self.index.month(2024, 5)[10]
+        self.assertEqual(summary.count, 10)
+        self.assertEqual(len(summary.titles), self.index.max_titles)
+
+    def test_large_calendar_uses_date_index(self):
+        """Test month loads stay indexed range scans with many events"""
+        start = date(2000, 1, 1)
+        self.conn.executemany(
+            "INSERT INTO calendar_events(name, date) VALUES (?, ?)",
+            ((f"Event {i}", (start + timedelta(days=i % 9000)).isoformat()) for i in range(50000)),
+        )
+        self.conn.commit()
+        plan = " ".join(
+            str(row[-1]) for row in self.conn.execute(
+                "EXPLAIN QUERY PLAN SELECT date, COUNT(*) FROM calendar_events "
+                "WHERE date >= ? AND date < ? GROUP BY date", ("2010-01-01", "2010-02-01")
+            )
+        )
+        self.assertIn("idx_cal_date", plan)
+        expected = self.conn.execute(
+            "SELECT COUNT(*) FROM calendar_events WHERE date LIKE '2010-01-%'"
+        ).fetchone()[0]
+        self.assertEqual(sum(s.count for s in self.index.month(2010, 1).values()), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for streaming CSV reading and batched inserts
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import csvio
+from utils.csvio import executemany_batched, iter_csv_rows, parse_float, read_csv_rows
+
+
+class TestCsvStreaming(unittest.TestCase):
+    """Test cases for iter_csv_rows and executemany_batched"""
+
+    def setUp(self):
+        """Set up each test with a scratch directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.temp_dir.cleanup()
+
+    def write(self, text, name="items.csv"):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            f.write(text)
+        return path
+
+    def test_headers_dialect_and_types(self):
+        """Test aliases, a sniffed delimiter, converters and ragged rows"""
+        path = self.write("Name;Qty;Net.Wt;Sub Cat\r\nRice;2;1.5;Grains\r\nOats;;\r\n")
+        headers = []
+        rows = list(iter_csv_rows(path, {"Sub Cat": "subcategory"}, converters={"quantity": parse_float},
+                                  headers_out=headers))
+        self.assertEqual(headers, ["name", "quantity", "net_weight", "subcategory"])
+        self.assertEqual(rows, [
+            {"name": "Rice", "quantity": 2.0, "net_weight": "1.5", "subcategory": "Grains"},
+            {"name": "Oats", "quantity": 0.0, "net_weight": "", "subcategory": ""},
+        ])
+        self.assertEqual(read_csv_rows(path), (headers, [
+            {"name": "Rice", "quantity": "2", "net_weight": "1.5", "subcategory": "Grains"},
+            {"name": "Oats", "quantity": "", "net_weight": "", "subcategory": ""},
+        ]))
+
+    def test_unknown_headers_can_be_dropped(self):
+        """Test only known columns are kept when asked"""
+        path = self.write('name,colour,notes\nRice,"white, long",dry\n')
+        rows = list(iter_csv_rows(path, keep_unknown_headers=False, known=["name", "notes"]))
+        self.assertEqual(rows, [{"name": "Rice", "notes": "dry"}])
+
+    def test_aliases_resolved_once_per_file(self):
+        """Test header aliases are merged once, not per row or cell"""
+        path = self.write("name,qty\n" + "".join(f"item{i},{i}\n" for i in range(500)))
+        calls = []
+        original = csvio.merge_aliases
+
+        def counting(*maps):
+            calls.append(1)
+            return original(*maps)
+
+        csvio.merge_aliases = counting
+        try:
+            self.assertEqual(sum(1 for _ in iter_csv_rows(path)), 500)
+        finally:
+            csvio.merge_aliases = original
+        self.assertEqual(len(calls), 1)
+
+    def test_rows_are_streamed_in_batches(self):
+        """Test the reader is lazy and the database sees fixed-size batches"""
+        path = self.write("name,qty\n" + "".join(f"item{i},{i}\n" for i in range(2500)))
+        rows = iter_csv_rows(path, converters={"quantity": parse_float})
+        self.assertEqual(next(rows), {"name": "item0", "quantity": 0.0})
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE pantry(name TEXT UNIQUE, quantity REAL)")
+        seen = []
+        params = ((row["name"], row["quantity"]) for row in rows)
+        count = executemany_batched(conn, "INSERT INTO pantry VALUES (?, ?)", params,
+                                    batch_size=1000, progress=seen.append)
+        self.assertEqual(count, 2499)
+        self.assertEqual(seen, [1000, 2000, 2499])
+
+        inserted = executemany_batched(
+            conn, "INSERT INTO pantry SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM pantry WHERE name = ?)",
+            [("item1", 1, "item1"), ("new", 2, "new"), ("new", 2, "new")])
+        self.assertEqual(inserted, 1)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
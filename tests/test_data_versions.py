@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-table data version tracking
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_versions import ensure_version_tracking, get_versions
+from utils.migrations import ensure_schema
+
+
+class TestDataVersions(unittest.TestCase):
+    """Test cases for data version counters"""
+
+    def setUp(self):
+        """Set up each test with an in-memory schema"""
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+
+    def test_writes_bump_only_their_table(self):
+        """Test insert, update and delete each bump the table version"""
+        before = get_versions(self.conn, ["pantry", "shopping_list"])
+        self.conn.execute("INSERT INTO pantry(name) VALUES ('Rice')")
+        self.conn.execute("UPDATE pantry SET name = 'Brown Rice'")
+        self.conn.execute("DELETE FROM pantry")
+        after = get_versions(self.conn, ["pantry", "shopping_list"])
+        self.assertEqual(after["pantry"], before["pantry"] + 3)
+        self.assertEqual(after["shopping_list"], before["shopping_list"])
+
+    def test_reads_do_not_bump(self):
+        """Test reading a table leaves its version unchanged"""
+        before = get_versions(self.conn, ["recipes"])
+        self.conn.execute("SELECT * FROM recipes").fetchall()
+        self.assertEqual(get_versions(self.conn, ["recipes"]), before)
+
+    def test_unknown_tables(self):
+        """Test tables without counters report 0"""
+        self.assertEqual(get_versions(self.conn, ["missing"]), {"missing": 0})
+
+    def test_tracking_is_idempotent(self):
+        """Test installing triggers twice does not double count"""
+        ensure_version_tracking(self.conn)
+        before = get_versions(self.conn, ["health_log"])["health_log"]
+        self.conn.execute("INSERT INTO health_log(date) VALUES ('2024-01-01')")
+        self.assertEqual(get_versions(self.conn, ["health_log"])["health_log"], before + 1)
+
+    def test_missing_counter_table(self):
+        """Test readers fall back to an empty result without the counter table"""
+        conn = sqlite3.connect(":memory:")
+        self.assertEqual(get_versions(conn, ["pantry"]), {})
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for streaming query exports
+"""
+
+import unittest
+import sys
+import os
+import csv
+import gzip
+import json
+import sqlite3
+import tempfile
+import tracemalloc
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.export_stream import export_query
+
+
+class TestExportStream(unittest.TestCase):
+    """Test cases for export_query"""
+
+    def setUp(self):
+        """Set up each test with a scratch directory and database"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE health_log (id INTEGER PRIMARY KEY, date TEXT, symptoms TEXT, severity INTEGER)")
+        self.conn.executemany(
+            "INSERT INTO health_log (date, symptoms, severity) VALUES (?, ?, ?)",
+            ((f"2024-01-{i % 28 + 1:02d}", "bloating, \"cramps\"", i % 10) for i in range(2500)))
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_csv_with_comments(self):
+        """Test CSV output with metadata comments, header and quoting"""
+        path = self.path("health.csv")
+        count = export_query(self.conn, "SELECT * FROM health_log ORDER BY id", path, "csv",
+                             comments=["CeliacShield Export - health_log"])
+        self.assertEqual(count, 2500)
+        with open(path, newline="", encoding="utf-8") as f:
+            self.assertEqual(f.readline(), "# CeliacShield Export - health_log\n")
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 2500)
+        self.assertEqual(rows[0]["symptoms"], "bloating, \"cramps\"")
+        self.assertEqual(rows[-1]["id"], "2500")
+
+    def test_gzipped_ndjson_and_progress(self):
+        """Test gzip by extension and progress reported once per block"""
+        path = self.path("health.ndjson.gz")
+        seen = []
+        count = export_query(self.conn, "SELECT id, severity FROM health_log ORDER BY id", path, "ndjson",
+                             size=1000, progress=seen.append)
+        self.assertEqual((count, seen), (2500, [1000, 2000, 2500]))
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines[1], {"id": 2, "severity": 1})
+
+    def test_json_document_and_nested_columns(self):
+        """Test the streamed JSON document, its trailer, nested JSON columns and empty results"""
+        path = self.path("health.json")
+        export_query(self.conn, "SELECT id, json_array(severity, 1) AS pair FROM health_log WHERE id <= 3",
+                     path, "json", header={"panel": "health_log"},
+                     trailer=lambda count: {"record_count": count}, json_columns=("pair",))
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+        self.assertEqual(document["panel"], "health_log")
+        self.assertEqual(document["record_count"], 3)
+        self.assertEqual(document["data"][2], {"id": 3, "pair": [2, 1]})
+
+        export_query(self.conn, "SELECT * FROM health_log WHERE 0", path, "json")
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"data": []})
+
+    def test_memory_does_not_grow_with_rows(self):
+        """Test that peak memory is bounded by the block, not the table"""
+        self.conn.execute("""
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 60000)
+            INSERT INTO health_log (date, symptoms, severity) SELECT '2024-02-01', 'fatigue', i % 10 FROM n
+        """)
+        tracemalloc.start()
+        try:
+            count = export_query(self.conn, "SELECT * FROM health_log", self.path("big.ndjson.gz"), "ndjson")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 62500)
+        self.assertLess(peak, 2 * 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the memoized gluten analysis
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.gluten_analysis_memo import GlutenAnalysisMemo, analysis_version, normalize_text
+from services.gluten_lexicon import GlutenLexicon
+
+
+class TestGlutenAnalysisMemo(unittest.TestCase):
+    """Test cases for GlutenAnalysisMemo"""
+
+    def setUp(self):
+        """Set up each test with a temporary memo database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "cache.db")
+        self.lexicon = GlutenLexicon()
+        self.memo = GlutenAnalysisMemo(self.lexicon, self.db_path)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.memo.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_lexicon(self):
+        """Test memoized results equal direct classification"""
+        texts = [
+            "Wheat flour, water, yeast", "barley malt, soy sauce, may contain wheat",
+            "rice flour, sea salt", "", "Oat bran (gluten free)",
+        ]
+        for text in texts:
+            self.assertEqual(self.memo.classify(text), self.lexicon.classify(text))
+            self.assertEqual(self.memo.classify(text), self.lexicon.classify(text))
+        self.assertEqual(
+            self.memo.classify("Gluten-Free Crackers", "Processed in facility with wheat"),
+            self.lexicon.classify("Gluten-Free Crackers", "Processed in facility with wheat"),
+        )
+
+    def test_repeats_skip_the_matcher(self):
+        """Test repeated and equivalent texts are answered from the memo"""
+        self.memo.classify("wheat flour, soy sauce")
+        self.memo.classify("wheat flour, soy sauce")
+        self.memo.classify("WHEAT FLOUR; Soy Sauce.")
+        self.assertEqual(self.memo.stats['misses'], 1)
+        self.assertEqual(self.memo.stats['memory_hits'], 1)
+        self.assertEqual(normalize_text("WHEAT FLOUR; Soy Sauce."), "wheat flour, soy sauce")
+
+    def test_separators_are_kept(self):
+        """Test list separators survive normalization, so "rice, flour" is not "rice flour" """
+        self.assertEqual(normalize_text("corn (flour)"), "corn, flour")
+        for text in ("sugar, rice, flour, salt", "corn (flour)", "rice flour"):
+            self.assertEqual(self.memo.classify(text), self.lexicon.classify(text))
+        self.assertEqual(self.memo.classify("sugar, rice, flour, salt").sources, [("flour", "wheat")])
+        self.assertEqual(self.memo.classify("rice flour").sources, [])
+
+    def test_results_persist_across_instances(self):
+        """Test a new memo reads earlier results from the table"""
+        expected = self.memo.classify("malt vinegar, spices")
+        self.memo.close()
+
+        memo = GlutenAnalysisMemo(self.lexicon, self.db_path)
+        self.assertEqual(memo.classify("malt vinegar, spices"), expected)
+        self.assertEqual(memo.stats['db_hits'], 1)
+        self.assertEqual(memo.stats['misses'], 0)
+        memo.close()
+
+    def test_lexicon_change_invalidates(self):
+        """Test rows from another lexicon version are purged and recomputed"""
+        self.memo.classify("spelt flour")
+        self.memo.close()
+
+        lexicon = GlutenLexicon()
+        lexicon.version = "changed"
+        memo = GlutenAnalysisMemo(lexicon, self.db_path)
+        memo.classify("spelt flour")
+        self.assertEqual(memo.stats['misses'], 1)
+        memo.close()
+
+        conn = sqlite3.connect(self.db_path)
+        versions = [row[0] for row in conn.execute(
+            "SELECT DISTINCT lexicon_version FROM gluten_analysis_memo")]
+        conn.close()
+        self.assertEqual(versions, [analysis_version(lexicon)])
+
+    def test_lru_is_bounded(self):
+        """Test the in-process cache keeps at most max_entries texts"""
+        memo = GlutenAnalysisMemo(self.lexicon, ":memory:", max_entries=10, flush_every=4)
+        for i in range(50):
+            memo.classify(f"ingredient {i}, wheat")
+        self.assertEqual(len(memo._lru), 10)
+        memo.classify("ingredient 0, wheat")
+        self.assertEqual(memo.stats['db_hits'], 1)
+        memo.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared gluten lexicon
+"""
+
+import unittest
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.gluten_lexicon import GlutenLexicon, get_gluten_lexicon, HIGH, MEDIUM, LOW
+from services.gluten_risk_analyzer import GlutenRiskAnalyzer
+from services.gluten_free_converter import GlutenFreeConverter
+from services.health_pattern_analyzer import HealthPatternAnalyzer
+from services.ingredient_correlator import IngredientCorrelator
+from services.upc_scanner import UPCScanner
+
+
+class TestGlutenLexicon(unittest.TestCase):
+    """Test cases for GlutenLexicon"""
+
+    def setUp(self):
+        """Set up each test"""
+        self.lexicon = get_gluten_lexicon()
+
+    def test_singleton_and_version(self):
+        """Test the lexicon is compiled once and has a stable version"""
+        self.assertIs(get_gluten_lexicon(), self.lexicon)
+        self.assertEqual(GlutenLexicon().version, self.lexicon.version)
+
+    def test_classify_categories(self):
+        """Test one classify call reports every category"""
+        match = self.lexicon.classify(
+            "wheat flour, corn starch, soy sauce", "Certified gluten-free", "may contain wheat"
+        )
+        self.assertEqual(match.sources, [("wheat", "wheat"), ("wheat flour", "wheat")])
+        self.assertIn("soy sauce", match.hidden)
+        self.assertIn("corn starch", match.safe)
+        self.assertIn("certified gluten free", match.claims)
+        self.assertEqual(match.manufacturing, ["may contain wheat"])
+        self.assertEqual(match.severity, HIGH)
+
+    def test_synonyms_report_canonical_terms(self):
+        """Test spelling variants map to their canonical term"""
+        self.assertEqual(self.lexicon.classify("malted milk").gluten_terms, ["malt"])
+        self.assertIn("corn starch", self.lexicon.classify("cornstarch").safe)
+
+    def test_gluten_terms_threshold(self):
+        """Test LOW severity hidden terms do not count as gluten"""
+        self.assertFalse(self.lexicon.classify("natural flavors, spices").contains_gluten)
+        self.assertTrue(self.lexicon.classify("miso soup").contains_gluten)
+        self.assertEqual(self.lexicon.severity("Oats"), MEDIUM)
+        self.assertEqual(self.lexicon.severity("spices"), LOW)
+        self.assertEqual(self.lexicon.severity("rice"), 0)
+
+    def test_unqualified_flour_is_wheat(self):
+        """Test plain flour counts as wheat unless a gluten-free flour names it"""
+        self.assertEqual(self.lexicon.classify("flour tortilla").sources, [("flour", "wheat")])
+        self.assertTrue(self.lexicon.classify("sugar, flour, salt").contains_gluten)
+        self.assertTrue(self.lexicon.classify("rice, flour").contains_gluten)
+        for text in ("rice flour", "almond flour", "chickpea flour", "gluten-free flour blend"):
+            with self.subTest(text=text):
+                self.assertFalse(self.lexicon.classify(text).contains_gluten)
+        self.assertEqual(self.lexicon.classify("whole wheat flour").sources[-1], ("whole wheat flour", "wheat"))
+
+    def test_ale_needs_a_beer_style(self):
+        """Test ginger ale is not barley but ale styles are"""
+        self.assertFalse(self.lexicon.classify("ginger ale").contains_gluten)
+        self.assertEqual(self.lexicon.classify("pale ale").sources, [("pale ale", "barley")])
+        self.assertTrue(self.lexicon.classify("brown ale batter").contains_gluten)
+
+    def test_negated_claims_are_ignored(self):
+        """Test claims preceded by a negation do not count"""
+        for text in ("not gluten free", "Not certified gluten-free", "this isn't gluten free"):
+            with self.subTest(text=text):
+                self.assertEqual(self.lexicon.classify(text).claims, [])
+        self.assertEqual(self.lexicon.classify("Gluten-free, not spicy").claims, ["gluten free"])
+
+
+class TestServicesAgree(unittest.TestCase):
+    """The five gluten services give the same answer for the same text"""
+
+    ITEMS = {
+        "whole wheat bread": True,
+        "barley soup": True,
+        "soy sauce": True,
+        "rolled oats": True,
+        "buckwheat pancakes": False,
+        "rice with vegetables": False,
+        "grilled chicken": False,
+        "flour tortilla": True,
+        "ginger ale": False,
+        "sugar, rice, flour, salt": True,
+        "corn (flour)": True,
+        "sugar, rice flour, salt": False,
+    }
+
+    def test_gluten_decisions_match(self):
+        """Test every service flags exactly the gluten-containing items"""
+        analyzer = GlutenRiskAnalyzer()
+        converter = GlutenFreeConverter()
+        health = HealthPatternAnalyzer(":memory:")
+        correlator = IngredientCorrelator()
+        scanner = UPCScanner()
+
+        for item, contains_gluten in self.ITEMS.items():
+            with self.subTest(item=item):
+                analysis = analyzer.analyze_ingredient_list(item)
+                flagged_by_analyzer = bool(analysis["gluten_sources_found"]) or any(
+                    analyzer.lexicon.severity(term) >= MEDIUM for term in analysis["hidden_gluten_found"]
+                )
+                self.assertEqual(flagged_by_analyzer, contains_gluten)
+                self.assertEqual(converter._find_gluten_ingredient(item) is not None, contains_gluten)
+                self.assertEqual(health._contains_gluten_ingredients(item), contains_gluten)
+                self.assertEqual(
+                    any(correlator._known_risk(i) for i in correlator._extract_ingredients(item)),
+                    contains_gluten,
+                )
+                safety = scanner._analyze_gluten_safety({"name": item, "ingredients": [item]})
+                self.assertEqual(safety["is_gluten_free"], not contains_gluten)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the gluten risk analyzer and its term matcher
+"""
+
+import unittest
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.term_matcher import TermMatcher, tokenize
+from services.gluten_risk_analyzer import GlutenRiskAnalyzer, GlutenSource, RiskLevel
+
+
+class TestTermMatcher(unittest.TestCase):
+    """Test cases for TermMatcher"""
+
+    def setUp(self):
+        """Set up each test"""
+        self.matcher = TermMatcher([
+            ("wheat", "wheat"), ("wheat flour", "wheat flour"), ("flour", "flour"),
+            ("malt vinegar", "malt vinegar"), ("vinegar", "vinegar"),
+        ])
+
+    def test_tokenize(self):
+        """Test text is split into lowercase words"""
+        self.assertEqual(tokenize("Whole-Wheat Flour (Enriched)"), ["whole", "wheat", "flour", "enriched"])
+
+    def test_overlapping_terms(self):
+        """Test nested and overlapping terms are all reported"""
+        self.assertEqual(self.matcher.find("wheat flour"), ["wheat", "wheat flour", "flour"])
+        self.assertEqual(self.matcher.find("MALT VINEGAR"), ["malt vinegar", "vinegar"])
+
+    def test_word_boundaries(self):
+        """Test terms only match whole words"""
+        self.assertEqual(self.matcher.find("buckwheat, wheatgrass"), [])
+        self.assertEqual(self.matcher.find("whole-wheat"), ["wheat"])
+
+    def test_suffix_terms_after_failed_prefix(self):
+        """Test matches that start inside a longer partial term"""
+        matcher = TermMatcher([("a b c", 1), ("b c d", 2), ("c", 3)])
+        self.assertEqual(matcher.find("a b c d"), [1, 3, 2])
+
+    def test_terms_added_after_matching(self):
+        """Test the automaton is rebuilt when terms are added later"""
+        self.assertEqual(self.matcher.find("buckwheat"), [])
+        self.matcher.add("buckwheat")
+        self.assertEqual(self.matcher.find("buckwheat flour"), ["buckwheat", "flour"])
+
+
+class TestGlutenRiskAnalyzer(unittest.TestCase):
+    """Test cases for GlutenRiskAnalyzer"""
+
+    def setUp(self):
+        """Set up each test"""
+        self.analyzer = GlutenRiskAnalyzer()
+
+    def test_direct_gluten_source(self):
+        """Test wheat ingredients are unsafe and listed in term order"""
+        result = self.analyzer.analyze_product("Bread", "Wheat flour, water, yeast, salt")
+        self.assertEqual(result.risk_level, RiskLevel.UNSAFE)
+        self.assertEqual(result.detected_sources, [GlutenSource.WHEAT, GlutenSource.WHEAT])
+        self.assertEqual(result.problematic_ingredients, ["wheat", "wheat flour"])
+        self.assertIn("salt", result.safe_ingredients)
+
+    def test_buckwheat_is_not_wheat(self):
+        """Test gluten terms are not matched inside other words"""
+        result = self.analyzer.analyze_product("Pancakes", "buckwheat flour, milk, eggs")
+        self.assertEqual(result.detected_sources, [])
+        self.assertIn("buckwheat flour", result.safe_ingredients)
+
+    def test_separated_flour_is_wheat(self):
+        """Test flour on its own in a comma- or parenthesis-separated list is a wheat source"""
+        for ingredients in ("sugar, rice, flour, salt", "corn (flour)", "rice; flour"):
+            with self.subTest(ingredients=ingredients):
+                result = self.analyzer.analyze_product("Mix", ingredients)
+                self.assertNotEqual(result.risk_level, RiskLevel.SAFE)
+                self.assertEqual(result.detected_sources, [GlutenSource.WHEAT])
+        result = self.analyzer.analyze_product("Mix", "sugar, rice flour, salt")
+        self.assertEqual(result.detected_sources, [])
+
+    def test_cross_contamination_and_certification(self):
+        """Test manufacturing notes from product info and certification from the name"""
+        result = self.analyzer.analyze_product(
+            "Gluten-Free Crackers", "rice flour, sea salt",
+            additional_info="Processed in facility with wheat"
+        )
+        self.assertEqual(result.certification_status, "certified_gluten_free")
+        self.assertTrue(result.cross_contamination_risk)
+        self.assertIn("processed in facility with wheat", result.manufacturing_notes)
+        self.assertEqual(result.risk_level, RiskLevel.LOW_RISK)
+
+    def test_analyze_many_matches_analyze_product(self):
+        """Test the batch API returns the same results in input order"""
+        products = [
+            {"name": "Bread", "ingredients": "wheat flour, yeast"},
+            {"product_name": "Soup", "ingredients": "broth, carrots", "barcode": "123"},
+            ("Rice", "rice", None, "certified gluten free"),
+        ]
+        results = self.analyzer.analyze_many(products)
+        self.assertEqual([r.product_name for r in results], ["Bread", "Soup", "Rice"])
+        self.assertEqual(results[1].barcode, "123")
+        expected = self.analyzer.analyze_product("Rice", "rice", None, "certified gluten free")
+        self.assertEqual(results[2], expected)
+
+    def test_analyze_ingredient_list(self):
+        """Test the ingredient breakdown and risk score"""
+        analysis = self.analyzer.analyze_ingredient_list("barley malt, soy sauce, may contain wheat")
+        self.assertEqual(analysis["total_ingredients"], 3)
+        self.assertIn({"source": "barley", "term": "barley malt"}, analysis["gluten_sources_found"])
+        self.assertIn("soy sauce", analysis["hidden_gluten_found"])
+        self.assertIn("may contain wheat", analysis["manufacturing_risks"])
+        self.assertEqual(analysis["risk_score"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
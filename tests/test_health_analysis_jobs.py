@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the background health analysis runner
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from datetime import date
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QApplication
+
+from services.health_analysis_jobs import AnalysisCancelled, HealthAnalysisRunner, run_insights
+from utils.migrations import ensure_schema
+
+
+class TestHealthAnalysisJobs(unittest.TestCase):
+    """Test cases for HealthAnalysisRunner"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment"""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        """Set up each test with a small health log"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "health.db")
+        conn = sqlite3.connect(self.db_path)
+        ensure_schema(conn)
+        today = date.today().isoformat()
+        conn.executemany(
+            "INSERT INTO health_log(date, time, items, symptoms, severity) VALUES (?, ?, ?, ?, ?)",
+            [(today, "08:00", "wheat toast", "", 0), (today, "12:00", "", "bloating", 6)])
+        conn.commit()
+        conn.close()
+        self.runner = HealthAnalysisRunner()
+        self.results = []
+        self.runner.result_ready.connect(lambda kind, result: self.results.append((kind, result)))
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.runner.cancel()
+        self.temp_dir.cleanup()
+
+    def wait_for_result(self, timeout_ms=10000):
+        loop = QEventLoop()
+        self.runner.result_ready.connect(loop.quit)
+        QTimer.singleShot(timeout_ms, loop.quit)
+        loop.exec()
+        self.runner.result_ready.disconnect(loop.quit)
+
+    def write(self, sql):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(sql)
+        conn.commit()
+        conn.close()
+
+    def test_cache_key_follows_data_versions(self):
+        """Test the key changes when a health table changes and only then"""
+        key = self.runner.cache_key('insights', 90, self.db_path)
+        self.assertEqual(self.runner.cache_key('insights', 90, self.db_path), key)
+        self.assertNotEqual(self.runner.cache_key('insights', 30, self.db_path), key)
+        self.write("INSERT INTO pantry(name) VALUES ('rice')")
+        self.assertEqual(self.runner.cache_key('insights', 90, self.db_path), key)
+        self.write("INSERT INTO hydration_log(date, liters) VALUES ('2024-01-01', 1.5)")
+        self.assertNotEqual(self.runner.cache_key('insights', 90, self.db_path), key)
+
+    def test_unchanged_data_is_answered_from_cache(self):
+        """Test a repeated analysis reuses the finished result until the log changes"""
+        self.assertTrue(self.runner.start('insights', 90, self.db_path))
+        self.wait_for_result()
+        self.assertEqual([kind for kind, _ in self.results], ['insights'])
+        self.assertNotIn('error', self.results[0][1])
+
+        self.assertFalse(self.runner.start('insights', 90, self.db_path))
+        self.assertEqual(len(self.results), 2)
+        self.assertIs(self.results[1][1], self.results[0][1])
+        self.assertEqual(self.runner.jobs_started, 1)
+
+        self.write("UPDATE health_log SET severity = 2 WHERE symptoms = 'bloating'")
+        self.assertTrue(self.runner.start('insights', 90, self.db_path))
+        self.wait_for_result()
+        self.assertEqual(self.runner.jobs_started, 2)
+
+    def test_new_analysis_supersedes_running_one(self):
+        """Test only the latest analysis reports a result and the superseded one is reported dropped"""
+        dropped = []
+        self.runner.dropped.connect(dropped.append)
+        self.runner.start('insights', 90, self.db_path)
+        self.runner.start('correlations', 90, self.db_path)
+        self.assertEqual(dropped, ['insights'])
+        self.wait_for_result()
+        self.assertEqual([kind for kind, _ in self.results], ['correlations'])
+        self.assertFalse(self.runner.is_running())
+
+        # Nothing to drop once the job has finished, or for another kind
+        self.runner.cancel()
+        self.runner.start('insights', 90, self.db_path)
+        self.runner.cancel('correlations')
+        self.assertEqual(dropped, ['insights'])
+        self.runner.cancel('insights')
+        self.assertEqual(dropped, ['insights', 'insights'])
+
+    def test_cancelled_job_stops_between_steps(self):
+        """Test a job polls for cancellation and reports progress up to that point"""
+        steps = []
+        with self.assertRaises(AnalysisCancelled):
+            run_insights(self.db_path, 90, lambda message, pct: steps.append(pct), lambda: len(steps) >= 2)
+        self.assertEqual(steps, [10, 30])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the normalized symptom and meal-item tables
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.health_index import HealthIndex, parse_symptoms
+from utils.health_index import pending_count
+from utils.migrations import ensure_schema
+
+
+class TestHealthIndex(unittest.TestCase):
+    """Test cases for HealthIndex"""
+
+    def setUp(self):
+        """Set up each test with an in-memory schema"""
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        self.index = HealthIndex(self.conn)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+
+    def log(self, date, time, items="", symptoms=""):
+        cursor = self.conn.execute(
+            "INSERT INTO health_log(date, time, items, symptoms) VALUES (?, ?, ?, ?)",
+            (date, time, items, symptoms))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def test_parse_symptoms(self):
+        """Test known symptoms are canonical and other parts are kept"""
+        self.assertEqual(parse_symptoms("Severe Bloating, gas;  itchy   eyes,,"),
+                         ["bloating", "gas", "itchy eyes"])
+        self.assertEqual(parse_symptoms(""), [])
+
+    def test_writes_are_parsed_once(self):
+        """Test inserts are queued, parsed on sync and edits re-parsed"""
+        entry = self.log("2024-03-01", "08:00", "cheese toast, wheat bread", "bloating, headache")
+        self.assertEqual(pending_count(self.conn), 1)
+        self.assertEqual(self.index.sync(), 1)
+        self.assertEqual(self.index.sync(), 0)
+        self.assertEqual(self.index.entry_symptoms([entry]), {entry: ["bloating", "headache"]})
+        self.assertIn("cheese", self.index.entry_ingredients([entry])[entry])
+        self.assertIn("wheat", self.index.entry_ingredients([entry])[entry])
+
+        self.conn.execute("UPDATE health_log SET symptoms = 'nausea' WHERE id = ?", (entry,))
+        self.assertEqual(self.index.entry_symptoms([entry]), {entry: ["nausea"]})
+        self.conn.execute("UPDATE health_log SET date = '2024-03-02' WHERE id = ?", (entry,))
+        self.assertEqual(self.conn.execute(
+            "SELECT DISTINCT date FROM meal_item WHERE health_log_id = ?", (entry,)).fetchall(),
+            [("2024-03-02",)])
+        self.conn.execute("DELETE FROM health_log WHERE id = ?", (entry,))
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM health_log_symptom").fetchone()[0], 0)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM meal_item").fetchone()[0], 0)
+
+    def test_symptoms_after_dairy(self):
+        """Test the meal/symptom window join"""
+        self.log("2024-03-01", "08:00", "yogurt, berries")
+        hit = self.log("2024-03-01", "12:30", "", "bloating")
+        self.log("2024-03-01", "23:00", "", "bloating")           # 15 h later
+        self.log("2024-03-02", "22:00", "milk shake")
+        late_night = self.log("2024-03-03", "02:00", "", "bloating")  # crosses midnight
+        self.log("2024-03-05", "09:00", "", "bloating")           # no dairy before
+
+        found = self.index.symptoms_after("bloating", ["dairy"], within_hours=6)
+        self.assertEqual([row["health_log_id"] for row in found], [hit, late_night])
+        self.assertAlmostEqual(found[0]["hours_after"], 4.5, places=3)
+        self.assertAlmostEqual(found[1]["hours_after"], 4.0, places=3)
+
+    def test_window_queries_use_indexes(self):
+        """Test the window join reads both sides through the (id, date) indexes"""
+        plan = " ".join(str(row[-1]) for row in self.conn.execute(
+            """EXPLAIN QUERY PLAN
+               SELECT * FROM health_log_symptom s JOIN meal_item m
+                 ON m.ingredient_id = 1 AND m.date >= date(s.date, '-1 days') AND m.date <= s.date
+               WHERE s.symptom_id = 2 AND s.date >= '2024-01-01'"""))
+        self.assertIn("idx_hls_symptom_date", plan)
+        self.assertIn("idx_meal_item_ingredient_date", plan)
+
+    def test_existing_entries_are_backfilled(self):
+        """Test databases that predate the tables get every entry queued"""
+        entry = self.log("2024-01-01", "09:00", "pasta", "fatigue")
+        for table in ("health_log_symptom", "symptom", "meal_item", "ingredient", "health_log_index_queue"):
+            self.conn.execute(f"DROP TABLE {table}")
+        ensure_schema(self.conn)
+        self.assertEqual(pending_count(self.conn), 1)
+        self.assertEqual(self.index.entry_symptoms([entry]), {entry: ["fatigue"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
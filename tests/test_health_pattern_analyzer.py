@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the vectorized health pattern analyzer
+
+The reference functions below are the per-entry loops the analyzer used
+before it moved to HealthFrame arrays; the vectorized results must match
+them.
+"""
+
+import unittest
+import sys
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.health_frame import HealthFrame
+from services.health_pattern_analyzer import HealthEntry, HealthPatternAnalyzer
+from utils.migrations import ensure_schema
+
+BAD_STOOL = (1, 2, 6, 7)
+
+
+def reference_severity(entry):
+    severity = 0.0
+    if entry.stool in BAD_STOOL:
+        severity += 0.4
+    if entry.energy_level <= 3:
+        severity += 0.3
+    if entry.mood in ['poor', 'terrible', 'awful']:
+        severity += 0.3
+    return min(1.0, severity)
+
+
+def reference_duration(entry):
+    return 24.0 if entry.stool in BAD_STOOL else 8.0
+
+
+def reference_reaction(analyzer, entry):
+    severity = 0.0
+    for symptom in analyzer._extract_symptoms(entry.symptoms):
+        if symptom in ['diarrhea', 'constipation', 'bloating', 'gas', 'abdominal pain']:
+            severity += 0.3
+        elif symptom in ['nausea', 'vomiting']:
+            severity += 0.4
+        elif symptom in ['fatigue', 'brain fog']:
+            severity += 0.2
+    if entry.stool in BAD_STOOL:
+        severity += 0.3
+    return min(1.0, severity)
+
+
+def reference_health_score(entry):
+    score = 0.5
+    if entry.stool == 4:
+        score += 0.2
+    elif entry.stool in [3, 5]:
+        score += 0.1
+    score += (entry.energy_level - 5) * 0.1
+    if entry.mood in ['excellent', 'great', 'good']:
+        score += 0.2
+    elif entry.mood in ['poor', 'terrible']:
+        score -= 0.2
+    if 2.0 <= entry.hydration_liters <= 3.0:
+        score += 0.1
+    return max(0.0, min(1.0, score))
+
+
+def reference_correlation(x_values, y_values):
+    if len(x_values) != len(y_values) or len(x_values) < 2:
+        return 0.0
+    x_mean = statistics.mean(x_values)
+    y_mean = statistics.mean(y_values)
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_values, y_values))
+    x_variance = sum((x - x_mean) ** 2 for x in x_values)
+    y_variance = sum((y - y_mean) ** 2 for y in y_values)
+    if x_variance == 0 or y_variance == 0:
+        return 0.0
+    return numerator / (x_variance * y_variance) ** 0.5
+
+
+def reference_symptom_patterns(analyzer, entries):
+    frequency = defaultdict(int)
+    severity = defaultdict(list)
+    duration = defaultdict(list)
+    triggers = defaultdict(set)
+    for entry in entries:
+        if entry.symptoms:
+            items = analyzer._extract_food_items(entry.items)
+            for symptom in analyzer._extract_symptoms(entry.symptoms):
+                frequency[symptom] += 1
+                severity[symptom].append(reference_severity(entry))
+                duration[symptom].append(reference_duration(entry))
+                for item in items:
+                    if analyzer._contains_gluten_ingredients(item):
+                        triggers[symptom].add(item)
+    patterns = [
+        (symptom, count, statistics.mean(severity[symptom]), statistics.mean(duration[symptom]),
+         sorted(triggers[symptom]), min(1.0, count / 10.0))
+        for symptom, count in frequency.items() if count >= 3
+    ]
+    patterns.sort(key=lambda p: (p[1], p[5]), reverse=True)
+    return patterns
+
+
+def reference_exposures(analyzer, entries):
+    exposures = []
+    for entry in entries:
+        if entry.items:
+            items = analyzer._extract_food_items(entry.items)
+            gluten_items = [i for i in items if analyzer._contains_gluten_ingredients(i)]
+            if gluten_items and entry.symptoms:
+                severity = reference_reaction(analyzer, entry)
+                if severity > 0.3:
+                    exposures.append((entry.date, ", ".join(gluten_items),
+                                      analyzer._extract_symptoms(entry.symptoms), severity,
+                                      reference_duration(entry), 24.0 * severity))
+    return exposures
+
+
+def reference_nutrition(entries):
+    impacts = []
+    for name, attr in (("Hydration (L/day)", "hydration_liters"), ("Fiber (g/day)", "fiber_grams")):
+        data = [(getattr(e, attr), reference_health_score(e)) for e in entries if getattr(e, attr) > 0]
+        if data:
+            impacts.append((name, abs(reference_correlation([d[0] for d in data], [d[1] for d in data])),
+                            statistics.mean([d[0] for d in data])))
+    return impacts
+
+
+def reference_trends(entries):
+    entries = sorted(entries, key=lambda x: x.date)
+    trends = []
+    for name, attr in (("Energy Level", "energy_level"), ("Bristol Scale", "stool"),
+                       ("Hydration", "hydration_liters"), ("Fiber", "fiber_grams")):
+        values = [getattr(e, attr) for e in entries]
+        first = statistics.mean(values[:len(values) // 2])
+        second = statistics.mean(values[len(values) // 2:])
+        change = ((second - first) / first * 100) if first > 0 else 0
+        direction = 'improving' if change > 5 else 'declining' if change < -5 else 'stable'
+        trends.append((name, direction, abs(change)))
+    return trends
+
+
+def make_entries(days, per_day=3, seed=7):
+    rng = random.Random(seed)
+    foods = ["rice, chicken", "wheat bread, butter", "oatmeal; honey", "salad|olive oil",
+             "soy sauce noodles, broccoli", "eggs", "", "pasta, tomato sauce", "yogurt, berries"]
+    symptoms = ["", "", "bloating", "Diarrhea and gas", "fatigue, brain fog", "nausea",
+                "abdominal pain; headache", "joint pain", "vomiting, bloating, fatigue"]
+    moods = ["good", "neutral", "poor", "great", "terrible", "awful", "excellent"]
+    start = date.today() - timedelta(days=days - 1)
+    entries = []
+    for day in range(days):
+        for _ in range(rng.randint(1, per_day)):
+            entries.append(HealthEntry(
+                id=len(entries) + 1, date=(start + timedelta(days=day)).isoformat(), time="",
+                meal="", items=rng.choice(foods), risk="", onset_min=0,
+                severity=rng.randint(0, 10), stool=rng.randint(1, 7), recipe="",
+                symptoms=rng.choice(symptoms), notes="",
+                hydration_liters=rng.choice([0.0, 1.5, 2.0, 2.5, 3.2]),
+                fiber_grams=rng.choice([0.0, 12.0, 25.0, 31.5]),
+                mood=rng.choice(moods), energy_level=rng.randint(1, 10),
+            ))
+    rng.shuffle(entries)
+    return entries
+
+
+class TestHealthPatternAnalyzer(unittest.TestCase):
+    """Parity tests against the per-entry implementation"""
+
+    def setUp(self):
+        """Set up each test"""
+        self.analyzer = HealthPatternAnalyzer(":memory:")
+        self.entries = make_entries(120)
+
+    def test_symptom_patterns_parity(self):
+        """Test symptom frequencies, averages, triggers and order"""
+        expected = reference_symptom_patterns(self.analyzer, self.entries)
+        actual = self.analyzer.analyze_symptom_patterns(self.entries)
+        self.assertEqual([p.symptoms[0] for p in actual], [p[0] for p in expected])
+        for pattern, (_, count, severity, duration, triggers, confidence) in zip(actual, expected):
+            self.assertEqual(pattern.frequency, count)
+            self.assertAlmostEqual(pattern.severity_avg, severity, places=12)
+            self.assertAlmostEqual(pattern.duration_avg, duration, places=12)
+            self.assertEqual(pattern.trigger_foods, triggers)
+            self.assertEqual(pattern.confidence, confidence)
+
+    def test_gluten_exposures_parity(self):
+        """Test exposures are detected for the same entries with the same values"""
+        expected = reference_exposures(self.analyzer, self.entries)
+        actual = self.analyzer.detect_gluten_exposures(self.entries)
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(
+            [(e.date, e.suspected_food, e.symptoms, e.severity, e.duration_hours, e.recovery_time)
+             for e in actual],
+            expected,
+        )
+
+    def test_nutritional_impact_parity(self):
+        """Test correlations and averages"""
+        expected = reference_nutrition(self.entries)
+        actual = self.analyzer.analyze_nutritional_impact(self.entries)
+        self.assertEqual([i.nutrient for i in actual], [e[0] for e in expected])
+        for impact, (_, correlation, average) in zip(actual, expected):
+            self.assertAlmostEqual(impact.correlation_with_symptoms, correlation, places=10)
+            self.assertAlmostEqual(impact.current_avg, average, places=10)
+
+    def test_health_trends_parity(self):
+        """Test first-half versus second-half trends in date order"""
+        expected = reference_trends(self.entries)
+        actual = self.analyzer.analyze_health_trends(self.entries)
+        self.assertEqual([(t.metric, t.trend_direction) for t in actual], [e[:2] for e in expected])
+        for trend, (_, _, change) in zip(actual, expected):
+            self.assertAlmostEqual(trend.change_percentage, change, places=9)
+
+    def test_summary_parity(self):
+        """Test summary statistics"""
+        summary = self.analyzer._generate_summary_stats(self.entries)
+        self.assertEqual(summary['total_days_tracked'], len(self.entries))
+        self.assertEqual(summary['days_with_symptoms'], len([e for e in self.entries if e.symptoms]))
+        self.assertEqual(summary['average_energy_level'],
+                         round(statistics.mean(e.energy_level for e in self.entries), 1))
+
+    def test_correlation(self):
+        """Test the Pearson correlation helper"""
+        self.assertAlmostEqual(self.analyzer._calculate_correlation([1, 2, 3], [2, 4, 6]), 1.0)
+        self.assertAlmostEqual(self.analyzer._calculate_correlation([1, 2, 3], [3, 2, 1]), -1.0)
+        self.assertEqual(self.analyzer._calculate_correlation([1, 1, 1], [1, 2, 3]), 0.0)
+        self.assertEqual(self.analyzer._calculate_correlation([1], [1]), 0.0)
+
+    def test_symptom_lag(self):
+        """Test symptoms following gluten days are measured per lag"""
+        start = date(2024, 1, 1)
+        entries = []
+        for day in range(60):
+            gluten = day % 10 == 0
+            entries.append(HealthEntry(
+                id=day, date=(start + timedelta(days=day)).isoformat(), time="", meal="",
+                items="wheat bread" if gluten else "rice", risk="", onset_min=0, severity=0,
+                stool=4, recipe="", symptoms="bloating" if day % 10 == 1 else "", notes="",
+                hydration_liters=0.0, fiber_grams=0.0, mood="neutral", energy_level=5,
+            ))
+        lags = self.analyzer.analyze_symptom_lag(entries, max_lag_days=2)
+        self.assertEqual([lag['lag_days'] for lag in lags], [0, 1, 2])
+        self.assertEqual(lags[0]['rate'], 0.0)
+        self.assertEqual(lags[1]['rate'], 1.0)
+        self.assertAlmostEqual(lags[1]['lift'], 10.0)
+
+    def test_frame_from_database(self):
+        """Test get_health_frame applies the same defaults as get_health_entries"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "health.db")
+            conn = sqlite3.connect(db_path)
+            ensure_schema(conn)
+            today = date.today().isoformat()
+            conn.executemany(
+                "INSERT INTO health_log(date, items, symptoms, stool, mood, energy_level, "
+                "hydration_liters) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(today, "wheat bread", "bloating", None, None, None, None),
+                 (today, None, "", 6, "poor", 2, 2.5)],
+            )
+            conn.commit()
+            conn.close()
+
+            analyzer = HealthPatternAnalyzer(db_path)
+            entries = analyzer.get_health_entries(7)
+            frame = analyzer.get_health_frame(7)
+            expected = HealthFrame.from_entries(entries, analyzer.celiac_symptoms)
+            for column in ("stool", "energy", "hydration", "mood", "has_gluten", "symptoms"):
+                self.assertEqual(getattr(frame, column).tolist(), getattr(expected, column).tolist())
+
+    def test_long_term_insights_from_rollups(self):
+        """Test the long-range summary and trends read the monthly rollups"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "health.db")
+            conn = sqlite3.connect(db_path)
+            ensure_schema(conn)
+            today = date.today()
+            rows = []
+            for day in range(1, 300):
+                # Symptoms every other day early on, every tenth day lately
+                symptoms = "bloating" if day % (2 if day > 150 else 10) == 0 else ""
+                rows.append(((today - timedelta(days=day)).isoformat(), symptoms, 4, 2.0))
+            conn.executemany(
+                "INSERT INTO health_log(date, symptoms, severity, hydration_liters) VALUES (?, ?, ?, ?)",
+                rows)
+            conn.commit()
+            conn.close()
+
+            analyzer = HealthPatternAnalyzer(db_path)
+            long_term = analyzer.get_long_term_insights(365)
+            summary = long_term['summary']
+            self.assertEqual(summary['days_logged'], 299)
+            self.assertEqual(summary['entries'], 299)
+            self.assertEqual(summary['symptom_entries'], len([r for r in rows if r[1]]))
+            self.assertAlmostEqual(summary['hydration_liters_per_day'], 2.0)
+            self.assertEqual(summary['periods'], len(analyzer.get_rollups('monthly', 365)))
+            self.assertEqual(summary['symptom_counts'], {'bloating': summary['symptom_entries']})
+            self.assertEqual(summary['most_common_symptom'], 'bloating')
+            trends = {t.metric: t.trend_direction for t in long_term['trends']}
+            self.assertEqual(trends['Symptom Frequency'], 'improving')
+            self.assertEqual(trends['Hydration'], 'stable')
+
+    def test_five_year_log_is_fast(self):
+        """Test a five-year log with several entries per day analyzes in well under a second"""
+        entries = make_entries(5 * 365, per_day=4, seed=11)
+        started = time.perf_counter()
+        insights = self.analyzer.generate_health_insights(entries)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(insights['summary']['total_days_tracked'], len(entries))
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the trigger-maintained health rollups
+"""
+
+import unittest
+import sys
+import os
+import random
+import sqlite3
+from datetime import date, timedelta
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.health_index import HealthIndex
+from utils.health_rollups import (
+    get_daily_rollups, get_monthly_rollups, get_weekly_rollups, rebuild_health_rollups
+)
+from utils.migrations import ensure_schema
+
+
+class TestHealthRollups(unittest.TestCase):
+    """Test cases for the health rollup tables"""
+
+    def setUp(self):
+        """Set up each test with an in-memory schema"""
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+
+    def snapshot(self):
+        return self.conn.execute("SELECT * FROM health_daily_rollup ORDER BY day").fetchall()
+
+    def test_day_values(self):
+        """Test one day combines all four logs"""
+        self.conn.executemany(
+            "INSERT INTO health_log(date, time, items, symptoms, severity, stool, hydration_liters, "
+            "fiber_grams) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [("2024-03-04", "08:00", "toast", "bloating", 4, 6, 0.5, 3.0),
+             ("2024-03-04", "12:00", "salad", "", 0, 4, 0.0, 5.0),
+             ("2024-03-04", "19:00", "", "nausea", 7, 0, 0.0, 0.0)],
+        )
+        self.conn.execute("INSERT INTO hydration_log(date, liters) VALUES ('2024-03-04', 1.5)")
+        self.conn.execute("INSERT INTO fiber_log(date, grams) VALUES ('2024-03-04', 10)")
+        self.conn.execute("INSERT INTO bristol_log(date, time, type) VALUES ('2024-03-04', '09:00', 6)")
+
+        day = get_daily_rollups(self.conn, "2024-03-04", "2024-03-04")[0]
+        self.assertEqual((day["entries"], day["symptom_entries"], day["meal_count"]), (3, 2, 2))
+        self.assertAlmostEqual(day["severity_mean"], 11 / 3)
+        self.assertEqual(day["severity_max"], 7)
+        self.assertAlmostEqual(day["hydration_liters"], 2.0)
+        self.assertAlmostEqual(day["fiber_grams"], 18.0)
+        self.assertEqual((day["bristol_4"], day["bristol_6"]), (1, 2))
+
+    def test_incremental_matches_rebuild(self):
+        """Test random inserts, updates and deletes leave the same table as a rebuild"""
+        rng = random.Random(3)
+        start = date(2023, 12, 25)
+        for _ in range(400):
+            day = (start + timedelta(days=rng.randint(0, 20))).isoformat()
+            action = rng.random()
+            if action < 0.5:
+                self.conn.execute(
+                    "INSERT INTO health_log(date, items, symptoms, severity, stool, hydration_liters) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (day, rng.choice(["", "rice"]), rng.choice(["", "gas"]), rng.randint(0, 10),
+                     rng.randint(0, 7), rng.choice([0.0, 0.25])),
+                )
+            elif action < 0.6:
+                self.conn.execute("INSERT INTO hydration_log(date, liters) VALUES (?, ?)", (day, 0.5))
+            elif action < 0.7:
+                self.conn.execute("INSERT INTO bristol_log(date, type) VALUES (?, ?)", (day, rng.randint(1, 7)))
+            elif action < 0.85:
+                self.conn.execute(
+                    "UPDATE health_log SET date = ?, severity = ? WHERE id = "
+                    "(SELECT id FROM health_log ORDER BY RANDOM() LIMIT 1)", (day, rng.randint(0, 10)))
+            else:
+                self.conn.execute("DELETE FROM health_log WHERE id = (SELECT MIN(id) FROM health_log)")
+        incremental = self.snapshot()
+        rebuild_health_rollups(self.conn)
+        self.assertEqual(incremental, self.snapshot())
+        self.assertGreater(len(incremental), 10)
+
+    def test_deleting_last_entry_removes_day(self):
+        """Test a day without entries has no rollup row"""
+        self.conn.execute("INSERT INTO fiber_log(date, grams) VALUES ('2024-05-01', 4)")
+        self.assertEqual(len(self.snapshot()), 1)
+        self.conn.execute("DELETE FROM fiber_log")
+        self.assertEqual(self.snapshot(), [])
+
+    def test_weekly_and_monthly_views(self):
+        """Test week (Monday start) and month aggregation over the daily table"""
+        for day in ("2024-01-28", "2024-01-29", "2024-02-04", "2024-02-05"):
+            self.conn.execute("INSERT INTO health_log(date, severity) VALUES (?, 2)", (day,))
+        weeks = get_weekly_rollups(self.conn, "2024-01-01", "2024-02-29")
+        self.assertEqual([(w["week_start"], w["entries"]) for w in weeks],
+                         [("2024-01-22", 1), ("2024-01-29", 2), ("2024-02-05", 1)])
+        months = get_monthly_rollups(self.conn, "2024-01-15", "2024-02-01")
+        self.assertEqual([(m["month"], m["entries"], m["days_logged"]) for m in months],
+                         [("2024-01", 2, 2), ("2024-02", 2, 2)])
+
+    def test_long_ranges_read_few_rows(self):
+        """Test five years of entries roll up to one row per day and month"""
+        start = date(2019, 1, 1)
+        self.conn.executemany(
+            "INSERT INTO health_log(date, severity) VALUES (?, ?)",
+            (((start + timedelta(days=i // 4)).isoformat(), i % 10) for i in range(5 * 365 * 4)),
+        )
+        self.assertEqual(len(get_daily_rollups(self.conn, "2019-01-01", "2023-12-31")), 5 * 365)
+        months = get_monthly_rollups(self.conn, "2019-01-01", "2023-12-31")
+        self.assertEqual(len(months), 60)
+        self.assertEqual(sum(m["entries"] for m in months), 5 * 365 * 4)
+
+    def test_daily_symptom_counts(self):
+        """Test per-symptom counts follow synced, edited and deleted entries"""
+        self.conn.executemany(
+            "INSERT INTO health_log(date, time, symptoms) VALUES (?, ?, ?)",
+            [("2024-03-04", "08:00", "bloating, headache"),
+             ("2024-03-04", "19:00", "bloating"),
+             ("2024-03-11", "09:00", "fatigue")],
+        )
+        index = HealthIndex(self.conn)
+        index.sync()
+        days = get_daily_rollups(self.conn, "2024-03-01", "2024-03-31")
+        self.assertEqual([day["symptoms"] for day in days],
+                         [{"bloating": 2, "headache": 1}, {"fatigue": 1}])
+
+        self.conn.execute("UPDATE health_log SET date = '2024-03-11' WHERE time = '19:00'")
+        self.conn.execute("UPDATE health_log SET symptoms = 'nausea' WHERE time = '09:00'")
+        self.conn.execute("DELETE FROM health_log WHERE time = '08:00'")
+        index.sync()
+        weeks = get_weekly_rollups(self.conn, "2024-03-01", "2024-03-31")
+        self.assertEqual([(week["week_start"], week["symptoms"]) for week in weeks],
+                         [("2024-03-11", {"bloating": 1, "nausea": 1})])
+        counts = "SELECT * FROM health_daily_symptom ORDER BY day, symptom_id"
+        incremental = self.conn.execute(counts).fetchall()
+        rebuild_health_rollups(self.conn)
+        self.assertEqual(incremental, self.conn.execute(counts).fetchall())
+        month = get_monthly_rollups(self.conn, "2024-03-01", "2024-03-31")[0]
+        self.assertEqual(month["symptoms"], {"bloating": 1, "nausea": 1})
+
+    def test_existing_logs_are_rolled_up_on_migration(self):
+        """Test databases that predate the rollups get them filled on first schema check"""
+        self.conn.execute("INSERT INTO health_log(date, severity) VALUES ('2024-06-01', 3)")
+        self.conn.execute("DROP TABLE health_daily_rollup")
+        ensure_schema(self.conn)
+        self.assertEqual(get_daily_rollups(self.conn, "2024-06-01", "2024-06-01")[0]["entries"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
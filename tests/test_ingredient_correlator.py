@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ingredient/symptom correlator
+"""
+
+import unittest
+import sys
+import os
+import math
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.health_index import HealthIndex
+from services.ingredient_correlator import IngredientCorrelator
+from utils.health_index import correlation_aggregates
+from utils.migrations import ensure_schema
+
+FOODS = ['wheat toast', 'rice bowl', 'cheese pizza', 'grilled chicken', 'pasta salad',
+         'yogurt', 'beef tacos with corn', 'soy sauce noodles', 'potato soup']
+SYMPTOMS = ['bloating', 'gas', 'fatigue', 'headache']
+
+
+def make_logs(count, seed=7):
+    """Random health and meal logs over count hours"""
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+    health_logs, meal_logs = [], []
+    for hour in range(count):
+        when = (start + timedelta(hours=hour, minutes=rng.randint(0, 59))).isoformat(sep=' ')
+        if rng.random() < 0.3:
+            meal_logs.append({'timestamp': when, 'items': rng.sample(FOODS, 2), 'meal_type': 'Lunch'})
+        if rng.random() < 0.2:
+            health_logs.append({'timestamp': when, 'symptoms': rng.sample(SYMPTOMS, rng.randint(0, 2)),
+                                'severity': rng.randint(1, 10)})
+    rng.shuffle(meal_logs)
+    return health_logs, meal_logs
+
+
+def reference_join(correlator, health_logs, meal_logs):
+    """The original all-pairs join: (health timestamp, sorted meal timestamps, ingredients)"""
+    combined = []
+    for health_log in health_logs:
+        health_time = datetime.fromisoformat(health_log['timestamp'])
+        meals = []
+        ingredients = set()
+        for meal_log in meal_logs:
+            meal_time = datetime.fromisoformat(meal_log['timestamp'])
+            if timedelta(minutes=30) <= health_time - meal_time <= timedelta(hours=24):
+                meals.append(meal_log['timestamp'])
+                for item in meal_log['items']:
+                    ingredients.update(correlator._extract_ingredients(item))
+        if meals:
+            combined.append((health_log['timestamp'], sorted(meals), ingredients))
+    return combined
+
+
+class TestIngredientCorrelator(unittest.TestCase):
+    """Test cases for IngredientCorrelator"""
+
+    def setUp(self):
+        """Set up each test"""
+        self.correlator = IngredientCorrelator()
+
+    def test_window_join_matches_all_pairs(self):
+        """Test the sliding window finds the same meals as comparing every pair"""
+        health_logs, meal_logs = make_logs(24 * 60)
+        combined = self.correlator._combine_health_meal_data(health_logs, meal_logs)
+        expected = reference_join(self.correlator, health_logs, meal_logs)
+        self.assertEqual(
+            [(entry['health_log']['timestamp'], set(entry['ingredients'])) for entry in combined],
+            [(timestamp, ingredients) for timestamp, _, ingredients in expected])
+        self.assertEqual([len(entry['related_meals']) for entry in combined],
+                         [len(meals) for _, meals, _ in expected])
+
+    def test_lag_window_is_configurable(self):
+        """Test meals outside a custom window are not related"""
+        correlator = IngredientCorrelator(lag_window=(timedelta(hours=1), timedelta(hours=3)))
+        meal_logs = [{'timestamp': '2024-01-01 08:00', 'items': ['toast']},
+                     {'timestamp': '2024-01-01 11:30', 'items': ['rice']}]
+        health_logs = [{'timestamp': '2024-01-01 12:00', 'symptoms': ['gas'], 'severity': 3},
+                       {'timestamp': 'not a time', 'symptoms': ['gas'], 'severity': 3}]
+        self.assertEqual(correlator._combine_health_meal_data(health_logs, meal_logs), [])
+        health_logs[0]['timestamp'] = '2024-01-01 10:30'
+        combined = correlator._combine_health_meal_data(health_logs, meal_logs)
+        self.assertEqual(len(combined), 1)
+        self.assertAlmostEqual(combined[0]['related_meals'][0]['time_before_symptoms'], 2.5)
+
+    def test_lift_and_pmi(self):
+        """Test association measures from the co-occurrence counts"""
+        combined = (
+            [{'symptoms': ['bloating'], 'severity': 8, 'ingredients': frozenset({'wheat'})}] * 4
+            + [{'symptoms': [], 'severity': 0, 'ingredients': frozenset({'wheat'})}]
+            + [{'symptoms': ['bloating'], 'severity': 8, 'ingredients': frozenset({'rice'})}]
+            + [{'symptoms': [], 'severity': 0, 'ingredients': frozenset({'rice'})}] * 4
+        )
+        correlations = {(c.ingredient, c.symptom): c for c in self.correlator._calculate_correlations(combined)}
+        wheat = correlations['wheat', 'bloating']
+        self.assertEqual(wheat.occurrences, 5)
+        self.assertAlmostEqual(wheat.conditional_probability, 0.8)
+        self.assertAlmostEqual(wheat.lift, 0.8 / 0.5)
+        self.assertAlmostEqual(wheat.pmi, math.log2(1.6))
+        self.assertNotIn(('rice', 'bloating'), correlations)
+
+    def test_repeated_symptoms_count_once(self):
+        """Test a symptom listed twice counts and weighs as one co-occurrence"""
+        counts = self.correlator._count_cooccurrences(
+            [{'symptoms': ['gas', 'gas'], 'severity': 4, 'ingredients': frozenset({'wheat'})}])
+        self.assertEqual(counts['pairs']['wheat', 'gas'], 1)
+        self.assertEqual(counts['symptoms']['gas'], 1)
+        self.assertEqual(counts['weights']['wheat', 'gas'], 4)
+
+    def test_analysis_work_scales_linearly(self):
+        """Test ten times the history parses each meal once and visits ten times the windows"""
+        def work(hours):
+            correlator = IngredientCorrelator()
+            health_logs, meal_logs = make_logs(hours)
+            combined = correlator._combine_health_meal_data(health_logs, meal_logs)
+            self.assertEqual(correlator.meal_parse_count, len(meal_logs))
+            self.assertEqual(correlator.window_visits,
+                             sum(len(entry['related_meals']) for entry in combined))
+            return correlator.window_visits, len(health_logs) * len(meal_logs)
+
+        small, small_pairs = work(24 * 30)
+        large, large_pairs = work(24 * 300)
+        self.assertLess(large, small * 15)
+        self.assertLess(large, large_pairs / 100)
+
+class TestDatabaseCorrelations(unittest.TestCase):
+    """The SQL aggregation path against the in-memory path"""
+
+    def setUp(self):
+        """Set up each test with a random health log"""
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        rng = random.Random(3)
+        for day in range(90):
+            for _ in range(rng.randint(1, 4)):
+                self.conn.execute(
+                    "INSERT INTO health_log(date, time, items, symptoms, severity) VALUES (?, ?, ?, ?, ?)",
+                    ((datetime(2024, 1, 1) + timedelta(days=day)).date().isoformat(),
+                     f"{rng.randint(0, 23):02d}:{rng.choice(['00', '30'])}",
+                     ", ".join(rng.sample(FOODS, rng.randint(0, 2))),
+                     ", ".join(rng.sample(SYMPTOMS, rng.randint(0, 2))),
+                     rng.randint(0, 10)))
+        self.conn.commit()
+        self.index = HealthIndex(self.conn)
+        self.index.sync()
+        self.correlator = IngredientCorrelator()
+        self.correlator.correlation_threshold = 0.05  # Random logs correlate weakly
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+
+    def in_memory(self, start):
+        """Load the logs the way the health log panel used to and analyze them in Python"""
+        rows = self.conn.execute(
+            "SELECT id, date, time, items, severity FROM health_log WHERE date >= ?", (start,)).fetchall()
+        symptoms = self.index.entry_symptoms(row[0] for row in rows)
+        ingredients = self.index.entry_ingredients(row[0] for row in rows)
+        health_logs = [{'timestamp': f"{d} {t}", 'symptoms': symptoms.get(i, []), 'severity': sev or 0}
+                       for i, d, t, _, sev in rows]
+        meal_logs = [{'timestamp': f"{d} {t}", 'items': items.split(','), 'ingredients': ingredients.get(i, [])}
+                     for i, d, t, items, _ in rows if items]
+        return self.correlator.analyze_ingredient_correlations(health_logs, meal_logs)
+
+    def test_matches_in_memory_analysis(self):
+        """Test correlations, patterns and safe ingredients agree"""
+        expected = self.in_memory("2024-02-01")
+        actual = self.correlator.analyze_database_correlations(self.conn, "2024-02-01", "9999-12-31")
+
+        def correlations(result):
+            return sorted((c.ingredient, c.symptom, c.occurrences, round(c.correlation_strength, 9),
+                           round(c.lift, 9), c.confidence_level, c.risk_assessment)
+                          for c in result['correlations'])
+
+        def patterns(result):
+            return sorted((tuple(p.ingredients_involved), tuple(p.symptoms), p.frequency,
+                           round(p.severity_avg, 9), p.time_pattern) for p in result['patterns'])
+
+        self.assertGreater(len(expected['correlations']), 0)
+        self.assertGreater(len(expected['patterns']), 0)
+        self.assertEqual(correlations(actual), correlations(expected))
+        self.assertEqual(patterns(actual), patterns(expected))
+        self.assertEqual(actual['safe_ingredients'], expected['safe_ingredients'])
+        self.assertEqual(actual['summary']['total_correlations_found'],
+                         expected['summary']['total_correlations_found'])
+
+    def test_repeated_symptom_weighs_the_same(self):
+        """Test both paths weigh a symptom listed twice in one entry once"""
+        self.conn.execute("DELETE FROM health_log")
+        self.conn.executemany(
+            "INSERT INTO health_log(date, time, items, symptoms, severity) VALUES (?, ?, ?, ?, ?)",
+            [("2024-05-01", "08:00", "wheat toast", "", 0),
+             ("2024-05-01", "12:00", "", "gas, bloating, gas", 6)])
+        self.conn.commit()
+        self.index.sync()
+
+        health_logs = [{'timestamp': '2024-05-01 12:00', 'symptoms': ['gas', 'bloating', 'gas'], 'severity': 6}]
+        meal_logs = [{'timestamp': '2024-05-01 08:00', 'items': ['wheat toast']}]
+        expected = self.correlator._count_cooccurrences(
+            self.correlator._combine_health_meal_data(health_logs, meal_logs))
+        actual = correlation_aggregates(self.conn, "2024-05-01", "2024-05-01")
+        self.assertEqual(actual['entries'], expected['entries'])
+        for key in ('ingredients', 'symptoms', 'pairs', 'weights'):
+            self.assertEqual(actual[key], dict(expected[key]), key)
+        self.assertEqual(actual['weights']['wheat', 'gas'], 6)
+
+    def test_scratch_tables_are_dropped(self):
+        """Test the aggregation leaves no temporary tables behind"""
+        self.correlator.analyze_database_correlations(self.conn, "2024-01-01", "2024-03-31")
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM temp.sqlite_master").fetchone()[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
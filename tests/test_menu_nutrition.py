@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Unit tests for menu nutrition rollups
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from datetime import date
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.menu_nutrition import (
+    MenuNutrition, RecipeNutritionCache, ingredient_grams, parse_ingredient_line, recipe_servings
+)
+from services.nutrient_database import NutrientDatabase
+from utils import nutrient_db
+from utils.migrations import ensure_schema
+
+MONDAY = date(2024, 1, 15)
+
+
+class TestMenuNutrition(unittest.TestCase):
+    """Test cases for RecipeNutritionCache and MenuNutrition"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the bundled nutrient database once"""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.nutrient_path = os.path.join(cls.temp_dir.name, "nutrients.db")
+        nutrient_db.ensure_seed_database(cls.nutrient_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the database"""
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        """Set up each test with two recipes"""
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        self.pancakes = self.recipe("Pancakes", 2, [("rice flour", "200", "g"), ("eggs", "2", "")])
+        self.rice = self.recipe("Rice Bowl", 1, [], text="100 g rice\n1 tbsp olive oil")
+        self.conn.commit()
+        self.nutrients = NutrientDatabase(self.nutrient_path)
+        self.cache = RecipeNutritionCache(self.conn, self.nutrients)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.nutrients.close()
+        self.conn.close()
+
+    def recipe(self, title, servings, rows, text=""):
+        recipe_id = self.conn.execute(
+            "INSERT INTO recipes(title, servings, ingredients) VALUES (?, ?, ?)", (title, servings, text)).lastrowid
+        self.conn.executemany(
+            "INSERT INTO recipe_ingredients(recipe_id, ingredient_name, quantity, unit) VALUES (?, ?, ?, ?)",
+            [(recipe_id, *row) for row in rows])
+        return recipe_id
+
+    def test_ingredient_parsing(self):
+        """Test ingredient lines and units become names and grams"""
+        self.assertEqual(parse_ingredient_line("1 1/2 cups rice flour"), ("rice flour", "1 1/2", "cups"))
+        self.assertEqual(parse_ingredient_line("- 2 eggs"), ("eggs", "2", ""))
+        self.assertAlmostEqual(ingredient_grams("1 1/2", "cups"), 360)
+        self.assertAlmostEqual(ingredient_grams("2", "tbsp"), 30)
+        self.assertAlmostEqual(ingredient_grams("2", ""), 100)
+
+    def test_vectors_are_cached_until_recipe_changes(self):
+        """Test vectors are computed once and recomputed only for an edited recipe"""
+        vectors = self.cache.vectors([self.pancakes, self.rice])
+        self.assertAlmostEqual(vectors[self.pancakes][0], (366 * 2 + 143) / 2)
+        self.assertAlmostEqual(vectors[self.rice][0], 365 + 884 * 0.15)
+        self.assertEqual(self.cache.computed, 2)
+
+        # A second cache over the same database reads the stored vectors
+        other = RecipeNutritionCache(self.conn, self.nutrients)
+        self.assertEqual(other.vectors([self.pancakes, self.rice]).keys(), vectors.keys())
+        self.assertEqual(other.computed, 0)
+
+        self.conn.execute("UPDATE recipes SET servings = 4 WHERE id = ?", (self.pancakes,))
+        self.conn.commit()
+        vectors = self.cache.vectors([self.pancakes, self.rice])
+        self.assertEqual(self.cache.computed, 3)
+        self.assertAlmostEqual(vectors[self.pancakes][0], (366 * 2 + 143) / 4)
+
+        self.conn.execute("DELETE FROM recipe_ingredients WHERE recipe_id = ? AND ingredient_name = 'eggs'",
+                          (self.pancakes,))
+        self.conn.commit()
+        self.assertAlmostEqual(self.cache.vectors([self.pancakes])[self.pancakes][0], 366 * 2 / 4)
+        self.assertEqual(self.cache.computed, 4)
+
+    def test_text_servings(self):
+        """Test servings stored as text divide by their first number, or by 1"""
+        self.assertEqual([recipe_servings(value) for value in (3, "4-6", "2 1/2", "serves many", None, 0)],
+                         [3, 4, 2.5, 1, 1, 1])
+        ranged = self.recipe("Crepes", "4-6", [("rice flour", "200", "g")])
+        unknown = self.recipe("Soup", "a crowd", [("rice flour", "100", "g")])
+        self.conn.commit()
+        vectors = self.cache.vectors([ranged, unknown])
+        self.assertAlmostEqual(vectors[ranged][0], 366 * 2 / 4)
+        self.assertAlmostEqual(vectors[unknown][0], 366)
+
+    def test_week_totals(self):
+        """Test the plan loaded from menu_plan and meal edits update the totals incrementally"""
+        self.conn.executemany(
+            "INSERT INTO menu_plan(date, meal, recipe_id, title, portions) VALUES (?, ?, ?, ?, ?)",
+            [("2024-01-15", "Breakfast", self.pancakes, "Pancakes", 1.0),
+             ("2024-01-15", "Dinner", None, "Rice Bowl", 2.0),
+             ("2024-01-17", "Breakfast", self.pancakes, "Pancakes", 1.5),
+             ("2024-01-29", "Breakfast", self.pancakes, "Pancakes", 1.0)])
+        self.conn.commit()
+        plan = MenuNutrition.for_week(self.conn, MONDAY, self.cache)
+        vectors = self.cache.vectors([self.pancakes, self.rice])
+        pancakes, rice = vectors[self.pancakes][0], vectors[self.rice][0]
+        self.assertAlmostEqual(plan.day_totals("2024-01-15")['calories'], pancakes + 2 * rice)
+        self.assertAlmostEqual(plan.week_totals()['calories'], 2.5 * pancakes + 2 * rice)
+
+        computed = self.cache.computed
+        plan.set_meal("2024-01-17", "Breakfast", self.rice)
+        plan.set_meal("2024-01-16", "Lunch", self.pancakes, 0.5)
+        self.assertEqual(self.cache.computed, computed)
+        self.assertAlmostEqual(plan.day_totals("2024-01-17")['calories'], rice)
+        self.assertAlmostEqual(plan.week_totals()['calories'], 1.5 * pancakes + 3 * rice)
+
+        plan.set_meal("2024-01-15", "Dinner", None)
+        self.assertAlmostEqual(plan.day_totals("2024-01-15")['calories'], pancakes)
+
+        reloaded = MenuNutrition(self.cache, plan.days)
+        reloaded.load(plan.meals())
+        for field, value in plan.week_totals().items():
+            self.assertAlmostEqual(reloaded.week_totals()[field], value)
+
+
+if __name__ == '__main__':
+    unittest.main()
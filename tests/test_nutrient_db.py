@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the offline USDA nutrient database
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.nutrient_database import NutrientDatabase
+from services.nutrition_analyzer import NutritionAnalyzer
+from utils import nutrient_db
+
+
+class TestNutrientDatabase(unittest.TestCase):
+    """Test cases for the nutrient database and ingredient matching"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the bundled database once"""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.temp_dir.name, "nutrients.db")
+        nutrient_db.ensure_seed_database(cls.db_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the database"""
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        """Set up each test with a fresh memo"""
+        self.db = NutrientDatabase(self.db_path)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.db.close()
+
+    def test_matching(self):
+        """Test common names, word and spelling matches, and refusing poor ones"""
+        cases = {
+            "2 large eggs": ("alias", "Egg, whole"),
+            "boneless chicken breast": ("alias", "Chicken, broilers or fryers, breast"),
+            "sweet potatoes": ("words", "Sweet potato"),
+            "brocoli": ("trigram", "Broccoli"),
+            "mozarella": ("trigram", "Cheese, mozzarella"),
+        }
+        for name, (method, description) in cases.items():
+            found = self.db.match(name)
+            self.assertIsNotNone(found, name)
+            self.assertEqual(found.method, method, name)
+            self.assertTrue(found.description.startswith(description), found.description)
+        self.assertIsNone(self.db.match("almond milk"))
+        self.assertIsNone(self.db.match("xanthan gum"))
+
+    def test_qualifier_words_do_not_match(self):
+        """Test words only found in a food's qualifiers or part of its name match nothing"""
+        for name in ("water", "1 cup water", "juice", "sauce"):
+            self.assertIsNone(self.db.match(name), name)
+        self.assertTrue(self.db.match("lemon juice").description.startswith("Lemon juice"))
+
+    def test_gluten_free_words_pick_gluten_free_food(self):
+        """Test gluten-free words are kept, so they never fall back to the wheat food"""
+        for name in ("gf soy sauce", "2 tbsp gluten-free soy sauce", "gluten free tamari"):
+            self.assertIn("(tamari)", self.db.match(name).description, name)
+        self.assertIn("(shoyu)", self.db.match("soy sauce").description)
+        self.assertIsNone(self.db.match("gf flour"))
+        self.assertTrue(self.db.match("gluten free oats").description.startswith("Cereals, oats"))
+
+    def test_matches_are_memoized(self):
+        """Test a repeated name, hit or miss, does not query the database again"""
+        for _ in range(3):
+            self.db.match("Rice Flour")
+            self.db.match("rice  flour")
+            self.db.match("xanthan gum")
+        self.assertEqual(self.db.stats['lookups'], 2)
+        self.assertEqual(self.db.stats['memory_hits'], 7)
+
+    def test_per_100g_vector(self):
+        """Test the packed vector round-trips in NUTRIENT_FIELDS order"""
+        vector = self.db.per_100g("rice flour")
+        values = dict(zip(nutrient_db.NUTRIENT_FIELDS, vector))
+        self.assertEqual(len(vector), len(nutrient_db.NUTRIENT_FIELDS))
+        self.assertAlmostEqual(values['calories'], 366)
+        self.assertAlmostEqual(values['protein_g'], 5.95)
+
+    def test_recipe_uses_local_data(self):
+        """Test recipe nutrition is scaled from the local vectors, repeats looked up once"""
+        analyzer = NutritionAnalyzer(self.db)
+        names = ["rice flour", "eggs", "whole milk", "butter", "sugar", "spinach"] * 5
+        recipe = {'ingredients': [{'name': name, 'quantity': 50} for name in names], 'servings': 5}
+        result = analyzer.analyze_recipe_nutrition(recipe)
+        self.assertEqual(self.db.stats['lookups'], 6)
+        self.assertAlmostEqual(result['per_serving_nutrition'].calories,
+                               (366 + 143 + 61 + 717 + 387 + 23) * 0.5)
+        self.assertGreater(result['total_nutrition'].vitamin_d_mcg, 0)
+
+    def test_seed_database_rebuilds_only_when_seed_changes(self):
+        """Test the database is rebuilt from the CSV only when the CSV changes"""
+        mtime = os.path.getmtime(self.db_path)
+        nutrient_db.ensure_seed_database(self.db_path)
+        self.assertEqual(os.path.getmtime(self.db_path), mtime)
+
+        seed = os.path.join(self.temp_dir.name, "seed.csv")
+        path = os.path.join(self.temp_dir.name, "small.db")
+        with open(seed, "w", encoding="utf-8") as f:
+            f.write("description,aliases," + ",".join(nutrient_db.NUTRIENT_FIELDS) + "\n")
+            f.write('"Honey",honey,304' + ",0" * 11 + "\n")
+        nutrient_db.ensure_seed_database(path, seed)
+        with open(seed, "a", encoding="utf-8") as f:
+            f.write('"Salt, table",salt,0' + ",0" * 11 + "\n")
+        nutrient_db.ensure_seed_database(path, seed)
+        conn = sqlite3.connect(path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM food").fetchone()[0], 2)
+        conn.close()
+
+    def test_fdc_csv_import(self):
+        """Test FoodData Central CSVs are reduced to the tracked nutrients, with fallbacks"""
+        directory = self.temp_dir.name
+        with open(os.path.join(directory, "food.csv"), "w", encoding="utf-8") as f:
+            f.write('"fdc_id","data_type","description"\n'
+                    '"1","sr_legacy_food","Millet, raw"\n'
+                    '"2","branded_food","Millet snack"\n'
+                    '"3","foundation_food","Flour, sorghum"\n')
+        with open(os.path.join(directory, "food_nutrient.csv"), "w", encoding="utf-8") as f:
+            f.write('"id","fdc_id","nutrient_id","amount"\n'
+                    '"10","1","1008","378"\n"11","1","1003","11.02"\n"12","1","1051","8.67"\n'
+                    '"13","2","1008","500"\n'
+                    '"14","3","2048","362"\n"15","3","2047","359"\n')
+        records = {record.fdc_id: record for record in nutrient_db.read_fdc_csv(directory)}
+        self.assertEqual(sorted(records), [1, 3])
+        self.assertEqual(records[1].nutrients[:2], (378.0, 11.02))
+        self.assertEqual(records[3].nutrients[0], 359.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the lazy panel registry
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import Mock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication, QTabWidget
+from core.panel_registry import PanelRegistry, PanelSpec, LazyPanelPlaceholder
+from panels.base_panel import BasePanel
+
+
+SPECS = [
+    PanelSpec("first", "First", "panels.base_panel", "BasePanel"),
+    PanelSpec("second", "Second", "panels.base_panel", "BasePanel"),
+    PanelSpec("third", "Third", "panels.base_panel", "BasePanel"),
+]
+
+
+class TestPanelRegistry(unittest.TestCase):
+    """Test cases for PanelRegistry"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment"""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        """Set up each test"""
+        self.tab_widget = QTabWidget()
+        self.registry = PanelRegistry(self.tab_widget)
+        self.registry.register_all(SPECS)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.tab_widget.close()
+
+    def test_only_default_tab_is_built(self):
+        """Test registering panels builds only the current tab"""
+        self.assertEqual(self.tab_widget.count(), 3)
+        self.assertIsInstance(self.tab_widget.widget(1), LazyPanelPlaceholder)
+        self.assertTrue(self.registry.is_built(0))
+        self.assertFalse(self.registry.is_built(1))
+        self.assertFalse(self.registry.is_built("third"))
+
+    def test_panel_built_on_activation(self):
+        """Test switching tabs constructs the panel"""
+        self.tab_widget.setCurrentIndex(2)
+        self.assertTrue(self.registry.is_built("third"))
+        self.assertIsInstance(self.registry.get_panel(2, create=False), BasePanel)
+        self.assertFalse(self.registry.is_built("second"))
+
+    def test_get_panel_by_key_creates_once(self):
+        """Test get_panel constructs on demand and then reuses the panel"""
+        panel = self.registry.get_panel("second")
+        self.assertIs(self.registry.get_panel("second"), panel)
+        self.assertIsNone(self.registry.get_panel("missing"))
+
+    def test_refresh_forwards_to_built_panel(self):
+        """Test placeholders forward refresh only once the panel exists"""
+        placeholder = self.tab_widget.widget(1)
+        placeholder.refresh()
+        self.assertFalse(placeholder.is_built())
+        panel = self.registry.get_panel(1)
+        panel.refresh = Mock()
+        placeholder.refresh()
+        panel.refresh.assert_called_once()
+
+    def test_prebuild_remaining(self):
+        """Test idle prebuild constructs every remaining panel"""
+        self.registry.prebuild_remaining(interval_ms=0)
+        for _ in range(len(SPECS)):
+            self.registry._prebuild_next()
+        self.assertEqual(len(self.registry.built_panels()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the parallel recipe import pipeline
+"""
+
+import unittest
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.recipe_import import (
+    UPDATE_EXISTING, RecipeImportPipeline, find_recipe_files, parse_recipe_file
+)
+from utils.migrations import ensure_schema
+
+
+class TestRecipeImport(unittest.TestCase):
+    """Test cases for RecipeImportPipeline"""
+
+    def setUp(self):
+        """Set up each test with a folder of recipe files and an in-memory schema"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.write("recipes.csv", "Title,Category,Servings,Ingredients\n"
+                                  "Rice Bowl,Lunch,2,rice\nPolenta,,3,cornmeal\n,,,\n")
+        self.write("more/pancakes.json", json.dumps([
+            {"name": "Pancakes", "ingredients": ["2 cups rice flour", "2 eggs"], "servings": "4"}]))
+        self.write("soup.md", "# Lentil Soup\n\nHearty.\n\n## Ingredients\n- 1 cup lentils\n\n"
+                              "## Instructions\nSimmer.\n")
+        self.write("salad.txt", "Title: Salad\nIngredients:\n1 cup lettuce\n2 tbsp olive oil\n")
+        self.write("broken.json", "{not json")
+        self.write("notes.rtf", "ignored")
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        self.conn.execute("INSERT INTO recipes (title, category) VALUES ('Polenta', 'Dinner')")
+        self.conn.commit()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+        self.temp_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.temp_dir.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def titles(self):
+        return {title: category for title, category in self.conn.execute("SELECT title, category FROM recipes")}
+
+    def test_finds_supported_files(self):
+        """Test folder discovery is recursive and skips unsupported types"""
+        names = [os.path.basename(path) for path in find_recipe_files(self.temp_dir.name)]
+        self.assertEqual(names, ["broken.json", "pancakes.json", "recipes.csv", "salad.txt", "soup.md"])
+
+    def test_parse_errors_are_isolated(self):
+        """Test a bad file is reported without raising"""
+        parsed = parse_recipe_file(os.path.join(self.temp_dir.name, "broken.json"))
+        self.assertEqual(parsed.recipes, [])
+        self.assertTrue(parsed.error)
+
+    def test_import_in_batches(self):
+        """Test every good file is imported, duplicates skipped and errors collected"""
+        seen = []
+        summary = RecipeImportPipeline(self.conn, workers=1, batch_size=2).run(
+            find_recipe_files(self.temp_dir.name), progress=lambda done, total: seen.append(done))
+        self.assertEqual((summary.imported, summary.skipped, summary.files_done), (4, 1, 5))
+        self.assertEqual(list(summary.errors), [os.path.join(self.temp_dir.name, "broken.json")])
+        self.assertEqual(seen, [0, 1, 2, 3, 4, 5])
+        titles = self.titles()
+        self.assertEqual(titles["Polenta"], "Dinner")
+        self.assertEqual(titles["Rice Bowl"], "Lunch")
+        self.assertEqual(set(titles), {"Polenta", "Rice Bowl", "Pancakes", "Lentil Soup", "Salad"})
+        salad_rows = self.conn.execute(
+            "SELECT i.ingredient_name FROM recipe_ingredients i JOIN recipes r ON r.id = i.recipe_id "
+            "WHERE r.title = 'Salad' ORDER BY i.id").fetchall()
+        self.assertEqual(salad_rows, [("lettuce",), ("olive oil",)])
+
+    def test_parallel_parsing_updates_existing(self):
+        """Test the process pool path and updating recipes that already exist"""
+        summary = RecipeImportPipeline(self.conn, workers=2, min_parallel=1).run(
+            find_recipe_files(self.temp_dir.name), UPDATE_EXISTING, default_category="Imported")
+        self.assertEqual((summary.imported, summary.updated), (4, 1))
+        self.assertEqual(self.titles()["Polenta"], "Imported")
+
+    def test_update_replaces_ingredient_rows(self):
+        """Test updating a recipe rewrites its ingredient rows along with its text"""
+        pipeline = RecipeImportPipeline(self.conn, workers=1)
+        self.write("bread.txt", "Title: Bread\nIngredients:\n2 cups wheat flour\n1 cup milk\n")
+        pipeline.run([os.path.join(self.temp_dir.name, "bread.txt")])
+        self.write("bread.txt", "Title: Bread\nIngredients:\n2 cups rice flour\n")
+        summary = pipeline.run([os.path.join(self.temp_dir.name, "bread.txt")], UPDATE_EXISTING)
+
+        self.assertEqual(summary.updated, 1)
+        text, = self.conn.execute("SELECT ingredients FROM recipes WHERE title = 'Bread'").fetchone()
+        self.assertIn("rice flour", text)
+        rows = self.conn.execute(
+            "SELECT i.ingredient_name FROM recipe_ingredients i JOIN recipes r ON r.id = i.recipe_id "
+            "WHERE r.title = 'Bread' ORDER BY i.id").fetchall()
+        self.assertEqual(rows, [("rice flour",)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for MinHash near-duplicate recipe detection
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.recipe_import import CREATE_NEW, SKIP_DUPLICATES, UPDATE_EXISTING, RecipeImportPipeline
+from utils.migrations import ensure_schema
+from utils.recipe_minhash import (
+    candidates, index_missing, near_duplicates, recipe_tokens, signature, similarity
+)
+
+PANCAKES = "2 cups rice flour\n2 eggs\n1 cup milk\n1 tsp baking powder"
+
+
+class TestRecipeMinHash(unittest.TestCase):
+    """Test cases for recipe signatures, the band index and import de-duplication"""
+
+    def setUp(self):
+        """Set up each test with an in-memory schema and two signed recipes"""
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        self.conn.executemany(
+            "INSERT INTO recipes (title, category, ingredients) VALUES (?, 'Breakfast', ?)",
+            [("Best GF Pancakes", PANCAKES), ("Lentil Soup", "1 cup lentils\n1 onion\n2 carrots")])
+        self.conn.commit()
+        index_missing(self.conn)
+        self.conn.commit()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+
+    def sign(self, title, ingredients=PANCAKES):
+        return signature(recipe_tokens(title, ingredients))
+
+    def test_tokens_ignore_filler_and_amounts(self):
+        """Test title filler words, quantities and units do not count"""
+        self.assertEqual(recipe_tokens("Best GF Pancakes", "2 cups rice flour"),
+                         {"t:pancakes", "i:rice", "i:flour"})
+        self.assertIsNone(signature(recipe_tokens("The Best", "")))
+        self.assertEqual(similarity(self.sign("Best GF Pancakes"), self.sign("GF pancakes (best)")), 1.0)
+        self.assertLess(similarity(self.sign("Best GF Pancakes"), self.sign("Lentil Soup", "1 cup lentils")), 0.2)
+
+    def test_near_duplicates_through_band_index(self):
+        """Test the band lookup finds a reworded recipe and not an unrelated one"""
+        pancakes_id = self.conn.execute("SELECT id FROM recipes WHERE title = 'Best GF Pancakes'").fetchone()[0]
+        sig = self.sign("Fluffy Pancakes", PANCAKES + "\n1 tbsp sugar")
+        self.assertIn(pancakes_id, candidates(self.conn, sig))
+        matches = near_duplicates(self.conn, sig)
+        self.assertEqual([match[:2] for match in matches], [(pancakes_id, "Best GF Pancakes")])
+        self.assertGreaterEqual(matches[0][2], 0.7)
+        self.assertEqual(near_duplicates(self.conn, sig, exclude=[pancakes_id]), [])
+
+    def test_edits_invalidate_signatures(self):
+        """Test triggers drop changed recipes and index_missing re-signs only those"""
+        self.conn.execute("UPDATE recipes SET ingredients = '1 cup quinoa' WHERE title = 'Lentil Soup'")
+        self.conn.execute("UPDATE recipes SET category = 'Brunch' WHERE title = 'Best GF Pancakes'")
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM recipe_minhash").fetchone()[0], 1)
+        self.assertEqual(index_missing(self.conn), 1)
+        self.conn.execute("DELETE FROM recipes WHERE title = 'Lentil Soup'")
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM recipe_lsh").fetchone()[0], 16)
+
+    def test_import_policies(self):
+        """Test near-duplicates are added and reported while title matches follow the policy"""
+        recipe = {"title": "Fluffy Pancakes", "ingredients": PANCAKES}
+        pipeline = RecipeImportPipeline(self.conn)
+
+        summary = pipeline.import_recipes([recipe], SKIP_DUPLICATES)
+        self.assertEqual((summary.imported, summary.skipped), (1, 0))
+        self.assertEqual(summary.near_duplicates[0][:2], ("Fluffy Pancakes", "Best GF Pancakes"))
+
+        summary = pipeline.import_recipes([dict(recipe, title="Best GF Pancakes")], SKIP_DUPLICATES)
+        self.assertEqual((summary.imported, summary.skipped), (0, 1))
+
+        summary = pipeline.import_recipes(
+            [dict(recipe, title="Best GF Pancakes", ingredients=PANCAKES + "\n1 tbsp sugar")], UPDATE_EXISTING)
+        self.assertEqual((summary.updated, summary.near_duplicates), (1, []))
+        ingredients = self.conn.execute(
+            "SELECT ingredients FROM recipes WHERE title = 'Best GF Pancakes'").fetchone()[0]
+        self.assertIn("sugar", ingredients)
+
+        summary = pipeline.import_recipes([dict(recipe, title="Pancakes")], CREATE_NEW)
+        self.assertEqual((summary.imported, len(summary.near_duplicates)), (1, 1))
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM recipe_minhash").fetchone()[0], 4)
+
+    def test_distinct_dishes_sharing_ingredients(self):
+        """Test different titles with the same ingredients are never skipped or merged"""
+        pipeline = RecipeImportPipeline(self.conn)
+        for title, policy in (("Crepes", SKIP_DUPLICATES), ("Waffles", UPDATE_EXISTING)):
+            with self.subTest(policy=policy):
+                summary = pipeline.import_recipes([{"title": title, "ingredients": PANCAKES}], policy)
+                self.assertEqual((summary.imported, summary.skipped, summary.updated), (1, 0, 0))
+                self.assertEqual(len(summary.near_duplicates), 1)
+        rows = self.conn.execute("SELECT title, ingredients FROM recipes ORDER BY id").fetchall()
+        self.assertEqual([title for title, _ in rows], ["Best GF Pancakes", "Lentil Soup", "Crepes", "Waffles"])
+        self.assertEqual(rows[0][1], PANCAKES)
+
+
+if __name__ == '__main__':
+    unittest.main()
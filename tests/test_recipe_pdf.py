@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming recipe PDF export
+"""
+
+import unittest
+import sys
+import os
+import re
+import sqlite3
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from services.recipe_pdf import IMAGE_MAX_WIDTH, RecipePdfLayout, export_recipes_pdf, recipe_html
+from utils.migrations import ensure_schema
+
+
+def pdf_pages(path):
+    """Number of page objects in a PDF file"""
+    with open(path, 'rb') as f:
+        return len(re.findall(rb"/Type\s*/Page\b(?!s)", f.read()))
+
+
+class TestRecipePdf(unittest.TestCase):
+    """Test cases for RecipePdfWriter and export_recipes_pdf"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up Qt application for the PDF painter"""
+        if not QApplication.instance():
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        """Set up each test with recipes sharing one large image"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.image_path = os.path.join(self.temp_dir.name, "photo.png")
+        image = QImage(1600, 1200, QImage.Format.Format_RGB32)
+        image.fill(QColor("orange"))
+        image.save(self.image_path)
+
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        self.conn.executemany(
+            "INSERT INTO recipes (title, ingredients, instructions, image_path) VALUES (?, ?, ?, ?)",
+            [(f"Recipe {i}", "2 cups rice flour\n1 egg", "Mix.\nBake.", self.image_path) for i in range(5)])
+        long_steps = "\n".join(f"Step {i}: stir the batter gently and wait." for i in range(150))
+        self.conn.execute("INSERT INTO recipes (title, instructions) VALUES ('Zucchini Bread', ?)", (long_steps,))
+        self.conn.commit()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+        self.temp_dir.cleanup()
+
+    def test_streams_every_recipe_with_progress(self):
+        """Test each recipe starts a page after the cover and progress is reported per recipe"""
+        path = os.path.join(self.temp_dir.name, "cookbook.pdf")
+        layout = RecipePdfLayout()
+        seen = []
+        count = export_recipes_pdf(self.conn, path, layout=layout, progress=lambda done, total: seen.append((done, total)))
+
+        self.assertEqual(count, 6)
+        self.assertEqual(seen, [(i, 6) for i in range(7)])
+        # Cover, five one-page recipes and a long recipe spread over several pages
+        self.assertGreater(pdf_pages(path), 1 + 6)
+        # The shared photo is read and scaled once
+        self.assertEqual(layout.image_loads, 1)
+        self.assertLessEqual(layout.scaled_image(self.image_path).width(), IMAGE_MAX_WIDTH)
+
+    def test_selected_recipes_and_cancel(self):
+        """Test exporting chosen ids and stopping between recipes"""
+        path = os.path.join(self.temp_dir.name, "some.pdf")
+        self.assertEqual(export_recipes_pdf(self.conn, path, recipe_ids=[1, 2]), 2)
+        self.assertEqual(pdf_pages(path), 3)
+
+        seen = []
+        count = export_recipes_pdf(self.conn, path, progress=lambda done, total: seen.append(done),
+                                   cancelled=lambda: len(seen) > 3)
+        self.assertEqual(count, 3)
+
+    def test_recipe_text_is_escaped(self):
+        """Test recipe fields are escaped and ingredient rows are listed"""
+        body = recipe_html({'name': 'Mac & <Cheese>', 'ingredient_rows': '1 cup pasta\n2 cups cheese'})
+        self.assertIn('Mac &amp; &lt;Cheese&gt;', body)
+        self.assertIn('<li>2 cups cheese</li>', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the background gluten risk sweep
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.risk_sweep import RiskSweep, RISK_SCORES
+from utils.migrations import ensure_schema
+
+
+class TestRiskSweep(unittest.TestCase):
+    """Test cases for RiskSweep"""
+
+    def setUp(self):
+        """Set up each test with an in-memory schema"""
+        self.conn = sqlite3.connect(":memory:")
+        ensure_schema(self.conn)
+        self.conn.executemany(
+            "INSERT INTO pantry(name, brand, tags, notes) VALUES (?, ?, ?, ?)",
+            [
+                ("Wheat Flour", "King Arthur", "", ""),
+                ("Rice Flour", "Bob's Red Mill", "gluten free", ""),
+                ("Rolled Oats", "", "", "may contain wheat"),
+            ],
+        )
+        self.conn.execute(
+            "INSERT INTO recipes(id, title, ingredients) VALUES (1, 'Pancakes', 'milk, eggs')"
+        )
+        self.conn.execute("INSERT INTO recipes(id, title, ingredients) VALUES (2, 'Salad', '')")
+        self.conn.executemany(
+            "INSERT INTO recipe_ingredients(recipe_id, ingredient_name) VALUES (?, ?)",
+            [(1, "all-purpose flour"), (1, "baking soda"), (2, "lettuce"), (2, "olive oil")],
+        )
+        self.conn.commit()
+        self.sweep = RiskSweep(self.conn, workers=1)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+
+    def risks(self, table, key):
+        return dict(self.conn.execute(f"SELECT {key}, gluten_risk FROM {table}"))
+
+    def test_scores_pantry_and_recipes(self):
+        """Test every row gets a risk level and score"""
+        self.assertEqual(self.sweep.run(), {'pantry': 3, 'recipes': 2})
+        pantry = self.risks("pantry", "name")
+        self.assertEqual(pantry["Wheat Flour"], "unsafe")
+        self.assertEqual(pantry["Rice Flour"], "safe")
+        recipes = self.risks("recipes", "title")
+        self.assertEqual(recipes["Pancakes"], "unsafe")
+        score = self.conn.execute(
+            "SELECT gluten_risk_score FROM pantry WHERE name = 'Wheat Flour'").fetchone()[0]
+        self.assertEqual(score, RISK_SCORES["unsafe"])
+
+    def test_only_changed_rows_are_rescored(self):
+        """Test a second sweep only touches rows whose text changed"""
+        self.sweep.run()
+        self.assertEqual(self.sweep.run(), {'pantry': 0, 'recipes': 0})
+
+        self.conn.execute("UPDATE pantry SET name = 'Corn Flour' WHERE name = 'Wheat Flour'")
+        self.conn.execute(
+            "INSERT INTO recipe_ingredients(recipe_id, ingredient_name) VALUES (2, 'croutons, soy sauce')")
+        self.conn.commit()
+        self.assertEqual(self.sweep.run(), {'pantry': 1, 'recipes': 1})
+        self.assertEqual(self.risks("pantry", "name")["Corn Flour"], "safe")
+        self.assertEqual(self.risks("recipes", "title")["Salad"], "high_risk")
+
+    def test_separated_flour_is_unsafe(self):
+        """Test a comma-separated recipe with stand-alone flour is not stored as safe"""
+        self.conn.execute(
+            "INSERT INTO recipes(id, title, ingredients) VALUES (3, 'Cookies', 'sugar, rice, flour, salt')")
+        self.conn.commit()
+        self.sweep.run()
+        self.assertEqual(self.risks("recipes", "title")["Cookies"], "unsafe")
+
+    def test_new_analysis_version_rescores_everything(self):
+        """Test rows scored under an older memo or lexicon version are swept again"""
+        self.sweep.run()
+        with patch("services.gluten_analysis_memo.MEMO_VERSION", 0):
+            self.assertEqual(self.sweep.run(), {'pantry': 3, 'recipes': 2})
+
+    def test_risk_queries_use_indexes(self):
+        """Test panels can filter and sort by risk with indexed queries"""
+        for table, name in (("pantry", "name"), ("recipes", "title")):
+            plan = " ".join(str(row[-1]) for row in self.conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM {table} WHERE gluten_risk = 'unsafe'"))
+            self.assertIn("idx_", plan)
+            plan = " ".join(str(row[-1]) for row in self.conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM {table} "
+                f"ORDER BY gluten_risk_score IS NULL, gluten_risk_score, {name}"))
+            self.assertIn("_risk_order", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_swept_state_matches_unchanged_data(self):
+        """Test a completed sweep's state equals the data state until something else writes"""
+        before = self.sweep.data_state()
+        counts = self.sweep.run()
+        swept = RiskSweep.swept_state(before, counts)
+        self.assertEqual(self.sweep.data_state(), swept)
+        self.assertEqual(self.sweep.run(), {'pantry': 0, 'recipes': 0})
+        self.assertEqual(self.sweep.data_state(), swept)
+
+        self.conn.execute("UPDATE pantry SET notes = 'opened' WHERE name = 'Rice Flour'")
+        self.conn.commit()
+        self.assertNotEqual(self.sweep.data_state(), swept)
+
+    def test_cancelled_sweep_resumes(self):
+        """Test a cancelled sweep leaves the remaining rows for the next one"""
+        sweep = RiskSweep(self.conn, workers=1, chunk_size=1)
+        calls = []
+        counts = sweep.run(cancelled=lambda: calls.append(1) or len(calls) > 2)
+        self.assertEqual(sum(counts.values()), 2)
+        self.assertEqual(sum(sweep.run().values()), 3)
+
+    def test_process_pool_matches_in_process(self):
+        """Test scoring in worker processes gives the same columns"""
+        sweep = RiskSweep(self.conn, workers=2, chunk_size=2, min_parallel=1)
+        sweep.run()
+        parallel = self.risks("pantry", "name"), self.risks("recipes", "title")
+        self.conn.execute("UPDATE pantry SET gluten_risk_hash = NULL, gluten_risk = NULL")
+        self.conn.execute("UPDATE recipes SET gluten_risk_hash = NULL, gluten_risk = NULL")
+        self.conn.commit()
+        self.sweep.run()
+        self.assertEqual((self.risks("pantry", "name"), self.risks("recipes", "title")), parallel)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit tests for online database snapshots
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.snapshot_service import (
+    SnapshotCancelled, list_snapshots, prune_snapshots, restore_snapshot, snapshot_due, take_snapshot
+)
+
+
+class TestSnapshotService(unittest.TestCase):
+    """Test cases for take_snapshot, restore_snapshot and rotation"""
+
+    def setUp(self):
+        """Set up each test with a WAL database on disk"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = self.path("live.db")
+        self.snapshots = self.path("snapshots")
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE health_log (id INTEGER PRIMARY KEY, notes TEXT)")
+        self.conn.executemany("INSERT INTO health_log (notes) VALUES (?)", [("x" * 500,) for _ in range(2000)])
+        self.conn.commit()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.conn.close()
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def count(self, conn):
+        return conn.execute("SELECT COUNT(*) FROM health_log").fetchone()[0]
+
+    def test_snapshot_in_steps(self):
+        """Test the copy is made page block by page block and is a standalone file"""
+        seen = []
+        path = take_snapshot(self.conn, self.snapshots, compress=False, pages=16, sleep=0,
+                             progress=lambda done, total: seen.append((done, total)))
+        self.assertGreater(len(seen), 10)
+        self.assertEqual(seen[-1][0], seen[-1][1])
+        with sqlite3.connect(path) as snapshot:
+            self.assertEqual(self.count(snapshot), 2000)
+            self.assertEqual(snapshot.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+        self.assertEqual(os.listdir(self.snapshots), [os.path.basename(path)])
+
+    def test_writers_are_not_blocked(self):
+        """Test another connection keeps committing while a snapshot runs"""
+        writer = sqlite3.connect(self.db_path, timeout=0.1, check_same_thread=False)
+        writes = []
+        done = threading.Event()
+
+        def write():
+            while not done.is_set():
+                writer.execute("INSERT INTO health_log (notes) VALUES ('new')")
+                writer.commit()
+                writes.append(1)
+                time.sleep(0.001)
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        try:
+            path = take_snapshot(self.db_path, self.snapshots, compress=False, pages=8, sleep=0.002)
+        finally:
+            done.set()
+            thread.join()
+            writer.close()
+        self.assertTrue(writes)
+        with sqlite3.connect(path) as snapshot:
+            self.assertGreaterEqual(self.count(snapshot), 2000)
+
+    def test_compressed_encrypted_round_trip(self):
+        """Test a gzipped, encrypted snapshot restores into the live database"""
+        path = take_snapshot(self.conn, self.snapshots, compress=True, encrypt=True, password="secret")
+        self.assertTrue(path.endswith(".db.gz.enc"))
+        self.conn.execute("DELETE FROM health_log WHERE id > 5")
+        self.conn.commit()
+        with self.assertRaises(Exception):
+            restore_snapshot(self.conn, path, password="wrong")
+        self.assertEqual(self.count(self.conn), 5)
+        restore_snapshot(self.conn, path, password="secret")
+        self.assertEqual(self.count(self.conn), 2000)
+
+    def test_cancel_and_rotation(self):
+        """Test cancelling leaves no file and rotation keeps the newest snapshots"""
+        with self.assertRaises(SnapshotCancelled):
+            take_snapshot(self.conn, self.snapshots, pages=8, cancelled=lambda: True)
+        self.assertEqual(list_snapshots(self.snapshots), [])
+        self.assertTrue(snapshot_due(self.snapshots, 24))
+
+        paths = [take_snapshot(self.conn, self.snapshots) for _ in range(3)]
+        for age, path in enumerate(reversed(paths)):
+            stamp = time.time() - age * 3600
+            os.utime(path, (stamp, stamp))
+        self.assertEqual(list_snapshots(self.snapshots), paths[::-1])
+        self.assertEqual(prune_snapshots(self.snapshots, 2), [paths[0]])
+        self.assertFalse(snapshot_due(self.snapshots, 24))
+        self.assertTrue(snapshot_due(self.snapshots, 24, now=datetime.now() + timedelta(days=1)))
+        self.assertFalse(snapshot_due(self.snapshots, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the startup profiler and the startup time budget
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+from pathlib import Path
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.startup_profiler import (
+    StartupProfiler, check_budget, load_budget, consume_profile_flag,
+    DEFAULT_REPORT_PATH, DEFAULT_BUDGET_PATH
+)
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test cases for StartupProfiler"""
+
+    def setUp(self):
+        """Set up each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.profiler = StartupProfiler()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.profiler.disable()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test spans are free no-ops until the profiler is enabled"""
+        with self.profiler.span("phase"):
+            pass
+        self.assertEqual(self.profiler.report()["phases"], [])
+
+    def test_nested_spans(self):
+        """Test nested spans record paths, wall and CPU time"""
+        self.profiler.enable(capture_imports=False)
+        with self.profiler.span("window"):
+            with self.profiler.span("setup_panels"):
+                sum(range(10000))
+        phases = {p["path"]: p for p in self.profiler.report()["phases"]}
+        self.assertIn("window", phases)
+        self.assertIn("window/setup_panels", phases)
+        self.assertEqual(phases["window/setup_panels"]["parent"], "window")
+        self.assertGreaterEqual(phases["window"]["wall_ms"], phases["window/setup_panels"]["wall_ms"])
+        self.assertGreaterEqual(phases["window/setup_panels"]["cpu_ms"], 0.0)
+
+    def test_import_timing(self):
+        """Test module imports are timed with self and cumulative cost"""
+        package = Path(self.temp_dir) / "profiled_pkg"
+        package.mkdir()
+        (package / "__init__.py").write_text("from . import child\n")
+        (package / "child.py").write_text("VALUE = sum(range(1000))\n")
+        sys.path.insert(0, self.temp_dir)
+        try:
+            self.profiler.enable()
+            import profiled_pkg  # noqa: F401
+        finally:
+            self.profiler.disable()
+            sys.path.remove(self.temp_dir)
+            sys.modules.pop("profiled_pkg", None)
+            sys.modules.pop("profiled_pkg.child", None)
+
+        imports = {i["module"]: i for i in self.profiler.report()["imports"]}
+        self.assertIn("profiled_pkg", imports)
+        self.assertIn("profiled_pkg.child", imports)
+        parent = imports["profiled_pkg"]
+        self.assertGreaterEqual(parent["cumulative_ms"], imports["profiled_pkg.child"]["cumulative_ms"])
+        self.assertLessEqual(parent["self_ms"], parent["cumulative_ms"])
+
+    def test_write_report_and_trace(self):
+        """Test the JSON report and Chrome trace are written"""
+        self.profiler.enable(capture_imports=False)
+        with self.profiler.span("init_database"):
+            pass
+        report_path = Path(self.temp_dir) / "report.json"
+        trace_path = Path(self.temp_dir) / "trace.json"
+        self.profiler.write(report_path, trace_path)
+
+        with open(report_path, encoding="utf-8") as f:
+            report = json.load(f)
+        with open(trace_path, encoding="utf-8") as f:
+            trace = json.load(f)
+        self.assertEqual(report["phases"][0]["name"], "init_database")
+        names = [e["name"] for e in trace["traceEvents"] if e["ph"] == "X"]
+        self.assertIn("init_database", names)
+
+    def test_check_budget(self):
+        """Test budget violations are reported per phase"""
+        report = {
+            "total_wall_ms": 900.0,
+            "import_total_ms": 100.0,
+            "phases": [
+                {"path": "window/setup_panels", "wall_ms": 600.0},
+                {"path": "window/init_database", "wall_ms": 10.0},
+            ],
+        }
+        budgets = {"total": 1000, "window/setup_panels": 500,
+                   "window/init_database": 50, "unknown_phase": 1}
+        violations = check_budget(report, budgets)
+        self.assertEqual(len(violations), 1)
+        self.assertIn("window/setup_panels", violations[0])
+
+    def test_consume_profile_flag(self):
+        """Test the command line flag is detected and removed"""
+        argv = ["main.py", "--profile-startup", "-style", "fusion"]
+        self.assertTrue(consume_profile_flag(argv))
+        self.assertEqual(argv, ["main.py", "-style", "fusion"])
+        self.assertFalse(consume_profile_flag(argv))
+
+
+# Report of a full `python main.py --profile-startup` run, trimmed to the budgeted phases
+FIXTURE_REPORT = {
+    "total_wall_ms": 2140.3,
+    "import_total_ms": 1012.8,
+    "phases": [
+        {"path": "imports", "wall_ms": 1065.2},
+        {"path": "qapplication", "wall_ms": 48.1},
+        {"path": "window", "wall_ms": 812.6},
+        {"path": "window/init_database", "wall_ms": 41.9},
+        {"path": "window/setup_panels", "wall_ms": 503.7},
+        {"path": "window/apply_saved_theme", "wall_ms": 96.4},
+        {"path": "show", "wall_ms": 60.3},
+        {"path": "first_frame", "wall_ms": 118.0},
+    ],
+}
+
+
+class TestStartupBudget(unittest.TestCase):
+    """Checks startup reports against data/startup_budget.json"""
+
+    def setUp(self):
+        """Set up each test"""
+        self.budgets = load_budget(DEFAULT_BUDGET_PATH)
+        self.temp_dir = tempfile.mkdtemp()
+        self.profiler = StartupProfiler()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.profiler.disable()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fixture_report_within_budget(self):
+        """Test the reference report passes and budgets name phases the app records"""
+        self.assertEqual(check_budget(FIXTURE_REPORT, self.budgets), [])
+        recorded = {phase["path"] for phase in FIXTURE_REPORT["phases"]}
+        recorded.update({"total", "import_total"})
+        stale = [key for key in self.budgets if key not in recorded
+                 and key != "window/start_bluetooth_sync"]  # app.py window only
+        self.assertEqual(stale, [])
+
+    def test_init_database_within_budget(self):
+        """Test a freshly profiled database initialization stays within its budget"""
+        from core.database_manager import DatabaseManager
+
+        old_db = os.environ.get("CELIAC_DB")
+        os.environ["CELIAC_DB"] = os.path.join(self.temp_dir, "startup.db")
+        manager = DatabaseManager()
+        try:
+            self.profiler.enable(capture_imports=False)
+            with self.profiler.span("window"):
+                with self.profiler.span("init_database"):
+                    self.assertTrue(manager.initialize())
+            report = self.profiler.report()
+        finally:
+            manager.close_connection()
+            if old_db is None:
+                os.environ.pop("CELIAC_DB", None)
+            else:
+                os.environ["CELIAC_DB"] = old_db
+
+        budget = {"window/init_database": self.budgets["window/init_database"]}
+        violations = check_budget(report, budget)
+        self.assertEqual(violations, [], "\n".join(violations))
+
+    def test_latest_report_within_budget(self):
+        """Test the latest `python main.py --profile-startup` report, when there is one"""
+        report_path = Path(os.getenv("CELIAC_STARTUP_REPORT") or DEFAULT_REPORT_PATH)
+        if not report_path.exists():
+            self.skipTest(f"No startup report at {report_path}; run main.py --profile-startup")
+
+        with open(report_path, encoding="utf-8") as f:
+            report = json.load(f)
+        violations = check_budget(report, self.budgets)
+        self.assertEqual(violations, [], "\n".join(violations))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -166,6 +166,48 @@ class TestThemeCreator(unittest.TestCase):
         result = self.theme_creator.apply_theme('test_theme', self.app)
         self.assertTrue(result)
         self.assertEqual(self.theme_creator.current_theme, 'test_theme')
+    
+    def test_compiled_stylesheet_cached_on_disk(self):
+        """Test compiled stylesheets are persisted and reused"""
+        theme_data = {
+            'name': 'Test Theme',
+            'colors': {'primary': '#ff0000', 'background': '#ffffff'}
+        }
+        
+        stylesheet = self.theme_creator.get_compiled_stylesheet(theme_data)
+        cache_dir = os.path.join(self.temp_dir, '.cache')
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        
+        # A fresh instance reads the cached file instead of regenerating
+        other = ThemeCreator(themes_dir=self.temp_dir)
+        with patch.object(other, '_generate_stylesheet') as mock_generate:
+            self.assertEqual(other.get_compiled_stylesheet(theme_data), stylesheet)
+            mock_generate.assert_not_called()
+    
+    def test_compiled_stylesheet_follows_theme_changes(self):
+        """Test editing a theme produces a new stylesheet"""
+        theme_data = {'colors': {'primary': '#ff0000', 'background': '#ffffff'}}
+        first = self.theme_creator.get_compiled_stylesheet(theme_data)
+        
+        theme_data['colors']['background'] = '#000000'
+        second = self.theme_creator.get_compiled_stylesheet(theme_data)
+        self.assertNotEqual(first, second)
+        self.assertIn('#000000', second)
+        
+        self.theme_creator.clear_stylesheet_cache()
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir, '.cache')), [])
+    
+    def test_reapplying_theme_keeps_stylesheet(self):
+        """Test applying the same theme twice does not reset the stylesheet"""
+        self.theme_creator.save_theme('test_theme', {
+            'name': 'Test Theme',
+            'colors': {'primary': '#ff0000', 'background': '#ffffff'}
+        })
+        self.assertTrue(self.theme_creator.apply_theme('test_theme', self.app))
+        
+        with patch.object(self.app, 'setStyleSheet') as mock_set:
+            self.assertTrue(self.theme_creator.apply_theme('test_theme', self.app))
+            mock_set.assert_not_called()
 
 
 if __name__ == '__main__':
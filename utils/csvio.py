@@ -1,12 +1,21 @@
 # path: utils/csvio.py
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
 import csv
 import datetime as _dt
+from itertools import islice
 from pathlib import Path
+import sqlite3
 from typing import Any
 
+# Rows handed to executemany at a time by the streaming importers
+BATCH_SIZE = 1000
+
+# Bytes read to sniff the dialect
+SNIFF_BYTES = 64 * 1024
+_DELIMITERS = ",;\t|"
+
 # Default alias map used by read/write helpers (extend per-call if needed)
 DEFAULT_ALIASES: dict[str, str] = {
     # pantry common
@@ -125,6 +134,119 @@ def parse_iso_date(val: Any, default: str = "") -> tuple[str, bool]:
 # --------------------------
 # Reading & writing
 # --------------------------
+def sniff_dialect(f, sample_size: int = SNIFF_BYTES) -> type[csv.Dialect] | csv.Dialect:
+    """
+    Guess the dialect (delimiter, quoting) from the start of an open text file
+    and rewind it. If the sniffer cannot decide (e.g. ragged rows), the most
+    frequent candidate delimiter in the header line is used with Excel quoting.
+    """
+    start = f.tell()
+    sample = f.read(sample_size)
+    f.seek(start)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=_DELIMITERS)
+    except csv.Error:
+        header = sample.splitlines()[0] if sample else ""
+        delimiter = max(_DELIMITERS, key=header.count)
+        if delimiter == "," or not header.count(delimiter):
+            return csv.excel
+        return type("SniffedDialect", (csv.excel,), {"delimiter": delimiter})
+
+
+def resolve_headers(
+    fieldnames: Iterable[str],
+    aliases: Mapping[str, str] | None = None,
+    *,
+    keep_unknown_headers: bool = True,
+    known: Iterable[str] | None = None,
+) -> tuple[list[str], list[int]]:
+    """
+    Resolve a file's header row once: normalized names, and the indexes of
+    the columns to keep (all, or only those in known when dropping unknowns).
+    Later duplicate names win, as they do in a dict.
+    """
+    headers = normalize_headers(fieldnames, aliases)
+    allowed = set(known) if known is not None and not keep_unknown_headers else None
+    keep = [i for i, h in enumerate(headers) if allowed is None or h in allowed]
+    return headers, keep
+
+
+def iter_csv_rows(
+    path: str | Path,
+    aliases: Mapping[str, str] | None = None,
+    *,
+    keep_unknown_headers: bool = True,
+    known: Iterable[str] | None = None,
+    converters: Mapping[str, Callable[[Any], Any]] | None = None,
+    headers_out: list[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream rows of a CSV file as dicts keyed by normalized header.
+
+    The dialect is sniffed and the header aliases are resolved once per file;
+    each row is then a single zip over the kept columns, with converters
+    (e.g. {"quantity": parse_float}) applied to their columns. Only one row is
+    held in memory at a time. Short rows are padded with "" and extra cells
+    are dropped. If headers_out is given it is filled with the normalized
+    headers when the header row has been read.
+    """
+    p = Path(path)
+    with p.open("r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, sniff_dialect(f))
+        fieldnames = next(reader, None)
+        if fieldnames is None:
+            return
+        headers, keep = resolve_headers(
+            fieldnames, aliases, keep_unknown_headers=keep_unknown_headers, known=known
+        )
+        if headers_out is not None:
+            headers_out[:] = headers
+        names = [headers[i] for i in keep]
+        convert = [(converters or {}).get(name) for name in names]
+        width = len(headers)
+        typed = any(convert)
+        for raw in reader:
+            if not raw:
+                continue
+            if len(raw) < width:
+                raw = raw + [""] * (width - len(raw))
+            values = [raw[i] for i in keep]
+            if typed:
+                values = [fn(v) if fn else v for fn, v in zip(convert, values)]
+            yield dict(zip(names, values))
+
+
+def batched(items: Iterable[Any], size: int = BATCH_SIZE) -> Iterator[list[Any]]:
+    """Split an iterable into lists of at most size items."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def executemany_batched(
+    conn: sqlite3.Connection,
+    sql: str,
+    params: Iterable[Iterable[Any]],
+    batch_size: int = BATCH_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """
+    Run sql for every parameter tuple, batch_size at a time, so a streamed
+    import holds one batch in memory. Does not commit.
+
+    Returns the number of rows the statement changed (not counting triggers),
+    so an INSERT ... WHERE NOT EXISTS counts only the rows it inserted.
+    progress, if given, is called with the tuples executed so far.
+    """
+    changed = executed = 0
+    for batch in batched(params, batch_size):
+        changed += max(conn.executemany(sql, batch).rowcount, 0)
+        executed += len(batch)
+        if progress is not None:
+            progress(executed)
+    return changed
+
+
 def read_csv_rows(
     path: str | Path,
     aliases: Mapping[str, str] | None = None,
@@ -134,26 +256,13 @@ def read_csv_rows(
     """
     Read CSV with UTF-8 BOM handling, normalize headers with aliases,
     and return (headers, rows) where headers are normalized names.
+    Use iter_csv_rows() for large files.
     """
-    p = Path(path)
-    with p.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        if reader.fieldnames is None:
-            return [], []
-        norm_headers = normalize_headers(reader.fieldnames, aliases)
-
-        rows: list[dict[str, Any]] = []
-        for raw in reader:
-            norm = {}
-            for raw_key, value in raw.items():
-                key = _norm_key(raw_key)
-                key = merge_aliases(DEFAULT_ALIASES, aliases or {}).get(key, key)
-                # If header was unknown and we drop unknowns, skip
-                if not keep_unknown_headers and key not in norm_headers:
-                    continue
-                norm[key] = value
-            rows.append(norm)
-        return norm_headers, rows
+    headers: list[str] = []
+    rows = list(
+        iter_csv_rows(path, aliases, keep_unknown_headers=keep_unknown_headers, headers_out=headers)
+    )
+    return headers, rows
 
 
 def write_csv_rows(
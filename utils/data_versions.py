@@ -0,0 +1,94 @@
+# path: utils/data_versions.py
+"""
+Per-table data version counters.
+
+Every tracked table gets AFTER INSERT/UPDATE/DELETE triggers that bump its
+row in ``data_versions``. Because the counters are maintained by SQLite
+itself, writes from any connection (panels, importers, mobile sync) are
+seen, and a reader can tell whether anything changed with a single query.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import sqlite3
+
+# Tables whose contents are rendered by panels
+TRACKED_TABLES: tuple[str, ...] = (
+    "pantry",
+    "shopping_list",
+    "recipes",
+    "recipe_ingredients",
+    "categories",
+    "recipe_categories",
+    "menu_plan",
+    "calendar_events",
+    "health_log",
+    "hydration_log",
+    "fiber_log",
+    "bristol_log",
+    "care_providers",
+)
+
+_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS data_versions (
+    table_name TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+_TRIGGER_SQL = """
+CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{suffix}
+AFTER {event} ON {table}
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}';
+END
+"""
+
+_EVENTS = (("ins", "INSERT"), ("upd", "UPDATE"), ("del", "DELETE"))
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_version_tracking(
+    conn: sqlite3.Connection, tables: Iterable[str] = TRACKED_TABLES
+) -> None:
+    """Create the counter table and install triggers on existing tables."""
+    conn.execute(_TABLE_SQL)
+    for table in tables:
+        if not _has_table(conn, table):
+            continue
+        conn.execute(
+            "INSERT OR IGNORE INTO data_versions(table_name, version) VALUES(?, 0)",
+            (table,),
+        )
+        for suffix, event in _EVENTS:
+            conn.execute(_TRIGGER_SQL.format(table=table, suffix=suffix, event=event))
+
+
+def get_versions(conn: sqlite3.Connection, tables: Iterable[str]) -> dict[str, int]:
+    """
+    Read the current version of each table.
+
+    Tables without a counter report 0. Returns an empty dict when the
+    counter table is unavailable so callers fall back to always reloading.
+    """
+    names = list(tables)
+    if not names:
+        return {}
+    qs = ",".join("?" * len(names))
+    try:
+        rows = conn.execute(
+            f"SELECT table_name, version FROM data_versions WHERE table_name IN ({qs})",
+            names,
+        ).fetchall()
+    except sqlite3.Error:
+        return {}
+    versions = {name: 0 for name in names}
+    versions.update({row[0]: row[1] for row in rows})
+    return versions
+
@@ -9,7 +9,7 @@ import hashlib
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from typing import Optional, Union
+from typing import BinaryIO, Optional, Union
 
 
 class DataEncryption:
@@ -208,6 +208,39 @@ class DataEncryption:
         except Exception as e:
             raise Exception(f"Failed to decrypt file: {e}")
     
+    def encrypt_stream(self, source: BinaryIO, target: BinaryIO, chunk_size: int = 1 << 20) -> None:
+        """
+        Encrypt a stream chunk by chunk, so large files are never held in memory
+        
+        Each chunk is written as a 4-byte big-endian length followed by its Fernet token.
+        
+        Args:
+            source: Readable binary stream
+            target: Writable binary stream
+            chunk_size: Plaintext bytes per token
+        """
+        try:
+            for chunk in iter(lambda: source.read(chunk_size), b''):
+                token = self._fernet.encrypt(chunk)
+                target.write(len(token).to_bytes(4, 'big') + token)
+        except Exception as e:
+            raise Exception(f"Failed to encrypt stream: {e}")
+    
+    def decrypt_stream(self, source: BinaryIO, target: BinaryIO) -> None:
+        """
+        Decrypt a stream written by encrypt_stream
+        
+        Args:
+            source: Readable binary stream of length-prefixed tokens
+            target: Writable binary stream
+        """
+        try:
+            for prefix in iter(lambda: source.read(4), b''):
+                token = source.read(int.from_bytes(prefix, 'big'))
+                target.write(self._fernet.decrypt(token))
+        except Exception as e:
+            raise Exception(f"Failed to decrypt stream: {e}")
+    
     def hash_password(self, password: str) -> str:
         """
         Hash a password for storage
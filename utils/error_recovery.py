@@ -6,6 +6,7 @@ Error recovery actions and strategies
 import os
 import sqlite3
 import shutil
+from contextlib import closing
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 from .error_handling import ErrorHandler, ErrorCategory, ErrorSeverity, error_handler
@@ -34,8 +35,11 @@ class DatabaseRecovery:
             db_path = _db_path()
             
             if os.path.exists(db_path):
+                from services.snapshot_service import copy_database
                 backup_path = f"{db_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                shutil.copy2(db_path, backup_path)
+                # Backup API copy: includes committed WAL frames, unlike a file copy
+                with closing(sqlite3.connect(db_path)) as conn:
+                    copy_database(conn, backup_path)
                 return backup_path
         except Exception:
             pass
@@ -49,7 +53,9 @@ class DatabaseRecovery:
             db_path = _db_path()
             
             if os.path.exists(backup_path):
-                shutil.copy2(backup_path, db_path)
+                from services.snapshot_service import restore_snapshot
+                with closing(sqlite3.connect(db_path)) as conn:
+                    restore_snapshot(conn, backup_path)
                 return True
         except Exception:
             pass
@@ -0,0 +1,201 @@
+# path: utils/export_stream.py
+"""
+Streaming query exports.
+
+Rows are pulled from a cursor with ``fetchmany`` (SQLite steps the statement
+lazily, so only one block of rows is ever materialized), serialized as a
+block and written with a single ``write`` per block. Output is CSV,
+newline-delimited JSON (one object per line) or a JSON document whose
+``data`` array is written element by element; any of them can be gzipped by
+passing ``compress=True`` or a path ending in ``.gz``. Memory use is bounded
+by the block size, not by the table size, and the first block reaches the
+file as soon as it has been fetched.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+import sqlite3
+from typing import IO, Any
+
+# Rows fetched, serialized and written at a time
+FETCH_ROWS = 1000
+
+# gzip level; 6 is zlib's default trade-off between speed and size
+GZIP_LEVEL = 6
+
+FORMATS: tuple[str, ...] = ("csv", "ndjson", "json")
+
+Progress = Callable[[int], None]
+
+
+def open_output(path: str | Path, compress: bool | None = None) -> IO[str]:
+    """
+    Open a text file for writing, gzipped if compress is set or, when it is
+    None, if the path ends in ``.gz``.
+    """
+    path = Path(path)
+    if compress is None:
+        compress = path.suffix.lower() == ".gz"
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=GZIP_LEVEL)
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def iter_blocks(cursor: sqlite3.Cursor, size: int = FETCH_ROWS) -> Iterator[list[tuple]]:
+    """Blocks of at most size rows from an executed cursor."""
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+
+def column_names(cursor: sqlite3.Cursor) -> list[str]:
+    return [d[0] for d in cursor.description or ()]
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def write_csv(
+    cursor: sqlite3.Cursor,
+    out: IO[str],
+    *,
+    comments: Sequence[str] = (),
+    size: int = FETCH_ROWS,
+    progress: Progress | None = None,
+) -> int:
+    """
+    Write an executed cursor as CSV, header first, optionally preceded by
+    ``# `` comment lines. Returns the number of rows written.
+    """
+    if comments:
+        out.write("".join(f"# {line}\n" for line in comments))
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(column_names(cursor))
+    count = 0
+    for rows in iter_blocks(cursor, size):
+        writer.writerows(rows)
+        out.write(buf.getvalue())
+        buf.seek(0)
+        buf.truncate()
+        count += len(rows)
+        if progress:
+            progress(count)
+    if buf.tell():  # header of an empty result
+        out.write(buf.getvalue())
+    return count
+
+
+def _json_lines(cursor: sqlite3.Cursor, rows: list[tuple], separator: str,
+                json_columns: Collection[str] = ()) -> str:
+    names = column_names(cursor)
+    nested = [i for i, name in enumerate(names) if name in json_columns]
+    lines = []
+    for row in rows:
+        values = [_json_value(v) for v in row]
+        for i in nested:
+            if isinstance(values[i], str):
+                values[i] = json.loads(values[i])
+        lines.append(json.dumps(dict(zip(names, values)), ensure_ascii=False, default=str))
+    return separator.join(lines)
+
+
+def write_ndjson(
+    cursor: sqlite3.Cursor,
+    out: IO[str],
+    *,
+    json_columns: Collection[str] = (),
+    size: int = FETCH_ROWS,
+    progress: Progress | None = None,
+) -> int:
+    """
+    Write an executed cursor as one JSON object per line; json_columns hold
+    JSON text (e.g. from json_group_array) that is nested rather than quoted.
+    Returns the row count.
+    """
+    count = 0
+    for rows in iter_blocks(cursor, size):
+        out.write(_json_lines(cursor, rows, "\n", json_columns) + "\n")
+        count += len(rows)
+        if progress:
+            progress(count)
+    return count
+
+
+def write_json_document(
+    cursor: sqlite3.Cursor,
+    out: IO[str],
+    header: Mapping[str, Any],
+    *,
+    trailer: Callable[[int], Mapping[str, Any]] | None = None,
+    json_columns: Collection[str] = (),
+    size: int = FETCH_ROWS,
+    progress: Progress | None = None,
+) -> int:
+    """
+    Write ``{**header, "data": [rows...], **trailer(count)}`` without holding
+    the rows, so readers that expect a single JSON document keep working.
+    """
+    opening = json.dumps(dict(header), ensure_ascii=False, default=str)
+    out.write(opening[:-1] + (', ' if header else '') + '"data": [\n')
+    count = 0
+    for rows in iter_blocks(cursor, size):
+        out.write((",\n" if count else "") + _json_lines(cursor, rows, ",\n", json_columns))
+        count += len(rows)
+        if progress:
+            progress(count)
+    closing = json.dumps(dict(trailer(count) if trailer else {}), ensure_ascii=False, default=str)
+    out.write("\n]" + (", " + closing[1:] if closing != "{}" else "}") + "\n")
+    return count
+
+
+def export_query(
+    conn: sqlite3.Connection,
+    sql: str,
+    path: str | Path,
+    format_type: str = "ndjson",
+    params: Sequence[Any] = (),
+    *,
+    compress: bool | None = None,
+    comments: Sequence[str] = (),
+    header: Mapping[str, Any] | None = None,
+    trailer: Callable[[int], Mapping[str, Any]] | None = None,
+    json_columns: Collection[str] = (),
+    size: int = FETCH_ROWS,
+    progress: Progress | None = None,
+) -> int:
+    """
+    Stream the result of a query to a file.
+
+    Args:
+        format_type: 'csv', 'ndjson' or 'json'
+        comments: Leading ``#`` lines (CSV only)
+        header, trailer: Top-level fields around the data array (JSON only)
+        json_columns: Columns holding JSON text to nest (JSON formats only)
+
+    Returns:
+        Number of rows written
+    """
+    if format_type not in FORMATS:
+        raise ValueError(f"Unsupported streaming format: {format_type}")
+    cursor = conn.execute(sql, params)
+    try:
+        with open_output(path, compress) as out:
+            if format_type == "csv":
+                return write_csv(cursor, out, comments=comments, size=size, progress=progress)
+            if format_type == "ndjson":
+                return write_ndjson(cursor, out, json_columns=json_columns, size=size, progress=progress)
+            return write_json_document(cursor, out, header or {}, trailer=trailer,
+                                       json_columns=json_columns, size=size, progress=progress)
+    finally:
+        cursor.close()
@@ -9,7 +9,7 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHeaderView, QLabel, QPushButton,
     QScrollArea, QWidget, QGroupBox, QProgressBar, QFrame
 )
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QPixmap, QPainter, QColor
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
@@ -18,42 +18,13 @@ import io
 import base64
 
 
-class HealthAnalysisWorker(QThread):
-    """Worker thread for health analysis"""
-    analysis_complete = Signal(dict)
-    progress_update = Signal(str, int)
-    
-    def __init__(self, db_path: str, days_back: int = 90):
-        super().__init__()
-        self.db_path = db_path
-        self.days_back = days_back
-    
-    def run(self):
-        try:
-            from services.health_pattern_analyzer import HealthPatternAnalyzer
-            
-            self.progress_update.emit("Initializing analyzer...", 10)
-            analyzer = HealthPatternAnalyzer(self.db_path)
-            
-            self.progress_update.emit("Fetching health data...", 30)
-            entries = analyzer.get_health_entries(self.days_back)
-            
-            self.progress_update.emit("Analyzing symptom patterns...", 50)
-            insights = analyzer.generate_health_insights(entries)
-            
-            self.progress_update.emit("Analysis complete!", 100)
-            self.analysis_complete.emit(insights)
-            
-        except Exception as e:
-            self.analysis_complete.emit({'error': str(e)})
-
-
 class HealthAnalysisDialog(QDialog):
     """Dialog for displaying comprehensive health analysis"""
     
-    def __init__(self, parent=None, db_path: str = "data/celiogix.db"):
+    def __init__(self, parent=None, db_path: str = "data/celiogix.db", days_back: int = 90):
         super().__init__(parent)
         self.db_path = db_path
+        self.days_back = days_back
         self.insights = None
         self.setWindowTitle("Health Pattern Analysis")
         self.setModal(True)
@@ -213,11 +184,33 @@ class HealthAnalysisDialog(QDialog):
         return tab
     
     def start_analysis(self):
-        """Start the health analysis in a separate thread"""
-        self.worker = HealthAnalysisWorker(self.db_path)
-        self.worker.progress_update.connect(self.update_progress)
-        self.worker.analysis_complete.connect(self.on_analysis_complete)
-        self.worker.start()
+        """Start the health analysis in the background; unchanged data is answered from the cache"""
+        from services.health_analysis_jobs import get_health_analysis_runner
+        
+        self.runner = get_health_analysis_runner()
+        self.runner.progress.connect(self.update_progress)
+        self.runner.result_ready.connect(self.on_result_ready)
+        self.runner.dropped.connect(self.on_analysis_dropped)
+        self.finished.connect(self.stop_analysis)
+        self.runner.start('insights', self.days_back, self.db_path)
+    
+    def stop_analysis(self):
+        """Cancel a running analysis and stop listening to the runner"""
+        self.runner.dropped.disconnect(self.on_analysis_dropped)
+        if self.insights is None:
+            self.runner.cancel('insights')
+        self.runner.progress.disconnect(self.update_progress)
+        self.runner.result_ready.disconnect(self.on_result_ready)
+    
+    def on_result_ready(self, kind: str, insights: Dict[str, Any]):
+        """Take the runner's insights result"""
+        if kind == 'insights':
+            self.on_analysis_complete(insights)
+    
+    def on_analysis_dropped(self, kind: str):
+        """Stop showing progress when another analysis superseded this one"""
+        if kind == 'insights' and self.insights is None:
+            self.on_analysis_complete({'error': "another analysis was started; reopen this window to retry"})
     
     def update_progress(self, message: str, percentage: int):
         """Update progress bar and label"""
@@ -264,6 +257,23 @@ class HealthAnalysisDialog(QDialog):
 • <b>Average hydration:</b> {summary.get('average_hydration_liters', 0)} L/day
 • <b>Average fiber intake:</b> {summary.get('average_fiber_grams', 0)} g/day
 
+"""
+        
+        # Long-range figures come from the monthly rollups, not the entries
+        long_term = self.insights.get('long_term', {}).get('summary', {})
+        if long_term:
+            summary_text += f"""
+<h3>📅 Last 12 Months</h3>
+• <b>Days logged:</b> {long_term['days_logged']} days ({long_term['entries']} entries)
+• <b>Entries with symptoms:</b> {long_term['symptom_frequency']:.1%}
+• <b>Average severity:</b> {long_term['average_severity']:.1f}
+• <b>Hydration:</b> {long_term['hydration_liters_per_day']:.1f} L/day
+• <b>Fiber:</b> {long_term['fiber_grams_per_day']:.1f} g/day
+"""
+            if long_term['most_common_bristol']:
+                summary_text += f"• <b>Most common Bristol type:</b> {long_term['most_common_bristol']}\n"
+        
+        summary_text += """
 <h3>🔍 Key Findings</h3>
 """
         
@@ -326,7 +336,8 @@ class HealthAnalysisDialog(QDialog):
     
     def populate_trends(self):
         """Populate health trends table"""
-        trends = self.insights.get('health_trends', [])
+        # Window trends, then month-over-month trends from the rollups
+        trends = self.insights.get('health_trends', []) + self.insights.get('long_term', {}).get('trends', [])
         
         self.trends_table.setRowCount(len(trends))
         
@@ -0,0 +1,425 @@
+# path: utils/health_index.py
+"""
+Normalized symptom and meal-item tables for health_log.
+
+``health_log.symptoms`` and ``health_log.items`` are free text. This module
+keeps them parsed into junction tables so analytics can use indexed joins
+instead of re-tokenizing every entry on every run:
+
+* ``symptom`` / ``health_log_symptom`` -- one row per symptom of an entry,
+  indexed on (symptom_id, date, time)
+* ``ingredient`` / ``meal_item`` -- one row per canonical ingredient eaten in
+  an entry, indexed on (ingredient_id, date, time)
+
+Parsing needs the symptom list and the ingredient lexicon, so it is not done
+in SQL. Instead, triggers on ``health_log`` put the id of every inserted or
+text-edited entry into ``health_log_index_queue`` (and drop the junction rows
+of deleted entries), and :func:`sync_health_index` parses just the queued
+entries with the parsers it is given. Writes from any connection are picked
+up. Date and time edits are copied to the junction rows by trigger directly.
+
+Existing entries are queued when the tables are first created, so the
+backfill happens on the first sync.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+import sqlite3
+
+Parser = Callable[[str], Iterable[str]]
+
+_TABLES_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS symptom (
+        id   INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS health_log_symptom (
+        health_log_id INTEGER NOT NULL,
+        symptom_id    INTEGER NOT NULL,
+        date          TEXT,
+        time          TEXT,
+        PRIMARY KEY (health_log_id, symptom_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ingredient (
+        id   INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meal_item (
+        health_log_id INTEGER NOT NULL,
+        ingredient_id INTEGER NOT NULL,
+        date          TEXT,
+        time          TEXT,
+        PRIMARY KEY (health_log_id, ingredient_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS health_log_index_queue (
+        health_log_id INTEGER PRIMARY KEY
+    )
+    """,
+)
+
+_INDEXES_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_hls_symptom_date ON health_log_symptom(symptom_id, date, time)",
+    "CREATE INDEX IF NOT EXISTS idx_meal_item_ingredient_date ON meal_item(ingredient_id, date, time)",
+)
+
+_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_health_log_index_ins
+    AFTER INSERT ON health_log
+    BEGIN
+        INSERT OR IGNORE INTO health_log_index_queue(health_log_id) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_health_log_index_text
+    AFTER UPDATE OF symptoms, items ON health_log
+    BEGIN
+        DELETE FROM health_log_symptom WHERE health_log_id = OLD.id;
+        DELETE FROM meal_item WHERE health_log_id = OLD.id;
+        INSERT OR IGNORE INTO health_log_index_queue(health_log_id) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_health_log_index_when
+    AFTER UPDATE OF date, time ON health_log
+    BEGIN
+        UPDATE health_log_symptom SET date = NEW.date, time = NEW.time WHERE health_log_id = NEW.id;
+        UPDATE meal_item SET date = NEW.date, time = NEW.time WHERE health_log_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_health_log_index_del
+    AFTER DELETE ON health_log
+    BEGIN
+        DELETE FROM health_log_symptom WHERE health_log_id = OLD.id;
+        DELETE FROM meal_item WHERE health_log_id = OLD.id;
+        DELETE FROM health_log_index_queue WHERE health_log_id = OLD.id;
+    END
+    """,
+)
+
+# Julian-day timestamp of a (date, time) pair; entries without a time count as midnight
+_WHEN = "julianday({t}.date || ' ' || COALESCE(NULLIF({t}.time, ''), '00:00'))"
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_health_index(conn: sqlite3.Connection) -> None:
+    """Create the junction tables and triggers; queue existing entries on first use."""
+    if not _has_table(conn, "health_log"):
+        return
+    created = not _has_table(conn, "health_log_index_queue")
+    for sql in _TABLES_SQL + _INDEXES_SQL + _TRIGGERS_SQL:
+        conn.execute(sql)
+    if created:
+        queue_all(conn)
+
+
+def queue_all(conn: sqlite3.Connection) -> int:
+    """Queue every entry for re-parsing, e.g. after the parsers changed."""
+    conn.execute("DELETE FROM health_log_symptom")
+    conn.execute("DELETE FROM meal_item")
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO health_log_index_queue(health_log_id) SELECT id FROM health_log"
+    )
+    return cursor.rowcount
+
+
+def pending_count(conn: sqlite3.Connection) -> int:
+    """Number of entries waiting to be parsed."""
+    return conn.execute("SELECT COUNT(*) FROM health_log_index_queue").fetchone()[0]
+
+
+def _ids(conn: sqlite3.Connection, table: str, names: set[str]) -> dict[str, int]:
+    conn.executemany(f"INSERT OR IGNORE INTO {table}(name) VALUES (?)", ((n,) for n in names))
+    ids: dict[str, int] = {}
+    names = list(names)
+    for i in range(0, len(names), 500):
+        chunk = names[i:i + 500]
+        qs = ",".join("?" * len(chunk))
+        ids.update(conn.execute(f"SELECT name, id FROM {table} WHERE name IN ({qs})", chunk))
+    return ids
+
+
+def sync_health_index(
+    conn: sqlite3.Connection,
+    parse_symptoms: Parser,
+    parse_items: Parser,
+    batch_size: int = 500,
+) -> int:
+    """
+    Parse the queued entries into the junction tables.
+
+    Args:
+        conn: Database connection
+        parse_symptoms: Maps symptoms text to symptom names
+        parse_items: Maps items text to canonical ingredient names
+        batch_size: Entries parsed per transaction
+
+    Returns:
+        Number of entries parsed
+    """
+    total = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT q.health_log_id, h.date, h.time, h.symptoms, h.items
+            FROM health_log_index_queue q JOIN health_log h ON h.id = q.health_log_id
+            LIMIT ?
+            """,
+            (batch_size,),
+        ).fetchall()
+        if not rows:
+            # Queue rows whose entry is gone are dropped
+            conn.execute("DELETE FROM health_log_index_queue")
+            conn.commit()
+            return total
+
+        parsed = [
+            (row, set(parse_symptoms(row[3] or "")), set(parse_items(row[4] or "")))
+            for row in rows
+        ]
+        with conn:
+            symptom_ids = _ids(conn, "symptom", set().union(*(p[1] for p in parsed)))
+            ingredient_ids = _ids(conn, "ingredient", set().union(*(p[2] for p in parsed)))
+            conn.executemany(
+                "INSERT OR IGNORE INTO health_log_symptom(health_log_id, symptom_id, date, time) "
+                "VALUES (?, ?, ?, ?)",
+                ((row[0], symptom_ids[name], row[1], row[2]) for row, names, _ in parsed for name in names),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO meal_item(health_log_id, ingredient_id, date, time) "
+                "VALUES (?, ?, ?, ?)",
+                ((row[0], ingredient_ids[name], row[1], row[2]) for row, _, names in parsed for name in names),
+            )
+            conn.executemany(
+                "DELETE FROM health_log_index_queue WHERE health_log_id = ?",
+                ((row[0],) for row in rows),
+            )
+        total += len(rows)
+
+
+def get_entry_symptoms(conn: sqlite3.Connection, entry_ids: Sequence[int]) -> dict[int, list[str]]:
+    """Symptom names of each entry, from the junction table."""
+    return _names_by_entry(conn, "health_log_symptom", "symptom", "symptom_id", entry_ids)
+
+
+def get_entry_ingredients(conn: sqlite3.Connection, entry_ids: Sequence[int]) -> dict[int, list[str]]:
+    """Canonical ingredient names of each entry, from the junction table."""
+    return _names_by_entry(conn, "meal_item", "ingredient", "ingredient_id", entry_ids)
+
+
+def _names_by_entry(
+    conn: sqlite3.Connection, junction: str, table: str, key: str, entry_ids: Sequence[int]
+) -> dict[int, list[str]]:
+    result: dict[int, list[str]] = {}
+    entry_ids = list(entry_ids)
+    for i in range(0, len(entry_ids), 500):
+        chunk = entry_ids[i:i + 500]
+        qs = ",".join("?" * len(chunk))
+        for entry_id, name in conn.execute(
+            f"""
+            SELECT j.health_log_id, t.name FROM {junction} j JOIN {table} t ON t.id = j.{key}
+            WHERE j.health_log_id IN ({qs})
+            ORDER BY j.health_log_id, t.name
+            """,
+            chunk,
+        ):
+            result.setdefault(entry_id, []).append(name)
+    return result
+
+
+def symptoms_after_ingredients(
+    conn: sqlite3.Connection,
+    symptom: str,
+    ingredients: Iterable[str],
+    within_hours: float = 6.0,
+    start: str = "0000-00-00",
+    end: str = "9999-12-31",
+) -> list[dict]:
+    """
+    Entries reporting a symptom within a window after eating any of the ingredients.
+
+    Both sides are read through the (name_id, date) indexes; the time window
+    is checked on the candidate pairs, which are limited to the same or next
+    calendar days.
+
+    Returns:
+        One dict per symptom entry (date, time, health_log_id) with the
+        closest preceding meal entry and the hours between them
+    """
+    ingredients = list(ingredients)
+    if not ingredients:
+        return []
+    qs = ",".join("?" * len(ingredients))
+    days = int(within_hours // 24) + 1
+    cursor = conn.execute(
+        f"""
+        SELECT s.health_log_id, s.date, s.time, m.health_log_id AS meal_id,
+               MIN(({_WHEN.format(t='s')} - {_WHEN.format(t='m')}) * 24.0) AS hours_after
+        FROM health_log_symptom s
+        JOIN meal_item m
+          ON m.ingredient_id IN (SELECT id FROM ingredient WHERE name IN ({qs}))
+         AND m.date >= date(s.date, '-{days} days') AND m.date <= s.date
+        WHERE s.symptom_id = (SELECT id FROM symptom WHERE name = ?)
+          AND s.date >= ? AND s.date <= ?
+          AND ({_WHEN.format(t='s')} - {_WHEN.format(t='m')}) * 24.0 BETWEEN 0 AND ?
+        GROUP BY s.health_log_id
+        ORDER BY s.date, s.time
+        """,
+        (*ingredients, symptom, start, end, within_hours),
+    )
+    columns = ("health_log_id", "date", "time", "meal_id", "hours_after")
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+# Scratch tables for correlation_aggregates, dropped after each run
+_CORRELATION_TABLES = ("corr_window", "corr_entry_ingredient", "corr_entry")
+
+_SEP = "\x1f"
+
+
+def correlation_aggregates(
+    conn: sqlite3.Connection,
+    start: str,
+    end: str,
+    min_lag_hours: float = 0.5,
+    max_lag_hours: float = 24.0,
+    min_pattern_entries: int = 3,
+) -> dict:
+    """
+    Ingredient/symptom co-occurrence counts for entries in a date range.
+
+    Every entry between start and end is related to the entries with food
+    items eaten min_lag_hours to max_lag_hours before it (a range join on
+    idx_health_dt), and takes the meal_item ingredients of those meals. The
+    counts are then grouped in SQLite, so only aggregates reach Python and
+    memory does not grow with the length of the log.
+
+    Returns:
+        Dict with 'entries' (entries with at least one related meal),
+        'ingredients' and 'symptoms' (entries per name), 'pairs' and
+        'weights' (entries and summed severity per (ingredient, symptom)),
+        and 'combinations': one dict per set of two or more ingredients
+        seen in at least min_pattern_entries entries, with 'ingredients',
+        'entries', 'severity_avg', 'symptoms' and 'timing' (entries whose
+        meals were on average <= 2 h, <= 8 h or longer before them)
+    """
+    days = int(max_lag_hours // 24) + 1
+    lag = f"ROUND(({_WHEN.format(t='h')} - {_WHEN.format(t='m')}) * 86400)"
+    statements = (
+        f"""
+        CREATE TEMP TABLE corr_window AS
+        SELECT h.id AS hid, m.id AS mid, COALESCE(h.severity, 0) AS severity, {lag} / 3600.0 AS hours
+        FROM health_log h
+        JOIN health_log m
+          ON m.date >= date(h.date, '-{days} days') AND m.date <= h.date
+         AND m.items IS NOT NULL AND m.items != ''
+        WHERE h.date >= ? AND h.date <= ? AND m.date >= ?
+          AND {lag} BETWEEN ? AND ?
+        """,
+        """
+        CREATE TEMP TABLE corr_entry_ingredient AS
+        SELECT DISTINCT w.hid, mi.ingredient_id, i.name
+        FROM corr_window w
+        JOIN meal_item mi ON mi.health_log_id = w.mid
+        JOIN ingredient i ON i.id = mi.ingredient_id
+        """,
+        f"""
+        CREATE TEMP TABLE corr_entry AS
+        SELECT e.hid, e.severity, e.hours,
+               (SELECT GROUP_CONCAT(name, char({ord(_SEP)})) FROM (
+                    SELECT name FROM corr_entry_ingredient WHERE hid = e.hid ORDER BY name
+               )) AS combo,
+               (SELECT COUNT(*) FROM corr_entry_ingredient WHERE hid = e.hid) AS size
+        FROM (SELECT hid, MAX(severity) AS severity, AVG(hours) AS hours
+              FROM corr_window GROUP BY hid) e
+        """,
+    )
+    params = (
+        (start, end, start, round(min_lag_hours * 3600), round(max_lag_hours * 3600)),
+        (),
+        (),
+    )
+    try:
+        for sql, args in zip(statements, params):
+            conn.execute(sql, args)
+        result = {
+            "entries": conn.execute("SELECT COUNT(*) FROM corr_entry").fetchone()[0],
+            "ingredients": dict(conn.execute(
+                "SELECT name, COUNT(*) FROM corr_entry_ingredient GROUP BY name"
+            )),
+            "symptoms": dict(conn.execute(
+                """
+                SELECT s.name, COUNT(*) FROM corr_entry e
+                JOIN health_log_symptom hs ON hs.health_log_id = e.hid
+                JOIN symptom s ON s.id = hs.symptom_id
+                GROUP BY s.name
+                """
+            )),
+            "pairs": {},
+            "weights": {},
+            "combinations": [],
+        }
+        for ingredient, symptom, count, weight in conn.execute(
+            """
+            SELECT ei.name, s.name, COUNT(*), TOTAL(e.severity)
+            FROM corr_entry_ingredient ei
+            JOIN corr_entry e ON e.hid = ei.hid
+            JOIN health_log_symptom hs ON hs.health_log_id = ei.hid
+            JOIN symptom s ON s.id = hs.symptom_id
+            GROUP BY ei.name, s.name
+            """
+        ):
+            result["pairs"][ingredient, symptom] = count
+            result["weights"][ingredient, symptom] = weight
+
+        combos = conn.execute(
+            """
+            SELECT combo, COUNT(*), AVG(severity),
+                   SUM(hours <= 2), SUM(hours > 2 AND hours <= 8), SUM(hours > 8)
+            FROM corr_entry
+            WHERE size >= 2
+            GROUP BY combo
+            HAVING COUNT(*) >= ?
+            ORDER BY MIN(hid)
+            """,
+            (min_pattern_entries,),
+        ).fetchall()
+        symptoms_by_combo: dict[str, list[str]] = {}
+        for combo, name in conn.execute(
+            """
+            SELECT DISTINCT e.combo, s.name FROM corr_entry e
+            JOIN health_log_symptom hs ON hs.health_log_id = e.hid
+            JOIN symptom s ON s.id = hs.symptom_id
+            WHERE e.size >= 2
+            ORDER BY e.combo, s.name
+            """
+        ):
+            symptoms_by_combo.setdefault(combo, []).append(name)
+        for combo, count, severity_avg, immediate, delayed, variable in combos:
+            result["combinations"].append({
+                "ingredients": combo.split(_SEP),
+                "entries": count,
+                "severity_avg": severity_avg,
+                "symptoms": symptoms_by_combo.get(combo, []),
+                "timing": {"immediate": immediate, "delayed": delayed, "variable": variable},
+            })
+        return result
+    finally:
+        for table in _CORRELATION_TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
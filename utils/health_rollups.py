@@ -0,0 +1,353 @@
+# path: utils/health_rollups.py
+"""
+Daily health rollups maintained by SQLite triggers.
+
+``health_daily_rollup`` holds one row per day with symptom counts, severity
+sum/count/max, meal counts, hydration and fiber totals and the Bristol type
+distribution, combined from ``health_log``, ``hydration_log``, ``fiber_log``
+and ``bristol_log``. Triggers on those tables recompute the affected day(s)
+whenever an entry is inserted, updated or deleted, which touches only that
+day's rows through the date indexes. ``health_weekly_rollup`` and
+``health_monthly_rollup`` are views over the daily table, so long-range
+charts and pattern detection read one row per day, week or month instead of
+every entry.
+
+``health_daily_symptom`` holds one row per day and symptom with the number of
+entries naming it, maintained by triggers on ``health_log_symptom`` (see
+``utils.health_index``), so it follows the parsed symptoms as they are
+synced. ``health_weekly_symptom`` and ``health_monthly_symptom`` are its
+views, and every rollup returned by the ``get_*_rollups`` functions carries a
+``symptoms`` dict of symptom name to count.
+
+Run ``python -m utils.health_rollups [db_path]`` to rebuild the table from
+scratch if it ever drifts (e.g. after a restore that bypassed the triggers).
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import sqlite3
+import sys
+
+SOURCE_TABLES: tuple[str, ...] = ("health_log", "hydration_log", "fiber_log", "bristol_log")
+
+# Parsed symptoms of health_log entries and their names (utils.health_index)
+SYMPTOM_TABLES: tuple[str, ...] = ("health_log_symptom", "symptom")
+
+_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS health_daily_rollup (
+    day              TEXT PRIMARY KEY,
+    entries          INTEGER NOT NULL DEFAULT 0,
+    symptom_entries  INTEGER NOT NULL DEFAULT 0,
+    meal_count       INTEGER NOT NULL DEFAULT 0,
+    severity_sum     REAL NOT NULL DEFAULT 0,
+    severity_count   INTEGER NOT NULL DEFAULT 0,
+    severity_max     REAL,
+    hydration_liters REAL NOT NULL DEFAULT 0,
+    fiber_grams      REAL NOT NULL DEFAULT 0,
+    bristol_1 INTEGER NOT NULL DEFAULT 0,
+    bristol_2 INTEGER NOT NULL DEFAULT 0,
+    bristol_3 INTEGER NOT NULL DEFAULT 0,
+    bristol_4 INTEGER NOT NULL DEFAULT 0,
+    bristol_5 INTEGER NOT NULL DEFAULT 0,
+    bristol_6 INTEGER NOT NULL DEFAULT 0,
+    bristol_7 INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID
+"""
+
+_SYMPTOM_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS health_daily_symptom (
+    day        TEXT NOT NULL,
+    symptom_id INTEGER NOT NULL,
+    count      INTEGER NOT NULL,
+    PRIMARY KEY (day, symptom_id)
+) WITHOUT ROWID
+"""
+
+_BRISTOL_COLUMNS = ", ".join(f"bristol_{k}" for k in range(1, 8))
+
+_COLUMNS = (
+    "day, entries, symptom_entries, meal_count, severity_sum, severity_count, "
+    f"severity_max, hydration_liters, fiber_grams, {_BRISTOL_COLUMNS}"
+)
+
+_AGGREGATES = (
+    "SUM(src = 'h'), "
+    "SUM(src = 'h' AND COALESCE(symptoms, '') != ''), "
+    "SUM(src = 'h' AND COALESCE(items, '') != ''), "
+    "TOTAL(severity), COUNT(severity), MAX(severity), "
+    "TOTAL(liters), TOTAL(grams), "
+    + ", ".join(f"COUNT(CASE WHEN stool = {k} THEN 1 END)" for k in range(1, 8))
+)
+
+# Entries of every source table as one stream of (day, values...) rows
+_SOURCES_SQL = """
+    SELECT 'h' AS src, date, severity, stool, symptoms, items,
+           hydration_liters AS liters, fiber_grams AS grams FROM health_log {where}
+    UNION ALL
+    SELECT 'w', date, NULL, NULL, NULL, NULL, liters, NULL FROM hydration_log {where}
+    UNION ALL
+    SELECT 'f', date, NULL, NULL, NULL, NULL, NULL, grams FROM fiber_log {where}
+    UNION ALL
+    SELECT 'b', date, NULL, type, NULL, NULL, NULL, NULL FROM bristol_log {where}
+"""
+
+# Recompute one day; {day} is an SQL expression yielding 'YYYY-MM-DD'
+_DAY_SQL = """
+    DELETE FROM health_daily_rollup WHERE day = {day};
+    INSERT INTO health_daily_rollup({columns})
+    SELECT {day}, {aggregates}
+    FROM ({sources})
+    GROUP BY 1;
+"""
+
+_DAY_WHERE = "WHERE date >= {day} AND date < date({day}, '+1 day')"
+
+# Recompute one symptom on one day through idx_hls_symptom_date
+_SYMPTOM_DAY_SQL = """
+    DELETE FROM health_daily_symptom WHERE day = {day} AND symptom_id = {symptom};
+    INSERT INTO health_daily_symptom(day, symptom_id, count)
+    SELECT {day}, {symptom}, COUNT(*) FROM health_log_symptom
+    WHERE symptom_id = {symptom} AND date >= {day} AND date < date({day}, '+1 day')
+    HAVING COUNT(*) > 0;
+"""
+
+_TRIGGER_SQL = """
+CREATE TRIGGER IF NOT EXISTS trg_{table}_rollup_{suffix}
+AFTER {event} ON {table}
+BEGIN
+{body}
+END
+"""
+
+_VIEWS_SQL = (
+    f"""
+    CREATE VIEW IF NOT EXISTS health_weekly_rollup AS
+    SELECT date(day, '-6 days', 'weekday 1') AS week_start,
+           SUM(entries) AS entries, SUM(symptom_entries) AS symptom_entries,
+           SUM(meal_count) AS meal_count,
+           SUM(severity_sum) / NULLIF(SUM(severity_count), 0) AS severity_mean,
+           MAX(severity_max) AS severity_max,
+           SUM(hydration_liters) AS hydration_liters, SUM(fiber_grams) AS fiber_grams,
+           {", ".join(f"SUM(bristol_{k}) AS bristol_{k}" for k in range(1, 8))},
+           COUNT(*) AS days_logged
+    FROM health_daily_rollup
+    GROUP BY week_start
+    """,
+    f"""
+    CREATE VIEW IF NOT EXISTS health_monthly_rollup AS
+    SELECT substr(day, 1, 7) AS month,
+           SUM(entries) AS entries, SUM(symptom_entries) AS symptom_entries,
+           SUM(meal_count) AS meal_count,
+           SUM(severity_sum) / NULLIF(SUM(severity_count), 0) AS severity_mean,
+           MAX(severity_max) AS severity_max,
+           SUM(hydration_liters) AS hydration_liters, SUM(fiber_grams) AS fiber_grams,
+           {", ".join(f"SUM(bristol_{k}) AS bristol_{k}" for k in range(1, 8))},
+           COUNT(*) AS days_logged
+    FROM health_daily_rollup
+    GROUP BY month
+    """,
+)
+
+_SYMPTOM_VIEWS_SQL = (
+    """
+    CREATE VIEW IF NOT EXISTS health_weekly_symptom AS
+    SELECT date(day, '-6 days', 'weekday 1') AS week_start, symptom_id,
+           SUM(count) AS count, COUNT(*) AS days
+    FROM health_daily_symptom
+    GROUP BY week_start, symptom_id
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS health_monthly_symptom AS
+    SELECT substr(day, 1, 7) AS month, symptom_id,
+           SUM(count) AS count, COUNT(*) AS days
+    FROM health_daily_symptom
+    GROUP BY month, symptom_id
+    """,
+)
+
+
+def _day_statements(day: str) -> str:
+    where = _DAY_WHERE.format(day=day)
+    return _DAY_SQL.format(
+        day=day, columns=_COLUMNS, aggregates=_AGGREGATES,
+        sources=_SOURCES_SQL.format(where=where),
+    )
+
+
+def _symptom_day_statements(row: str) -> str:
+    return _SYMPTOM_DAY_SQL.format(day=f"substr({row}.date, 1, 10)", symptom=f"{row}.symptom_id")
+
+
+def _has_tables(conn: sqlite3.Connection, names: Iterable[str]) -> bool:
+    names = list(names)
+    qs = ",".join("?" * len(names))
+    row = conn.execute(
+        f"SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name IN ({qs})", names
+    ).fetchone()
+    return row[0] == len(names)
+
+
+def ensure_health_rollups(conn: sqlite3.Connection) -> None:
+    """Create the rollup table, views and triggers; fill the table on first use."""
+    if not _has_tables(conn, SOURCE_TABLES):
+        return
+    created = not _has_tables(conn, ["health_daily_rollup"])
+    conn.execute(_TABLE_SQL)
+    for sql in _VIEWS_SQL:
+        conn.execute(sql)
+
+    new_day = "substr(NEW.date, 1, 10)"
+    old_day = "substr(OLD.date, 1, 10)"
+    for table in SOURCE_TABLES:
+        for suffix, event, body in (
+            ("ins", "INSERT", _day_statements(new_day)),
+            ("del", "DELETE", _day_statements(old_day)),
+            ("upd", "UPDATE", _day_statements(old_day) + _day_statements(new_day)),
+        ):
+            conn.execute(_TRIGGER_SQL.format(table=table, suffix=suffix, event=event, body=body))
+
+    if created:
+        rebuild_health_rollups(conn)
+    _ensure_symptom_rollups(conn)
+
+
+def _ensure_symptom_rollups(conn: sqlite3.Connection) -> None:
+    if not _has_tables(conn, SYMPTOM_TABLES):
+        return
+    created = not _has_tables(conn, ["health_daily_symptom"])
+    conn.execute(_SYMPTOM_TABLE_SQL)
+    for sql in _SYMPTOM_VIEWS_SQL:
+        conn.execute(sql)
+    for suffix, event, body in (
+        ("ins", "INSERT", _symptom_day_statements("NEW")),
+        ("del", "DELETE", _symptom_day_statements("OLD")),
+        ("upd", "UPDATE", _symptom_day_statements("OLD") + _symptom_day_statements("NEW")),
+    ):
+        conn.execute(_TRIGGER_SQL.format(table="health_log_symptom", suffix=suffix, event=event, body=body))
+    if created:
+        _rebuild_symptom_rollups(conn)
+
+
+def rebuild_health_rollups(conn: sqlite3.Connection) -> int:
+    """
+    Recompute every day from the source tables.
+
+    Returns the number of days in the rebuilt table.
+    """
+    conn.execute("DELETE FROM health_daily_rollup")
+    conn.execute(
+        f"""
+        INSERT INTO health_daily_rollup({_COLUMNS})
+        SELECT substr(date, 1, 10) AS day, {_AGGREGATES}
+        FROM ({_SOURCES_SQL.format(where="WHERE date IS NOT NULL")})
+        GROUP BY day
+        """
+    )
+    if _has_tables(conn, ["health_daily_symptom"]):
+        _rebuild_symptom_rollups(conn)
+    return conn.execute("SELECT COUNT(*) FROM health_daily_rollup").fetchone()[0]
+
+
+def _rebuild_symptom_rollups(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM health_daily_symptom")
+    conn.execute(
+        """
+        INSERT INTO health_daily_symptom(day, symptom_id, count)
+        SELECT substr(date, 1, 10) AS day, symptom_id, COUNT(*)
+        FROM health_log_symptom
+        WHERE date IS NOT NULL
+        GROUP BY day, symptom_id
+        """
+    )
+
+
+def _rows(conn: sqlite3.Connection, sql: str, params: Iterable[object]) -> list[dict]:
+    cursor = conn.execute(sql, tuple(params))
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _with_symptoms(
+    conn: sqlite3.Connection, rows: list[dict], key: str, table: str, where: str, params: tuple
+) -> list[dict]:
+    """Add each period's symptom counts, most frequent first, as a 'symptoms' dict."""
+    by_period: dict[str, dict[str, int]] = {row[key]: {} for row in rows}
+    for row in rows:
+        row["symptoms"] = by_period[row[key]]
+    if rows and _has_tables(conn, ["health_daily_symptom"]):
+        for period, name, count in conn.execute(
+            f"""
+            SELECT {key}, s.name, r.count FROM {table} r JOIN symptom s ON s.id = r.symptom_id
+            WHERE {where}
+            ORDER BY r.count DESC, s.name
+            """,
+            params,
+        ):
+            if period in by_period:
+                by_period[period][name] = count
+    return rows
+
+
+def get_daily_rollups(conn: sqlite3.Connection, start: str, end: str) -> list[dict]:
+    """Daily rollups for an inclusive ISO date range, with severity_mean and symptoms added."""
+    where = "day >= ? AND day <= ?"
+    rows = _rows(
+        conn,
+        f"""
+        SELECT *, severity_sum / NULLIF(severity_count, 0) AS severity_mean
+        FROM health_daily_rollup
+        WHERE {where}
+        ORDER BY day
+        """,
+        (start, end),
+    )
+    return _with_symptoms(conn, rows, "day", "health_daily_symptom", where, (start, end))
+
+
+def get_weekly_rollups(conn: sqlite3.Connection, start: str, end: str) -> list[dict]:
+    """Weekly rollups (weeks start on Monday) overlapping an inclusive ISO date range."""
+    where = "week_start >= date(?, '-6 days', 'weekday 1') AND week_start <= ?"
+    rows = _rows(
+        conn,
+        f"""
+        SELECT * FROM health_weekly_rollup
+        WHERE {where}
+        ORDER BY week_start
+        """,
+        (start, end),
+    )
+    return _with_symptoms(conn, rows, "week_start", "health_weekly_symptom", where, (start, end))
+
+
+def get_monthly_rollups(conn: sqlite3.Connection, start: str, end: str) -> list[dict]:
+    """Monthly rollups overlapping an inclusive ISO date range."""
+    where = "month >= substr(?, 1, 7) AND month <= substr(?, 1, 7)"
+    rows = _rows(
+        conn,
+        f"""
+        SELECT * FROM health_monthly_rollup
+        WHERE {where}
+        ORDER BY month
+        """,
+        (start, end),
+    )
+    return _with_symptoms(conn, rows, "month", "health_monthly_symptom", where, (start, end))
+
+
+def main(argv: list[str]) -> int:
+    """Rebuild the rollups of the app database, or of the database given as argument."""
+    if argv:
+        conn = sqlite3.connect(argv[0])
+    else:
+        from utils.db import get_connection
+        conn = get_connection()
+    ensure_health_rollups(conn)
+    with conn:
+        days = rebuild_health_rollups(conn)
+    conn.close()
+    print(f"Rebuilt health rollups: {days} days")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,6 +3,12 @@ from __future__ import annotations
 from collections.abc import Iterable  # ruff: UP035
 import sqlite3
 
+from utils.data_versions import ensure_version_tracking
+from utils.health_index import ensure_health_index
+from utils.health_rollups import ensure_health_rollups
+from utils.recipe_minhash import ensure_recipe_minhash
+from utils.recipe_nutrition import ensure_recipe_nutrition
+
 
 def _has_table(conn: sqlite3.Connection, name: str) -> bool:
     row = conn.execute(
@@ -218,6 +224,7 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     _add_col(conn, "recipes", "difficulty TEXT DEFAULT 'Medium'")
     _add_col(conn, "recipes", "is_favorite INTEGER DEFAULT 0")
     _add_col(conn, "recipes", "image_path TEXT DEFAULT ''")
+    _add_col(conn, "recipes", "notes TEXT DEFAULT ''")
     
     # Add UPC column to pantry table
     _add_col(conn, "pantry", "upc TEXT")
@@ -235,6 +242,19 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
             FOREIGN KEY (recipe_id) REFERENCES recipes(id) ON DELETE CASCADE
         )"""
     )
+    _create_indexes(conn, "recipe_ingredients", [("idx_recipe_ing_recipe", "recipe_id")])
+    
+    # Precomputed gluten risk, filled in by the background risk sweep
+    # The risk sort puts unscored rows last, so its index has the same leading expression
+    for table, prefix, name in (("pantry", "pantry", "name"), ("recipes", "rec", "title")):
+        _add_col(conn, table, "gluten_risk TEXT")
+        _add_col(conn, table, "gluten_risk_score REAL")
+        _add_col(conn, table, "gluten_risk_hash TEXT")
+        conn.execute(f"DROP INDEX IF EXISTS idx_{prefix}_risk_score")
+        _create_indexes(conn, table, [
+            (f"idx_{prefix}_risk", "gluten_risk"),
+            (f"idx_{prefix}_risk_order", f"gluten_risk_score IS NULL, gluten_risk_score, {name}"),
+        ])
     
     # Create categories table
     conn.execute(
@@ -279,6 +299,8 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
             notes TEXT
         )"""
     )
+    _add_col(conn, "menu_plan", "time TEXT")
+    _add_col(conn, "menu_plan", "portions REAL DEFAULT 1.0")
     _create_indexes(conn, "menu_plan", [("idx_menu_date", "date")])
 
     conn.execute(
@@ -373,6 +395,11 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     _add_col(conn, "health_log", "energy_level INTEGER DEFAULT 5")
 
     _migrate_legacy_health(conn)
+    ensure_health_index(conn)
+    ensure_health_rollups(conn)
+    ensure_recipe_nutrition(conn)
+    ensure_recipe_minhash(conn)
+    ensure_version_tracking(conn)
     conn.commit()
 
 
@@ -0,0 +1,327 @@
+# path: utils/nutrient_db.py
+"""
+Offline USDA nutrient database.
+
+A compact, read-only SQLite file with one row per food: its description and a
+packed vector of nutrients per 100 g in ``NUTRIENT_FIELDS`` order, so looking
+up a food is a single primary-key read. Ingredient names are matched through
+``food_alias`` (exact common names such as "all-purpose flour"),
+``food_fts`` (an FTS5 word index with Porter stemming, so "eggs" finds "Egg,
+whole, raw") and ``food_trigram`` (an FTS5 trigram index for misspellings such
+as "quinao"). Both indexes hold only the food's name (see ``food_name``), not
+qualifiers such as "canned in water", so a qualifier word never picks a food.
+
+The app builds ``data/usda_nutrients.db`` on first use from the bundled
+``data/usda_nutrients.csv``, a subset of FoodData Central SR Legacy foods, and
+rebuilds it whenever that file changes. For the full SR Legacy / Foundation
+data, download the FoodData Central CSV release and run::
+
+    python -m utils.nutrient_db <fdc_csv_dir> [db_path]
+
+then point ``CELIAC_NUTRIENT_DB`` at the result.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+import csv
+import hashlib
+import os
+from pathlib import Path
+import re
+import sqlite3
+import sys
+from typing import NamedTuple
+
+from utils.term_matcher import tokenize
+
+ENV_VAR = "CELIAC_NUTRIENT_DB"
+
+# Recorded in the seed database's source, so a database with older tables is rebuilt
+SCHEMA_VERSION = 2
+
+# Order of the packed per-100 g vector; matches NutritionData
+NUTRIENT_FIELDS: tuple[str, ...] = (
+    "calories", "protein_g", "carbs_g", "fiber_g", "sugar_g", "fat_g", "saturated_fat_g",
+    "sodium_mg", "calcium_mg", "iron_mg", "vitamin_d_mcg", "folate_mcg",
+)
+
+# FoodData Central nutrient ids for each field; later ids are fallbacks
+FDC_NUTRIENT_IDS: dict[str, tuple[int, ...]] = {
+    "calories": (1008, 2047, 2048),  # Energy (kcal), then the Atwater energies Foundation foods use
+    "protein_g": (1003,),
+    "carbs_g": (1005, 1050),
+    "fiber_g": (1079,),
+    "sugar_g": (2000, 1063),
+    "fat_g": (1004, 1085),
+    "saturated_fat_g": (1258,),
+    "sodium_mg": (1093,),
+    "calcium_mg": (1087,),
+    "iron_mg": (1089,),
+    "vitamin_d_mcg": (1114,),
+    "folate_mcg": (1177, 1190),
+}
+
+FDC_DATA_TYPES: tuple[str, ...] = ("sr_legacy_food", "foundation_food")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS food (
+    id          INTEGER PRIMARY KEY,
+    fdc_id      INTEGER,
+    description TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    data_type   TEXT NOT NULL,
+    nutrients   BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS food_alias (
+    alias   TEXT PRIMARY KEY,
+    food_id INTEGER NOT NULL REFERENCES food(id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS nutrient_db_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS food_fts USING fts5(
+    name, content='food', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS food_trigram USING fts5(
+    name, content='food', content_rowid='id', tokenize='trigram'
+);
+"""
+
+
+class FoodRecord(NamedTuple):
+    description: str
+    data_type: str
+    nutrients: tuple[float, ...]
+    aliases: tuple[str, ...] = ()
+    fdc_id: int | None = None
+
+
+_PARENTHESES_RE = re.compile(r"\([^)]*\)")
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def seed_path() -> Path:
+    return _project_root() / "data" / "usda_nutrients.csv"
+
+
+def default_db_path() -> Path:
+    return Path(os.getenv(ENV_VAR) or _project_root() / "data" / "usda_nutrients.db")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase words joined by single spaces"""
+    return " ".join(tokenize(name))
+
+
+def head_words(description: str) -> list[str]:
+    """Words before the first comma of a description, without parenthesized text"""
+    return tokenize(_PARENTHESES_RE.sub(" ", description.split(",", 1)[0]))
+
+
+def food_name(description: str) -> str:
+    """
+    The part of a description that names the food
+
+    That is the text before the first comma ("Lemon juice" of "Lemon juice,
+    raw"), or the first two parts when the first is a one-word group ("Fish,
+    tuna" of "Fish, tuna, light, canned in water").
+    """
+    parts = description.split(",")
+    if len(parts) > 1 and len(head_words(description)) == 1:
+        return f"{parts[0]},{parts[1]}".strip()
+    return parts[0].strip()
+
+
+def pack_nutrients(values: Sequence[float]) -> bytes:
+    return array("d", values).tobytes()
+
+
+def unpack_nutrients(blob: bytes) -> tuple[float, ...]:
+    values = array("d")
+    values.frombytes(blob)
+    return tuple(values)
+
+
+def read_seed_csv(path: Path | str) -> Iterator[FoodRecord]:
+    """Foods from the bundled CSV: description, |-separated aliases, then NUTRIENT_FIELDS"""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield FoodRecord(
+                description=row["description"],
+                data_type="sr_legacy_subset",
+                nutrients=tuple(float(row[field] or 0) for field in NUTRIENT_FIELDS),
+                aliases=tuple(alias for alias in row.get("aliases", "").split("|") if alias),
+            )
+
+
+def read_fdc_csv(directory: Path | str,
+                 data_types: Sequence[str] = FDC_DATA_TYPES) -> Iterator[FoodRecord]:
+    """
+    Foods from a FoodData Central CSV release (food.csv and food_nutrient.csv)
+
+    food_nutrient.csv has millions of rows, so it is streamed once and only
+    the nutrients in FDC_NUTRIENT_IDS are kept.
+    """
+    directory = Path(directory)
+    foods: dict[int, tuple[str, str]] = {}
+    with open(directory / "food.csv", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["data_type"] in data_types:
+                foods[int(row["fdc_id"])] = (row["description"], row["data_type"])
+
+    wanted: dict[int, tuple[int, int]] = {}  # nutrient id -> (field index, preference)
+    for index, field in enumerate(NUTRIENT_FIELDS):
+        for preference, nutrient_id in enumerate(FDC_NUTRIENT_IDS[field]):
+            wanted[nutrient_id] = (index, preference)
+
+    amounts: dict[int, dict[int, tuple[int, float]]] = {}
+    with open(directory / "food_nutrient.csv", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            nutrient = wanted.get(int(row["nutrient_id"]))
+            if nutrient is None or not row["amount"]:
+                continue
+            fdc_id = int(row["fdc_id"])
+            if fdc_id not in foods:
+                continue
+            index, preference = nutrient
+            found = amounts.setdefault(fdc_id, {})
+            if index not in found or preference < found[index][0]:
+                found[index] = (preference, float(row["amount"]))
+
+    for fdc_id, (description, data_type) in foods.items():
+        found = amounts.get(fdc_id, {})
+        yield FoodRecord(
+            description=description,
+            data_type=data_type,
+            nutrients=tuple(found[i][1] if i in found else 0.0 for i in range(len(NUTRIENT_FIELDS))),
+            fdc_id=fdc_id,
+        )
+
+
+def build_database(path: Path | str, records: Iterable[FoodRecord], source: str = "") -> int:
+    """
+    Write a nutrient database, replacing path atomically
+
+    Returns:
+        Number of foods written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(_SCHEMA)
+        count = 0
+        with conn:
+            for record in records:
+                cursor = conn.execute(
+                    "INSERT INTO food(fdc_id, description, name, data_type, nutrients) VALUES (?, ?, ?, ?, ?)",
+                    (record.fdc_id, record.description, food_name(record.description), record.data_type,
+                     pack_nutrients(record.nutrients)),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO food_alias(alias, food_id) VALUES (?, ?)",
+                    [(normalize_name(alias), cursor.lastrowid) for alias in record.aliases],
+                )
+                count += 1
+            conn.execute("INSERT INTO food_fts(food_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO food_trigram(food_trigram) VALUES ('rebuild')")
+            conn.execute("INSERT OR REPLACE INTO nutrient_db_meta(key, value) VALUES ('source', ?)", (source,))
+            conn.execute("INSERT OR REPLACE INTO nutrient_db_meta(key, value) VALUES ('fields', ?)",
+                         (",".join(NUTRIENT_FIELDS),))
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+    return count
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def database_source(path: Path | str) -> str | None:
+    """The source recorded in a nutrient database, or None if it is missing or unreadable"""
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        return read_source(conn)
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def read_source(conn: sqlite3.Connection) -> str | None:
+    row = conn.execute("SELECT value FROM nutrient_db_meta WHERE key = 'source'").fetchone()
+    return row[0] if row else None
+
+
+def ensure_seed_database(path: Path | str, seed: Path | str | None = None) -> Path:
+    """Build path from the bundled CSV unless it was already built from the same CSV"""
+    path, seed = Path(path), Path(seed or seed_path())
+    source = f"seed:{SCHEMA_VERSION}:{_file_hash(seed)}"
+    if database_source(path) != source:
+        build_database(path, read_seed_csv(seed), source)
+    return path
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def alias_food(conn: sqlite3.Connection, name: str) -> int | None:
+    row = conn.execute("SELECT food_id FROM food_alias WHERE alias = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def word_candidates(conn: sqlite3.Connection, terms: Sequence[str], limit: int = 5) -> list[tuple[int, str]]:
+    """Foods whose name contains every (stemmed) word, best bm25 rank first"""
+    if not terms:
+        return []
+    return conn.execute(
+        "SELECT food.id, food.description FROM food_fts JOIN food ON food.id = food_fts.rowid "
+        "WHERE food_fts MATCH ? ORDER BY bm25(food_fts), length(food.description) LIMIT ?",
+        (" ".join(_quote(term) for term in terms), limit),
+    ).fetchall()
+
+
+def trigram_candidates(conn: sqlite3.Connection, grams: Iterable[str], limit: int = 20) -> list[tuple[int, str]]:
+    """Foods whose name shares any of the trigrams, best bm25 rank first"""
+    query = " OR ".join(_quote(gram) for gram in sorted(set(grams)))
+    if not query:
+        return []
+    return conn.execute(
+        "SELECT food.id, food.description FROM food_trigram JOIN food ON food.id = food_trigram.rowid "
+        "WHERE food_trigram MATCH ? ORDER BY bm25(food_trigram) LIMIT ?",
+        (query, limit),
+    ).fetchall()
+
+
+def food_nutrients(conn: sqlite3.Connection, food_id: int) -> tuple[float, ...] | None:
+    row = conn.execute("SELECT nutrients FROM food WHERE id = ?", (food_id,)).fetchone()
+    return unpack_nutrients(row[0]) if row else None
+
+
+def main(argv: list[str]) -> int:
+    if not argv:
+        path = ensure_seed_database(default_db_path())
+        print(f"Nutrient database up to date: {path}")
+        return 0
+    directory = Path(argv[0])
+    path = Path(argv[1]) if len(argv) > 1 else default_db_path()
+    count = build_database(path, read_fdc_csv(directory), f"fdc:{directory.resolve()}")
+    print(f"Wrote {count} foods to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,260 @@
+# path: utils/recipe_minhash.py
+"""
+MinHash signatures and an LSH band index for near-duplicate recipes.
+
+A recipe is reduced to a set of tokens: the words of its title, minus filler
+such as "best" or "gf", and the ingredient words, minus quantities and
+units. ``recipe_minhash`` stores a MinHash signature of that set for each
+recipe; the fraction of equal signature slots estimates the Jaccard
+similarity of two recipes, so "Best GF Pancakes" and "GF pancakes (best)"
+with the same ingredients come out identical. The signature is cut into
+``BANDS`` bands of ``ROWS`` slots, and ``recipe_lsh`` maps the hash of each
+band to the recipes that share it. Looking up a recipe's candidates is one
+indexed probe per band, however large the library is. Recipes with
+similarity s share at least one band with probability 1 - (1 - s**ROWS)**BANDS,
+which is about 0.64 at s = 0.5, 0.99 at s = 0.7 and above 0.999 at s = 0.8.
+
+Triggers drop a recipe's rows when its title, ingredient text or ingredient
+rows change, or when it is deleted. ``index_missing`` then re-signs only
+those recipes. Run ``python -m utils.recipe_minhash [db_path]`` to rebuild
+the index from scratch.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+import hashlib
+import sqlite3
+import sys
+
+import numpy as np
+
+from utils.term_matcher import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Least estimated Jaccard similarity reported as a near-duplicate
+DEFAULT_THRESHOLD = 0.7
+
+# Mersenne prime 2**61 - 1 keeps a * x + b below 2**64 for 32-bit x and a < 2**31
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _seeded(label: str, i: int, bits: int) -> int:
+    digest = hashlib.blake2b(f"{label}{i}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % (1 << bits)
+
+
+# Hash permutations (a * x + b) mod p; derived from fixed labels so every process agrees
+_A = np.array([_seeded("minhash-a", i, 31) | 1 for i in range(NUM_PERM)], dtype=np.uint64)
+_B = np.array([_seeded("minhash-b", i, 31) for i in range(NUM_PERM)], dtype=np.uint64)
+
+# Title words that do not tell recipes apart
+TITLE_STOPWORDS = frozenset({
+    "a", "an", "and", "the", "with", "of", "for", "in", "my", "our", "best", "easy", "quick",
+    "simple", "perfect", "classic", "homemade", "ultimate", "favorite", "favourite", "recipe",
+    "gf", "gluten", "free", "glutenfree", "healthy", "delicious", "super", "style",
+})
+
+# Ingredient words that are amounts, units or preparation rather than food
+INGREDIENT_STOPWORDS = frozenset({
+    "cup", "cups", "tbsp", "tsp", "tablespoon", "tablespoons", "teaspoon", "teaspoons", "g",
+    "gram", "grams", "kg", "ml", "l", "oz", "ounce", "ounces", "lb", "lbs", "pound", "pounds",
+    "pinch", "dash", "can", "cans", "package", "pkg", "clove", "cloves", "slice", "slices",
+    "large", "medium", "small", "fresh", "chopped", "diced", "minced", "sliced", "grated",
+    "melted", "softened", "to", "taste", "optional", "of", "and", "or", "a", "for", "divided",
+    "plus", "more", "about", "gf", "gluten", "free", "certified",
+})
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS recipe_minhash (
+        recipe_id INTEGER PRIMARY KEY,
+        signature BLOB NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS recipe_lsh (
+        band      INTEGER NOT NULL,
+        bucket    INTEGER NOT NULL,
+        recipe_id INTEGER NOT NULL,
+        PRIMARY KEY (band, bucket, recipe_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_recipe_lsh_recipe ON recipe_lsh(recipe_id)",
+)
+
+_DROP = ("DELETE FROM recipe_minhash WHERE recipe_id = {id}; "
+         "DELETE FROM recipe_lsh WHERE recipe_id = {id};")
+
+_TRIGGERS = {
+    "trg_recipe_minhash_rec_upd": "AFTER UPDATE OF title, ingredients ON recipes BEGIN "
+        + _DROP.format(id="OLD.id") + " END",
+    "trg_recipe_minhash_rec_del": "AFTER DELETE ON recipes BEGIN " + _DROP.format(id="OLD.id") + " END",
+    "trg_recipe_minhash_ing_ins": "AFTER INSERT ON recipe_ingredients BEGIN "
+        + _DROP.format(id="NEW.recipe_id") + " END",
+    "trg_recipe_minhash_ing_upd": "AFTER UPDATE ON recipe_ingredients BEGIN "
+        + _DROP.format(id="OLD.recipe_id") + " " + _DROP.format(id="NEW.recipe_id") + " END",
+    "trg_recipe_minhash_ing_del": "AFTER DELETE ON recipe_ingredients BEGIN "
+        + _DROP.format(id="OLD.recipe_id") + " END",
+}
+
+
+def ensure_recipe_minhash(conn: sqlite3.Connection) -> None:
+    """Create the signature and band tables and their invalidation triggers."""
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    for name, body in _TRIGGERS.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def recipe_tokens(title: str, ingredients: str | Iterable[str] = ()) -> set[str]:
+    """Title and ingredient words of a recipe, prefixed so the two never collide"""
+    if isinstance(ingredients, str):
+        ingredients = ingredients.splitlines()
+    tokens = {f"t:{word}" for word in tokenize(title or "") if word not in TITLE_STOPWORDS}
+    for line in ingredients:
+        tokens.update(f"i:{word}" for word in tokenize(str(line or ""))
+                      if word not in INGREDIENT_STOPWORDS and not word.isdigit())
+    return tokens
+
+
+def signature(tokens: Iterable[str]) -> np.ndarray | None:
+    """MinHash signature (NUM_PERM uint32 values) of a token set, None if it is empty"""
+    hashes = np.array(
+        sorted({int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), "little")
+                for token in tokens}),
+        dtype=np.uint64,
+    )
+    if not hashes.size:
+        return None
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % _PRIME & _MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the token sets behind two signatures"""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def band_buckets(sig: np.ndarray) -> list[int]:
+    """Signed 64-bit hash of each band of a signature"""
+    data = sig.astype("<u4").tobytes()
+    width = ROWS * 4
+    return [
+        int.from_bytes(hashlib.blake2b(data[i * width:(i + 1) * width], digest_size=8).digest(),
+                       "little", signed=True)
+        for i in range(BANDS)
+    ]
+
+
+def _unpack(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<u4").astype(np.uint32)
+
+
+def store_signatures(conn: sqlite3.Connection, signatures: dict[int, np.ndarray]) -> None:
+    """Replace the signatures and band rows of recipes."""
+    if not signatures:
+        return
+    ids = [(recipe_id,) for recipe_id in signatures]
+    conn.executemany("DELETE FROM recipe_lsh WHERE recipe_id = ?", ids)
+    conn.executemany(
+        "INSERT OR REPLACE INTO recipe_minhash(recipe_id, signature) VALUES (?, ?)",
+        [(recipe_id, sig.astype("<u4").tobytes()) for recipe_id, sig in signatures.items()],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO recipe_lsh(band, bucket, recipe_id) VALUES (?, ?, ?)",
+        [(band, bucket, recipe_id)
+         for recipe_id, sig in signatures.items()
+         for band, bucket in enumerate(band_buckets(sig))],
+    )
+
+
+def candidates(conn: sqlite3.Connection, sig: np.ndarray) -> list[int]:
+    """Recipes sharing at least one band with a signature"""
+    buckets = band_buckets(sig)
+    where = " OR ".join(["(band = ? AND bucket = ?)"] * BANDS)
+    params = [value for pair in enumerate(buckets) for value in pair]
+    return [row[0] for row in conn.execute(f"SELECT DISTINCT recipe_id FROM recipe_lsh WHERE {where}", params)]
+
+
+def near_duplicates(
+    conn: sqlite3.Connection, sig: np.ndarray, threshold: float = DEFAULT_THRESHOLD,
+    exclude: Iterable[int] = (),
+) -> list[tuple[int, str, float]]:
+    """
+    Recipes whose estimated similarity to a signature is at least threshold
+
+    Returns:
+        (recipe id, title, similarity), most similar first
+    """
+    skip = set(exclude)
+    ids = [recipe_id for recipe_id in candidates(conn, sig) if recipe_id not in skip]
+    if not ids:
+        return []
+    rows = conn.execute(
+        f"SELECT m.recipe_id, r.title, m.signature FROM recipe_minhash m JOIN recipes r ON r.id = m.recipe_id "
+        f"WHERE m.recipe_id IN ({','.join('?' * len(ids))})", ids,
+    ).fetchall()
+    found = [(recipe_id, title, similarity(sig, _unpack(blob))) for recipe_id, title, blob in rows]
+    return sorted((match for match in found if match[2] >= threshold), key=lambda match: (-match[2], match[0]))
+
+
+def _recipe_texts(conn: sqlite3.Connection, recipe_ids: Sequence[int]) -> dict[int, tuple[str, list[str]]]:
+    marks = ",".join("?" * len(recipe_ids))
+    texts = {
+        recipe_id: (title or "", (ingredients or "").splitlines())
+        for recipe_id, title, ingredients in conn.execute(
+            f"SELECT id, title, ingredients FROM recipes WHERE id IN ({marks})", recipe_ids)
+    }
+    for recipe_id, name in conn.execute(
+        f"SELECT recipe_id, ingredient_name FROM recipe_ingredients WHERE recipe_id IN ({marks})", recipe_ids,
+    ):
+        if recipe_id in texts:
+            texts[recipe_id][1].append(name or "")
+    return texts
+
+
+def index_recipes(conn: sqlite3.Connection, recipe_ids: Iterable[int]) -> int:
+    """Sign recipes from their stored title and ingredients; returns the number signed."""
+    ids = list(recipe_ids)
+    count = 0
+    for start in range(0, len(ids), 500):
+        signatures = {}
+        for recipe_id, (title, ingredients) in _recipe_texts(conn, ids[start:start + 500]).items():
+            sig = signature(recipe_tokens(title, ingredients))
+            if sig is not None:
+                signatures[recipe_id] = sig
+        store_signatures(conn, signatures)
+        count += len(signatures)
+    return count
+
+
+def index_missing(conn: sqlite3.Connection) -> int:
+    """Sign every recipe that has no signature (new, edited or never indexed)."""
+    ids = [row[0] for row in conn.execute(
+        "SELECT id FROM recipes WHERE id NOT IN (SELECT recipe_id FROM recipe_minhash)")]
+    return index_recipes(conn, ids)
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Drop and recompute every signature."""
+    with conn:
+        conn.execute("DELETE FROM recipe_lsh")
+        conn.execute("DELETE FROM recipe_minhash")
+        return index_missing(conn)
+
+
+def main(argv: list[str]) -> int:
+    from utils.db import get_connection
+
+    conn = sqlite3.connect(argv[0]) if argv else get_connection()
+    try:
+        ensure_recipe_minhash(conn)
+        count = rebuild(conn)
+    finally:
+        conn.close()
+    print(f"Indexed {count} recipes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
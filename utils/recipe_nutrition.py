@@ -0,0 +1,94 @@
+# path: utils/recipe_nutrition.py
+"""
+Cached per-recipe nutrient vectors.
+
+``recipe_nutrition`` holds one row per recipe with its nutrients per serving,
+packed in ``utils.nutrient_db.NUTRIENT_FIELDS`` order, and the source of the
+nutrient database they were computed from. Triggers delete a recipe's row
+whenever its ``recipe_ingredients`` rows change or its ``ingredients`` text or
+``servings`` are edited, so any row present is current and only recipes
+without one need computing.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+import sqlite3
+
+from utils.nutrient_db import pack_nutrients, unpack_nutrients
+
+_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS recipe_nutrition (
+    recipe_id INTEGER PRIMARY KEY,
+    source    TEXT NOT NULL,
+    nutrients BLOB NOT NULL
+)
+"""
+
+_TRIGGERS = {
+    "trg_recipe_nutrition_ing_ins": "AFTER INSERT ON recipe_ingredients BEGIN "
+        "DELETE FROM recipe_nutrition WHERE recipe_id = NEW.recipe_id; END",
+    "trg_recipe_nutrition_ing_upd": "AFTER UPDATE ON recipe_ingredients BEGIN "
+        "DELETE FROM recipe_nutrition WHERE recipe_id IN (OLD.recipe_id, NEW.recipe_id); END",
+    "trg_recipe_nutrition_ing_del": "AFTER DELETE ON recipe_ingredients BEGIN "
+        "DELETE FROM recipe_nutrition WHERE recipe_id = OLD.recipe_id; END",
+    "trg_recipe_nutrition_rec_upd": "AFTER UPDATE OF ingredients, servings ON recipes BEGIN "
+        "DELETE FROM recipe_nutrition WHERE recipe_id = OLD.id; END",
+    "trg_recipe_nutrition_rec_del": "AFTER DELETE ON recipes BEGIN "
+        "DELETE FROM recipe_nutrition WHERE recipe_id = OLD.id; END",
+}
+
+
+def ensure_recipe_nutrition(conn: sqlite3.Connection) -> None:
+    """Create the cache table and its invalidation triggers."""
+    conn.execute(_TABLE_SQL)
+    for name, body in _TRIGGERS.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def _placeholders(values: Sequence) -> str:
+    return ",".join("?" * len(values))
+
+
+def cached_vectors(conn: sqlite3.Connection, recipe_ids: Iterable[int], source: str) -> dict[int, tuple[float, ...]]:
+    """Per-serving vectors of the recipes that have a current row for source."""
+    ids = list(recipe_ids)
+    if not ids:
+        return {}
+    rows = conn.execute(
+        f"SELECT recipe_id, nutrients FROM recipe_nutrition "
+        f"WHERE source = ? AND recipe_id IN ({_placeholders(ids)})",
+        [source, *ids],
+    ).fetchall()
+    return {recipe_id: unpack_nutrients(blob) for recipe_id, blob in rows}
+
+
+def store_vectors(conn: sqlite3.Connection, vectors: dict[int, Sequence[float]], source: str) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO recipe_nutrition(recipe_id, source, nutrients) VALUES (?, ?, ?)",
+        [(recipe_id, source, pack_nutrients(vector)) for recipe_id, vector in vectors.items()],
+    )
+
+
+def recipe_ingredients(conn: sqlite3.Connection, recipe_ids: Iterable[int]) -> dict[int, dict]:
+    """
+    Servings, structured ingredient rows and ingredient text of many recipes
+    in two queries.
+
+    Returns:
+        recipe id -> {'servings', 'rows': [(name, quantity, unit)], 'text'}
+    """
+    ids = list(recipe_ids)
+    if not ids:
+        return {}
+    recipes = {
+        recipe_id: {"servings": servings, "rows": [], "text": text or ""}
+        for recipe_id, servings, text in conn.execute(
+            f"SELECT id, servings, ingredients FROM recipes WHERE id IN ({_placeholders(ids)})", ids)
+    }
+    for recipe_id, name, quantity, unit in conn.execute(
+        f"SELECT recipe_id, ingredient_name, quantity, unit FROM recipe_ingredients "
+        f"WHERE recipe_id IN ({_placeholders(ids)}) ORDER BY recipe_id, id", ids,
+    ):
+        if recipe_id in recipes:
+            recipes[recipe_id]["rows"].append((name, quantity or "", unit or ""))
+    return recipes
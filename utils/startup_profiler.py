@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Startup profiler for CeliacShield
+
+Records wall-clock and CPU time for nested startup phases and the cost of
+every module import (in the spirit of ``python -X importtime``), then writes
+a JSON report and a Chrome trace (load it in chrome://tracing or Perfetto).
+
+The profiler is disabled by default; ``span()`` then costs one attribute
+check, so the phase markers can stay in the startup code permanently.
+"""
+
+import importlib.abc
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+PROFILE_FLAG = "--profile-startup"
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_REPORT_PATH = _PROJECT_ROOT / "logs" / "startup_profile.json"
+DEFAULT_TRACE_PATH = _PROJECT_ROOT / "logs" / "startup_trace.json"
+DEFAULT_BUDGET_PATH = _PROJECT_ROOT / "data" / "startup_budget.json"
+
+logger = logging.getLogger(__name__)
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Wraps a module loader and times exec_module"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Only the main thread's import stack is tracked
+        if threading.current_thread() is not threading.main_thread():
+            self._loader.exec_module(module)
+            return
+        with self._profiler._time_import(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        # Resource readers, get_source, etc. go to the real loader
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that wraps every found module's loader"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._finding = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._finding, "active", False):
+            return None
+        self._finding.active = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.active = False
+
+        if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _TimingLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """Collects nested phase spans and module import timings"""
+
+    def __init__(self):
+        self.enabled = False
+        self._origin_wall = time.perf_counter()
+        self._origin_cpu = time.process_time()
+        self._spans: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._imports: List[Dict[str, Any]] = []
+        self._import_stack: List[Dict[str, Any]] = []
+        self._import_timer: Optional[_ImportTimer] = None
+
+    def enable(self, capture_imports: bool = True):
+        """Start recording; capture_imports installs the import timer"""
+        self.enabled = True
+        self._origin_wall = time.perf_counter()
+        self._origin_cpu = time.process_time()
+        if capture_imports and self._import_timer is None:
+            self._import_timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._import_timer)
+
+    def disable(self):
+        """Stop recording and remove the import timer"""
+        self.enabled = False
+        if self._import_timer is not None:
+            try:
+                sys.meta_path.remove(self._import_timer)
+            except ValueError:
+                pass
+            self._import_timer = None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time a (possibly nested) startup phase"""
+        if not self.enabled:
+            yield
+            return
+        record = self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(record)
+
+    def begin(self, name: str) -> Optional[Dict[str, Any]]:
+        """Open a span that ends in a later callback; pair with end()"""
+        if not self.enabled:
+            return None
+        record = {
+            "name": name,
+            "parent": self._stack[-1]["path"] if self._stack else None,
+            "path": "/".join([s["name"] for s in self._stack] + [name]),
+            "depth": len(self._stack),
+            "start_ms": (time.perf_counter() - self._origin_wall) * 1000.0,
+            "_cpu_start": time.process_time(),
+        }
+        self._stack.append(record)
+        return record
+
+    def end(self, record: Optional[Dict[str, Any]]):
+        """Close a span opened with begin()"""
+        if record is None:
+            return
+        if record in self._stack:
+            self._stack.remove(record)
+        record["wall_ms"] = (time.perf_counter() - self._origin_wall) * 1000.0 - record["start_ms"]
+        record["cpu_ms"] = (time.process_time() - record.pop("_cpu_start")) * 1000.0
+        self._spans.append(record)
+
+    @contextmanager
+    def _time_import(self, module_name: str) -> Iterator[None]:
+        """Time one module body, separating self time from nested imports"""
+        record = {
+            "module": module_name,
+            "start_ms": (time.perf_counter() - self._origin_wall) * 1000.0,
+            "depth": len(self._import_stack),
+            "children_ms": 0.0,
+        }
+        self._import_stack.append(record)
+        try:
+            yield
+        finally:
+            self._import_stack.pop()
+            cumulative = (time.perf_counter() - self._origin_wall) * 1000.0 - record["start_ms"]
+            record["cumulative_ms"] = cumulative
+            record["self_ms"] = cumulative - record.pop("children_ms")
+            if self._import_stack:
+                self._import_stack[-1]["children_ms"] += cumulative
+            self._imports.append(record)
+
+    def report(self, top_imports: int = 50) -> Dict[str, Any]:
+        """
+        Build the JSON report
+
+        Returns:
+            Dict with total timings, phases in start order and the most
+            expensive imports by cumulative time
+        """
+        phases = sorted(self._spans, key=lambda s: s["start_ms"])
+        imports = sorted(self._imports, key=lambda i: i["cumulative_ms"], reverse=True)
+        return {
+            "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "total_wall_ms": (time.perf_counter() - self._origin_wall) * 1000.0,
+            "total_cpu_ms": (time.process_time() - self._origin_cpu) * 1000.0,
+            "phases": [dict(span) for span in phases],
+            "import_count": len(self._imports),
+            "import_total_ms": sum(i["self_ms"] for i in self._imports),
+            "imports": imports[:top_imports],
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Build a Chrome trace event document for phases and imports"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span["name"], "cat": "phase", "ph": "X", "pid": pid, "tid": 1,
+                "ts": span["start_ms"] * 1000.0, "dur": span["wall_ms"] * 1000.0,
+                "args": {"cpu_ms": round(span["cpu_ms"], 3)},
+            }
+            for span in self._spans
+        ]
+        events.extend(
+            {
+                "name": imp["module"], "cat": "import", "ph": "X", "pid": pid, "tid": 2,
+                "ts": imp["start_ms"] * 1000.0, "dur": imp["cumulative_ms"] * 1000.0,
+                "args": {"self_ms": round(imp["self_ms"], 3)},
+            }
+            for imp in self._imports
+        )
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "phases"}})
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": 2, "args": {"name": "imports"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, report_path: Path = DEFAULT_REPORT_PATH,
+              trace_path: Path = DEFAULT_TRACE_PATH) -> Dict[str, Any]:
+        """Write the JSON report and Chrome trace; returns the report"""
+        report = self.report()
+        for path, payload in ((report_path, report), (trace_path, self.chrome_trace())):
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+        return report
+
+
+def check_budget(report: Dict[str, Any], budgets: Dict[str, float]) -> List[str]:
+    """
+    Compare a startup report against per-phase wall-clock budgets
+
+    Args:
+        report: Report produced by StartupProfiler.report()
+        budgets: Budget in milliseconds per phase path (e.g. "window/setup_panels"),
+            plus the optional keys "total" and "import_total"
+
+    Returns:
+        List of human-readable violations; empty when within budget
+    """
+    violations = []
+    phases = {p["path"]: p for p in report.get("phases", [])}
+    for key, limit in budgets.items():
+        if key == "total":
+            actual = report.get("total_wall_ms", 0.0)
+        elif key == "import_total":
+            actual = report.get("import_total_ms", 0.0)
+        elif key in phases:
+            actual = phases[key]["wall_ms"]
+        else:
+            continue
+        if actual > limit:
+            violations.append(f"{key}: {actual:.1f} ms exceeds budget of {limit:.1f} ms")
+    return violations
+
+
+def load_budget(path: Path = DEFAULT_BUDGET_PATH) -> Dict[str, float]:
+    """Load per-phase budgets in milliseconds from JSON"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {k: float(v) for k, v in data.get("budgets_ms", {}).items()}
+
+
+def finish_after_first_frame(profiler: Optional[StartupProfiler] = None):
+    """
+    Close the startup profile once the event loop has delivered the first frame
+
+    Records a "first_frame" phase from now until the first event loop
+    iteration, then writes the report and trace and stops profiling.
+    """
+    profiler = profiler or _startup_profiler
+    if not profiler.enabled:
+        return
+
+    from PySide6.QtCore import QTimer
+
+    record = profiler.begin("first_frame")
+
+    def _finish():
+        profiler.end(record)
+        try:
+            report = profiler.write()
+            logger.info(
+                "Startup profile: %.1f ms wall, %.1f ms CPU, %d imports; report written to %s",
+                report["total_wall_ms"], report["total_cpu_ms"], report["import_count"],
+                DEFAULT_REPORT_PATH,
+            )
+        except Exception as e:
+            logger.error(f"Error writing startup profile: {e}")
+        finally:
+            profiler.disable()
+
+    QTimer.singleShot(0, _finish)
+
+
+def consume_profile_flag(argv: List[str]) -> bool:
+    """Remove --profile-startup from argv and report whether it was present"""
+    if PROFILE_FLAG in argv:
+        argv[:] = [arg for arg in argv if arg != PROFILE_FLAG]
+        return True
+    return False
+
+
+# Global startup profiler instance
+_startup_profiler = StartupProfiler()
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """Get global startup profiler instance"""
+    return _startup_profiler
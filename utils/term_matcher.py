@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Multi-term matcher for ingredient text
+
+Finds every occurrence of a fixed vocabulary of (multi-word) terms in a
+single pass over the text. Terms are matched on whole words: the text is
+split into word tokens once and an Aho-Corasick automaton over those tokens
+reports all terms ending at each word, including overlapping ones such as
+"wheat" and "wheat flour". "wheat" therefore matches "whole-wheat" but not
+"buckwheat".
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class TermMatcher:
+    """Aho-Corasick automaton over word tokens"""
+
+    def __init__(self, terms: Optional[Iterable[Tuple[str, Hashable]]] = None):
+        """
+        Initialize the matcher
+
+        Args:
+            terms: Optional (term, payload) pairs to add
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terms: List[Tuple[Tuple[Hashable, int], ...]] = [()]  # (payload, token count)
+        self._out: List[Tuple[Tuple[Hashable, int], ...]] = [()]
+        self._compiled = True
+        for term, payload in terms or ():
+            self.add(term, payload)
+
+    def add(self, term: str, payload: Hashable = None):
+        """
+        Add a term; matching it reports payload (the term itself if None)
+
+        The same term may be added with several payloads.
+        """
+        tokens = tokenize(term)
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            child = self._goto[node].get(token)
+            if child is None:
+                child = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._terms.append(())
+                self._goto[node][token] = child
+            node = child
+        self._terms[node] += ((term if payload is None else payload, len(tokens)),)
+        self._compiled = False
+
+    def compile(self):
+        """Build failure links; called automatically before matching"""
+        self._out = list(self._terms)
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                # Terms that are suffixes of this path also end here
+                self._out[child] += self._out[self._fail[child]]
+                queue.append(child)
+        self._compiled = True
+
+    def find(self, text: str) -> List[Any]:
+        """
+        Find the payloads of all terms occurring in text
+
+        Returns:
+            Unique payloads in order of first occurrence
+        """
+        return list(dict.fromkeys(self.iter_matches(text)))
+
+    def iter_matches(self, text: str):
+        """Yield the payload of every term occurrence, duplicates included"""
+        if not self._compiled:
+            self.compile()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for token in _TOKEN_RE.findall(text.lower()):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for payload, _ in out[node]:
+                yield payload
+
+    def iter_spans(self, tokens: List[str]):
+        """
+        Yield every term occurrence in a tokenized text with its position
+
+        Args:
+            tokens: Word tokens as returned by tokenize()
+
+        Yields:
+            (start, end, payload) with end exclusive, in token indexes
+        """
+        if not self._compiled:
+            self.compile()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for position, token in enumerate(tokens):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for payload, length in out[node]:
+                yield position + 1 - length, position + 1, payload